@@ -0,0 +1,80 @@
+"""
+collection_health.py — 收藏庫 metadata 健康度判定規則
+
+異常番號（corruption pattern）與日文 tag 的判定集中於此：
+- web/routers/collection.py 的 analysis / fix-numbers 端點直接使用
+- core/database 寫入 videos 時預先算好 `number_issue` / `has_japanese_tags` 旗標，
+  並由 trigger 維護 video_health_summary 統計列（見 connection._ensure_video_health）
+"""
+
+import json
+import re
+from typing import Optional
+
+CORRUPTION_RULES = [
+    {"name": "digit_prefix", "pattern": r"^(\d+)([A-Z]{2,}-\d+)$",  "fix_group": 2},
+    {"name": "TK_prefix",    "pattern": r"^TK([A-Z]{2,}-\d+)$",     "fix_group": 1},
+    {"name": "K9_prefix",    "pattern": r"^K9([A-Z]{2,}-\d+)$",     "fix_group": 1},
+    {"name": "R_prefix",     "pattern": r"^R-([A-Z]{2,}-\d+)$",     "fix_group": 1},
+]
+
+_KANA_RE = re.compile(r"[\u3040-\u30ff]")
+
+
+def number_issue(number) -> str:
+    """回傳番號符合的第一個 corruption rule 名稱；正常番號（或 None）回傳 ''。
+
+    各 rule 的首字元互斥（數字 / TK / K9 / R-），同一番號至多符合一條。
+    """
+    if number is None:
+        return ""
+    upper = number.upper()
+    for rule in CORRUPTION_RULES:
+        if re.match(rule["pattern"], upper):
+            return rule["name"]
+    return ""
+
+
+def is_corrupted_number(number) -> bool:
+    """判斷番號是否符合任一 corruption pattern（None-safe）"""
+    return number_issue(number) != ""
+
+
+def get_fixed_number(number) -> Optional[str]:
+    """
+    遍歷 CORRUPTION_RULES，找第一個 match，回傳 fix_group 對應的 capture group。
+    不 match → 回傳 None。供 preview 和 apply 共用。
+    """
+    if number is None:
+        return None
+    upper = number.upper()
+    for rule in CORRUPTION_RULES:
+        m = re.match(rule["pattern"], upper)
+        if m:
+            return m.group(rule["fix_group"])
+    return None
+
+
+def has_japanese_tags(tags_json) -> bool:
+    """判斷 tags JSON 字串中是否含有假名字元（None-safe，非法 JSON 返回 False）"""
+    if not tags_json:
+        return False
+    try:
+        tags = json.loads(tags_json)
+    except (json.JSONDecodeError, TypeError):
+        return False
+    if not isinstance(tags, list):
+        return False
+    return any(
+        bool(_KANA_RE.search(tag))
+        for tag in tags
+        if isinstance(tag, str)
+    )
+
+
+def health_flags(number, tags_json) -> dict:
+    """寫入 videos 時一併存入的健康度旗標欄位（number_issue / has_japanese_tags）。"""
+    return {
+        "number_issue": number_issue(number),
+        "has_japanese_tags": int(has_japanese_tags(tags_json)),
+    }
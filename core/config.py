@@ -4,11 +4,12 @@ core/config.py — 設定載入 / 儲存 / 遷移邏輯
 提供：
 - CONFIG_PATH, CONFIG_DEFAULT_PATH  — 設定檔路徑常數
 - AppConfig（及全部子 schema）     — Pydantic 設定 schema
-- load_config()                    — 載入設定，含完整 migration 邏輯
+- load_config()                    — 載入設定，含完整 migration 邏輯（唯讀快照，stat 驗證快取）
 - save_config()                    — 儲存設定至 config.json
 """
 
 import json
+import os
 import shutil
 import threading
 from pathlib import Path
@@ -37,6 +38,82 @@ CONFIG_DEFAULT_PATH = _PROJECT_ROOT / "web" / "config.default.json"
 _config_write_lock = threading.Lock()
 
 
+# load_config() 快照快取：(快取 key, 唯讀快照)。key = (路徑, st_mtime_ns, st_size, st_ino)，
+# 外部編輯 config.json（含 atomic replace 換 inode）stat 即變 → 下次 load 重讀；本 process
+# 的寫入（_save_config_unlocked）直接清空。讀寫皆在 _config_write_lock 內。
+_config_cache: Optional[tuple] = None
+
+
+def _readonly(self, *args, **kwargs):
+    raise TypeError("config snapshot is read-only; change settings via mutate_config()")
+
+
+class _FrozenDict(dict):
+    """load_config() 回傳的唯讀 dict：所有呼叫端共用同一份快照，禁止原地修改。
+
+    仍是 dict 子類（isinstance / json.dumps / Pydantic / jsonable_encoder 照常）；
+    copy() / copy.deepcopy() 回傳可修改的一般 dict（巢狀一併解凍）。
+    """
+    __slots__ = ()
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> dict:
+        return _thaw(self)
+
+    def __copy__(self) -> dict:
+        return _thaw(self)
+
+    def __deepcopy__(self, memo) -> dict:
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (dict, (_thaw(self),))
+
+
+class _FrozenList(list):
+    """_FrozenDict 內的唯讀 list。"""
+    __slots__ = ()
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    append = extend = insert = pop = remove = clear = sort = reverse = _readonly
+
+    def copy(self) -> list:
+        return _thaw(self)
+
+    def __copy__(self) -> list:
+        return _thaw(self)
+
+    def __deepcopy__(self, memo) -> list:
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (list, (_thaw(self),))
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return _FrozenDict((k, _freeze(v)) for k, v in value.items())
+    if isinstance(value, list):
+        return _FrozenList(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, dict):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_thaw(v) for v in value]
+    return value
+
+
+def _config_cache_key() -> Optional[tuple]:
+    try:
+        st = os.stat(CONFIG_PATH)
+    except OSError:
+        return None
+    return (str(CONFIG_PATH), st.st_mtime_ns, st.st_size, st.st_ino)
+
+
 # 外部管理器模式共用常數（organizer / enricher 引用）
 STEM_IMAGE_MODES = ('jellyfin', 'emby', 'kodi')
 
@@ -173,6 +250,13 @@ class GalleryConfig(BaseModel):
     output_filename: str = "gallery_output.html"
     path_mappings: dict = {}
     min_size_mb: int = 0
+    scan_workers: int = 8  # 掃描時目錄列舉平行度（fast_scan_directory；NAS 上兄弟目錄同時列）
+    scan_file_workers: int = 4  # 掃描時 scan_file 平行度（讀 NFO / 找封面 / 列 extrafanart 的 I/O 延遲互相重疊）
+    scan_dir_index: bool = True  # 重掃時目錄 mtime 沒變就沿用上次列舉結果（core.database.scan_index）
+    watch_enabled: bool = False  # 背景監看來源資料夾，變動即增量同步（core.gallery_watcher）
+    watch_mode: str = "auto"  # auto（本機原生通知、網路掛載輪詢）/ native / poll
+    watch_poll_interval_s: int = 60  # 輪詢模式的列舉間隔
+    watch_debounce_s: float = 2.0  # 安靜多久後套用累積的變動
     default_mode: str = "image"
     default_sort: str = "date"
     default_order: str = "descending"
@@ -217,6 +301,8 @@ class AppConfig(BaseModel):
     general: GeneralConfig = GeneralConfig()
     sources: list[SourceConfig] = Field(default_factory=get_builtin_sources)
     thumbnail_cache_enabled: bool = False  # 縮圖快取開關（feature/71 T2）；預設關閉；top-level additive migration 補缺漏
+    thumbnail_cache_max_mb: int = 0  # 縮圖快取容量上限（MB）；0 = 不限。讀端一律 .get(..., 0)，no migration needed
+    thumbnail_cache_packed: bool = False  # 縮圖改存 pack 檔 + 索引（core/thumbnail_pack.py）；讀端 .get(..., False)
     metatube: MetatubeConfig = MetatubeConfig()  # CD-63b-3；Pydantic default 自動補缺漏（no migration needed）
 
 
@@ -528,9 +614,21 @@ def _load_config_unlocked() -> dict:  # noqa: C901 — config 遷移主流程；
 
 
 def load_config() -> dict:
-    """載入設定，包含自動遷移邏輯和首次啟動初始化（process-wide 序列化）"""
+    """載入設定，包含自動遷移邏輯和首次啟動初始化（process-wide 序列化）
+
+    回傳唯讀快照（_FrozenDict）：config.json 的 stat 未變時直接回同一份，不重讀、不重跑
+    migration。要改設定請走 mutate_config()；需要可修改的副本用 `.copy()`。
+    """
+    global _config_cache
     with _config_write_lock:
-        return _load_config_unlocked()
+        key = _config_cache_key()
+        if key is not None and _config_cache is not None and _config_cache[0] == key:
+            return _config_cache[1]
+        snapshot = _freeze(_load_config_unlocked())
+        # migration 可能剛寫回檔案 → 以讀完後的 stat 為 key；檔案不存在（純預設值）不快取
+        key = _config_cache_key()
+        _config_cache = (key, snapshot) if key is not None else None
+        return snapshot
 
 
 def _save_config_unlocked(config: dict) -> None:
@@ -540,9 +638,14 @@ def _save_config_unlocked(config: dict) -> None:
     所有權：同目錄 mkstemp → 關 fd → os.replace → 任何失敗清 temp 並讓原例外
     往上傳）。本函式保留的部分：不取鎖（由 caller 持 _config_write_lock）、
     text mode + encoding='utf-8'、以及「例外一路往上拋」的失敗語意。
+    寫入後清空 load_config() 快照快取（不論成敗，保守重讀）。
     """
-    with atomic_write(CONFIG_PATH, mode='w', encoding='utf-8') as f:
-        json.dump(config, f, indent=2, ensure_ascii=False)
+    global _config_cache
+    try:
+        with atomic_write(CONFIG_PATH, mode='w', encoding='utf-8') as f:
+            json.dump(config, f, indent=2, ensure_ascii=False)
+    finally:
+        _config_cache = None
 
 
 def save_config(config: dict) -> None:
@@ -569,7 +672,9 @@ def mutate_config(mutator: Callable[[dict], None]) -> None:
 
 def reset_config_file() -> None:
     """刪除 config.json（恢復原廠）—— 在鎖內檢查 + 刪除，無 exists/unlink TOCTOU。"""
+    global _config_cache
     with _config_write_lock:
+        _config_cache = None
         if CONFIG_PATH.exists():
             CONFIG_PATH.unlink()
 
@@ -5,6 +5,8 @@
 from .connection import (
     get_db_path,
     get_connection,
+    get_readonly_connection,
+    close_pooled_connections,
     init_db,
     _migrate_old_aliases,
 )
@@ -14,10 +16,16 @@ from .tag_alias import TagAliasRecord, TagAliasRepository
 from .actress import Actress, ActressRepository
 from .actress_library import get_library_actresses
 from .migrate import migrate_json_to_sqlite, backfill_readonly_nfo_mtime
+from .maintenance import MAINTENANCE_INTERVAL_S, DbMaintenance, db_maintenance
+from .read_model import LibrarySnapshot, get_library_snapshot, invalidate_library_snapshots
+from .scan_index import ScanDirIndexRepository
+from .scan_journal import ScanJournal, ScanJournalRepository, scan_filter_key
 
 __all__ = [
     "get_db_path",
     "get_connection",
+    "get_readonly_connection",
+    "close_pooled_connections",
     "init_db",
     "_migrate_old_aliases",
     "Video",
@@ -31,4 +39,14 @@ __all__ = [
     "get_library_actresses",
     "migrate_json_to_sqlite",
     "backfill_readonly_nfo_mtime",
+    "MAINTENANCE_INTERVAL_S",
+    "DbMaintenance",
+    "db_maintenance",
+    "LibrarySnapshot",
+    "get_library_snapshot",
+    "invalidate_library_snapshots",
+    "ScanDirIndexRepository",
+    "ScanJournal",
+    "ScanJournalRepository",
+    "scan_filter_key",
 ]
@@ -9,6 +9,7 @@ from datetime import datetime
 from core.logger import get_logger
 
 from . import connection
+from .read_model import get_library_snapshot
 
 logger = get_logger(__name__)
 
@@ -279,8 +280,9 @@ class ActressRepository:
     def count_videos_for_actress_names(self, names: set) -> int:
         """Count videos where any actress name in `names` appears in the actresses JSON array.
 
-        Uses COUNT(DISTINCT videos.rowid) to avoid double-counting a video that
-        lists multiple aliases of the same actress.
+        Reads the video_actresses junction table (index seek on name); COUNT(DISTINCT
+        video_id) avoids double-counting a video that lists multiple aliases of the
+        same actress.
         """
         if not names:
             return 0
@@ -288,8 +290,8 @@ class ActressRepository:
         conn = self._get_connection()
         try:
             cursor = conn.execute(
-                f"""SELECT COUNT(DISTINCT videos.rowid) FROM videos, json_each(videos.actresses)
-                   WHERE json_valid(videos.actresses) AND json_each.value IN ({placeholders})""",
+                f"""SELECT COUNT(DISTINCT video_id) FROM video_actresses
+                   WHERE name IN ({placeholders})""",
                 tuple(names),
             )
             return cursor.fetchone()[0]
@@ -307,22 +309,15 @@ class ActressRepository:
         依 alias group 聚合用。本方法只吐出原始配對，不做任何分組判斷——分組是 alias
         語意，屬於另一個模組的責任（TASK-117-T1）。
 
-        連線／例外／json_valid 寫法逐字照抄 video.py:995-1023 count_by_actress() 的骨架
-        （BE-DATA-01：不用 context manager，conn.execute 直接用）。
+        配對取自片庫唯讀快照（core.database.read_model；口徑同 video_actresses
+        junction：每片同名只算一次、略過空字串與非字串），不再每次查 junction 表。
         """
-        conn = self._get_connection()
         try:
-            cursor = conn.execute(
-                """SELECT videos.rowid, json_each.value FROM videos, json_each(videos.actresses)
-                   WHERE json_valid(videos.actresses)"""
-            )
-            return cursor.fetchall()
-        except sqlite3.OperationalError:
+            return get_library_snapshot(self.db_path).actress_pairs()
+        except sqlite3.Error:
             # 這支的唯一呼叫端是「從片庫加入女優」面板的聚合，而面板有自己的「載入失敗」狀態。
             # 吞成 [] 會讓端點回 200 + 0 筆 → 面板顯示「共 0 位」，使用者分不出「庫是空的」
             # 和「這次沒讀到」。往上拋 → 端點 500 → 前端 !resp.ok → 顯示「載入失敗，請稍後再試」。
             # （Codex PR#133 review）
-            logger.exception("get_video_actress_pairs json_each failed")
+            logger.exception("get_video_actress_pairs query failed")
             raise
-        finally:
-            conn.close()
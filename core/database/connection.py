@@ -1,11 +1,17 @@
 """core.database.connection — DB 路徑、連線與 schema 初始化（spec-87 子模組）。
 
-get_db_path / get_connection / init_db / _migrate_old_aliases 同住於此。
+get_db_path / get_connection / get_readonly_connection / init_db / _migrate_old_aliases
+同住於此。連線一律經 process-wide 的 per-thread 連線池取得（見 `_ConnectionPool`）。
 """
+import os
 import sqlite3
+import string
 import json
+import threading
 import time
+import weakref
 from pathlib import Path
+from typing import Optional
 
 from core.logger import get_logger
 
@@ -22,15 +28,209 @@ def get_db_path() -> Path:
     return db_dir / "openaver.db"
 
 
+# ── 連線池 ──────────────────────────────────────────────────────────────────
+# 每支 repository method 都是「取連線 → 查詢 → finally conn.close()」的短交易 pattern。
+# 原本每次都 sqlite3.connect() + PRAGMA journal_mode=WAL，單次 thumb miss / prewarm
+# 迭代就開 2~4 條連線；LAN 多機瀏覽時連線建立成本佔請求延遲的可觀比例。
+#
+# 池化做法：`sqlite3.connect(factory=_PooledConnection)`，覆寫 close() 為「歸還」。
+# 呼叫端 pattern 完全不用改（仍然 finally conn.close()），語意等同真 close：
+# - 未 commit 的寫入一律 rollback（真 close 也是丟棄未 commit 變更）
+# - 該連線開出的 cursor 一律 close（結束未讀完 SELECT 殘留的隱性讀交易，否則 WAL
+#   下這條連線下次被借出時會停在舊 snapshot，且寫入升級會 SQLITE_BUSY_SNAPSHOT）
+# - trace / progress / authorizer callback 與 row_factory 還原預設
+#
+# per-thread：sqlite3 連線預設 check_same_thread，池以 threading.local 分執行緒保存；
+# 同一執行緒巢狀借用（如 get_by_path 內呼叫 _get_columns）拿到的是不同連線。
+# 每執行緒閒置上限 `_POOL_MAX_IDLE_PER_THREAD`（跨 db_path 共用 LRU），避免大量
+# tmp DB（測試）或多路徑時 fd 無限累積；執行緒結束時 threading.local 連帶釋放。
+#
+# 借出前以 (st_dev, st_ino) 驗證 DB 檔仍是開連線時那一個——DB 檔被刪除/替換
+# （重置快取、測試重建）時丟棄舊連線重開，不會讀寫到已 unlink 的 inode。
+
+_POOL_MAX_IDLE_PER_THREAD = 4
+
+# 每條連線只套一次的 PRAGMA（WAL 為持久設定，其餘為 per-connection 設定）。
+# synchronous=NORMAL 在 WAL 下不會損毀 DB，僅斷電時可能遺失最後幾筆 commit。
+_RW_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",      # 16 MiB page cache（負值單位為 KiB）
+    "PRAGMA mmap_size=268435456",    # 256 MiB memory-mapped I/O
+)
+_RO_PRAGMAS = (
+    "PRAGMA query_only=ON",          # belt-and-suspenders（mode=ro 之外再擋一層）
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+class _PooledConnection(sqlite3.Connection):
+    """池化連線：close() 歸還連線池而非真的關閉（見上方模組註解）。"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pool = None
+        self._pool_key: tuple = ()
+        self._file_id: Optional[tuple] = None
+        self._pool_generation = 0
+        self._idle = False
+        self._cursors: weakref.WeakSet = weakref.WeakSet()
+
+    # conn.execute / executemany / executescript 在 C 層自建 cursor、不經 cursor()，
+    # 這裡改走 self.cursor() 讓歸還時能一併 close 掉殘留 cursor。
+    def cursor(self, *args, **kwargs):
+        cur = super().cursor(*args, **kwargs)
+        self._cursors.add(cur)
+        return cur
+
+    def execute(self, sql, parameters=(), /):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, parameters, /):
+        return self.cursor().executemany(sql, parameters)
+
+    def executescript(self, sql_script, /):
+        return self.cursor().executescript(sql_script)
+
+    def close(self):
+        if self._pool is None:
+            super().close()
+            return
+        self._pool.release(self)
+
+    def _close_for_real(self):
+        self._pool = None
+        try:
+            super().close()
+        except sqlite3.Error:
+            logger.debug("pooled connection close failed (ignored)", exc_info=True)
+
+
+def _file_identity(db_path: str) -> Optional[tuple]:
+    try:
+        st = os.stat(db_path)
+    except OSError:
+        return None
+    return (st.st_dev, st.st_ino)
+
+
+class _ConnectionPool:
+    """Process-wide、thread-aware 的 SQLite 連線池（rw 與 read-only 分開 key）。"""
+
+    def __init__(self, max_idle_per_thread: int = _POOL_MAX_IDLE_PER_THREAD):
+        self._local = threading.local()
+        self._max_idle = max_idle_per_thread
+        self._generation = 0
+
+    def _idle_list(self) -> list:
+        idle = getattr(self._local, "idle", None)
+        if idle is None:
+            idle = []
+            self._local.idle = idle
+        return idle
+
+    def acquire(self, db_path: Path, readonly: bool = False) -> sqlite3.Connection:
+        db_str = str(db_path)
+        key = (db_str, readonly)
+        file_id = _file_identity(db_str)
+        idle = self._idle_list()
+        # LIFO：最近歸還的連線 page cache 最熱
+        for i in range(len(idle) - 1, -1, -1):
+            conn = idle[i]
+            if conn._pool_key != key:
+                continue
+            del idle[i]
+            if (conn._pool_generation != self._generation
+                    or file_id is None or conn._file_id != file_id):
+                conn._close_for_real()
+                continue
+            conn._idle = False
+            return conn
+        return self._open(db_str, key, readonly)
+
+    def _open(self, db_str: str, key: tuple, readonly: bool) -> sqlite3.Connection:
+        if readonly:
+            uri = Path(db_str).resolve().as_uri() + "?mode=ro"
+            conn = sqlite3.connect(uri, uri=True, factory=_PooledConnection)
+            pragmas = _RO_PRAGMAS
+        else:
+            conn = sqlite3.connect(db_str, factory=_PooledConnection)
+            pragmas = _RW_PRAGMAS
+        if not isinstance(conn, _PooledConnection):
+            # sqlite3.connect 被測試 patch 成 mock 時不納入池
+            return conn
+        for pragma in pragmas:
+            conn.execute(pragma)
+        conn._pool = self
+        conn._pool_key = key
+        conn._file_id = _file_identity(db_str)
+        conn._pool_generation = self._generation
+        return conn
+
+    def release(self, conn: "_PooledConnection") -> None:
+        if conn._idle:
+            return  # 重複 close() → no-op（真 close 也是 idempotent）
+        try:
+            for cur in list(conn._cursors):
+                cur.close()
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+            conn.text_factory = str
+            conn.isolation_level = ""
+            conn.set_trace_callback(None)
+            conn.set_progress_handler(None, 0)
+            conn.set_authorizer(None)
+        except sqlite3.Error:
+            conn._close_for_real()
+            return
+        if conn._pool_generation != self._generation or conn._file_id is None:
+            conn._close_for_real()
+            return
+        idle = self._idle_list()
+        conn._idle = True
+        idle.append(conn)
+        while len(idle) > self._max_idle:
+            idle.pop(0)._close_for_real()
+
+    def clear(self) -> None:
+        """作廢所有已池化連線：目前執行緒立即關閉，其他執行緒下次借用時丟棄重開。"""
+        self._generation += 1
+        idle = self._idle_list()
+        while idle:
+            idle.pop()._close_for_real()
+
+
+_pool = _ConnectionPool()
+
+
 def get_connection(db_path: Path = None) -> sqlite3.Connection:
-    """取得資料庫連線，啟用 WAL 模式"""
+    """取得資料庫連線（池化，WAL + 效能 PRAGMA 只在開新連線時套一次）。
+
+    呼叫端照舊在 finally 呼叫 conn.close()——池化連線的 close() 是歸還。
+    """
+    if db_path is None:
+        db_path = get_db_path()
+    return _pool.acquire(db_path)
+
+
+def get_readonly_connection(db_path: Path = None) -> sqlite3.Connection:
+    """取得唯讀資料庫連線（`mode=ro` + `query_only`，池化）。
+
+    供純讀取的 GET 端點使用；DB 檔不存在時 sqlite3 直接拋 OperationalError
+    （不像 rw 連線會新建空檔），呼叫端需先確認 DB 已初始化。
+    """
     if db_path is None:
         db_path = get_db_path()
+    return _pool.acquire(db_path, readonly=True)
 
-    conn = sqlite3.connect(str(db_path))
-    # 啟用 WAL 模式以提升並發效能
-    conn.execute("PRAGMA journal_mode=WAL")
-    return conn
+
+def close_pooled_connections() -> None:
+    """關閉/作廢連線池內所有閒置連線（app shutdown 與測試重建 DB 時用）。"""
+    _pool.clear()
 
 
 def _migrate_old_aliases(rows: list) -> list:
@@ -88,58 +288,457 @@ def _migrate_old_aliases(rows: list) -> list:
     ]
 
 
-def init_db(db_path: Path = None) -> None:
-    """初始化資料庫 Schema"""
-    conn = get_connection(db_path)
-    cursor = conn.cursor()
+# ── videos 正規化 junction 表（video_actresses / video_tags）──────────────────
+# videos.actresses / videos.tags 以 JSON 陣列存放，女優卡片數、女優作品列表、
+# /api/tags/top 原本都得 `FROM videos, json_each(...)` 全表展開。junction 表以
+# (name|tag, video_id) index 支援 seek，由 videos 上的 trigger 維護——upsert /
+# upsert_batch / repath / update_tags_if_changed / delete_by_paths / clear_all 以及
+# 其他直接寫 videos 的 raw SQL 都自動同步，不需要每條寫入路徑各自記得補寫。
+#
+# 展開規則鏡射既有 json_each 查詢：json_valid 不過（含 NULL）視為空陣列；只收非空
+# 字串元素；同片重複名字只記一次（PRIMARY KEY 去重）。
+_JUNCTION_SPECS = (
+    # (junction 表, 值欄位, videos 來源欄位)
+    ("video_actresses", "name", "actresses"),
+    ("video_tags", "tag", "tags"),
+)
 
-    # 創建影片表格
+
+def _junction_insert_sql(table: str, value_col: str, src_col: str, row_ref: str) -> str:
+    """row_ref='NEW' → trigger body；row_ref='videos' → 全表 backfill。"""
+    expand = (
+        f"json_each(CASE WHEN json_valid({row_ref}.{src_col}) "
+        f"THEN {row_ref}.{src_col} ELSE '[]' END) AS je"
+    )
+    source = f"videos, {expand}" if row_ref == "videos" else expand
+    return (
+        f"INSERT OR IGNORE INTO {table} (video_id, {value_col}) "
+        f"SELECT {row_ref}.id, je.value FROM {source} "
+        f"WHERE je.type = 'text' AND je.value != ''"
+    )
+
+
+def _ensure_video_junctions(cursor: sqlite3.Cursor) -> None:
+    """建立 junction 表 / index / trigger；表首次建立時從 videos 一次性 backfill。"""
+    for table, value_col, src_col in _JUNCTION_SPECS:
+        existed = cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone() is not None
+
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                video_id INTEGER NOT NULL,
+                {value_col} TEXT NOT NULL,
+                PRIMARY KEY (video_id, {value_col})
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_{value_col} ON {table}({value_col}, video_id)"
+        )
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_ai AFTER INSERT ON videos BEGIN
+                {_junction_insert_sql(table, value_col, src_col, 'NEW')};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_au AFTER UPDATE OF {src_col} ON videos
+            WHEN OLD.{src_col} IS NOT NEW.{src_col} BEGIN
+                DELETE FROM {table} WHERE video_id = OLD.id;
+                {_junction_insert_sql(table, value_col, src_col, 'NEW')};
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_ad AFTER DELETE ON videos BEGIN
+                DELETE FROM {table} WHERE video_id = OLD.id;
+            END
+        """)
+
+        if not existed:
+            # 一次性 backfill：既有庫升級時把現存 JSON 展開進 junction 表
+            cursor.execute(_junction_insert_sql(table, value_col, src_col, 'videos'))
+            logger.info("Backfilled %s junction table (%d rows)", table, cursor.rowcount)
+
+
+# ── videos_fts 全文檢索索引（FTS5 trigram）────────────────────────────────────
+# 以 external-content FTS5 表索引 videos 的文字欄位，trigram tokenizer 讓中日文
+# 這種無空白分詞的字串也能做子字串比對（不分大小寫）。同樣由 videos 上的 trigger
+# 維護；external content 的刪除必須帶回「當初寫入的舊值」，因此 UPDATE trigger
+# 以 OLD.* 做 'delete' 再以 NEW.* 重新寫入。
+#
+# FTS5 / trigram（SQLite >= 3.34）屬編譯期選項：建表失敗時只記 warning、不建
+# trigger，VideoRepository.search_text 會自動退回 LIKE 全表比對，不影響 init_db。
+VIDEO_FTS_COLUMNS = (
+    "number", "title", "original_title", "actresses", "tags", "series", "maker", "label",
+)
+
+
+def _ensure_video_fts(cursor: sqlite3.Cursor) -> None:
+    """建立 videos_fts 與同步 trigger；首次建立時以 'rebuild' 從 videos 全量灌入。"""
+    existed = cursor.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'videos_fts'"
+    ).fetchone() is not None
+    present = {row[1] for row in cursor.execute("PRAGMA table_info(videos)")}
+    missing = [c for c in VIDEO_FTS_COLUMNS if c not in present]
+    if missing:
+        logger.warning("videos_fts skipped: videos table lacks %s", ", ".join(missing))
+        return
+    cols = ", ".join(VIDEO_FTS_COLUMNS)
+    new_vals = ", ".join(f"NEW.{c}" for c in VIDEO_FTS_COLUMNS)
+    old_vals = ", ".join(f"OLD.{c}" for c in VIDEO_FTS_COLUMNS)
+    # 重掃 upsert 的 DO UPDATE 會 SET 全部欄位——值沒變就不重寫索引
+    changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in VIDEO_FTS_COLUMNS)
+    try:
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+                {cols},
+                content='videos', content_rowid='id', tokenize='trigram'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning("videos_fts unavailable (FTS5 trigram not supported: %s); "
+                       "library search falls back to LIKE scans", e)
+        return
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_videos_fts_ai AFTER INSERT ON videos BEGIN
+            INSERT INTO videos_fts (rowid, {cols}) VALUES (NEW.id, {new_vals});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_videos_fts_ad AFTER DELETE ON videos BEGIN
+            INSERT INTO videos_fts (videos_fts, rowid, {cols}) VALUES ('delete', OLD.id, {old_vals});
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS trg_videos_fts_au AFTER UPDATE OF {cols} ON videos
+        WHEN {changed} BEGIN
+            INSERT INTO videos_fts (videos_fts, rowid, {cols}) VALUES ('delete', OLD.id, {old_vals});
+            INSERT INTO videos_fts (rowid, {cols}) VALUES (NEW.id, {new_vals});
+        END
+    """)
+
+    if not existed:
+        cursor.execute("INSERT INTO videos_fts (videos_fts) VALUES ('rebuild')")
+        logger.info("Built videos_fts full-text index")
+
+
+# Showcase 分頁列表（VideoRepository.list_page）的排序鍵 → SQL 排序運算式。
+# NULL 以 IFNULL 收斂成同型別預設值：row-value keyset 比較遇到 NULL 會得 NULL，
+# 該列就永遠落在任何一頁之外。運算式索引必須與查詢逐字相同 planner 才會採用，
+# 所以兩邊共用這一張表。
+VIDEO_SORT_EXPRESSIONS = {
+    "date": "IFNULL(release_date, '')",
+    "mtime": "IFNULL(mtime, 0)",
+    "size": "IFNULL(size_bytes, 0)",
+    "rating": "IFNULL(user_rating, 0)",
+}
+
+
+def _ensure_video_sort_indexes(cursor: sqlite3.Cursor) -> None:
+    """為每個排序鍵建 (運算式, id) 索引：keyset 分頁直接走索引順序，找到 limit 筆就停。"""
+    for key, expr in VIDEO_SORT_EXPRESSIONS.items():
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_videos_sort_{key} ON videos({expr}, id)"
+        )
+
+
+# 番號比對鍵：大小寫、分隔符（- _ 空白）與 FC2-PPV / FC2 寫法不同的番號視為同一片
+# （SONE-205 / sone205 / FC2-PPV-1234567 / FC2-1234567），涵蓋 normalize_number 補
+# hyphen 前後兩種寫法。以運算式索引實作：包含 raw SQL 在內的所有寫入路徑都由 SQLite
+# 自動維護索引，不需另存欄位或 trigger；查詢端必須逐字使用同一運算式 planner 才會採用。
+NUMBER_KEY_SQL = (
+    "REPLACE(REPLACE(REPLACE(REPLACE(UPPER(number), '-', ''), '_', ''), ' ', ''), "
+    "'FC2PPV', 'FC2')"
+)
+_ASCII_UPPER = str.maketrans(string.ascii_lowercase, string.ascii_uppercase)
+
+
+def number_key(number: str) -> str:
+    """NUMBER_KEY_SQL 的 Python 版，產生查詢參數用。
+
+    SQLite UPPER() 只轉 ASCII 字母，這裡同樣只轉 ASCII，兩邊結果逐字一致。
+    """
+    key = number.translate(_ASCII_UPPER)
+    for sep in ('-', '_', ' '):
+        key = key.replace(sep, '')
+    return key.replace('FC2PPV', 'FC2')
+
+
+def _ensure_number_key_index(cursor: sqlite3.Cursor) -> None:
+    """番號比對鍵運算式索引（get_by_number / get_by_numbers 的 index seek）。"""
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_videos_number_key ON videos({NUMBER_KEY_SQL})"
+    )
+
+
+def _ensure_library_generation(cursor: sqlite3.Cursor) -> None:
+    """videos 表的「片庫世代」計數器：任何對 videos 的 INSERT / UPDATE / DELETE 都 +1。
+
+    以 trigger 維護而非在各 repository method 手動遞增——raw SQL 寫入路徑
+    （collection fix-numbers、migrate 等）與多 process 寫入一併涵蓋，不會漏。
+    epoch 是建表時的隨機值：DB 檔刪除重建後 generation 從 0 重數，(epoch, generation)
+    仍不會與舊庫撞號（供 Showcase payload 快取當 key，見 VideoRepository.get_library_generation）。
+    """
     cursor.execute("""
-        CREATE TABLE IF NOT EXISTS videos (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            path TEXT UNIQUE NOT NULL,
-            number TEXT,
-            title TEXT,
-            original_title TEXT,
-            actresses TEXT,
-            maker TEXT,
-            director TEXT DEFAULT '',
-            series TEXT,
-            label TEXT DEFAULT '',
-            tags TEXT,
-            sample_images TEXT DEFAULT '',
-            user_tags TEXT DEFAULT '[]',
-            output_dir TEXT DEFAULT '',
-            duration INTEGER,
-            size_bytes INTEGER,
-            cover_path TEXT,
-            release_date TEXT,
-            mtime REAL,
-            nfo_mtime REAL,
-            scrape_attempted_at REAL DEFAULT 0,
-            auto_focal TEXT DEFAULT '',
-            crop_mode TEXT NOT NULL DEFAULT 'auto',
-            focal_attempted_at TIMESTAMP DEFAULT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        CREATE TABLE IF NOT EXISTS library_generation (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            epoch TEXT NOT NULL,
+            generation INTEGER NOT NULL
         )
     """)
+    cursor.execute("""
+        INSERT OR IGNORE INTO library_generation (id, epoch, generation)
+        VALUES (1, lower(hex(randomblob(8))), 0)
+    """)
+    bump = "UPDATE library_generation SET generation = generation + 1 WHERE id = 1;"
+    for suffix, event in (("ai", "INSERT"), ("au", "UPDATE"), ("ad", "DELETE")):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_videos_generation_{suffix} AFTER {event} ON videos BEGIN
+                {bump}
+            END
+        """)
 
-    # 創建索引
+
+def _ensure_path_key(cursor: sqlite3.Cursor) -> None:
+    """videos.path_key：path 經 `core.path_utils.path_scope_key` 正規化後的可索引鍵。
+
+    「某列在不在設定資料夾底下」因此可寫成 path_key 上的索引範圍查詢
+    （見 VideoRepository._scope_where），不必逐列跑 is_path_under_dir。
+    鍵只取決於 path 本身，與 gallery.directories 無關——設定變更不需重算。
+
+    寫入端（upsert / insert_if_ignore / upsert_batch / repath / repath_path_only）
+    由 Python 算好一併寫入；SQL 算不出 NFC + casefold，所以：
+    - 任何不經 VideoRepository 改 path 的寫入，trigger 把 path_key 清成 NULL
+    - NULL 列由 `_heal_path_keys()` 補算；查詢端對 NULL 列退回 is_path_under_dir，結果不受影響
+    """
+    existing = {row[1] for row in cursor.execute("PRAGMA table_info(videos)")}
+    if "path_key" not in existing:
+        cursor.execute("ALTER TABLE videos ADD COLUMN path_key TEXT")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_videos_path_key ON videos(path_key)")
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_videos_number ON videos(number)
+        CREATE TRIGGER IF NOT EXISTS trg_videos_path_key_stale AFTER UPDATE OF path ON videos
+        WHEN NEW.path IS NOT OLD.path AND NEW.path_key IS OLD.path_key BEGIN
+            UPDATE videos SET path_key = NULL WHERE id = NEW.id;
+        END
     """)
+    _heal_path_keys(cursor.connection)
+
+
+def _heal_path_keys(conn: sqlite3.Connection) -> None:
+    """補算 path_key 為 NULL 的列（每個 process 驗證 schema 時做一次；commit 由呼叫端負責）。
+
+    先以索引探測有無 NULL 列，沒有就不發 UPDATE——避免無事也去搶 WAL 寫鎖。
+    """
+    if conn.execute("SELECT 1 FROM videos WHERE path_key IS NULL LIMIT 1").fetchone() is None:
+        return
+    from core.path_utils import path_scope_key
+
+    conn.create_function("path_scope_key", 1, path_scope_key, deterministic=True)
+    cursor = conn.execute("UPDATE videos SET path_key = path_scope_key(path) WHERE path_key IS NULL")
+    logger.info("Backfilled videos.path_key (%d rows)", cursor.rowcount)
+
+
+# /api/collection/analysis 的健康度計數：summary 欄位名 → 對單列 videos 的判定式
+# （{r} 代入 NEW / OLD / videos）。video_health_summary 的欄位、初始彙總與 trigger
+# 全由此表產生；新增計數項目須另開 migration（ALTER TABLE ADD COLUMN + 重算）。
+def _health_counters() -> dict:
+    from core.collection_health import CORRUPTION_RULES
+
+    counters = {"total": "1"}
+    for col in ("title", "actresses", "maker", "tags", "release_date", "cover_path",
+                "director", "label", "original_title"):
+        counters[f"missing_{col}"] = f"{{r}}.{col} IS NULL OR {{r}}.{col} = ''"
+    for col in ("actresses", "tags"):
+        # '[]' 長度為 2
+        counters[f"empty_{col}"] = f"COALESCE(LENGTH({{r}}.{col}), 0) < 3"
+    counters["has_nfo"] = "{r}.nfo_mtime IS NOT NULL AND {r}.nfo_mtime > 0"
+    counters["missing_nfo"] = "{r}.nfo_mtime IS NULL OR {r}.nfo_mtime = 0"
+    for rule in CORRUPTION_RULES:
+        counters[f"corrupted_{rule['name']}"] = f"{{r}}.number_issue = '{rule['name']}'"
+    counters["japanese_tags"] = "{r}.has_japanese_tags = 1"
+    return counters
+
+
+VIDEO_HEALTH_COUNTERS = _health_counters()
+
+# 判定式引用到的欄位：只有這些欄位被 UPDATE 時才需要調整計數
+_HEALTH_TRACKED_COLUMNS = (
+    "title", "actresses", "maker", "tags", "release_date", "cover_path", "director",
+    "label", "original_title", "nfo_mtime", "number_issue", "has_japanese_tags",
+)
+
+_HEALTH_STALE_SQL = "number_issue IS NULL OR has_japanese_tags IS NULL"
+
+
+def _health_term(counter: str, row_ref: str) -> str:
+    """判定式 → 0/1（NULL 視為 0：旗標未補算前不計入）。"""
+    return f"IFNULL(({VIDEO_HEALTH_COUNTERS[counter].format(r=row_ref)}), 0)"
+
+
+def _ensure_video_health(cursor: sqlite3.Cursor) -> None:
+    """收藏庫健康度：逐列旗標欄位 + trigger 維護的 video_health_summary 單列統計。
+
+    - videos.number_issue：符合的 corruption rule 名稱，正常番號為 ''
+    - videos.has_japanese_tags：tags 含假名為 1，否則 0
+    兩者由寫入端（VideoRepository._upsert_dict 等）以 core.collection_health 算好
+    一併寫入；判定需 Python regex，SQL 算不出，因此比照 path_key：不經 repository
+    改 number / tags 的寫入由 trigger 把旗標清成 NULL，再由 `_heal_health_flags()` 補算。
+
+    video_health_summary 以 INSERT / DELETE / UPDATE trigger 增減（VIDEO_HEALTH_COUNTERS），
+    analysis 端點讀單列即得全部計數，不再對 videos 做十餘次全表 COUNT 與 Python 全量掃描。
+    """
+    existing = {row[1] for row in cursor.execute("PRAGMA table_info(videos)")}
+    if "number_issue" not in existing:
+        cursor.execute("ALTER TABLE videos ADD COLUMN number_issue TEXT")
+    if "has_japanese_tags" not in existing:
+        cursor.execute("ALTER TABLE videos ADD COLUMN has_japanese_tags INTEGER")
+    # drill-down（analysis/groups）與補算探測用的 partial index
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_videos_number_issue ON videos(number_issue) "
+        "WHERE number_issue != ''"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_videos_japanese_tags ON videos(id) "
+        "WHERE has_japanese_tags = 1"
+    )
+    cursor.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_videos_health_stale ON videos(id) WHERE {_HEALTH_STALE_SQL}"
+    )
+    for col, flag in (("number", "number_issue"), ("tags", "has_japanese_tags")):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_videos_{flag}_stale AFTER UPDATE OF {col} ON videos
+            WHEN NEW.{col} IS NOT OLD.{col} AND NEW.{flag} IS OLD.{flag} BEGIN
+                UPDATE videos SET {flag} = NULL WHERE id = NEW.id;
+            END
+        """)
+    _heal_health_flags(cursor.connection)
+
+    counters = list(VIDEO_HEALTH_COUNTERS)
+    column_defs = ",\n".join(f"{c} INTEGER NOT NULL DEFAULT 0" for c in counters)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS video_health_summary (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            {column_defs}
+        )
+    """)
+    sums = ", ".join(f"IFNULL(SUM({_health_term(c, 'videos')}), 0)" for c in counters)
+    cursor.execute(
+        f"INSERT OR REPLACE INTO video_health_summary (id, {', '.join(counters)}) "
+        f"SELECT 1, {sums} FROM videos"
+    )
+    deltas = {
+        "ai": ("INSERT ON videos", lambda c: f"{c} = {c} + {_health_term(c, 'NEW')}"),
+        "ad": ("DELETE ON videos", lambda c: f"{c} = {c} - {_health_term(c, 'OLD')}"),
+        "au": (
+            f"UPDATE OF {', '.join(_HEALTH_TRACKED_COLUMNS)} ON videos",
+            lambda c: f"{c} = {c} + {_health_term(c, 'NEW')} - {_health_term(c, 'OLD')}",
+        ),
+    }
+    for suffix, (event, delta) in deltas.items():
+        assignments = ", ".join(delta(c) for c in counters if not (suffix == "au" and c == "total"))
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_videos_health_{suffix} AFTER {event} BEGIN
+                UPDATE video_health_summary SET {assignments} WHERE id = 1;
+            END
+        """)
+
+
+def _heal_health_flags(conn: sqlite3.Connection) -> int:  # ranker-invalidate-ok: 只補算衍生旗標欄位，number / tags 本身不變
+    """補算 number_issue / has_japanese_tags 為 NULL 的列（commit 由呼叫端負責）。
+
+    先以 partial index 探測，沒有待補列就不發 UPDATE。回傳補算列數。
+    """
+    if conn.execute(f"SELECT 1 FROM videos WHERE {_HEALTH_STALE_SQL} LIMIT 1").fetchone() is None:
+        return 0
+    from core.collection_health import has_japanese_tags, number_issue
+
+    conn.create_function("number_issue_of", 1, number_issue, deterministic=True)
+    conn.create_function(
+        "has_japanese_tags_of", 1, lambda tags: int(has_japanese_tags(tags)), deterministic=True
+    )
+    cursor = conn.execute(f"""
+        UPDATE videos SET
+            number_issue = IFNULL(number_issue, number_issue_of(number)),
+            has_japanese_tags = IFNULL(has_japanese_tags, has_japanese_tags_of(tags))
+        WHERE {_HEALTH_STALE_SQL}
+    """)
+    logger.info("Backfilled videos health flags (%d rows)", cursor.rowcount)
+    return cursor.rowcount
+
+
+def _ensure_video_changelog(cursor: sqlite3.Cursor) -> None:
+    """videos 變更日誌：每次 INSERT / UPDATE / DELETE 以 trigger 記下受影響的 video id。
+
+    供 process 內的唯讀快照（core.database.read_model）增量更新：快照記住建立時的
+    最大 seq，之後只重讀 seq 更大的那些 id。與 library_generation 同樣以 trigger
+    維護，raw SQL 與多 process 寫入一併涵蓋。舊紀錄由背景維護（maintenance）修剪；
+    被修剪過頭的快照會偵測到斷號、改走全量重建。
+    """
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_videos_path ON videos(path)
+        CREATE TABLE IF NOT EXISTS video_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            video_id INTEGER NOT NULL
+        )
     """)
+    for suffix, event, body in (
+        ("ai", "INSERT", "INSERT INTO video_changes (video_id) VALUES (NEW.id);"),
+        ("ad", "DELETE", "INSERT INTO video_changes (video_id) VALUES (OLD.id);"),
+        # id 被改寫（罕見）時新舊 id 都要記，快照才會移除舊位置
+        ("au", "UPDATE", "INSERT INTO video_changes (video_id) VALUES (NEW.id);\n"
+                         "                INSERT INTO video_changes (video_id) "
+                         "SELECT OLD.id WHERE OLD.id != NEW.id;"),
+    ):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_videos_changes_{suffix} AFTER {event} ON videos BEGIN
+                {body}
+            END
+        """)
+
+
+def _ensure_scan_dir_index(cursor: sqlite3.Cursor) -> None:
+    """fast_scan_directory 的目錄簽章索引（見 core.database.scan_index）。"""
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_videos_maker ON videos(maker)
+        CREATE TABLE IF NOT EXISTS scan_dir_index (
+            root TEXT NOT NULL,
+            path TEXT NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            entry_count INTEGER NOT NULL,
+            extrafanart_mtime_ns INTEGER,
+            listed_at_ns INTEGER NOT NULL,
+            listing TEXT NOT NULL,
+            PRIMARY KEY (root, path)
+        )
     """)
     cursor.execute("""
-        CREATE INDEX IF NOT EXISTS idx_videos_cover_path ON videos(cover_path)
+        CREATE TABLE IF NOT EXISTS scan_dir_roots (
+            root TEXT PRIMARY KEY,
+            verified_at REAL,
+            unreliable INTEGER NOT NULL DEFAULT 0,
+            filter_key TEXT
+        )
+    """)
+
+
+def _ensure_scan_journal(cursor: sqlite3.Cursor) -> None:
+    """可續掃的掃描日誌（見 core.database.scan_journal）。"""
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scan_journal (
+            kind TEXT NOT NULL,
+            root TEXT NOT NULL,
+            filter_key TEXT NOT NULL,
+            listing TEXT NOT NULL,
+            total INTEGER NOT NULL,
+            processed INTEGER NOT NULL DEFAULT 0,
+            started_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (kind, root)
+        )
     """)
 
-    # 女優別名表 — 偵測舊 schema (old_name 欄位) 並執行跟鏈遷移
+
+def _ensure_actress_aliases(cursor: sqlite3.Cursor) -> None:
+    """schema v1 的 actress_aliases：偵測舊 schema（old_name 欄位）時跟鏈遷移，否則直接建表。"""
     existing_alias_cols = {
         row[1] for row in cursor.execute("PRAGMA table_info(actress_aliases)").fetchall()
     }
@@ -179,52 +778,9 @@ def init_db(db_path: Path = None) -> None:
             )
         """)
 
-    # 刪除舊 index（新 schema 不需要；IF EXISTS 保證 idempotent）
-    cursor.execute("DROP INDEX IF EXISTS idx_actress_aliases_new_name")
-
-    # 創建 tag 別名資料表（完全鏡射 actress_aliases schema，CD-58-3）
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS tag_aliases (
-            primary_name  TEXT PRIMARY KEY,
-            aliases       TEXT NOT NULL DEFAULT '[]',
-            source        TEXT NOT NULL DEFAULT 'manual',
-            created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
-
-    # 創建女優資料表
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS actresses (
-            name TEXT PRIMARY KEY,
-            name_en TEXT,
-            birth TEXT,
-            height TEXT,
-            cup TEXT,
-            bust INTEGER,
-            waist INTEGER,
-            hip INTEGER,
-            hometown TEXT,
-            hobby TEXT,
-            aliases TEXT DEFAULT '[]',
-            agency TEXT,
-            debut_work TEXT,
-            tags TEXT DEFAULT '[]',
-            nickname TEXT,
-            blog_url TEXT,
-            official_url TEXT,
-            photo_source TEXT,
-            primary_text_source TEXT,
-            auto_focal TEXT DEFAULT '',
-            crop_mode TEXT NOT NULL DEFAULT 'auto',
-            photo_fp_path TEXT DEFAULT '',
-            photo_fp_mtime_ns INTEGER DEFAULT 0,
-            photo_fp_size INTEGER DEFAULT 0,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    """)
 
+def _migrate_legacy_columns(cursor: sqlite3.Cursor) -> None:
+    """schema v1 的逐欄位探測式 migration：補齊舊版 DB 缺少的 videos / actresses 欄位。"""
     # Migration: 加入 Phase 37 新欄位
     existing_cols = {row[1] for row in cursor.execute("PRAGMA table_info(videos)").fetchall()}
     if 'director' not in existing_cols:
@@ -295,5 +851,183 @@ def init_db(db_path: Path = None) -> None:
     if 'photo_fp_size' not in existing_actress_cols:
         cursor.execute("ALTER TABLE actresses ADD COLUMN photo_fp_size INTEGER DEFAULT 0")
 
-    conn.commit()
-    conn.close()
+
+def _migrate_base_schema(cursor: sqlite3.Cursor) -> None:
+    """schema v1：user_version 導入前的全部 schema 與逐欄位探測式 migration。
+
+    刻意保留 `IF NOT EXISTS` / `PRAGMA table_info` 探測寫法：user_version 為 0 的
+    既有 DB 可能停在任何一個舊版本的欄位組合，只能逐項補齊。
+    """
+    # 創建影片表格
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS videos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            path TEXT UNIQUE NOT NULL,
+            number TEXT,
+            title TEXT,
+            original_title TEXT,
+            actresses TEXT,
+            maker TEXT,
+            director TEXT DEFAULT '',
+            series TEXT,
+            label TEXT DEFAULT '',
+            tags TEXT,
+            sample_images TEXT DEFAULT '',
+            user_tags TEXT DEFAULT '[]',
+            output_dir TEXT DEFAULT '',
+            duration INTEGER,
+            size_bytes INTEGER,
+            cover_path TEXT,
+            release_date TEXT,
+            mtime REAL,
+            nfo_mtime REAL,
+            scrape_attempted_at REAL DEFAULT 0,
+            auto_focal TEXT DEFAULT '',
+            crop_mode TEXT NOT NULL DEFAULT 'auto',
+            focal_attempted_at TIMESTAMP DEFAULT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 創建索引
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_number ON videos(number)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_path ON videos(path)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_maker ON videos(maker)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_videos_cover_path ON videos(cover_path)
+    """)
+
+    _ensure_actress_aliases(cursor)
+
+    # 刪除舊 index（新 schema 不需要；IF EXISTS 保證 idempotent）
+    cursor.execute("DROP INDEX IF EXISTS idx_actress_aliases_new_name")
+
+    # 創建 tag 別名資料表（完全鏡射 actress_aliases schema，CD-58-3）
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS tag_aliases (
+            primary_name  TEXT PRIMARY KEY,
+            aliases       TEXT NOT NULL DEFAULT '[]',
+            source        TEXT NOT NULL DEFAULT 'manual',
+            created_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at    TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    # 創建女優資料表
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS actresses (
+            name TEXT PRIMARY KEY,
+            name_en TEXT,
+            birth TEXT,
+            height TEXT,
+            cup TEXT,
+            bust INTEGER,
+            waist INTEGER,
+            hip INTEGER,
+            hometown TEXT,
+            hobby TEXT,
+            aliases TEXT DEFAULT '[]',
+            agency TEXT,
+            debut_work TEXT,
+            tags TEXT DEFAULT '[]',
+            nickname TEXT,
+            blog_url TEXT,
+            official_url TEXT,
+            photo_source TEXT,
+            primary_text_source TEXT,
+            auto_focal TEXT DEFAULT '',
+            crop_mode TEXT NOT NULL DEFAULT 'auto',
+            photo_fp_path TEXT DEFAULT '',
+            photo_fp_mtime_ns INTEGER DEFAULT 0,
+            photo_fp_size INTEGER DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    _migrate_legacy_columns(cursor)
+
+
+# ── Schema 版本 ─────────────────────────────────────────────────────────────
+# 以 `PRAGMA user_version` 記錄 DB 已套用到第幾個 migration；init_db() 只跑編號大於
+# user_version 的項目，依序執行後寫回 SCHEMA_VERSION。每一項都必須 idempotent
+# （DB 可能由舊版程式建立、或在 migration 中途被中斷）。新增 schema 變更一律在
+# 清單尾端 append 新編號，不得改動既有項目的編號或語意。
+_MIGRATIONS = (
+    (1, _migrate_base_schema),
+    (2, _ensure_video_junctions),      # video_actresses / video_tags junction + trigger + backfill
+    (3, _ensure_video_fts),            # videos_fts 全文檢索 + trigger + 首次 rebuild
+    (4, _ensure_video_sort_indexes),   # Showcase 分頁排序索引（需在 user_rating 欄位之後）
+    (5, _ensure_path_key),             # videos.path_key scope 索引鍵 + 補算
+    (6, _ensure_library_generation),   # 片庫世代計數器（Showcase payload 快取 / ETag）
+    (7, _ensure_number_key_index),     # 番號比對鍵運算式索引（local-status / by-number）
+    (8, _ensure_video_health),         # 健康度旗標欄位 + video_health_summary 統計（collection analysis）
+    (9, _ensure_video_changelog),      # videos 變更日誌（read_model 快照增量更新）
+    (10, _ensure_scan_dir_index),      # 掃描目錄簽章索引（fast_scan_directory 跳過未變動目錄）
+    (11, _ensure_scan_journal),        # 掃描日誌（generate / 唯讀生成中斷後續掃）
+)
+SCHEMA_VERSION = _MIGRATIONS[-1][0]
+
+# process-level「schema 已驗證」閂鎖：{(db_path 字串, (st_dev, st_ino))}。
+# 同一個 DB 檔在本 process 內驗證過一次後，init_db() 直接返回——熱端點（showcase /
+# tags / local-status / scan）不再每次開連線、讀 user_version。DB 檔被刪除重建時
+# inode 改變，自然重新驗證。
+_schema_verified: set = set()
+_schema_lock = threading.Lock()
+
+
+def init_db(db_path: Path = None) -> None:
+    """初始化／升級資料庫 Schema（每個 process 每個 DB 檔實際只跑一次）。
+
+    1. 閂鎖命中 → 直接返回（零 SQL）
+    2. user_version == SCHEMA_VERSION → 只做 `_heal_path_keys()` / `_heal_health_flags()` 檢查，不跑 DDL
+    3. 否則 `BEGIN IMMEDIATE` 取得寫鎖（多 process 同時升級時序列化），重讀
+       user_version 後依序套用缺少的 migration，寫回 user_version 並 commit
+    """
+    if db_path is None:
+        db_path = get_db_path()
+    db_str = str(db_path)
+    file_id = _file_identity(db_str)
+    if file_id is not None and (db_str, file_id) in _schema_verified:
+        return
+
+    with _schema_lock:
+        conn = get_connection(db_path)
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version == 0 and conn.execute("SELECT 1 FROM sqlite_master LIMIT 1").fetchone() is None:
+                # 全新空庫：建表前切成 auto_vacuum=INCREMENTAL（建表後只能靠完整 VACUUM 切換），
+                # 之後的 freelist 由背景維護以 incremental_vacuum 回收（見 maintenance.py）
+                conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                conn.execute("VACUUM")
+            if version < SCHEMA_VERSION:
+                conn.execute("BEGIN IMMEDIATE")
+                version = conn.execute("PRAGMA user_version").fetchone()[0]
+                cursor = conn.cursor()
+                for number, migrate in _MIGRATIONS:
+                    if number > version:
+                        migrate(cursor)
+                if version < SCHEMA_VERSION:
+                    cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+                    logger.info("Database schema upgraded: v%d -> v%d", version, SCHEMA_VERSION)
+                conn.commit()
+            else:
+                if version > SCHEMA_VERSION:
+                    logger.warning("Database schema v%d is newer than this build (v%d)",
+                                   version, SCHEMA_VERSION)
+                _heal_path_keys(conn)
+                _heal_health_flags(conn)
+                conn.commit()
+        finally:
+            conn.close()
+
+        file_id = _file_identity(db_str)
+        if file_id is not None:
+            _schema_verified.add((db_str, file_id))
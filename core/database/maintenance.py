@@ -0,0 +1,278 @@
+"""core.database.maintenance — openaver.db 背景維護（ANALYZE / optimize / checkpoint / vacuum）。
+
+長時間執行的安裝不會有人手動維護 DB：大量掃描、prune、clear_all 之後 WAL 檔與
+freelist 只增不減，planner 也沒有 JSON 重度查詢需要的統計資料。`DbMaintenance.run_once()`
+由 web lifespan 的背景 task 定期在 executor 內呼叫，每輪依條件挑選要做的項目：
+
+- `PRAGMA optimize`：每 `_OPTIMIZE_INTERVAL_S` 一次（SQLite 自行判斷哪些表需要重新分析，很便宜）
+- `ANALYZE`（先設 `analysis_limit`，大庫也只抽樣、不全表掃描）：從未分析過（無 sqlite_stat1），或距上次超過 `_ANALYZE_INTERVAL_S` 且期間有寫入
+- `wal_checkpoint(TRUNCATE)`：自上次 checkpoint 起 videos 寫入數（library_generation 差值）
+  達 `_CHECKPOINT_WRITE_THRESHOLD`，或 WAL 檔超過 `_CHECKPOINT_WAL_BYTES`
+- vacuum：只在閒置（上一輪至今 videos 無寫入）時做；freelist 佔比達
+  `_VACUUM_FREELIST_RATIO` 時，auto_vacuum=INCREMENTAL 的庫跑 `incremental_vacuum`。
+  舊庫（auto_vacuum=NONE）要一次性 `VACUUM` 轉成 INCREMENTAL——整檔重寫並持有獨佔鎖，
+  所以只在連續閒置達 `_FULL_VACUUM_IDLE_S` 時才做，之後都走增量回收
+- 補算健康度旗標：raw SQL 寫入（繞過 repository）留下 NULL 的 number_issue /
+  has_japanese_tags 由此補齊（`connection._heal_health_flags`，無待補列時只是一次
+  partial index 探測），讓 GET /api/collection/analysis 維持唯讀
+- 修剪 `video_changes` 變更日誌：累積超過 2 × `_CHANGELOG_KEEP` 筆時只留最近
+  `_CHANGELOG_KEEP` 筆（落後更多的唯讀快照會偵測到斷號、自行全量重建，見 read_model）
+
+每項結果（時間、耗時、細節、錯誤）記在 `status()`，由 GET /api/diagnostics 回報。
+維護失敗只記錄、不外拋——不能因為維護把服務弄掛。
+"""
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from core.logger import get_logger
+
+from . import connection
+
+logger = get_logger(__name__)
+
+MAINTENANCE_INTERVAL_S = 60.0     # 背景 task 每輪間隔（web lifespan 使用）
+_OPTIMIZE_INTERVAL_S = 3600.0
+_ANALYZE_INTERVAL_S = 24 * 3600.0
+_CHECKPOINT_WRITE_THRESHOLD = 2000
+_CHECKPOINT_WAL_BYTES = 64 * 1024 * 1024
+_VACUUM_FREELIST_RATIO = 0.2
+_VACUUM_MIN_FREE_PAGES = 256
+_INCREMENTAL_VACUUM_PAGES = 4096  # 每輪最多回收頁數，避免單輪持有寫鎖過久
+_FULL_VACUUM_IDLE_S = 6 * 3600.0  # 舊庫一次性完整 VACUUM 需要的連續閒置時間
+_ANALYSIS_LIMIT = 1000            # ANALYZE / optimize 每個索引最多檢視的列數（SQLite 建議值）
+_CHANGELOG_KEEP = 20_000
+
+_AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+
+
+class DbMaintenance:
+    """單一 DB 檔的維護排程狀態（執行緒安全；同時只會有一輪在跑）。"""
+
+    def __init__(self, db_path: Path = None):
+        self._db_path = db_path
+        self._lock = threading.Lock()
+        self._last_run: dict = {}          # task 名稱 → 最近一次結果
+        self._last_optimize: Optional[float] = None
+        self._last_analyze = 0.0
+        self._analyze_generation: Optional[int] = None
+        self._checkpoint_generation: Optional[int] = None
+        self._tick_generation: Optional[int] = None
+        self._idle_since: Optional[float] = None  # 最近一次觀察到 videos 寫入的時間
+
+    @property
+    def db_path(self) -> Path:
+        return self._db_path or connection.get_db_path()
+
+    # ── 排程 ────────────────────────────────────────────────────────────────
+
+    def run_once(self, now: float = None) -> list:
+        """跑一輪維護，回傳本輪實際執行的項目名稱。
+
+        上一輪尚未結束（lock 取不到）時直接跳過，不排隊。
+        """
+        if not self._lock.acquire(blocking=False):
+            return []
+        try:
+            now = time.time() if now is None else now
+            if not self.db_path.exists():
+                return []
+            conn = connection.get_connection(self.db_path)
+            try:
+                return self._run(conn, now)
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            logger.warning("db maintenance: round failed", exc_info=True)
+            return []
+        finally:
+            self._lock.release()
+
+    def _run(self, conn: sqlite3.Connection, now: float) -> list:
+        generation = _library_generation(conn)
+        idle = self._tick_generation is not None and generation == self._tick_generation
+        if not idle:
+            self._idle_since = now
+        self._tick_generation = generation
+        if self._analyze_generation is None:
+            # process 啟動後第一輪：以目前世代為基準，之後的差值才算「期間寫入」
+            self._analyze_generation = generation
+            self._checkpoint_generation = generation
+
+        done = []
+        if self._last_optimize is None or now - self._last_optimize >= _OPTIMIZE_INTERVAL_S:
+            self._record(conn, "optimize", now, lambda: _optimize(conn))
+            self._last_optimize = now
+            done.append("optimize")
+
+        never_analyzed = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone() is None
+        if never_analyzed or (
+            now - self._last_analyze >= _ANALYZE_INTERVAL_S and generation != self._analyze_generation
+        ):
+            self._record(conn, "analyze", now, lambda: _analyze(conn))
+            self._last_analyze = now
+            self._analyze_generation = generation
+            done.append("analyze")
+
+        writes = generation - self._checkpoint_generation
+        wal_bytes = _wal_size(self.db_path)
+        if writes >= _CHECKPOINT_WRITE_THRESHOLD or wal_bytes >= _CHECKPOINT_WAL_BYTES:
+            self._record(conn, "checkpoint", now, lambda: _checkpoint(conn, writes, wal_bytes))
+            self._checkpoint_generation = generation
+            done.append("checkpoint")
+
+        if _health_flags_stale(conn):
+            self._record(conn, "health_heal", now, lambda: _heal_health(conn))
+            done.append("health_heal")
+
+        span = _changelog_span(conn)
+        if span >= 2 * _CHANGELOG_KEEP:
+            self._record(conn, "changelog_prune", now, lambda: _prune_changelog(conn))
+            done.append("changelog_prune")
+
+        if idle:
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            incremental = conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+            if (free_pages >= _VACUUM_MIN_FREE_PAGES and free_pages >= page_count * _VACUUM_FREELIST_RATIO
+                    and (incremental or now - self._idle_since >= _FULL_VACUUM_IDLE_S)):
+                self._record(conn, "vacuum", now, lambda: _vacuum(conn, free_pages))
+                done.append("vacuum")
+        return done
+
+    def _record(self, conn: sqlite3.Connection, task: str, now: float, action) -> None:
+        started = time.monotonic()
+        entry = {"at": now}
+        try:
+            entry["detail"] = action()
+            entry["ok"] = True
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.rollback()
+            entry["ok"] = False
+            entry["error"] = str(e)
+            logger.warning("db maintenance: %s failed: %s", task, e)
+        entry["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+        self._last_run[task] = entry
+        if entry["ok"]:
+            logger.info("db maintenance: %s done in %.1f ms %s", task, entry["duration_ms"], entry["detail"])
+
+    # ── 回報 ────────────────────────────────────────────────────────────────
+
+    def status(self) -> dict:
+        """目前 DB 檔狀態 + 各項維護最近一次結果（供 /api/diagnostics）。"""
+        result = {"db_path": str(self.db_path), "last_run": {k: dict(v) for k, v in self._last_run.items()}}
+        if not self.db_path.exists():
+            result["exists"] = False
+            return result
+        result["exists"] = True
+        result["db_bytes"] = self.db_path.stat().st_size
+        result["wal_bytes"] = _wal_size(self.db_path)
+        try:
+            conn = connection.get_connection(self.db_path)
+            try:
+                page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+                result["page_count"] = conn.execute("PRAGMA page_count").fetchone()[0]
+                result["freelist_count"] = conn.execute("PRAGMA freelist_count").fetchone()[0]
+                result["free_bytes"] = result["freelist_count"] * page_size
+                mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+                result["auto_vacuum"] = _AUTO_VACUUM_MODES.get(mode, str(mode))
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            result["error"] = str(e)
+        return result
+
+
+def _library_generation(conn: sqlite3.Connection) -> int:
+    row = conn.execute("SELECT generation FROM library_generation WHERE id = 1").fetchone()
+    return row[0] if row else 0
+
+
+def _changelog_span(conn: sqlite3.Connection) -> int:
+    try:
+        first, last = conn.execute("SELECT MIN(seq), MAX(seq) FROM video_changes").fetchone()
+    except sqlite3.OperationalError:
+        return 0  # 尚未升級到含變更日誌的 schema
+    return 0 if first is None else last - first + 1
+
+
+def _health_flags_stale(conn: sqlite3.Connection) -> bool:
+    try:
+        return conn.execute(
+            f"SELECT 1 FROM videos WHERE {connection._HEALTH_STALE_SQL} LIMIT 1"
+        ).fetchone() is not None
+    except sqlite3.OperationalError:
+        return False  # 尚未升級到含健康度旗標的 schema
+
+
+def _heal_health(conn: sqlite3.Connection) -> dict:
+    healed = connection._heal_health_flags(conn)
+    conn.commit()
+    return {"rows": healed}
+
+
+def _prune_changelog(conn: sqlite3.Connection) -> dict:
+    cursor = conn.execute(
+        "DELETE FROM video_changes WHERE seq <= (SELECT MAX(seq) FROM video_changes) - ?",
+        (_CHANGELOG_KEEP,),
+    )
+    conn.commit()
+    return {"deleted": cursor.rowcount, "kept": _CHANGELOG_KEEP}
+
+
+def _wal_size(db_path: Path) -> int:
+    try:
+        return os.stat(f"{db_path}-wal").st_size
+    except OSError:
+        return 0
+
+
+def _optimize(conn: sqlite3.Connection) -> dict:
+    conn.execute(f"PRAGMA analysis_limit = {_ANALYSIS_LIMIT}")
+    conn.execute("PRAGMA optimize")
+    return {}
+
+
+def _analyze(conn: sqlite3.Connection) -> dict:
+    conn.execute(f"PRAGMA analysis_limit = {_ANALYSIS_LIMIT}")
+    conn.execute("ANALYZE")
+    conn.commit()
+    tables = conn.execute("SELECT COUNT(DISTINCT tbl) FROM sqlite_stat1").fetchone()[0]
+    return {"tables": tables}
+
+
+def _checkpoint(conn: sqlite3.Connection, writes: int, wal_bytes: int) -> dict:
+    busy, log_frames, checkpointed = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    # busy=1：有讀者擋住，這輪只完成部分 checkpoint，下一輪條件仍成立時會再試
+    return {
+        "writes": writes,
+        "wal_bytes_before": wal_bytes,
+        "busy": bool(busy),
+        "log_frames": log_frames,
+        "checkpointed_frames": checkpointed,
+    }
+
+
+def _vacuum(conn: sqlite3.Connection, free_pages: int) -> dict:
+    mode = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+    if mode == 2:
+        # 每次 sqlite3_step 只回收一頁；execute() 只 step 一次，executescript 才會跑到底
+        conn.executescript(f"PRAGMA incremental_vacuum({_INCREMENTAL_VACUUM_PAGES})")
+        kind = "incremental"
+    else:
+        # auto_vacuum 模式只能經一次完整 VACUUM 切換；切成 INCREMENTAL 後之後都走增量回收
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        kind = "full"
+    remaining = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"kind": kind, "free_pages_before": free_pages, "free_pages_after": remaining}
+
+
+# process-wide 實例（預設 DB 路徑）；web lifespan 的背景 task 與 /api/diagnostics 共用
+db_maintenance = DbMaintenance()
@@ -0,0 +1,383 @@
+"""core.database.read_model — videos 表的 process 內唯讀快照（讀多寫少端點共用）。
+
+Showcase 全量 payload、similar ranker corpus、/api/tags/top、女優庫聚合都要「整張
+videos 表」的不同切面；各自 SELECT * ＋ JSON 解碼，同一份資料在每個端點被重讀、重解碼、
+各自再佔一份記憶體。這裡改由單一快照供應：
+
+- 欄式（columnar）存放：每個 Video 欄位一個 tuple，依 id 升冪排列
+- actresses / tags / maker 字典編碼成整數 id（詞彙表共用同一份字串物件），
+  series / label / director 等低基數欄位 `sys.intern`；list 欄位預先解碼成 tuple
+- 不可變（copy-on-write）：更新時組出新快照再整個換掉參考，讀者永遠拿到一致的一份，
+  不需要讀鎖；對外交出的 Video / list 一律是新物件，呼叫端改了也不會汙染快照
+- 增量更新：快照記住建立時的 `video_changes.seq`（connection._ensure_video_changelog
+  以 trigger 記錄每筆寫入的 video id）。每次取用只發一個單列查詢比對 seq；有變更就只
+  重讀那些 id 的列並 patch 出新快照。epoch 不同（DB 重建）、日誌已被修剪而斷號、或
+  變更量過大時改走全量重建。
+
+入口：`get_library_snapshot(db_path)`（VideoRepository.get_snapshot() 包裝）。
+"""
+import copy
+import sqlite3
+import sys
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import fields
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from core.logger import get_logger
+from core.path_utils import path_scope_key
+
+from . import connection
+from .video import Video, VideoRepository, _json_list
+
+logger = get_logger(__name__)
+
+# 快照欄位：Video 全部欄位（id 另存）＋ 衍生的 path_key（scope 過濾用）
+_VIDEO_FIELDS = tuple(f.name for f in fields(Video) if f.name != 'id')
+_FIELDS = _VIDEO_FIELDS + ('path_key',)
+_FIELD_INDEX = {name: i for i, name in enumerate(_FIELDS)}
+
+_VOCAB_LIST_FIELDS = ('actresses', 'tags')          # list[str] → tuple[int]（詞彙表 id）
+_PLAIN_LIST_FIELDS = ('user_tags', 'sample_images')  # list[str] → tuple[str]
+_VOCAB_FIELDS = _VOCAB_LIST_FIELDS + ('maker',)
+_INTERN_FIELDS = ('series', 'label', 'director', 'crop_mode', 'release_date')
+_DATETIME_FIELDS = ('created_at', 'updated_at')
+
+# 單次增量更新最多重讀的 id 數；超過（或超過快照列數 1/4）直接全量重建比較快
+_INCREMENTAL_MAX_CHANGES = 5000
+_FETCH_CHUNK = 500
+# process 內最多同時保留幾個 DB 檔的快照（測試會開很多暫存 DB）
+_MAX_CACHED_DBS = 4
+
+
+class LibrarySnapshot:
+    """某一時點的 videos 全表唯讀快照（建立後不再變動）。
+
+    讀取 API：
+      - `videos()` / `videos_in_scope(scope_uris)`：Video 物件（順序同 get_all()，id 升冪）
+      - `get(video_id)` / `find_by_number(number)`：單筆查找（語意同 get_by_id / get_by_number）
+      - `rows(columns)`：欄位投影 namedtuple（同 iter_rows 的 row 型別）
+      - `tag_counts()` / `actress_pairs()`：與 video_tags / video_actresses junction 同口徑的聚合
+    """
+
+    def __init__(self, epoch: Optional[str], seq: int, ids: tuple, columns: dict, vocabs: dict):
+        self.epoch = epoch
+        self.seq = seq
+        self.ids = ids
+        self._columns = columns      # 欄位名 → tuple（與 ids 等長）
+        self._vocabs = vocabs        # 欄位名 → (值 tuple, 值 → id dict)
+        self._pos = {vid: i for i, vid in enumerate(ids)}
+        # 衍生索引：首次用到才建（快照不可變，重複建也只是多算一次，不需鎖）
+        self._number_index: Optional[dict] = None
+        self._tag_counts: Optional[Counter] = None
+        self._actress_pairs: Optional[list] = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ── 解碼 ────────────────────────────────────────────────────────────────
+
+    def _decode(self, name: str, value):
+        """欄位值 → 對外的新物件（list 一律新建，快照本身不被呼叫端改到）。"""
+        if name in _VOCAB_LIST_FIELDS:
+            if type(value) is tuple:
+                names = self._vocabs[name][0]
+                return [names[i] for i in value]
+            return copy.deepcopy(value)  # 非 list[str] 的髒資料原樣保留（同 from_row）
+        if name in _PLAIN_LIST_FIELDS:
+            return list(value) if type(value) is tuple else copy.deepcopy(value)
+        if name == 'maker':
+            return self._vocabs['maker'][0][value]
+        return value
+
+    def _video_at(self, pos: int) -> Video:
+        data = {name: self._decode(name, self._columns[name][pos]) for name in _VIDEO_FIELDS}
+        return Video(id=self.ids[pos], **data)
+
+    # ── 讀取 API ────────────────────────────────────────────────────────────
+
+    def videos(self) -> List[Video]:
+        """全部影片（id 升冪），每次呼叫都是新的 Video 物件。"""
+        return [self._video_at(pos) for pos in range(len(self.ids))]
+
+    def videos_in_scope(self, scope_uris) -> List[Video]:
+        """path 在任一設定資料夾底下的影片，語意同 VideoRepository._scope_where。"""
+        return [self._video_at(pos) for pos in self._scope_positions(scope_uris)]
+
+    def _scope_positions(self, scope_uris) -> List[int]:
+        from core.path_utils import is_path_under_dir
+
+        uris = list(scope_uris)
+        if not uris:
+            return []
+        exact = set()
+        ranges = []
+        for uri in uris:
+            key = path_scope_key(uri)
+            prefix = key if key.endswith('/') else key + '/'
+            exact.add(key)
+            ranges.append((prefix, prefix[:-1] + '0'))
+        keys = self._columns['path_key']
+        paths = self._columns['path']
+        result = []
+        for pos, key in enumerate(keys):
+            if key is None:
+                path = paths[pos]
+                hit = path is not None and any(is_path_under_dir(path, u) for u in uris)
+            else:
+                hit = key in exact or any(lo <= key < hi for lo, hi in ranges)
+            if hit:
+                result.append(pos)
+        return result
+
+    def get(self, video_id: int) -> Optional[Video]:
+        pos = self._pos.get(video_id)
+        return None if pos is None else self._video_at(pos)
+
+    def find_by_number(self, number: str) -> Optional[Video]:
+        """番號查找，比對與排序規則同 VideoRepository.get_by_number。"""
+        if self._number_index is None:
+            index: Dict[str, List[int]] = {}
+            for pos, value in enumerate(self._columns['number']):
+                if value is not None:
+                    index.setdefault(connection.number_key(value), []).append(pos)
+            self._number_index = index
+        candidates = self._number_index.get(connection.number_key(number))
+        if not candidates:
+            return None
+        wanted = number.translate(connection._ASCII_UPPER)
+        numbers = self._columns['number']
+        exact = [p for p in candidates if numbers[p].translate(connection._ASCII_UPPER) == wanted]
+        return self._video_at((exact or candidates)[0])
+
+    def rows(self, columns: Sequence[str]) -> List[tuple]:
+        """欄位投影：回傳 iter_rows 同型別的 namedtuple（id 升冪，list 欄位為新 list）。"""
+        columns = tuple(columns)
+        unknown = [c for c in columns if c != 'id' and c not in _FIELD_INDEX]
+        if unknown:
+            raise ValueError(f"Unknown videos column(s): {unknown}")
+        row_type = VideoRepository._row_type(columns)
+        sources = [self.ids if c == 'id' else self._columns[c] for c in columns]
+        return [
+            row_type._make(self._decode(c, src[pos]) for c, src in zip(columns, sources, strict=True))
+            for pos in range(len(self.ids))
+        ]
+
+    def _str_items(self, name: str, value) -> Iterable[str]:
+        """list 欄位值中「非空字串」元素（同 junction trigger 的 json_each 篩選），同列去重。"""
+        if type(value) is tuple:
+            names = self._vocabs[name][0]
+            items = (names[i] for i in value)
+        elif isinstance(value, list):
+            items = (x for x in value if isinstance(x, str))
+        else:
+            return ()
+        return [x for x in dict.fromkeys(items) if x]
+
+    def tag_counts(self) -> Counter:
+        """tag → 片數（同 video_tags junction 口徑：每片同一 tag 只算一次、略過空字串）。"""
+        if self._tag_counts is None:
+            counts: Counter = Counter()
+            for value in self._columns['tags']:
+                counts.update(self._str_items('tags', value))
+            self._tag_counts = counts
+        return Counter(self._tag_counts)
+
+    def actress_pairs(self) -> List[Tuple[int, str]]:
+        """全部 (video_id, actress_name) 配對（同 video_actresses junction 口徑）。"""
+        if self._actress_pairs is None:
+            self._actress_pairs = [
+                (vid, name)
+                for vid, value in zip(self.ids, self._columns['actresses'], strict=True)
+                for name in self._str_items('actresses', value)
+            ]
+        return list(self._actress_pairs)
+
+
+class _Encoder:
+    """把 DB row 編成快照欄位值；詞彙表以基底快照為起點只增不減（新快照各持一份）。"""
+
+    def __init__(self, base: Optional[LibrarySnapshot] = None):
+        self.vocabs = {}
+        for name in _VOCAB_FIELDS:
+            if base is None:
+                self.vocabs[name] = ([], {})
+            else:
+                values, index = base._vocabs[name]
+                self.vocabs[name] = (list(values), dict(index))
+
+    def _vocab_id(self, name: str, value) -> int:
+        values, index = self.vocabs[name]
+        vid = index.get(value)
+        if vid is None:
+            vid = index[value] = len(values)
+            values.append(sys.intern(value) if isinstance(value, str) else value)
+        return vid
+
+    def encode(self, data: dict) -> tuple:
+        """row dict → 依 _FIELDS 順序的欄位值 tuple。"""
+        out = []
+        for name in _FIELDS:
+            value = data.get(name)
+            if name in _VOCAB_LIST_FIELDS or name in _PLAIN_LIST_FIELDS:
+                items = _json_list(value)
+                if isinstance(items, list) and all(isinstance(x, str) for x in items):
+                    if name in _VOCAB_LIST_FIELDS:
+                        value = tuple(self._vocab_id(name, x) for x in items)
+                    else:
+                        value = tuple(items)
+                else:
+                    value = items
+            elif name == 'maker':
+                value = self._vocab_id('maker', value)
+            elif name in _INTERN_FIELDS and isinstance(value, str):
+                value = sys.intern(value)
+            elif name in _DATETIME_FIELDS and value and isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            out.append(value)
+        return tuple(out)
+
+    def freeze(self) -> dict:
+        return {name: (tuple(values), index) for name, (values, index) in self.vocabs.items()}
+
+
+def _row_dicts(cursor: sqlite3.Cursor) -> Iterable[dict]:
+    names = [d[0] for d in cursor.description]
+    for row in cursor:
+        yield dict(zip(names, row, strict=True))
+
+
+def _read_head(conn: sqlite3.Connection) -> Optional[Tuple[str, int]]:
+    """(epoch, 最新 seq)；舊庫缺 library_generation / video_changes 時回 None。"""
+    try:
+        row = conn.execute(
+            "SELECT epoch, (SELECT IFNULL(MAX(seq), 0) FROM video_changes) "
+            "FROM library_generation WHERE id = 1"
+        ).fetchone()
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        return None
+    return (row[0], row[1]) if row else None
+
+
+def _build_full(conn: sqlite3.Connection, head: Optional[Tuple[str, int]]) -> LibrarySnapshot:
+    encoder = _Encoder()
+    ids = []
+    records = []
+    for data in _row_dicts(conn.execute("SELECT * FROM videos ORDER BY id")):
+        ids.append(data['id'])
+        records.append(encoder.encode(data))
+    transposed = list(zip(*records, strict=True)) if records else [()] * len(_FIELDS)
+    columns = dict(zip(_FIELDS, transposed, strict=True))
+    epoch, seq = head if head is not None else (None, 0)
+    return LibrarySnapshot(epoch, seq, tuple(ids), columns, encoder.freeze())
+
+
+def _build_incremental(conn: sqlite3.Connection, base: LibrarySnapshot, head: Tuple[str, int]) -> Optional[LibrarySnapshot]:
+    """在 base 上套用 seq > base.seq 的變更；不適用（斷號 / 變更過多）時回 None。"""
+    first = conn.execute("SELECT MIN(seq) FROM video_changes").fetchone()[0]
+    if first is None or first > base.seq + 1:
+        return None  # 日誌已被修剪到 base 之後：中間的變更不可考
+    changed = [row[0] for row in conn.execute(
+        "SELECT DISTINCT video_id FROM video_changes WHERE seq > ? AND seq <= ?",
+        (base.seq, head[1]),
+    )]
+    if len(changed) > min(_INCREMENTAL_MAX_CHANGES, max(len(base) // 4, 64)):
+        return None
+
+    encoder = _Encoder(base)
+    fresh: Dict[int, Optional[tuple]] = dict.fromkeys(changed)
+    for start in range(0, len(changed), _FETCH_CHUNK):
+        chunk = changed[start:start + _FETCH_CHUNK]
+        placeholders = ','.join('?' * len(chunk))
+        for data in _row_dicts(conn.execute(f"SELECT * FROM videos WHERE id IN ({placeholders})", chunk)):
+            fresh[data['id']] = encoder.encode(data)
+
+    pos = base._pos
+    updated = {vid: rec for vid, rec in fresh.items() if rec is not None and vid in pos}
+    deleted = {vid for vid, rec in fresh.items() if rec is None and vid in pos}
+    inserted = sorted(vid for vid, rec in fresh.items() if rec is not None and vid not in pos)
+
+    columns = {name: list(col) for name, col in base._columns.items()}
+    for vid, rec in updated.items():
+        p = pos[vid]
+        for i, name in enumerate(_FIELDS):
+            columns[name][p] = rec[i]
+
+    ids = base.ids
+    if not deleted and (not inserted or not ids or inserted[0] > ids[-1]):
+        # 常見情形：只有更新，或新列 id 都在尾端 → 直接 append
+        for vid in inserted:
+            for i, name in enumerate(_FIELDS):
+                columns[name].append(fresh[vid][i])
+        ids = ids + tuple(inserted)
+    else:
+        order = sorted(
+            [(vid, p, None) for p, vid in enumerate(ids) if vid not in deleted]
+            + [(vid, None, fresh[vid]) for vid in inserted],
+            key=lambda entry: entry[0],
+        )
+        columns = {
+            name: [columns[name][p] if p is not None else rec[i] for _, p, rec in order]
+            for i, name in enumerate(_FIELDS)
+        }
+        ids = tuple(vid for vid, _, _ in order)
+
+    return LibrarySnapshot(
+        head[0], head[1], ids,
+        {name: tuple(col) for name, col in columns.items()},
+        encoder.freeze(),
+    )
+
+
+_lock = threading.Lock()
+_snapshots: "OrderedDict[str, LibrarySnapshot]" = OrderedDict()
+
+
+def get_library_snapshot(db_path: Path = None) -> LibrarySnapshot:
+    """取得 db_path 最新的 videos 快照（必要時增量更新或重建）。
+
+    穩態成本是一個單列查詢（epoch + 最新 seq）。缺變更日誌的舊庫不快取，每次全量讀。
+    """
+    db_path = db_path or connection.get_db_path()
+    key = str(db_path)
+    conn = connection.get_connection(db_path)
+    try:
+        head = _read_head(conn)
+        current = _snapshots.get(key)
+        if head is not None and current is not None and (current.epoch, current.seq) == head:
+            return current
+        with _lock:
+            current = _snapshots.get(key)
+            # 讀 head 與讀資料放同一個讀交易，seq 與內容一致
+            conn.execute("BEGIN")
+            try:
+                head = _read_head(conn)
+                if head is None:
+                    return _build_full(conn, None)
+                if current is not None and (current.epoch, current.seq) == head:
+                    return current
+                snapshot = None
+                if current is not None and current.epoch == head[0] and current.seq <= head[1]:
+                    snapshot = _build_incremental(conn, current, head)
+                if snapshot is None:
+                    snapshot = _build_full(conn, head)
+                    logger.debug("library snapshot: full build (%d videos, seq %d)", len(snapshot), head[1])
+            finally:
+                conn.rollback()
+            _snapshots[key] = snapshot
+            _snapshots.move_to_end(key)
+            while len(_snapshots) > _MAX_CACHED_DBS:
+                _snapshots.popitem(last=False)
+            return snapshot
+    finally:
+        conn.close()
+
+
+def invalidate_library_snapshots() -> None:
+    """丟棄全部快照（下次取用全量重建）。"""
+    with _lock:
+        _snapshots.clear()
@@ -0,0 +1,165 @@
+"""core.database.scan_index — 掃描用的目錄簽章索引（fast_scan_directory 增量重掃）。
+
+重掃時大部分資料夾根本沒變，但 fast_scan_directory 仍會列出每個目錄、stat 每個檔案；
+NAS 上每次都是網路往返。這裡持久化「每個目錄上次列舉的結果 ＋ 當時的簽章」：
+
+- 簽章：目錄 mtime_ns、entry 數、`extrafanart/` 的 mtime_ns（有影片的目錄才有）
+- 列舉結果：子目錄名（scandir 順序）與合格影片（name / mtime / size / nfo_mtime /
+  nfo 檔名 / sample_image_count）
+
+下次走訪時只 stat 目錄本身（＋ extrafanart/）與上次記下的影片、NFO，全部相同才沿用列舉
+結果、不再 scandir。目錄 mtime 只在「新增 / 刪除 / 改名 entry」時變動，原地改寫檔案內容
+（update_nfo_file 的 tree.write、外部工具覆寫 NFO）不會反映在上面，所以影片與 NFO 要
+逐一 stat；其他 entry（圖片、字幕）的原地改寫不影響結果。週期性全量驗證
+（`FULL_VERIFY_INTERVAL_S`）仍會整棵重新列舉一次。全量驗證
+時若發現「簽章沒變、entry 數卻變了」，代表該檔案系統的目錄 mtime 不可靠，整個根目錄
+標成 unreliable，之後一律全量走訪（呼叫 `clear()` 才會重新評估）。
+
+走訪邏輯在 core.gallery_scanner.fast_scan_directory；本模組只負責存取。
+"""
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+from core.logger import get_logger
+
+from . import connection
+
+logger = get_logger(__name__)
+
+FULL_VERIFY_INTERVAL_S = 24 * 3600.0
+
+
+@dataclass
+class DirSignature:
+    """單一目錄上次列舉時的簽章與結果。"""
+    mtime_ns: int
+    entry_count: int
+    extrafanart_mtime_ns: Optional[int]
+    listed_at_ns: int
+    dirs: List[str] = field(default_factory=list)
+    files: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class ScanIndexState:
+    """某個掃描根目錄本次走訪要用的索引狀態（load() 產生、save() 寫回）。"""
+    root: str
+    filter_key: str
+    entries: Dict[str, DirSignature]
+    verify: bool        # True：本次全量列舉（首次 / 到期驗證 / 篩選條件改變）
+    unreliable: bool    # True：此根目錄的目錄 mtime 不可信，永遠全量列舉、不記錄
+
+
+class ScanDirIndexRepository:
+    """scan_dir_index / scan_dir_roots 兩張表的存取層。"""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or connection.get_db_path()
+
+    def _get_connection(self):
+        return connection.get_connection(self.db_path)
+
+    def load(self, root: str, filter_key: str, now: float = None) -> ScanIndexState:
+        """讀出 root 底下全部目錄簽章，並決定本次是否需要全量驗證。"""
+        now = time.time() if now is None else now
+        conn = self._get_connection()
+        try:
+            meta = conn.execute(
+                "SELECT verified_at, unreliable, filter_key FROM scan_dir_roots WHERE root = ?", (root,)
+            ).fetchone()
+            if meta is not None and meta[1]:
+                return ScanIndexState(root, filter_key, {}, verify=True, unreliable=True)
+            verify = (
+                meta is None
+                or meta[2] != filter_key
+                or now - (meta[0] or 0) >= FULL_VERIFY_INTERVAL_S
+            )
+            entries = {}
+            if meta is not None and meta[2] == filter_key:
+                for path, mtime_ns, count, ef_mtime_ns, listed_at_ns, listing in conn.execute(
+                    "SELECT path, mtime_ns, entry_count, extrafanart_mtime_ns, listed_at_ns, listing "
+                    "FROM scan_dir_index WHERE root = ?", (root,)
+                ):
+                    try:
+                        data = json.loads(listing)
+                    except (json.JSONDecodeError, TypeError):
+                        continue
+                    entries[path] = DirSignature(
+                        mtime_ns, count, ef_mtime_ns, listed_at_ns,
+                        data.get("dirs", []), data.get("files", []),
+                    )
+            return ScanIndexState(root, filter_key, entries, verify=verify, unreliable=False)
+        finally:
+            conn.close()
+
+    def save(
+        self,
+        state: ScanIndexState,
+        recorded: Dict[str, DirSignature],
+        kept: Set[str],
+        now: float = None,
+        unreliable: bool = False,
+    ) -> None:
+        """寫回本次走訪結果：upsert recorded、刪掉沒被沿用也沒重新記錄的舊目錄。
+
+        verify 走訪完成才更新 verified_at；unreliable=True 時清空該根目錄的簽章。
+        """
+        now = time.time() if now is None else now
+        conn = self._get_connection()
+        try:
+            if unreliable:
+                conn.execute("DELETE FROM scan_dir_index WHERE root = ?", (state.root,))
+                conn.execute(
+                    "INSERT INTO scan_dir_roots (root, verified_at, unreliable, filter_key) VALUES (?, ?, 1, ?) "
+                    "ON CONFLICT(root) DO UPDATE SET unreliable = 1, verified_at = excluded.verified_at",
+                    (state.root, now, state.filter_key),
+                )
+                conn.commit()
+                logger.info("scan index: directory mtimes unreliable under %s, full walks from now on", state.root)
+                return
+
+            if state.verify:
+                # 全量走訪：每個可記錄的目錄都在 recorded 裡，舊資料（含篩選條件不同時的）整批換掉
+                conn.execute("DELETE FROM scan_dir_index WHERE root = ?", (state.root,))
+            else:
+                conn.executemany(
+                    "DELETE FROM scan_dir_index WHERE root = ? AND path = ?",
+                    [(state.root, p) for p in state.entries if p not in kept and p not in recorded],
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO scan_dir_index "
+                "(root, path, mtime_ns, entry_count, extrafanart_mtime_ns, listed_at_ns, listing) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (state.root, path, sig.mtime_ns, sig.entry_count, sig.extrafanart_mtime_ns,
+                     sig.listed_at_ns, json.dumps({"dirs": sig.dirs, "files": sig.files}, ensure_ascii=False))
+                    for path, sig in recorded.items()
+                ],
+            )
+            if state.verify:
+                conn.execute(
+                    "INSERT INTO scan_dir_roots (root, verified_at, unreliable, filter_key) VALUES (?, ?, 0, ?) "
+                    "ON CONFLICT(root) DO UPDATE SET verified_at = excluded.verified_at, "
+                    "filter_key = excluded.filter_key",
+                    (state.root, now, state.filter_key),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def clear(self, root: Optional[str] = None) -> None:
+        """清掉索引（root=None 全部）；下次走訪全量列舉並重新評估 mtime 可靠性。"""
+        conn = self._get_connection()
+        try:
+            if root is None:
+                conn.execute("DELETE FROM scan_dir_index")
+                conn.execute("DELETE FROM scan_dir_roots")
+            else:
+                conn.execute("DELETE FROM scan_dir_index WHERE root = ?", (root,))
+                conn.execute("DELETE FROM scan_dir_roots WHERE root = ?", (root,))
+            conn.commit()
+        finally:
+            conn.close()
@@ -0,0 +1,133 @@
+"""core.database.scan_journal — 可續掃的掃描日誌（generate / 唯讀生成中斷後續掃）。
+
+3 萬檔的 generate 跑到一半斷線或重啟，下一次原本要從列舉重來；NAS 上光列舉就是
+數分鐘到數小時的往返。每個來源開始處理前，這裡記下一筆日誌：
+
+- 本次的列舉結果（fast_scan_directory 的 file_info 清單 ＋ 讀取失敗的路徑）
+- 篩選條件（副檔名 ＋ 最小檔案大小；不同就不沿用）
+- 游標：本輪待處理清單已處理（且已寫入 DB）到第幾筆、共幾筆
+
+逐段寫入 DB 時推進游標，來源正常跑完就刪除日誌；中斷（斷線 / 例外 / 重啟）則保留。
+`resume` 模式下有日誌的來源直接沿用列舉結果，不再列目錄。已寫入的片本來就會被
+增量比對（mtime）或 scrape_attempted_at 略過，游標只用來回報進度與跳過唯讀生成
+已處理過的項目。續掃沿用的是舊列舉：中斷後才新增的檔案留給下一次完整 generate，
+也一律不據此推論刪除。
+"""
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+from core.logger import get_logger
+
+from . import connection
+
+logger = get_logger(__name__)
+
+
+def scan_filter_key(extensions, min_size_bytes: int) -> str:
+    """列舉篩選條件的比對鍵（條件不同，記下的列舉結果就不適用）。"""
+    return json.dumps([sorted(extensions), min_size_bytes])
+
+
+@dataclass
+class ScanJournal:
+    """單一來源的未完成掃描。"""
+    kind: str
+    root: str
+    total: int
+    processed: int
+    started_at: float
+    updated_at: float
+    files: List[dict] = field(default_factory=list)
+    skipped_paths: List[str] = field(default_factory=list)
+
+
+class ScanJournalRepository:
+    """scan_journal 表的存取層；kind 區分呼叫端（'gallery' / 'readonly'）。"""
+
+    def __init__(self, db_path: Path = None):
+        self.db_path = db_path or connection.get_db_path()
+
+    def _get_connection(self):
+        return connection.get_connection(self.db_path)
+
+    def begin(self, kind: str, root: str, filter_key: str, files: List[dict],
+              skipped_paths: List[str], total: int) -> None:
+        """記下新一輪的列舉結果（覆蓋同一來源的舊日誌），游標歸零。"""
+        now = time.time()
+        listing = json.dumps({"files": files, "skipped": skipped_paths}, ensure_ascii=False)
+        conn = self._get_connection()
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO scan_journal "
+                "(kind, root, filter_key, listing, total, processed, started_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, 0, ?, ?)",
+                (kind, root, filter_key, listing, total, now, now),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def load(self, kind: str, root: str, filter_key: str) -> Optional[ScanJournal]:
+        """讀回未完成的日誌；沒有、篩選條件不同或內容損毀時回 None。"""
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT filter_key, listing, total, processed, started_at, updated_at "
+                "FROM scan_journal WHERE kind = ? AND root = ?", (kind, root),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None or row[0] != filter_key:
+            return None
+        try:
+            listing = json.loads(row[1])
+        except (json.JSONDecodeError, TypeError):
+            logger.warning("scan journal: unreadable listing for %s %s, ignoring", kind, root)
+            return None
+        return ScanJournal(kind, root, row[2], row[3], row[4], row[5],
+                           listing.get("files", []), listing.get("skipped", []))
+
+    def advance(self, kind: str, root: str, processed: int, total: int = None) -> None:
+        """推進游標（呼叫端須在對應的 DB 寫入 commit 之後才呼叫）；total 給定時一併更新。"""
+        conn = self._get_connection()
+        try:
+            if total is None:
+                conn.execute(
+                    "UPDATE scan_journal SET processed = ?, updated_at = ? WHERE kind = ? AND root = ?",
+                    (processed, time.time(), kind, root),
+                )
+            else:
+                conn.execute(
+                    "UPDATE scan_journal SET processed = ?, total = ?, updated_at = ? WHERE kind = ? AND root = ?",
+                    (processed, total, time.time(), kind, root),
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def finish(self, kind: str, root: str) -> None:
+        """來源處理完成：刪除日誌。"""
+        conn = self._get_connection()
+        try:
+            conn.execute("DELETE FROM scan_journal WHERE kind = ? AND root = ?", (kind, root))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def list_unfinished(self) -> List[dict]:
+        """全部未完成日誌的摘要（不含列舉內容），供前端決定是否提供續掃。"""
+        conn = self._get_connection()
+        try:
+            rows = conn.execute(
+                "SELECT kind, root, total, processed, started_at, updated_at "
+                "FROM scan_journal ORDER BY updated_at DESC"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {"kind": k, "root": r, "total": t, "processed": p, "started_at": s, "updated_at": u}
+            for k, r, t, p, s, u in rows
+        ]
@@ -1,12 +1,16 @@
 """core.database.video — Video 資料模型與 VideoRepository（spec-87 子模組）。"""
+import collections
+import functools
 import sqlite3
 import json
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
-from typing import Optional, List, Tuple
+from typing import Iterator, Optional, List, Sequence, Tuple
 from datetime import datetime
 
+from core.collection_health import health_flags
 from core.logger import get_logger
+from core.path_utils import path_scope_key
 
 from . import connection
 
@@ -110,6 +114,9 @@ class Video:
     def from_row(cls, row: tuple, columns: List[str]) -> 'Video':
         """從資料庫 row 建立"""
         data = dict(zip(columns, row, strict=True))
+        data.pop('path_key', None)  # 衍生索引欄位（path_scope_key(path)），不進 dataclass
+        data.pop('number_issue', None)  # 衍生健康度旗標（core.collection_health），不進 dataclass
+        data.pop('has_japanese_tags', None)
 
         # 反序列化 JSON 欄位
         if 'actresses' in data and data['actresses']:
@@ -190,6 +197,46 @@ _FOCAL_CROP_MODE_CASE_SQL = (
 )
 
 
+# upsert_batch() 每個 transaction 的列數：夠大以攤平 commit/fsync，又不讓單一寫鎖
+# 長時間擋住其他寫入者（首次掃描 5 萬檔 ≈ 25 個 transaction）。
+_UPSERT_BATCH_CHUNK = 2000
+
+
+# JSON list 欄位（Video.from_row 會解碼的那幾欄）；iter_rows() 只解碼有投影到的。
+_JSON_LIST_COLUMNS = frozenset({'actresses', 'tags', 'user_tags', 'sample_images'})
+
+
+def _json_list(raw) -> list:
+    """JSON list 欄位解碼，規則同 Video.from_row：空值／損毀 JSON → []。"""
+    if not raw:
+        return []
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return []
+
+
+# search_text() 的 bm25 欄位權重，順序同 connection.VIDEO_FTS_COLUMNS
+# （number, title, original_title, actresses, tags, series, maker, label）。
+_FTS_BM25_WEIGHTS = (10.0, 4.0, 2.0, 6.0, 2.0, 3.0, 2.0, 1.0)
+# trigram tokenizer 最短可索引長度；更短的詞（如兩字女優名）改走 LIKE 子條件。
+_FTS_MIN_TERM_LEN = 3
+
+
+def _split_search_terms(query: str) -> Tuple[List[str], List[str]]:
+    """以空白切詞，回傳 (可走 FTS 的詞, 過短需走 LIKE 的詞)；重複詞去除。"""
+    fts_terms: List[str] = []
+    short_terms: List[str] = []
+    for term in dict.fromkeys(query.split()):
+        (fts_terms if len(term) >= _FTS_MIN_TERM_LEN else short_terms).append(term)
+    return fts_terms, short_terms
+
+
+def _fts_phrase(term: str) -> str:
+    """把使用者輸入包成 FTS5 字串 phrase（雙引號跳脫），杜絕 MATCH 語法注入。"""
+    return '"' + term.replace('"', '""') + '"'
+
+
 class VideoRepository:
     """影片資料存取層"""
 
@@ -213,6 +260,71 @@ class VideoRepository:
                 conn.close()
         return self._columns_cache
 
+    @staticmethod
+    @functools.lru_cache(maxsize=16)
+    def _upsert_sql(columns: Tuple[str, ...]) -> str:  # ranker-invalidate-ok: (只組 SQL 字串不執行；執行端 upsert() / upsert_batch() 自帶 invalidate)
+        """依欄位組合（column shape）建 `INSERT … ON CONFLICT(path) DO UPDATE` SQL，結果快取。
+
+        Video.to_dict() 的欄位組合固定，實務上整個 process 只建一次；upsert() /
+        upsert_batch() 共用，保證兩者的保留語意（CASE WHEN）一致。
+        """
+        update_parts = []
+        for col in columns:
+            if col == 'path':
+                continue
+            elif col in _FOCAL_PRESERVE:
+                if col == 'crop_mode':
+                    # 同封面保留；換封面時 manual 座標已失效 → 降回 auto（CD-10/99a-T1b）
+                    update_parts.append(_FOCAL_CROP_MODE_CASE_SQL)
+                elif col == 'auto_focal':
+                    # cover_path 相同 → 保留；換封面 → 重置為未偵測（Codex PR#105 P2b）
+                    update_parts.append(_FOCAL_AUTO_FOCAL_CASE_SQL)
+                elif col == 'focal_attempted_at':
+                    update_parts.append(_FOCAL_ATTEMPTED_AT_CASE_SQL)
+            elif col == 'user_tags':
+                # user_tags = '[]' 時視同「不更新」，保留 DB 現有值
+                update_parts.append(
+                    "user_tags = CASE WHEN excluded.user_tags = '[]' THEN videos.user_tags ELSE excluded.user_tags END"
+                )
+            elif col == 'output_dir':
+                # output_dir = '' 時視同「不更新」，保留 DB 現有值（TASK-89a-T1）
+                update_parts.append(
+                    "output_dir = CASE WHEN excluded.output_dir = '' THEN videos.output_dir ELSE excluded.output_dir END"
+                )
+            elif col == 'scrape_attempted_at':
+                # scrape_attempted_at = 0 時視同「不更新」，保留 DB 現有值（P2 修正，須與 output_dir 對稱）
+                update_parts.append(
+                    "scrape_attempted_at = CASE WHEN excluded.scrape_attempted_at = 0 THEN videos.scrape_attempted_at ELSE excluded.scrape_attempted_at END"
+                )
+            else:
+                update_parts.append(f"{col} = excluded.{col}")
+        update_clause = ', '.join(update_parts)
+        placeholders = ', '.join(['?'] * len(columns))
+        return f"""
+            INSERT INTO videos ({', '.join(columns)})
+            VALUES ({placeholders})
+            ON CONFLICT(path) DO UPDATE SET
+                {update_clause},
+                updated_at = CURRENT_TIMESTAMP
+        """
+
+    @staticmethod
+    def _path_columns(uri: str) -> dict:
+        """寫入 path 時一律同步的欄位：path 本身與衍生索引 path_key（見 path_scope_key）。"""
+        return {'path': uri, 'path_key': path_scope_key(uri)}
+
+    @staticmethod
+    def _upsert_dict(video: Video) -> dict:
+        """upsert 用的欄位 dict：去掉自動欄位與 user_rating，補上 path_key 與健康度旗標。"""
+        video_dict = video.to_dict()
+        video_dict.pop('id', None)
+        video_dict.pop('created_at', None)
+        video_dict.pop('updated_at', None)
+        video_dict.pop('user_rating', None)  # CD-123-3：只由 set_user_rating() 寫入，排除在動態欄位外
+        video_dict.update(VideoRepository._path_columns(video.path))
+        video_dict.update(health_flags(video.number, video_dict['tags']))
+        return video_dict
+
     def upsert(self, video: Video) -> int:
         """新增或更新影片（根據 path 判斷）
 
@@ -223,54 +335,8 @@ class VideoRepository:
         cursor = conn.cursor()
 
         try:
-            video_dict = video.to_dict()
-            # 移除自動欄位
-            video_dict.pop('id', None)
-            video_dict.pop('created_at', None)
-            video_dict.pop('updated_at', None)
-            video_dict.pop('user_rating', None)  # CD-123-3：只由 set_user_rating() 寫入，排除在動態欄位外
-
-            columns = list(video_dict.keys())
-            placeholders = ', '.join(['?'] * len(columns))
-            update_parts = []
-            for col in columns:
-                if col == 'path':
-                    continue
-                elif col in _FOCAL_PRESERVE:
-                    if col == 'crop_mode':
-                        # 同封面保留；換封面時 manual 座標已失效 → 降回 auto（CD-10/99a-T1b）
-                        update_parts.append(_FOCAL_CROP_MODE_CASE_SQL)
-                    elif col == 'auto_focal':
-                        # cover_path 相同 → 保留；換封面 → 重置為未偵測（Codex PR#105 P2b）
-                        update_parts.append(_FOCAL_AUTO_FOCAL_CASE_SQL)
-                    elif col == 'focal_attempted_at':
-                        update_parts.append(_FOCAL_ATTEMPTED_AT_CASE_SQL)
-                elif col == 'user_tags':
-                    # user_tags = '[]' 時視同「不更新」，保留 DB 現有值
-                    update_parts.append(
-                        "user_tags = CASE WHEN excluded.user_tags = '[]' THEN videos.user_tags ELSE excluded.user_tags END"
-                    )
-                elif col == 'output_dir':
-                    # output_dir = '' 時視同「不更新」，保留 DB 現有值（TASK-89a-T1）
-                    update_parts.append(
-                        "output_dir = CASE WHEN excluded.output_dir = '' THEN videos.output_dir ELSE excluded.output_dir END"
-                    )
-                elif col == 'scrape_attempted_at':
-                    # scrape_attempted_at = 0 時視同「不更新」，保留 DB 現有值（P2 修正，須與 output_dir 對稱）
-                    update_parts.append(
-                        "scrape_attempted_at = CASE WHEN excluded.scrape_attempted_at = 0 THEN videos.scrape_attempted_at ELSE excluded.scrape_attempted_at END"
-                    )
-                else:
-                    update_parts.append(f"{col} = excluded.{col}")
-            update_clause = ', '.join(update_parts)
-
-            sql = f"""
-                INSERT INTO videos ({', '.join(columns)})
-                VALUES ({placeholders})
-                ON CONFLICT(path) DO UPDATE SET
-                    {update_clause},
-                    updated_at = CURRENT_TIMESTAMP
-            """
+            video_dict = self._upsert_dict(video)
+            sql = self._upsert_sql(tuple(video_dict))
 
             cursor.execute(sql, list(video_dict.values()))
             conn.commit()
@@ -308,6 +374,8 @@ class VideoRepository:
             video_dict.pop('id', None)
             video_dict.pop('created_at', None)
             video_dict.pop('updated_at', None)
+            video_dict.update(self._path_columns(video.path))
+            video_dict.update(health_flags(video.number, video_dict['tags']))
 
             columns = list(video_dict.keys())
             placeholders = ', '.join(['?'] * len(columns))
@@ -393,7 +461,7 @@ class VideoRepository:
             video_dict.pop('id', None)
             video_dict.pop('created_at', None)
             video_dict.pop('updated_at', None)
-            video_dict.pop('path', None)   # path 會另外指定
+            video_dict.update(self._path_columns(new_uri))  # path 換成新 URI（連同 path_key）
             video_dict.pop('user_rating', None)  # CD-123-3：只由 set_user_rating() 寫入，排除在動態欄位外
 
             # cover_path 是否變動決定 auto_focal/focal_attempted_at 保留或重置
@@ -440,9 +508,6 @@ class VideoRepository:
             set_parts.append("user_tags = ?")
             set_values.append(json.dumps(merged_tags, ensure_ascii=False))
 
-            # path + updated_at
-            set_parts.append("path = ?")
-            set_values.append(new_uri)
             set_parts.append("updated_at = CURRENT_TIMESTAMP")
 
             sql = f"UPDATE videos SET {', '.join(set_parts)} WHERE path = ?"
@@ -505,15 +570,15 @@ class VideoRepository:
         video_dict.pop('id', None)
         video_dict.pop('created_at', None)
         video_dict.pop('updated_at', None)
+        video_dict.update(self._path_columns(new_uri))
+        video_dict.update(health_flags(video.number, video_dict['tags']))
 
         columns = list(video_dict.keys())
         values = list(video_dict.values())
 
-        # 強制覆蓋 path + user_tags
+        # 強制覆蓋 user_tags / user_rating（path 已由 _path_columns 換成 new_uri）
         for i, col in enumerate(columns):
-            if col == 'path':
-                values[i] = new_uri
-            elif col == 'user_tags':
+            if col == 'user_tags':
                 values[i] = json.dumps(merged_tags, ensure_ascii=False)
             elif col == 'user_rating':
                 values[i] = merged_rating
@@ -596,7 +661,7 @@ class VideoRepository:
         Contract:
         - old_uri 空或 old_uri == new_uri → return False（no-op）
         - new_uri 已有 row → 不 UPDATE（避免 UNIQUE 碰撞）→ return False
-        - 否則 UPDATE path + updated_at WHERE path=old_uri；commit；
+        - 否則 UPDATE path + path_key + updated_at WHERE path=old_uri；commit；
           invalidate ranker cache（non-fatal）；rowcount > 0 → True else False
         """
         if not old_uri or old_uri == new_uri:
@@ -610,8 +675,8 @@ class VideoRepository:
         cursor = conn.cursor()
         try:
             cursor.execute(
-                "UPDATE videos SET path = ?, updated_at = CURRENT_TIMESTAMP WHERE path = ?",
-                (new_uri, old_uri),
+                "UPDATE videos SET path = ?, path_key = ?, updated_at = CURRENT_TIMESTAMP WHERE path = ?",
+                (new_uri, path_scope_key(new_uri), old_uri),
             )
             conn.commit()
             rowcount = cursor.rowcount  # 讀在 close() 之前
@@ -629,6 +694,12 @@ class VideoRepository:
     def upsert_batch(self, videos: List[Video]) -> tuple:
         """批次新增或更新
 
+        同一欄位組合只建一條 SQL，以 executemany 分塊寫入（每 _UPSERT_BATCH_CHUNK
+        列一個 transaction）。新增／更新筆數不再預先 `SELECT path IN (...)`（大批量會
+        超過 SQLite 變數上限）：transaction 內先記下 MAX(id)，executemany 後以
+        changes() 總數與 `id > 水位` 的列數推得（AUTOINCREMENT 保證新列 id 遞增）。
+        同批重複 path 時第一筆算新增、其後算更新。
+
         Returns:
             Tuple[int, int]: (inserted, updated)
         """
@@ -637,85 +708,44 @@ class VideoRepository:
 
         conn = self._get_connection()
         cursor = conn.cursor()
+        inserted = 0
+        updated = 0
+        committed = False
 
         try:
-            # 先取得現有 path 列表
-            paths = [v.path for v in videos]
-            placeholders = ', '.join(['?'] * len(paths))
-            cursor.execute(f"SELECT path FROM videos WHERE path IN ({placeholders})", paths)
-            existing_paths = {row[0] for row in cursor.fetchall()}
-
-            inserted = 0
-            updated = 0
-
+            # 依欄位組合分組（保持各組內原順序）；Video.to_dict() 欄位固定，通常只有一組
+            shapes: dict = {}
             for video in videos:
-                video_dict = video.to_dict()
-                video_dict.pop('id', None)
-                video_dict.pop('created_at', None)
-                video_dict.pop('updated_at', None)
-                video_dict.pop('user_rating', None)  # CD-123-3：只由 set_user_rating() 寫入，排除在動態欄位外
-
-                columns = list(video_dict.keys())
-                placeholders_sql = ', '.join(['?'] * len(columns))
-                update_parts = []
-                for col in columns:
-                    if col == 'path':
-                        continue
-                    elif col in _FOCAL_PRESERVE:
-                        if col == 'crop_mode':
-                            # 同封面保留；換封面時 manual 座標已失效 → 降回 auto（CD-10/99a-T1b）
-                            update_parts.append(_FOCAL_CROP_MODE_CASE_SQL)
-                        elif col == 'auto_focal':
-                            # cover_path 相同 → 保留；換封面 → 重置為未偵測（Codex PR#105 P2b）
-                            update_parts.append(_FOCAL_AUTO_FOCAL_CASE_SQL)
-                        elif col == 'focal_attempted_at':
-                            update_parts.append(_FOCAL_ATTEMPTED_AT_CASE_SQL)
-                    elif col == 'user_tags':
-                        # user_tags = '[]' 時視同「不更新」，保留 DB 現有值
-                        update_parts.append(
-                            "user_tags = CASE WHEN excluded.user_tags = '[]' THEN videos.user_tags ELSE excluded.user_tags END"
-                        )
-                    elif col == 'output_dir':
-                        # output_dir = '' 時視同「不更新」，保留 DB 現有值（TASK-89a-T1，須與 upsert() 對稱）
-                        update_parts.append(
-                            "output_dir = CASE WHEN excluded.output_dir = '' THEN videos.output_dir ELSE excluded.output_dir END"
-                        )
-                    elif col == 'scrape_attempted_at':
-                        # scrape_attempted_at = 0 時視同「不更新」，保留 DB 現有值（P2 修正，須與 upsert() 對稱）
-                        update_parts.append(
-                            "scrape_attempted_at = CASE WHEN excluded.scrape_attempted_at = 0 THEN videos.scrape_attempted_at ELSE excluded.scrape_attempted_at END"
-                        )
-                    else:
-                        update_parts.append(f"{col} = excluded.{col}")
-                update_clause = ', '.join(update_parts)
-
-                sql = f"""
-                    INSERT INTO videos ({', '.join(columns)})
-                    VALUES ({placeholders_sql})
-                    ON CONFLICT(path) DO UPDATE SET
-                        {update_clause},
-                        updated_at = CURRENT_TIMESTAMP
-                """
-
-                cursor.execute(sql, list(video_dict.values()))
-
-                if video.path in existing_paths:
-                    updated += 1
-                else:
-                    inserted += 1
-
-            conn.commit()
-
-            # invalidate ranker cache（寫成功才 invalidate；commit 失敗跳過）
-            try:
-                from core.similar.ranker_cache import SimilarRankerCache
-                SimilarRankerCache.invalidate()
-            except Exception:
-                logger.exception("SimilarRankerCache invalidate failed (non-fatal)")
+                video_dict = self._upsert_dict(video)
+                shapes.setdefault(tuple(video_dict), []).append(tuple(video_dict.values()))
+
+            for columns, rows in shapes.items():
+                sql = self._upsert_sql(columns)
+                for i in range(0, len(rows), _UPSERT_BATCH_CHUNK):
+                    chunk = rows[i:i + _UPSERT_BATCH_CHUNK]
+                    # BEGIN IMMEDIATE：水位讀取與寫入在同一把寫鎖內，其他寫入者無法插隊
+                    cursor.execute("BEGIN IMMEDIATE")
+                    cursor.execute("SELECT IFNULL(MAX(id), 0) FROM videos")
+                    watermark = cursor.fetchone()[0]
+                    cursor.executemany(sql, chunk)
+                    changed = cursor.rowcount
+                    cursor.execute("SELECT COUNT(*) FROM videos WHERE id > ?", (watermark,))
+                    chunk_inserted = cursor.fetchone()[0]
+                    conn.commit()
+                    committed = True
+                    inserted += chunk_inserted
+                    updated += changed - chunk_inserted
 
             return (inserted, updated)
         finally:
             conn.close()
+            # invalidate ranker cache（有任一 chunk commit 成功才 invalidate）
+            if committed:
+                try:
+                    from core.similar.ranker_cache import SimilarRankerCache
+                    SimilarRankerCache.invalidate()
+                except Exception:
+                    logger.exception("SimilarRankerCache invalidate failed (non-fatal)")
 
     def get_by_path(self, path: str) -> Optional[Video]:
         """根據 path 查詢"""
@@ -772,6 +802,37 @@ class VideoRepository:
         finally:
             conn.close()
 
+    def get_cover_path_map(self, paths: List[str]) -> dict:
+        """批次讀 {path: cover_path}（縮圖預熱逐批 before/after fence 用，避免每張兩次 get_by_path）。
+
+        單條 `SELECT path, cover_path FROM videos WHERE path IN (...)`，超過 SQLite 變數
+        上限時分批。空 paths 直接回 {}（不查詢）。鏡射 get_focal_crop_map 連線 pattern。
+
+        Returns:
+            dict[str, str]: {path: cover_path}；未在 DB 的 path 不會出現在結果中，
+            cover_path 空的列值為 ''。
+        """
+        if not paths:
+            return {}
+
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        try:
+            result: dict = {}
+            chunk_size = 900  # 保守低於 SQLite 999 變數上限
+            for i in range(0, len(paths), chunk_size):
+                chunk = paths[i:i + chunk_size]
+                placeholders = ', '.join(['?'] * len(chunk))
+                cursor.execute(
+                    f"SELECT path, cover_path FROM videos WHERE path IN ({placeholders})",
+                    chunk,
+                )
+                for row in cursor.fetchall():
+                    result[row[0]] = row[1] or ''
+            return result
+        finally:
+            conn.close()
+
     def get_empty_focal_candidates(self, paths: List[str]) -> List[Tuple[str, Optional[str], str, str]]:
         """批次讀「本次掃描 in-scope 但 auto_focal 仍空、且從未偵測過」的候選列
         （Codex PR#105 P2 修復；no-face re-enqueue 修復同號 P2）。
@@ -926,6 +987,58 @@ class VideoRepository:
         finally:
             conn.close()
 
+    def get_library_generation(self) -> Tuple[str, int]:
+        """回傳 (epoch, generation)：videos 表任何寫入後 generation 必然變大。
+
+        由 connection._ensure_library_generation 的 trigger 維護，涵蓋本類別以外的
+        raw SQL 寫入。尚未 init_db 的舊庫沒有此表，sqlite3.OperationalError 原樣上拋，
+        由呼叫端決定退回不快取路徑。
+        """
+        conn = self._get_connection()
+        try:
+            row = conn.execute(
+                "SELECT epoch, generation FROM library_generation WHERE id = 1"
+            ).fetchone()
+            if row is None:
+                raise sqlite3.OperationalError("library_generation row missing")
+            return row[0], row[1]
+        finally:
+            conn.close()
+
+    def get_health_summary(self) -> dict:
+        """回傳 video_health_summary 的全部計數（欄位名見 connection.VIDEO_HEALTH_COUNTERS）。
+
+        計數由 trigger 隨寫入增減；唯讀連線、不寫入。raw SQL 寫入留下的 NULL 旗標由
+        init_db、改 number / tags 的寫入端與背景維護（`DbMaintenance` 的 health_heal）補算，
+        補算前不計入旗標類計數。
+        """
+        conn = connection.get_readonly_connection(self.db_path)
+        try:
+            cursor = conn.execute("SELECT * FROM video_health_summary WHERE id = 1")
+            columns = [d[0] for d in cursor.description]
+            row = cursor.fetchone()
+            if row is None:
+                raise sqlite3.OperationalError("video_health_summary row missing")
+            summary = dict(zip(columns, row, strict=True))
+            summary.pop('id')
+            return summary
+        finally:
+            conn.close()
+
+    def heal_health_flags(self) -> int:
+        """補算 number_issue / has_japanese_tags 為 NULL 的列，回傳補算列數。
+
+        供依旗標查詢的端點（analysis/groups）在查詢前呼叫。
+        """
+        conn = self._get_connection()
+        try:
+            healed = connection._heal_health_flags(conn)
+            if healed:
+                conn.commit()
+            return healed
+        finally:
+            conn.close()
+
     def clear_all(self) -> int:
         """清除所有影片快取
 
@@ -969,8 +1082,309 @@ class VideoRepository:
         finally:
             conn.close()
 
+    def get_by_ids(self, ids: List[int]) -> List[Video]:
+        """依 id 批次取回影片，回傳順序與 ids 相同（不存在的 id 略過）。
+
+        超過 SQLite 變數上限時分批，鏡射 get_focal_crop_map 連線 pattern。
+        """
+        if not ids:
+            return []
+
+        conn = self._get_connection()
+        try:
+            by_id: dict = {}
+            columns = self._get_columns()
+            chunk_size = 900  # 保守低於 SQLite 999 變數上限
+            for i in range(0, len(ids), chunk_size):
+                chunk = ids[i:i + chunk_size]
+                placeholders = ', '.join(['?'] * len(chunk))
+                cursor = conn.execute(
+                    f"SELECT * FROM videos WHERE id IN ({placeholders})", chunk
+                )
+                for row in cursor.fetchall():
+                    video = Video.from_row(row, columns)
+                    by_id[video.id] = video
+            return [by_id[i] for i in ids if i in by_id]
+        finally:
+            conn.close()
+
+    def search_text(self, query: str, scope_uris=None) -> List[Tuple[int, str]]:
+        """本地片庫全文檢索，回傳依相關度排序的 [(id, path), ...]。
+
+        以空白切詞、詞與詞 AND；每個詞是子字串比對（不分大小寫），涵蓋番號、標題、
+        原文標題、女優、標籤、系列、片商、廠牌。長度 >= 3 的詞走 videos_fts
+        （trigram）並以 bm25 排序；更短的詞（trigram 無法索引）以 LIKE 子條件補上。
+        全部都是短詞、或 FTS5 不可用（見 connection._ensure_video_fts）時退回
+        videos 全表 LIKE，依 id 新到舊排序。
+
+        scope_uris 給定時只回設定資料夾底下的命中（見 `_scope_where()`）。
+        只回 (id, path)：分頁由呼叫端做，完整列再用 get_by_ids 取回當頁，避免為
+        整個命中集合 decode JSON 欄位。
+        """
+        fts_terms, short_terms = _split_search_terms(query)
+        if not fts_terms and not short_terms:
+            return []
+
+        conn = self._get_connection()
+        try:
+            scope_sql: List[str] = []
+            scope_params: list = []
+            if scope_uris is not None:
+                sql, scope_params = self._scope_where(conn, scope_uris, alias="v")
+                scope_sql = [sql]
+
+            if fts_terms:
+                weights = ", ".join(str(w) for w in _FTS_BM25_WEIGHTS)
+                like_sql, like_params = self._like_all_terms(short_terms)
+                where = " AND ".join(["videos_fts MATCH ?"] + like_sql + scope_sql)
+                try:
+                    cursor = conn.execute(
+                        f"""SELECT v.id, v.path FROM videos_fts
+                            JOIN videos v ON v.id = videos_fts.rowid
+                            WHERE {where}
+                            ORDER BY bm25(videos_fts, {weights}), v.id DESC""",
+                        [" ".join(_fts_phrase(t) for t in fts_terms)] + like_params + scope_params,
+                    )
+                    return cursor.fetchall()
+                except sqlite3.OperationalError:
+                    logger.warning("search_text: videos_fts unavailable, falling back to LIKE scan",
+                                   exc_info=True)
+
+            like_sql, like_params = self._like_all_terms(fts_terms + short_terms)
+            cursor = conn.execute(
+                f"SELECT v.id, v.path FROM videos v WHERE {' AND '.join(like_sql + scope_sql)} ORDER BY v.id DESC",
+                like_params + scope_params,
+            )
+            return cursor.fetchall()
+        finally:
+            conn.close()
+
+    @classmethod
+    def _like_all_terms(cls, terms: List[str]) -> Tuple[List[str], List[str]]:
+        """每個詞一組「任一 FTS 欄位 LIKE %詞%」子條件（search_text 的短詞／退回路徑）。"""
+        sql: List[str] = []
+        params: List[str] = []
+        for term in terms:
+            pattern = '%' + cls._escape_like(term) + '%'
+            sql.append("(" + " OR ".join(
+                f"v.{col} LIKE ? ESCAPE '\\'" for col in connection.VIDEO_FTS_COLUMNS
+            ) + ")")
+            params.extend([pattern] * len(connection.VIDEO_FTS_COLUMNS))
+        return sql, params
+
+    def list_page(
+        self,
+        sort: str = "date",
+        descending: bool = True,
+        after: Optional[Tuple[object, int]] = None,
+        limit: int = 60,
+        **filters,
+    ) -> List[Tuple[object, Video]]:
+        """Showcase 分頁列表：依 sort 鍵 keyset 分頁，回傳 [(排序值, Video), ...]。
+
+        Args:
+            sort: connection.VIDEO_SORT_EXPRESSIONS 的鍵（date / mtime / size / rating）。
+            descending: True 為新到舊／大到小；同值以 id 同向排序當 tie-breaker。
+            after: 上一頁最後一列的 (排序值, id)；None 表示第一頁。
+            limit: 本頁最多列數。
+            **filters: 見 `_listing_where()`。
+
+        排序值一併回傳，呼叫端用最後一列組下一頁游標（不需在 Python 重算 IFNULL）。
+        """
+        expr = connection.VIDEO_SORT_EXPRESSIONS[sort]
+        direction = "DESC" if descending else "ASC"
+        conn = self._get_connection()
+        try:
+            where, params = self._listing_where(conn, **filters)
+            if after is not None:
+                where.append(f"({expr}, id) {'<' if descending else '>'} (?, ?)")
+                params.extend(after)
+            sql = f"SELECT {expr} AS sort_value, * FROM videos"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += f" ORDER BY {expr} {direction}, id {direction} LIMIT ?"
+            cursor = conn.execute(sql, params + [limit])
+            columns = self._get_columns()
+            return [(row[0], Video.from_row(row[1:], columns)) for row in cursor.fetchall()]
+        finally:
+            conn.close()
+
+    def count_listing(self, **filters) -> int:
+        """`list_page()` 同一組 filters 下的總列數（檔案數，分集片每段各算一列）。"""
+        conn = self._get_connection()
+        try:
+            where, params = self._listing_where(conn, **filters)
+            sql = "SELECT COUNT(*) FROM videos"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            return conn.execute(sql, params).fetchone()[0]
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _scope_where(conn: sqlite3.Connection, scope_uris, alias: str = "") -> Tuple[str, list]:
+        """「path 在任一設定資料夾底下」的 WHERE 片段（語意同 is_path_under_dir）。
+
+        每個目錄化為 path_key 上的等值 ＋ 前綴範圍（key/ ≤ path_key < key0，'0' 是
+        '/' 的下一個字元），走 idx_videos_path_key。path_key 為 NULL 的列（不經
+        VideoRepository 改過 path、尚未補算）退回逐列 is_path_under_dir，結果不變。
+        空 scope_uris ＝ 一列都不留（同 /videos 既有語意）。
+        """
+        from core.path_utils import is_path_under_dir
+
+        col = f"{alias}." if alias else ""
+        uris = list(scope_uris)
+        terms: List[str] = []
+        params: list = []
+        for uri in uris:
+            key = path_scope_key(uri)
+            prefix = key if key.endswith('/') else key + '/'
+            terms.append(f"{col}path_key = ?")
+            terms.append(f"({col}path_key >= ? AND {col}path_key < ?)")
+            params.extend([key, prefix, prefix[:-1] + '0'])
+        conn.create_function(
+            "path_in_scope", 1,
+            lambda p: p is not None and any(is_path_under_dir(p, u) for u in uris),
+            deterministic=True,
+        )
+        terms.append(f"({col}path_key IS NULL AND path_in_scope({col}path))")
+        return "(" + " OR ".join(terms) + ")", params
+
+    def get_snapshot(self):
+        """本 DB 的 process 內唯讀快照（core.database.read_model.LibrarySnapshot）。
+
+        讀多寫少的全庫端點（Showcase 全量、similar、tags top、女優庫）共用同一份，
+        取用時只以一個單列查詢確認新鮮度，有寫入才增量更新。
+        """
+        from .read_model import get_library_snapshot
+        return get_library_snapshot(self.db_path)
+
+    def get_all_in_scope(self, scope_uris) -> List[Video]:
+        """取得 path 在任一設定資料夾底下的全部影片（取代 get_all() ＋ 逐列 is_path_under_dir）。
+
+        順序同 get_all()（id 升冪）：group_rows 的組間順序取決於輸入順序。
+        由唯讀快照供應（scope 判定同 _scope_where），不再每次 SELECT * ＋ JSON 解碼。
+        """
+        return self.get_snapshot().videos_in_scope(scope_uris)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=32)
+    def _row_type(columns: Tuple[str, ...]):
+        """iter_rows() 的輕量 row 型別（每種欄位組合一個 namedtuple class）。"""
+        return collections.namedtuple('VideoRow', columns)
+
+    def iter_rows(
+        self,
+        columns: Sequence[str],
+        where: Optional[str] = None,
+        params: Sequence = (),
+        scope_uris: Optional[List[str]] = None,
+        batch: int = 1000,
+    ) -> Iterator[tuple]:
+        """欄位投影 ＋ 串流讀取：依 id 升冪逐批 yield 只含指定欄位的 namedtuple。
+
+        給只需要少數欄位的全庫掃描（維護端點、prewarm、ranker corpus）用，取代
+        `get_all()` 全量建 Video：不 SELECT *、只 JSON 解碼有投影到的 list 欄位
+        （actresses / tags / user_tags / sample_images，解碼規則同 Video.from_row）。
+        屬性名與 Video 相同，`getattr(row, 'path')` 類呼叫端可直接沿用。
+
+        以 `id > 上批最後 id` keyset 分批，每批各借一次連線——消費端處理再久也不
+        長時間佔住連線或 WAL 讀快照，記憶體只放一批。迭代期間其他寫入可能被部分
+        看見（每批各自一致），與逐筆 re-check 的呼叫端語意相容。
+
+        Args:
+            columns: videos 欄位名（須為實際存在的欄位，否則 ValueError）
+            where: 額外 SQL 條件片段（僅供內部呼叫端使用，值一律走 params）
+            params: where 的綁定參數
+            scope_uris: 給定時只取設定資料夾底下的列（同 get_all_in_scope）
+            batch: 每批列數
+        """
+        columns = tuple(columns)
+        known = set(self._get_columns())
+        unknown = [c for c in columns if c not in known]
+        if unknown:
+            raise ValueError(f"Unknown videos column(s): {unknown}")
+        row_type = self._row_type(columns)
+        json_idx = [i for i, c in enumerate(columns) if c in _JSON_LIST_COLUMNS]
+        select_sql = ', '.join(('id',) + columns)
+
+        last_id = 0
+        while True:
+            conn = self._get_connection()
+            try:
+                clauses = ["id > ?"]
+                args: list = [last_id]
+                if where:
+                    clauses.append(f"({where})")
+                    args.extend(params)
+                if scope_uris is not None:
+                    scope_sql, scope_params = self._scope_where(conn, scope_uris)
+                    clauses.append(scope_sql)
+                    args.extend(scope_params)
+                rows = conn.execute(
+                    f"SELECT {select_sql} FROM videos WHERE {' AND '.join(clauses)} "
+                    f"ORDER BY id LIMIT ?",
+                    [*args, batch],
+                ).fetchall()
+            finally:
+                conn.close()
+
+            for row in rows:
+                values = list(row[1:])
+                for i in json_idx:
+                    values[i] = _json_list(values[i])
+                yield row_type._make(values)
+            if len(rows) < batch:
+                return
+            last_id = rows[-1][0]
+
+    @staticmethod
+    def _listing_where(
+        conn: sqlite3.Connection,
+        scope_uris: Optional[List[str]] = None,
+        actress: Optional[str] = None,
+        tag: Optional[str] = None,
+        maker: Optional[str] = None,
+        series: Optional[str] = None,
+        min_rating: Optional[int] = None,
+        has_cover: Optional[bool] = None,
+    ) -> Tuple[List[str], list]:
+        """list_page / count_listing 共用的 WHERE 子句。
+
+        scope_uris 為 None 時不限目錄；給定時見 `_scope_where()`。
+        actress / tag 走 video_actresses / video_tags junction 精確比對。
+        """
+        where: List[str] = []
+        params: list = []
+        if scope_uris is not None:
+            scope_sql, scope_params = VideoRepository._scope_where(conn, scope_uris)
+            where.append(scope_sql)
+            params.extend(scope_params)
+        if actress:
+            where.append("id IN (SELECT video_id FROM video_actresses WHERE name = ?)")
+            params.append(actress)
+        if tag:
+            where.append("id IN (SELECT video_id FROM video_tags WHERE tag = ?)")
+            params.append(tag)
+        if maker:
+            where.append("maker = ?")
+            params.append(maker)
+        if series:
+            where.append("series = ?")
+            params.append(series)
+        if min_rating:
+            where.append("IFNULL(user_rating, 0) >= ?")
+            params.append(min_rating)
+        if has_cover is not None:
+            where.append("IFNULL(cover_path, '') != ''" if has_cover
+                         else "IFNULL(cover_path, '') = ''")
+        return where, params
+
     def get_by_number(self, number: str) -> Optional[Video]:
-        """根據番號查詢單筆影片，大小寫不敏感（供 by-number 端點使用）。
+        """根據番號查詢單筆影片（供 by-number 端點使用）。
+
+        比對規則同 get_by_numbers（大小寫、分隔符、FC2-PPV 寫法不敏感，走
+        idx_videos_number_key）；多筆命中時優先大小寫不敏感完全相同者，其次 id 最小。
 
         Returns:
             Video 若找到，None 若番號不存在
@@ -979,8 +1393,9 @@ class VideoRepository:
         cursor = conn.cursor()
         try:
             cursor.execute(
-                "SELECT * FROM videos WHERE UPPER(number) = UPPER(?) LIMIT 1",
-                (number,)
+                f"SELECT * FROM videos WHERE {connection.NUMBER_KEY_SQL} = ? "
+                f"ORDER BY UPPER(number) = UPPER(?) DESC, id LIMIT 1",
+                (connection.number_key(number), number)
             )
             row = cursor.fetchone()
             if row:
@@ -990,14 +1405,18 @@ class VideoRepository:
             conn.close()
 
     def get_by_numbers(self, numbers: List[str]) -> dict:
-        """根據番號批次查詢（大小寫不敏感）
+        """根據番號批次查詢（大小寫、分隔符、FC2-PPV 寫法不敏感）
+
+        以 connection.NUMBER_KEY_SQL 比對：SONE-205 / sone205、FC2-PPV-1234567 /
+        FC2-1234567 視為同一番號。查詢走 idx_videos_number_key 運算式索引
+        （逐個 index seek，不全表掃描）；超過 SQLite 變數上限時分批。
 
         Args:
             numbers: 番號列表 (e.g., ["SONE-205", "ABW-001"])
 
         Returns:
             dict: {番號: [Video, ...]} - 同番號可能有多個檔案
-                  番號 key 使用原始輸入的大小寫形式
+                  番號 key 使用原始輸入的形式；多個輸入對應同一比對鍵時各自都有結果
         """
         if not numbers:
             return {}
@@ -1006,29 +1425,33 @@ class VideoRepository:
         cursor = conn.cursor()
 
         try:
-            # 建立大寫番號 → 原始輸入的映射
-            upper_to_original = {n.upper(): n for n in numbers}
-            upper_numbers = list(upper_to_original.keys())
-
-            # 使用 UPPER() 進行大小寫不敏感比對
-            placeholders = ', '.join(['?'] * len(upper_numbers))
-            cursor.execute(
-                f"SELECT * FROM videos WHERE UPPER(number) IN ({placeholders})",
-                upper_numbers
-            )
-            rows = cursor.fetchall()
+            # 比對鍵 → 原始輸入（可能多個，如 "SONE-205" 與 "sone205" 同時查）
+            key_to_originals: dict = {}
+            for n in numbers:
+                originals = key_to_originals.setdefault(connection.number_key(n), [])
+                if n not in originals:
+                    originals.append(n)
+            keys = list(key_to_originals)
+
+            rows = []
+            chunk_size = 900  # 保守低於 SQLite 999 變數上限
+            for i in range(0, len(keys), chunk_size):
+                chunk = keys[i:i + chunk_size]
+                placeholders = ', '.join(['?'] * len(chunk))
+                cursor.execute(
+                    f"SELECT * FROM videos WHERE {connection.NUMBER_KEY_SQL} IN ({placeholders}) ORDER BY id",
+                    chunk
+                )
+                rows.extend(cursor.fetchall())
 
             # 建立結果字典（使用原始輸入的 key）
             result = {}
+            columns = self._get_columns()
             for row in rows:
-                video = Video.from_row(row, self._get_columns())
+                video = Video.from_row(row, columns)
                 if video.number:
-                    # 找到原始輸入的 key
-                    original_key = upper_to_original.get(video.number.upper())
-                    if original_key:
-                        if original_key not in result:
-                            result[original_key] = []
-                        result[original_key].append(video)
+                    for original_key in key_to_originals.get(connection.number_key(video.number), ()):
+                        result.setdefault(original_key, []).append(video)
 
             return result
         finally:
@@ -1037,8 +1460,8 @@ class VideoRepository:
     def count_by_actress(self, actress_name: str) -> int:
         """查詢某女優名字的片數
 
-        Uses json_each to expand the actresses JSON array and match exactly,
-        replacing the previous 4-LIKE-OR pattern to prevent prefix/suffix false matches.
+        走 video_actresses junction 表的 (name, video_id) index（完全比對、同片去重），
+        不再對 videos 全表 json_each 展開。
 
         Args:
             actress_name: 女優名稱
@@ -1049,15 +1472,14 @@ class VideoRepository:
         conn = self._get_connection()
         try:
             cursor = conn.execute(
-                """SELECT COUNT(DISTINCT videos.rowid) FROM videos, json_each(videos.actresses)
-                   WHERE json_valid(videos.actresses) AND json_each.value = ?""",
+                "SELECT COUNT(*) FROM video_actresses WHERE name = ?",
                 (actress_name,)
             )
             row = cursor.fetchone()
             return row[0] if row else 0
         except sqlite3.OperationalError:
             logger.exception(
-                "count_by_actress json_each failed for %r (returning 0)",
+                "count_by_actress query failed for %r (returning 0)",
                 actress_name
             )
             return 0
@@ -1067,8 +1489,7 @@ class VideoRepository:
     def get_videos_by_actress(self, actress_name: str) -> List['Video']:
         """取得包含某女優的所有影片
 
-        Uses json_each to expand the actresses JSON array and match exactly,
-        replacing the previous 4-LIKE-OR pattern to prevent prefix/suffix false matches.
+        以 video_actresses junction 表 index seek 取 video id，再依主鍵取回 videos 列。
 
         Args:
             actress_name: 女優名稱
@@ -1079,8 +1500,8 @@ class VideoRepository:
         conn = self._get_connection()
         try:
             cursor = conn.execute(
-                """SELECT DISTINCT videos.* FROM videos, json_each(videos.actresses)
-                   WHERE json_valid(videos.actresses) AND json_each.value = ?
+                """SELECT videos.* FROM videos
+                   WHERE videos.id IN (SELECT video_id FROM video_actresses WHERE name = ?)
                    ORDER BY videos.id""",
                 (actress_name,)
             )
@@ -1088,7 +1509,7 @@ class VideoRepository:
             return [Video.from_row(row, self._get_columns()) for row in rows]
         except sqlite3.OperationalError:
             logger.exception(
-                "get_videos_by_actress json_each failed for %r (returning [])",
+                "get_videos_by_actress query failed for %r (returning [])",
                 actress_name
             )
             return []
@@ -1098,10 +1519,8 @@ class VideoRepository:
     def get_videos_by_actress_names(self, names: list) -> List['Video']:
         """多名 OR 查詢（用於 alias 展開後的本地封面候選）
 
-        Uses json_each with IN (placeholders) and SELECT DISTINCT to match any of the
-        given names exactly, replacing the previous per-name UNION-of-LIKE pattern.
-        DISTINCT prevents duplicate rows when a video's actresses list contains
-        multiple names from the query set.
+        以 video_actresses junction 表 `name IN (...)` 取 video id 子查詢，完全比對任一
+        名稱；IN 子查詢天然去重——影片同時列出查詢集合內多個名字時不會重複回傳。
 
         Args:
             names: 女優名稱 list（alias 展開後的所有名稱）
@@ -1116,8 +1535,10 @@ class VideoRepository:
         conn = self._get_connection()
         try:
             cursor = conn.execute(
-                f"""SELECT DISTINCT videos.* FROM videos, json_each(videos.actresses)
-                   WHERE json_valid(videos.actresses) AND json_each.value IN ({placeholders})
+                f"""SELECT videos.* FROM videos
+                   WHERE videos.id IN (
+                       SELECT video_id FROM video_actresses WHERE name IN ({placeholders})
+                   )
                    ORDER BY videos.id""",
                 tuple(names)
             )
@@ -1125,7 +1546,7 @@ class VideoRepository:
             return [Video.from_row(row, self._get_columns()) for row in rows]
         except sqlite3.OperationalError:
             logger.exception(
-                "get_videos_by_actress_names json_each failed for %d names (returning [])",
+                "get_videos_by_actress_names query failed for %d names (returning [])",
                 len(names)
             )
             return []
@@ -1232,6 +1653,7 @@ class VideoRepository:
                 "UPDATE videos SET tags = ?, updated_at = CURRENT_TIMESTAMP WHERE path = ?",
                 (json.dumps(tags, ensure_ascii=False), path)
             )
+            connection._heal_health_flags(conn)  # trigger 已清空 has_japanese_tags，同交易補算
             conn.commit()
 
             try:
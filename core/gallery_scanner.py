@@ -9,11 +9,14 @@ generator 則負責靜態 HTML 的輸出。VideoScanner 是主要入口，
 
 import os
 import re
+import sqlite3
+import stat as stat_module
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
 import xml.etree.ElementTree as ET
 from dataclasses import dataclass, field, fields as dataclass_fields
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
 from core.cover_attributes import effective_tags
 from core.focal import requires_face_detection
@@ -33,6 +36,9 @@ from core.nfo_utils import sanitize_nfo_bytes
 from core.path_utils import normalize_path, to_file_uri, uri_to_fs_path, uri_to_local_fs_path
 from core.video_extensions import DEFAULT_VIDEO_EXTENSIONS, ZERO_SIZE_EXTENSIONS
 
+if TYPE_CHECKING:
+    from core.database.scan_index import ScanDirIndexRepository
+
 logger = get_logger(__name__)
 
 # Jellyfin BaseItem.SupportedImageExtensions minus .svg.
@@ -105,17 +111,32 @@ IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp')
 DEFAULT_CACHE_FILE = "gallery_cache.json"
 
 
+# fast_scan_directory() 的目錄列舉平行度預設值（gallery.scan_workers）。NAS（SMB/NFS）上
+# 每次列目錄都是一次網路往返，同層兄弟目錄平行列舉才不會被延遲串起來；本機磁碟多幾條
+# 執行緒也幾乎沒有額外成本。1 = 單執行緒逐層遞迴。
+DEFAULT_SCAN_WORKERS = 8
+
+
 def fast_scan_directory(
     directory: str,
     extensions: set,
     min_size_bytes: int = 0,
     on_skip: Optional[Callable[[str, Exception], None]] = None,
+    workers: Optional[int] = None,
+    dir_index: Optional['ScanDirIndexRepository'] = None,
+    recursive: bool = True,
 ) -> List[dict]:
     """快速掃描目錄，一次取得所有檔案資訊
 
     使用 os.scandir() 替代 glob() + stat()，大幅減少系統呼叫次數
     同時收集 NFO 檔案的 mtime，用於偵測 NFO 更新
 
+    目錄列舉（scandir + stat + extrafanart 張數）交給最多 `workers` 條執行緒的 pool：
+    每列完一層就把子目錄送進 pool，兄弟目錄同時列舉。結果與 on_skip 呼叫則由呼叫端
+    執行緒依「單執行緒遞迴」的順序組裝——子目錄結果先於本層影片、依 scandir 回傳
+    順序——所以回傳內容、順序與 on_skip 的呼叫順序都與 workers 無關，on_skip 也只在
+    呼叫端執行緒上被呼叫。
+
     Args:
         directory: 要掃描的根目錄
         extensions: 目標副檔名集合（含點）
@@ -125,9 +146,19 @@ def fast_scan_directory(
             用於讓呼叫端捕捉「因長路徑/權限而無法存取」的檔案，因為這類 entry
             根本不會進入回傳 results，僅透過 callback 讓呼叫端知道它們存在。
             callback 本身拋的例外會被吞掉，不影響掃描進度。
+        workers: 目錄列舉平行度（預設 DEFAULT_SCAN_WORKERS；<= 1 為單執行緒）
+        dir_index: 目錄簽章索引（core.database.ScanDirIndexRepository）。給定時只 stat
+            目錄本身與上次記下的影片 / NFO，簽章（mtime_ns ＋ extrafanart/ mtime_ns）與
+            這些檔案都沒變就沿用上次的列舉結果、不再 scandir；到期時整棵全量驗證（見 scan_index）。
+            None = 每次全量列舉（既有行為）。
+        recursive: False 時只列 directory 這一層（子目錄不展開，extrafanart 張數照算；
+            不使用 dir_index）。給 core.gallery_watcher 的單一資料夾同步用。
     """
     logger.debug(f"[FastScan] 掃描目錄: {directory}")
+    workers = DEFAULT_SCAN_WORKERS if workers is None else workers
     results = []
+    index_walk = _DirIndexWalk.open(dir_index, directory, extensions, min_size_bytes) if recursive else None
+
     def _safe_on_skip(p: str, exc: Exception) -> None:
         if on_skip is None:
             return
@@ -137,45 +168,47 @@ def fast_scan_directory(
             # callback 本身出錯不得影響掃描
             pass
 
-    def _count_extrafanart_images(parent_dir: str) -> int:
-        """數 `<parent_dir>/extrafanart/` 裡的合格劇照張數（TASK-118b-T9）。
+    def list_dir(path: str, spawn) -> Tuple[list, list]:
+        """列舉單一目錄（不遞迴）：回傳 (events, files)。
 
-        **這裡刻意複製 scan_file() 的定位方式，而不是自己找那個目錄**：
-        `Path(parent) / 'extrafanart'` ＋ `.is_dir()` 與 scan_file()（見該函式內的
-        `extrafanart_dir = video_path.parent / 'extrafanart'`）是**逐字相同的表達式**，
-        所以「哪個目錄算數」在兩端由構造保證一致——不管底下的檔案系統大小寫敏不敏感、
-        那個目錄是不是 symlink。
-
-        走訪端曾用 `entry.name` 比對過兩版（精確 → `.lower()`），兩版都在某一類檔案系統上
-        與 scan_file() 分岔：精確比對讓大小寫不敏感的 FS（NTFS／APFS）上的 `Extrafanart`
-        走訪端數 0、DB 數 N；`.lower()` 則讓大小寫敏感的 FS（ext4）上的 `Extrafanart`
-        走訪端數 N、DB 數 0。**兩種分岔的症狀都是「每次產生都重掃該片且永遠對不上」**。
-        用同一句表達式就沒有第三種寫錯的方式。
-
-        張數本身的過濾（副檔名／隱藏檔／size>0）同樣不另抄——直接呼叫
-        `VideoScanner._iter_extrafanart_images()`，與撿取端同源。
+        events 依發生順序記錄 ('dir', spawn(子目錄)) 與 ('skip', path, exc)；
+        組裝端照順序展開子目錄、補呼叫 on_skip，最後接上本層 files。
+        有索引時先比對目錄簽章，命中就直接由上次的列舉結果組出同樣的 (events, files)。
         """
-        extrafanart_dir = Path(parent_dir) / 'extrafanart'
-        try:
-            if not extrafanart_dir.is_dir():
-                return 0
-            return sum(1 for _ in VideoScanner._iter_extrafanart_images(extrafanart_dir))
-        except OSError as e:
-            _safe_on_skip(str(extrafanart_dir), e)
-            return 0
-
-    def scan_recursive(path: str):
+        if index_walk is None:
+            return scandir_listing(path, spawn)[:2]
+
+        dir_mtime_ns, cached, hit = index_walk.lookup(path)
+        if hit and not index_walk.state.verify:
+            return index_walk.replay(path, cached, spawn)
+        listed_at_ns = time.time_ns()
+        events, files, dir_names, entry_count, nfo_names = scandir_listing(path, spawn)
+        if dir_mtime_ns is not None and not any(e[0] == 'skip' for e in events):
+            # 有 entry 讀取失敗的目錄不記錄：下次仍要重新列舉、重新回報 on_skip
+            index_walk.record(path, dir_mtime_ns, listed_at_ns, entry_count, dir_names, files,
+                              nfo_names, cached if hit else None)
+        return events, files
+
+    def scandir_listing(path: str, spawn) -> Tuple[list, list, list, int, dict]:
+        """實際 scandir 一層：(events, files, 子目錄名, entry 數, {影片路徑: NFO 檔名或 None})。"""
         # 每層目錄各自獨立（新的區域變數），天然不會跨目錄污染。
+        events: list = []
+        dir_names: list = []
+        entry_count = 0
         extrafanart_image_count = 0
         try:
             with os.scandir(path) as entries:
                 dir_files = []
                 dir_nfos = {}
+                dir_nfo_names = {}
 
                 for entry in entries:
+                    entry_count += 1
                     try:
                         if entry.is_dir(follow_symlinks=False):
-                            scan_recursive(entry.path)
+                            if recursive:
+                                events.append(('dir', spawn(entry.path)))
+                            dir_names.append(entry.name)
                         elif entry.is_file(follow_symlinks=False):
                             ext = os.path.splitext(entry.name)[1].lower()
                             stem = os.path.splitext(entry.name)[0]
@@ -185,10 +218,11 @@ def fast_scan_directory(
                                 _NFO_MTIME_POLICY = NFO_MTIME_REFRESH
                                 mt = nfo_mtime_or_none(
                                     entry,
-                                    on_error=lambda e, entry=entry: _safe_on_skip(entry.path, e),
+                                    on_error=lambda e, entry=entry: events.append(('skip', entry.path, e)),
                                 )
                                 if mt is not None:
                                     dir_nfos[stem] = mt
+                                    dir_nfo_names[stem] = entry.name
                             elif ext in extensions:
                                 stat = entry.stat()
                                 if min_size_bytes <= 0 or ext in ZERO_SIZE_EXTENSIONS or stat.st_size >= min_size_bytes:
@@ -200,32 +234,303 @@ def fast_scan_directory(
                                     })
                     except (OSError, PermissionError) as e:
                         # entry.path 是 os.DirEntry 的純拼接屬性，通常不會拋
-                        _safe_on_skip(entry.path, e)
+                        events.append(('skip', entry.path, e))
 
                 # 只有「這層真的有影片」才去問 extrafanart/ 在不在（沒有影片的目錄
                 # 一次 syscall 都不多花）。放在 entry 迴圈**之後**：此時 dir_files 已定，
                 # 而定位方式與 scan_file() 同源，不依賴走訪順序或 entry 名稱比對。
                 if dir_files:
-                    extrafanart_image_count = _count_extrafanart_images(path)
+                    extrafanart_image_count = _count_extrafanart_images(path, events)
 
                 # 將 NFO mtime 加入對應的影片資訊
+                nfo_names = {}
                 for f in dir_files:
                     f['nfo_mtime'] = dir_nfos.get(f['stem'], 0)
+                    nfo_names[f['path']] = dir_nfo_names.get(f['stem'])
                     # 同目錄下所有影片本來就共用同一個 extrafanart/（scan_file()
                     # 也是用 video_path.parent / 'extrafanart' 算路徑，既有行為）
                     # ——均等掛給本層每部片，不是只掛給其中一部（TASK-118b-T9）。
                     f['sample_image_count'] = extrafanart_image_count
                     del f['stem']  # 不需要保留 stem
-                    results.append(f)
+                return events, dir_files, dir_names, entry_count, nfo_names
 
         except (OSError, PermissionError) as e:
-            _safe_on_skip(path, e)
+            # 已列到的子目錄照常展開；本層影片整批捨棄（同單執行緒遞迴的既有行為）
+            events.append(('skip', path, e))
+            return events, [], dir_names, entry_count, {}
+
+    def assemble(handle, resolve) -> None:
+        events, files = resolve(handle)
+        for event in events:
+            if event[0] == 'dir':
+                assemble(event[1], resolve)
+            else:
+                _safe_on_skip(event[1], event[2])
+        results.extend(files)
+
+    if workers <= 1:
+        # 單執行緒：handle 即路徑，組裝到該層時才列舉
+        def spawn_inline(p: str) -> str:
+            return p
 
-    scan_recursive(directory)
+        assemble(directory, lambda p: list_dir(p, spawn_inline))
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='fastscan') as pool:
+            def spawn(p: str) -> Future:
+                return pool.submit(list_dir, p, spawn)
+
+            assemble(spawn(directory), lambda fut: fut.result())
+
+    if index_walk is not None:
+        index_walk.save()
     logger.debug(f"[FastScan] 找到 {len(results)} 個檔案")
     return results
 
 
+# 目錄 mtime 與列舉時間太接近時不信任（racy）：同一個 mtime 刻度內稍後的變更不會
+# 再推進 mtime（FAT 2 秒、部分 SMB 1 秒），只有「列舉時 mtime 已舊於此窗口」的簽章才沿用。
+_DIR_MTIME_RACY_NS = 2_000_000_000
+
+
+def _extrafanart_mtime_ns(parent_dir: str) -> Optional[int]:
+    """`<parent_dir>/extrafanart/` 的 mtime_ns（不存在 / 不是目錄 / 讀不到 → None）。
+
+    定位方式同 _count_extrafanart_images()（Path(parent) / 'extrafanart'，跟隨 symlink）。
+    """
+    try:
+        st = os.stat(Path(parent_dir) / 'extrafanart')
+    except OSError:
+        return None
+    return st.st_mtime_ns if stat_module.S_ISDIR(st.st_mode) else None
+
+
+def _count_extrafanart_images(parent_dir: str, skips: list) -> int:
+    """數 `<parent_dir>/extrafanart/` 裡的合格劇照張數（TASK-118b-T9）。
+
+    **這裡刻意複製 scan_file() 的定位方式，而不是自己找那個目錄**：
+    `Path(parent) / 'extrafanart'` ＋ `.is_dir()` 與 scan_file()（見該函式內的
+    `extrafanart_dir = video_path.parent / 'extrafanart'`）是**逐字相同的表達式**，
+    所以「哪個目錄算數」在兩端由構造保證一致——不管底下的檔案系統大小寫敏不敏感、
+    那個目錄是不是 symlink。
+
+    走訪端曾用 `entry.name` 比對過兩版（精確 → `.lower()`），兩版都在某一類檔案系統上
+    與 scan_file() 分岔：精確比對讓大小寫不敏感的 FS（NTFS／APFS）上的 `Extrafanart`
+    走訪端數 0、DB 數 N；`.lower()` 則讓大小寫敏感的 FS（ext4）上的 `Extrafanart`
+    走訪端數 N、DB 數 0。**兩種分岔的症狀都是「每次產生都重掃該片且永遠對不上」**。
+    用同一句表達式就沒有第三種寫錯的方式。
+
+    張數本身的過濾（副檔名／隱藏檔／size>0）同樣不另抄——直接呼叫
+    `VideoScanner._iter_extrafanart_images()`，與撿取端同源。
+    """
+    extrafanart_dir = Path(parent_dir) / 'extrafanart'
+    try:
+        if not extrafanart_dir.is_dir():
+            return 0
+        return sum(1 for _ in VideoScanner._iter_extrafanart_images(extrafanart_dir))
+    except OSError as e:
+        skips.append(('skip', str(extrafanart_dir), e))
+        return 0
+
+
+class _DirIndexWalk:
+    """fast_scan_directory 單次走訪的目錄索引狀態（見 core.database.scan_index）。
+
+    lookup / replay / record 會在列舉執行緒上被呼叫：recorded 與 kept 只以不同 key
+    寫入（每個目錄只被列舉一次），unreliable_hits 只 append，皆不需額外加鎖。
+    """
+
+    def __init__(self, repo: 'ScanDirIndexRepository', state):
+        self.repo = repo
+        self.state = state
+        self.recorded: dict = {}         # 本次重新列舉、可寫回索引的目錄
+        self.kept: set = set()           # 本次沿用索引的目錄
+        self.unreliable_hits: list = []  # 驗證走訪：簽章沒變、內容卻變了的目錄
+
+    @classmethod
+    def open(cls, repo, directory: str, extensions: set, min_size_bytes: int) -> Optional['_DirIndexWalk']:
+        """讀索引；索引是純加速，讀不到 / 根目錄已判定不可靠就回 None（全量列舉）。"""
+        if repo is None:
+            return None
+        from core.database.scan_journal import scan_filter_key
+
+        # 篩選條件不同，上次記下的影片清單就不適用（load 會判定需全量重建）
+        filter_key = scan_filter_key(extensions, min_size_bytes)
+        try:
+            state = repo.load(directory, filter_key)
+        except sqlite3.Error:
+            logger.warning("[FastScan] 目錄索引讀取失敗，改為全量列舉: %s", directory, exc_info=True)
+            return None
+        return None if state.unreliable else cls(repo, state)
+
+    def lookup(self, path: str):
+        """(目錄 mtime_ns 或 None, 上次簽章或 None, 簽章是否相符)。"""
+        try:
+            dir_mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, None, False  # 交給 scandir 走既有錯誤路徑（on_skip）
+        cached = self.state.entries.get(path)
+        if cached is None or not dir_mtime_ns or dir_mtime_ns != cached.mtime_ns:
+            return dir_mtime_ns, cached, False
+        if cached.mtime_ns >= cached.listed_at_ns - _DIR_MTIME_RACY_NS:
+            return dir_mtime_ns, cached, False
+        if cached.files and _extrafanart_mtime_ns(path) != cached.extrafanart_mtime_ns:
+            return dir_mtime_ns, cached, False
+        if not self._files_unchanged(path, cached.files):
+            return dir_mtime_ns, cached, False
+        return dir_mtime_ns, cached, True
+
+    @staticmethod
+    def _files_unchanged(path: str, files: list) -> bool:
+        """逐一 stat 上次記下的影片與其 NFO，mtime / size 都與記錄相同才算沒變。
+
+        原地改寫（update_nfo_file 的 tree.write、外部工具覆寫影片）不會推進目錄 mtime，
+        只看目錄簽章會沿用舊的 nfo_mtime / mtime 直到全量驗證。每部片多 1～2 次 stat，
+        仍省下整層 scandir 與其他 entry（圖片、字幕）的 stat。
+        """
+        for f in files:
+            if 'nfo' not in f:
+                return False  # 舊版索引沒記 NFO 檔名：重新列舉一次補上
+            try:
+                st = os.stat(os.path.join(path, f['name']))
+            except OSError:
+                return False
+            if st.st_mtime != f['mtime'] or st.st_size != f['size']:
+                return False
+            if f['nfo'] is None:
+                # 上次沒有 NFO；新放進來的 NFO 會推進目錄 mtime，不必另查
+                continue
+            try:
+                nfo_mtime = os.stat(os.path.join(path, f['nfo'])).st_mtime
+            except OSError:
+                return False
+            if nfo_mtime != f['nfo_mtime']:
+                return False
+        return True
+
+    def replay(self, path: str, cached, spawn) -> Tuple[list, list]:
+        """由上次的列舉結果組出與 scandir 相同形狀的 (events, files)。"""
+        self.kept.add(path)
+        events = [('dir', spawn(os.path.join(path, name))) for name in cached.dirs]
+        files = [{
+            'path': os.path.join(path, f['name']),
+            'mtime': f['mtime'],
+            'size': f['size'],
+            'nfo_mtime': f['nfo_mtime'],
+            'sample_image_count': f['sample_image_count'],
+        } for f in cached.files]
+        return events, files
+
+    def record(self, path: str, dir_mtime_ns: int, listed_at_ns: int, entry_count: int,
+               dir_names: list, files: list, nfo_names: dict, matched=None) -> None:
+        """記下一次乾淨的列舉；matched = 簽章相符卻仍重新列舉（驗證走訪）時的舊簽章。"""
+        from core.database.scan_index import DirSignature
+
+        self.recorded[path] = DirSignature(
+            dir_mtime_ns, entry_count,
+            _extrafanart_mtime_ns(path) if files else None,
+            listed_at_ns, dir_names,
+            [{
+                'name': os.path.basename(f['path']),
+                'mtime': f['mtime'],
+                'size': f['size'],
+                'nfo_mtime': f['nfo_mtime'],
+                'nfo': nfo_names.get(f['path']),
+                'sample_image_count': f['sample_image_count'],
+            } for f in files],
+        )
+        if matched is not None and (
+            entry_count != matched.entry_count
+            or dir_names != matched.dirs
+            or [f['name'] for f in self.recorded[path].files] != [f['name'] for f in matched.files]
+        ):
+            # 新增 / 刪除 / 改名 entry 卻沒推進目錄 mtime：此檔案系統的 mtime 不可靠
+            self.unreliable_hits.append(path)
+
+    def save(self) -> None:
+        if self.unreliable_hits:
+            logger.info("[FastScan] 目錄 mtime 未反映內容變更（%d 個，如 %s）",
+                        len(self.unreliable_hits), self.unreliable_hits[0])
+        try:
+            self.repo.save(self.state, self.recorded, self.kept, unreliable=bool(self.unreliable_hits))
+        except sqlite3.Error:
+            logger.warning("[FastScan] 目錄索引寫入失敗: %s", self.state.root, exc_info=True)
+
+
+# iter_scan_files() 的 scan_file 平行度預設值（gallery.scan_file_workers）。scan_file 的
+# 成本幾乎都是 I/O 延遲（讀 NFO、找封面、列 extrafanart/），首次匯入時 NAS 往返會被
+# 逐檔串起來；執行緒即可重疊這些等待。1 = 在呼叫端執行緒逐檔執行。
+DEFAULT_SCAN_FILE_WORKERS = 4
+
+# 掃描寫入的分段大小：呼叫端每累積這麼多筆就先 upsert_batch 一次，寫入與後續
+# scan_file 交錯進行，也不必把整批 Video 留在記憶體到最後。
+SCAN_UPSERT_CHUNK = 500
+
+
+def iter_scan_files(
+    scan_file: Callable[..., 'VideoInfo'],
+    file_infos: List[dict],
+    workers: Optional[int] = None,
+    should_abort: Optional[Callable[[], bool]] = None,
+):
+    """以有界執行緒池執行 scan_file，依 file_infos 原順序逐筆產出結果
+
+    Args:
+        scan_file: 單檔掃描函式（通常是 VideoScanner.scan_file 的 bound method），
+            以 scan_file(path, None) 呼叫
+        file_infos: fast_scan_directory() 的結果（或其子集）
+        workers: 平行度（預設 DEFAULT_SCAN_FILE_WORKERS；<= 1 為逐檔同步執行）
+        should_abort: 可選中止檢查，每產出一筆之前呼叫一次；回 True 就不再掃描 /
+            送出後續檔案並結束（已在途的取消、結果捨棄）。逐檔同步時在該檔
+            scan_file 之前檢查，中止後不會多掃一檔。
+
+    Yields:
+        (file_info, VideoInfo 或 None, Exception 或 None)——順序與 file_infos 相同，
+        與執行緒完成順序無關；單檔例外不會中止其他檔案。
+
+    最多同時有 workers * 2 個檔案在途（執行中＋排隊），消費端（產生 SSE / 寫入 DB）
+    慢下來時不會無限往前跑。提前 close 這個 generator（呼叫端 break）時，尚未開始的
+    檔案會被取消，只等待已在執行中的 scan_file 結束，其結果直接捨棄。
+    """
+    workers = DEFAULT_SCAN_FILE_WORKERS if workers is None else workers
+
+    def run(file_info: dict):
+        try:
+            return scan_file(file_info['path'], None), None
+        except Exception as e:
+            return None, e
+
+    def aborted() -> bool:
+        return should_abort is not None and should_abort()
+
+    if workers <= 1:
+        for file_info in file_infos:
+            if aborted():
+                return
+            yield (file_info, *run(file_info))
+        return
+
+    window = workers * 2
+    pending: list = []
+    remaining = iter(file_infos)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='scanfile') as pool:
+        try:
+            for file_info in remaining:
+                pending.append((file_info, pool.submit(run, file_info)))
+                if len(pending) >= window:
+                    break
+            while pending:
+                if aborted():
+                    return
+                file_info, fut = pending.pop(0)
+                nxt = next(remaining, None)
+                if nxt is not None:
+                    pending.append((nxt, pool.submit(run, nxt)))
+                yield (file_info, *fut.result())
+        finally:
+            for _, fut in pending:
+                fut.cancel()
+
+
 class VideoScanner:
     """影片掃描器"""
 
@@ -280,6 +585,8 @@ class VideoScanner:
         self.prefix_mapping = load_prefix_mapping()
         self.name_mapping = load_name_mapping()
         # key: dir path str → (sorted videos list, sorted images list)
+        # iter_scan_files 會在多條執行緒上呼叫 scan_file：同一目錄偶爾被重複列舉一次
+        # 無妨（結果相同、後寫覆蓋），不加鎖。
         self._dir_scan_cache: Dict[str, Tuple[List[str], List[str]]] = {}
 
     def normalize_maker(self, num: str, maker: str) -> str:
@@ -675,7 +982,8 @@ class VideoScanner:
     def scan_to_sqlite(self, directory: str, db_path: 'Path' = None,
                        min_size_mb: int = 0,
                        progress_callback: callable = None,
-                       video_extensions: set = None) -> dict:
+                       video_extensions: set = None,
+                       scan_file_workers: int = None) -> dict:
         """掃描目錄並寫入 SQLite
 
         Args:
@@ -684,11 +992,12 @@ class VideoScanner:
             min_size_mb: 最小檔案大小 (MB)
             progress_callback: 進度回調函數，簽名: (current, total, filename) -> None
             video_extensions: 影片副檔名集合（預設使用 VIDEO_EXTENSIONS）
+            scan_file_workers: scan_file 平行度（見 iter_scan_files；預設 DEFAULT_SCAN_FILE_WORKERS）
 
         Returns:
             dict: {'inserted': int, 'updated': int, 'deleted': int, 'total': int}
         """
-        from core.database import VideoRepository, Video, init_db, get_db_path
+        from core.database import VideoRepository, Video, init_db, get_db_path, ScanDirIndexRepository
 
         directory = Path(directory)
         if not directory.exists():
@@ -705,7 +1014,9 @@ class VideoScanner:
 
         # 步驟 1: 快速掃描檔案取得 mtime
         logger.info("[*] 快速掃描目錄中...")
-        file_infos = fast_scan_directory(str(directory), extensions, min_size_bytes)
+        file_infos = fast_scan_directory(
+            str(directory), extensions, min_size_bytes, dir_index=ScanDirIndexRepository(db_path)
+        )
         logger.info(f"[*] 找到 {len(file_infos)} 個影片檔案")
 
         # 步驟 2: 從 SQLite 取得現有 mtime 索引
@@ -745,11 +1056,14 @@ class VideoScanner:
         if deleted_count > 0:
             logger.info(f"[*] 清理 {deleted_count} 個已刪除檔案")
 
-        # 步驟 5: 掃描並寫入
+        # 步驟 5: 掃描並寫入（scan_file 在執行緒池上跑，結果依原順序回來、分段寫入）
         videos_to_upsert = []
         total_needs_scan = len(needs_scan)
+        inserted = updated = 0
 
-        for i, file_info in enumerate(needs_scan, 1):
+        for i, (file_info, video_info, error) in enumerate(
+            iter_scan_files(self.scan_file, needs_scan, scan_file_workers), 1
+        ):
             video_name = os.path.basename(file_info['path'])
 
             # 回報進度
@@ -759,7 +1073,8 @@ class VideoScanner:
             logger.info(f"[{i}/{total_needs_scan}] 處理: {video_name}")
 
             try:
-                video_info = self.scan_file(file_info['path'], None)
+                if error is not None:
+                    raise error
                 video = Video.from_video_info(video_info)
                 video.mtime = file_info['mtime']
                 video.nfo_mtime = file_info.get('nfo_mtime', 0)
@@ -767,8 +1082,16 @@ class VideoScanner:
             except Exception as e:
                 logger.warning(f"  [!] 錯誤: {e}")
 
-        # 批次寫入
-        inserted, updated = repo.upsert_batch(videos_to_upsert)
+            if len(videos_to_upsert) >= SCAN_UPSERT_CHUNK:
+                chunk_inserted, chunk_updated = repo.upsert_batch(videos_to_upsert)
+                inserted += chunk_inserted
+                updated += chunk_updated
+                videos_to_upsert = []
+
+        # 批次寫入（剩餘不足一段的部分）
+        chunk_inserted, chunk_updated = repo.upsert_batch(videos_to_upsert)
+        inserted += chunk_inserted
+        updated += chunk_updated
         logger.info(f"[*] 完成: 新增 {inserted}, 更新 {updated}, 刪除 {deleted_count}")
 
         # 掃描 focal trigger（TASK-98b-T2 / Codex PR#105 P2）：與 web/routers/scanner.py
@@ -0,0 +1,506 @@
+"""core.gallery_watcher — gallery 資料夾即時監看（opt-in：gallery.watch_enabled）。
+
+片庫要保持新鮮原本只能按「生成」（/api/gallery/generate），每次都整批列舉全部來源。
+這裡在背景監看非唯讀的 gallery 來源，把變動收斂成「哪些資料夾髒了」，再只對那些
+資料夾做與 generate 相同的比對（mtime / nfo_mtime / 劇照張數），套用成精準的
+scan_file + upsert_batch / repath_path_only / delete_by_paths：
+
+- 事件來源：本機路徑用 watchfiles（inotify / FSEvents / ReadDirectoryChangesW，隨
+  uvicorn[standard] 安裝）；網路掛載（UNC、NFS / SMB mount、Windows 網路磁碟機）
+  收不到遠端變更的通知，改為每 `gallery.watch_poll_interval_s` 用 fast_scan_directory
+  輪詢（有 scan_dir_index 時只 stat 目錄，未變動的子樹不列舉）。watchfiles 不可用時
+  一律輪詢。
+- debounce：事件按資料夾合併（同一資料夾多次變動只同步一次），整個 watcher 安靜
+  `WATCH_DEBOUNCE_S` 秒後一起套用——同一批裡的刪除 ＋ 新增可配成搬移（size ＋ mtime
+  相同），走 repath_path_only 保留評分 / 標籤 / 焦點；最久等 `WATCH_MAX_DELAY_S`。
+- 快取：寫入都經 VideoRepository，SimilarRankerCache 由各寫入方法 invalidate，
+  Showcase payload 快取與唯讀快照以 library_generation 判定新鮮度，不需另外通知；
+  被刪除 / 搬走的片另外清掉縮圖快取（同 generate 的 prune）。
+- 與 generate 互斥：有 generate 在跑時延後套用；套用期間在 core.generate_state 佔住
+  watch sync token，新的 generate 會等它套用完才開始，外部管理器切換也會被擋。
+  靜態 HTML 輸出仍只在 generate 時產生。
+
+唯讀來源（readonly）由 readonly_producer 管理，不在監看範圍。
+"""
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core.config import iter_gallery_sources, load_config
+from core.gallery_scanner import (
+    IMAGE_EXTENSIONS,
+    SCAN_UPSERT_CHUNK,
+    VideoScanner,
+    fast_scan_directory,
+    iter_scan_files,
+)
+from core.generate_state import end_watch_sync, try_begin_watch_sync
+from core.logger import get_logger
+from core.path_utils import to_file_uri, uri_to_fs_path
+from core.video_extensions import get_video_extensions
+
+try:
+    import watchfiles
+except ImportError:  # uvicorn[standard] 未安裝時退回輪詢
+    watchfiles = None
+
+logger = get_logger(__name__)
+
+WATCH_DEBOUNCE_S = 2.0
+WATCH_MAX_DELAY_S = 30.0
+WATCH_POLL_INTERVAL_S = 60.0
+_TICK_S = 0.5
+
+# /proc/mounts 的檔案系統類型：遠端變更不會觸發本機 inotify
+_NETWORK_FS_TYPES = frozenset({
+    'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'afs', 'ceph', 'glusterfs',
+    'fuse.sshfs', 'fuse.rclone', 'davfs', 'fuse.davfs2',
+})
+
+_SYNC_COLUMNS = ('path', 'mtime', 'nfo_mtime', 'size_bytes', 'sample_images')
+
+
+def is_network_path(path: str) -> bool:
+    """path 是否位於網路掛載上（判斷失敗時當作本機）。"""
+    if path.startswith(('\\\\', '//')):
+        return True
+    if os.name == 'nt':
+        drive = os.path.splitdrive(os.path.abspath(path))[0]
+        if not drive:
+            return False
+        try:
+            import ctypes
+            return ctypes.windll.kernel32.GetDriveTypeW(drive + '\\') == 4  # DRIVE_REMOTE
+        except (AttributeError, OSError):
+            return False
+    try:
+        with open('/proc/mounts', encoding='utf-8') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) >= 3]
+    except OSError:
+        return False
+    real = os.path.realpath(path)
+    best, fstype = '', ''
+    for mount_point, kind in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        if (real == mount_point or real.startswith(mount_point.rstrip('/') + '/')) and len(mount_point) > len(best):
+            best, fstype = mount_point, kind
+    return fstype in _NETWORK_FS_TYPES
+
+
+def folders_for_change(path: str, deleted: bool, extensions: set) -> List[Tuple[str, bool]]:
+    """把單一路徑變動轉成要同步的資料夾：[(資料夾, deep)]。
+
+    deep=False 只同步資料夾本身這一層的影片；deep=True 連子目錄（新搬入 / 刪除的
+    整個目錄）。與 scan 結果無關的檔案（字幕、暫存檔……）回傳空 list。
+    """
+    parent, name = os.path.split(path)
+    ext = os.path.splitext(name)[1].lower()
+    if os.path.basename(parent) == 'extrafanart':
+        # 劇照張數掛在影片所在資料夾（見 fast_scan_directory 的 sample_image_count）
+        return [(os.path.dirname(parent), False)] if ext in IMAGE_EXTENSIONS else []
+    if name == 'extrafanart':
+        return [(parent, False)]
+    if ext in extensions or ext == '.nfo':
+        return [(parent, False)]
+    if not deleted and os.path.isdir(path):
+        return [(path, True)]
+    if deleted and ext not in IMAGE_EXTENSIONS:
+        # 已刪除的路徑無從判斷是不是目錄：當作目錄，底下（若有）的列一起清掉
+        return [(path, True)]
+    return []
+
+
+def _collapse(folders: Dict[str, bool]) -> Dict[str, bool]:
+    """去掉已被某個 deep 祖先資料夾涵蓋的項目。"""
+    deep_roots = sorted(f for f, deep in folders.items() if deep)
+    out = {}
+    for folder, deep in folders.items():
+        if any(folder != d and folder.startswith(d.rstrip(os.sep) + os.sep) for d in deep_roots):
+            continue
+        out[folder] = deep
+    return out
+
+
+def _parent_uri(uri: str) -> str:
+    return uri.rsplit('/', 1)[0]
+
+
+class PendingFolders:
+    """待同步資料夾的 debounce 佇列（執行緒安全）。"""
+
+    def __init__(self, debounce_s: float = WATCH_DEBOUNCE_S, max_delay_s: float = WATCH_MAX_DELAY_S):
+        self.debounce_s = debounce_s
+        self.max_delay_s = max_delay_s
+        self._lock = threading.Lock()
+        self._folders: Dict[str, bool] = {}
+        self._first_at: Optional[float] = None
+        self._last_at: Optional[float] = None
+
+    def add(self, folders: Iterable[Tuple[str, bool]], now: float = None) -> None:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for folder, deep in folders:
+                self._folders[folder] = self._folders.get(folder, False) or deep
+                if self._first_at is None:
+                    self._first_at = now
+                self._last_at = now
+
+    def take_due(self, now: float = None) -> Dict[str, bool]:
+        """安靜滿 debounce_s、或最早一筆已等滿 max_delay_s 時取出全部；否則回空 dict。"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if not self._folders:
+                return {}
+            if now - self._last_at < self.debounce_s and now - self._first_at < self.max_delay_s:
+                return {}
+            folders, self._folders = self._folders, {}
+            self._first_at = self._last_at = None
+            return folders
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._folders)
+
+
+class GallerySync:
+    """對一批髒資料夾套用增量同步（一批用一個新的 VideoScanner，目錄快取不跨批）。"""
+
+    def __init__(self, config: dict, roots: List[str], db_path=None):
+        from core.database import VideoRepository
+
+        gallery = config.get('gallery', {})
+        self.path_mappings = gallery.get('path_mappings', {})
+        self.extensions = get_video_extensions(config)
+        self.min_size_bytes = (gallery.get('min_size_mb') or 0) * 1024 * 1024
+        self.scan_workers = gallery.get('scan_workers')
+        self.scan_file_workers = gallery.get('scan_file_workers')
+        self.roots = roots
+        self.repo = VideoRepository(db_path)
+
+    def _root_reachable(self, folder: str) -> bool:
+        for root in self.roots:
+            if folder == root or folder.startswith(root.rstrip(os.sep) + os.sep):
+                return os.path.isdir(root)
+        return False
+
+    def sync(self, folders: Dict[str, bool]) -> dict:
+        """同步 folders（{資料夾: deep}），回傳 {'scanned', 'moved', 'deleted', 'skipped_folders'}。"""
+        from core import thumbnail_cache
+        from core.database import Video
+
+        listed: Dict[str, dict] = {}
+        db_rows: Dict[str, tuple] = {}
+        protected: set = set()
+        skipped_folders = 0
+
+        for folder, deep in _collapse(folders).items():
+            if os.path.isdir(folder):
+                skipped: list = []
+                infos = fast_scan_directory(
+                    folder, self.extensions, self.min_size_bytes,
+                    on_skip=lambda p, _e: skipped.append(p),  # noqa: B023 — consumed synchronously
+                    workers=self.scan_workers, recursive=deep,
+                )
+            elif self._root_reachable(folder):
+                infos, skipped = [], []  # 來源在線、資料夾不見了 → 底下的列都要清掉
+            else:
+                skipped_folders += 1  # 來源離線：不推論刪除，等下次事件 / generate
+                continue
+
+            folder_uri = to_file_uri(folder, self.path_mappings)
+            rows = [
+                r for r in self.repo.iter_rows(_SYNC_COLUMNS, scope_uris=[folder_uri])
+                if deep or _parent_uri(r.path) == folder_uri
+            ]
+            db_rows.update((r.path, r) for r in rows)
+            if skipped:
+                # 列舉不完整（權限 / 長路徑）：只做新增與更新，不推論刪除（同 generate）
+                protected.update(r.path for r in rows)
+            for info in infos:
+                listed[to_file_uri(info['path'], self.path_mappings)] = info
+
+        to_scan = []
+        new_uris = []
+        for uri, info in listed.items():
+            row = db_rows.get(uri)
+            if row is None:
+                new_uris.append(uri)
+                to_scan.append(info)
+            elif (
+                row.mtime != info['mtime']
+                or row.nfo_mtime != info.get('nfo_mtime', 0)
+                or len(row.sample_images) != info.get('sample_image_count', 0)
+            ):
+                to_scan.append(info)
+
+        gone = {uri: row for uri, row in db_rows.items() if uri not in listed and uri not in protected}
+
+        # 同一批內「消失 ＋ 出現」且 size / mtime 相同 → 搬移：先改 path 保留使用者資料，
+        # 之後照常 scan_file 重寫封面 / 劇照等路徑欄位
+        by_signature: Dict[tuple, List[str]] = {}
+        for uri, row in gone.items():
+            by_signature.setdefault((row.mtime, row.size_bytes), []).append(uri)
+        moved = 0
+        for uri in new_uris:
+            info = listed[uri]
+            candidates = by_signature.get((info['mtime'], info['size']))
+            if candidates and len(candidates) == 1:
+                old_uri = candidates.pop()
+                if self.repo.repath_path_only(old_uri, uri):
+                    del gone[old_uri]
+                    thumbnail_cache.invalidate(old_uri)
+                    moved += 1
+
+        deleted = self.repo.delete_by_paths(list(gone))
+        for uri in gone:
+            thumbnail_cache.invalidate(uri)
+
+        scanner = VideoScanner(path_mappings=self.path_mappings)
+        batch: list = []
+        upserted: List[str] = []
+        for info, video_info, error in iter_scan_files(scanner.scan_file, to_scan, self.scan_file_workers):
+            if error is not None:
+                logger.warning("[Watch] 掃描失敗: %s (%s)", info['path'], error)
+                continue
+            video = Video.from_video_info(video_info)
+            video.mtime = info['mtime']
+            video.nfo_mtime = info.get('nfo_mtime', 0)
+            batch.append(video)
+            if len(batch) >= SCAN_UPSERT_CHUNK:
+                self.repo.upsert_batch(batch)
+                upserted.extend(v.path for v in batch)
+                batch = []
+        if batch:
+            self.repo.upsert_batch(batch)
+            upserted.extend(v.path for v in batch)
+
+        self._submit_focal(upserted)
+        return {
+            'scanned': len(upserted),
+            'moved': moved,
+            'deleted': deleted,
+            'skipped_folders': skipped_folders,
+        }
+
+    def _submit_focal(self, paths: List[str]) -> None:
+        """新寫入的無碼片排自動焦點偵測（同 scan_to_sqlite；純副作用，失敗不影響同步）。"""
+        if not paths:
+            return
+        from core.focal import requires_face_detection
+        from core.focal_trigger import maybe_submit_video_focal
+        from core.path_utils import uri_to_local_fs_path
+
+        try:
+            for c_path, c_number, c_maker, c_cover_path in self.repo.get_empty_focal_candidates(paths):
+                if requires_face_detection(c_number, c_maker):
+                    cover_fs = uri_to_local_fs_path(c_cover_path, self.path_mappings)
+                    maybe_submit_video_focal(c_number, c_maker, c_path, cover_fs,
+                                             db_path=self.repo.db_path, cover_path_uri=c_cover_path)
+        except Exception:
+            logger.warning("[Watch] focal trigger 排程失敗（不影響同步結果）", exc_info=True)
+
+
+class GalleryWatcher:
+    """背景監看執行緒：依 config 決定監看哪些來源、用哪種方式，並套用 debounce 後的同步。
+
+    start() 後每 _TICK_S 檢查一次 config（load_config 有 stat 快取），所以開關、來源、
+    模式在設定頁修改後不需重啟就會生效。
+    """
+
+    def __init__(self, db_path=None):
+        self._db_path = db_path
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending = PendingFolders()
+        self._native_thread: Optional[threading.Thread] = None
+        self._native_stop: Optional[threading.Event] = None
+        self._native_roots: Tuple[str, ...] = ()
+        self._poll_state: Dict[str, Dict[str, tuple]] = {}
+        self._next_poll = 0.0
+        self._config: dict = {}
+        self._backends: Dict[str, str] = {}
+        self._last_sync: Optional[dict] = None
+        self._last_error: Optional[str] = None
+
+    # ── 生命週期 ────────────────────────────────────────────────────────────
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='gallery-watch', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._stop_native()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                self._last_error = str(e)
+                logger.warning("[Watch] 監看迴圈發生錯誤", exc_info=True)
+            self._stop.wait(_TICK_S)
+        self._stop_native()
+
+    def tick(self, now: float = None) -> None:
+        """一輪：對齊 config → 到期就輪詢 → 套用到期的髒資料夾。"""
+        now = time.monotonic() if now is None else now
+        self._config = load_config()
+        gallery = self._config.get('gallery', {})
+        self._pending.debounce_s = float(gallery.get('watch_debounce_s', WATCH_DEBOUNCE_S))
+        if not gallery.get('watch_enabled', False):
+            self._backends = {}
+            self._poll_state.clear()
+            self._stop_native()
+            return
+
+        self._backends = self._choose_backends(gallery)
+        native = tuple(sorted(r for r, kind in self._backends.items() if kind == 'native'))
+        if native != self._native_roots:
+            self._stop_native()
+            if native:
+                self._start_native(native)
+
+        polled = [r for r, kind in self._backends.items() if kind == 'poll']
+        for root in list(self._poll_state):
+            if root not in polled:
+                del self._poll_state[root]
+        if polled and now >= self._next_poll:
+            self._next_poll = now + float(gallery.get('watch_poll_interval_s', WATCH_POLL_INTERVAL_S))
+            for root in polled:
+                self._poll(root)
+
+        self._flush(now)
+
+    def _choose_backends(self, gallery: dict) -> Dict[str, str]:
+        mode = gallery.get('watch_mode', 'auto')
+        backends = {}
+        for src in iter_gallery_sources(gallery):
+            if src.readonly:
+                continue
+            try:
+                root = uri_to_fs_path(src.path)  # uri-no-reverse: native config path (DirectoryConfig.path)
+            except ValueError:
+                continue
+            if not os.path.isdir(root):
+                continue
+            if watchfiles is None or mode == 'poll':
+                backends[root] = 'poll'
+            elif mode == 'native':
+                backends[root] = 'native'
+            else:
+                previous = self._backends.get(root)
+                backends[root] = previous or ('poll' if is_network_path(root) else 'native')
+        return backends
+
+    # ── 事件來源 ────────────────────────────────────────────────────────────
+
+    def _start_native(self, roots: Tuple[str, ...]) -> None:
+        stop = threading.Event()
+        extensions = get_video_extensions(self._config)
+
+        def run():
+            try:
+                for changes in watchfiles.watch(*roots, stop_event=stop, debounce=200, raise_interrupt=False):
+                    folders = []
+                    for change, path in changes:
+                        folders.extend(folders_for_change(path, change == watchfiles.Change.deleted, extensions))
+                    self._pending.add(folders)
+            except Exception as e:
+                # 例如 inotify watch 上限用盡：改輪詢這些來源
+                self._last_error = str(e)
+                logger.warning("[Watch] 原生監看失敗，改為輪詢: %s", roots, exc_info=True)
+                for root in roots:
+                    self._backends[root] = 'poll'
+
+        self._native_stop = stop
+        self._native_roots = roots
+        self._native_thread = threading.Thread(target=run, name='gallery-watch-native', daemon=True)
+        self._native_thread.start()
+        logger.info("[Watch] 原生監看: %s", ', '.join(roots))
+
+    def _stop_native(self) -> None:
+        if self._native_stop is not None:
+            self._native_stop.set()
+        if self._native_thread is not None:
+            self._native_thread.join(5.0)
+        self._native_thread = self._native_stop = None
+        self._native_roots = ()
+
+    def _poll(self, root: str) -> None:
+        """列舉 root，與上一輪比對，把有變動的檔案所在資料夾標成髒（第一輪只建立基準）。"""
+        from core.database import ScanDirIndexRepository
+
+        gallery = self._config.get('gallery', {})
+        skipped: list = []
+        infos = fast_scan_directory(
+            root, get_video_extensions(self._config), (gallery.get('min_size_mb') or 0) * 1024 * 1024,
+            on_skip=lambda p, _e: skipped.append(p),
+            workers=gallery.get('scan_workers'),
+            dir_index=ScanDirIndexRepository(self._db_path) if gallery.get('scan_dir_index', True) else None,
+        )
+        current = {
+            info['path']: (info['mtime'], info['size'], info.get('nfo_mtime', 0), info.get('sample_image_count', 0))
+            for info in infos
+        }
+        previous = self._poll_state.get(root)
+        if previous is not None:
+            changed = [p for p, sig in current.items() if previous.get(p) != sig]
+            removed = [p for p in previous if p not in current]
+            if skipped:
+                # 列舉不完整：消失的檔案可能只是這輪讀不到，保留在基準裡、不回報
+                current.update((p, previous[p]) for p in removed)
+                removed = []
+            self._pending.add((os.path.dirname(p), False) for p in changed + removed)
+        self._poll_state[root] = current
+
+    # ── 套用 ────────────────────────────────────────────────────────────────
+
+    def _flush(self, now: float) -> None:
+        folders = self._pending.take_due(now)
+        if not folders:
+            return
+        token = object()
+        if not try_begin_watch_sync(token):
+            self._pending.add(folders.items(), now)  # generate / 模式切換進行中：稍後再套用
+            return
+        try:
+            started = time.monotonic()
+            result = GallerySync(self._config, list(self._backends), self._db_path).sync(folders)
+            result['folders'] = len(folders)
+            result['duration_ms'] = round((time.monotonic() - started) * 1000, 1)
+            result['at'] = time.time()
+            self._last_sync = result
+            logger.info("[Watch] 同步 %d 個資料夾: %s", len(folders), result)
+        except Exception:
+            # 已從佇列取出：放回去下一輪重試，否則這批變更要等下次有人再動該資料夾
+            # 才會進 DB。錯誤交給 _run 記進 last_error。
+            self._pending.add(folders.items(), now)
+            raise
+        finally:
+            end_watch_sync(token)
+
+    # ── 回報 ────────────────────────────────────────────────────────────────
+
+    def status(self) -> dict:
+        """目前監看狀態（供 /api/diagnostics）。"""
+        return {
+            "enabled": bool(self._config.get('gallery', {}).get('watch_enabled', False)),
+            "running": self._thread is not None and self._thread.is_alive(),
+            "native_available": watchfiles is not None,
+            "sources": dict(self._backends),
+            "pending_folders": len(self._pending),
+            "last_sync": dict(self._last_sync) if self._last_sync else None,
+            "last_error": self._last_error,
+        }
+
+
+# process-wide 實例（預設 DB 路徑）；web lifespan 啟停，/api/diagnostics 讀狀態
+gallery_watcher = GalleryWatcher()
@@ -39,6 +39,11 @@ _switch_active = False  # True while switch_external_manager is mid-purge (PR #9
 # save's `end_config_save(token)` only discards ITS token — it can't clear a second save's
 # still-open window (the bool version let that happen → switch slipped in → race reopened).
 _config_save_tokens: set = set()
+# Tokens of in-flight folder-watcher syncs (core.gallery_watcher). Each is ALSO in
+# `_active_tokens` (a watcher sync writes the same rows a generate does, so switch / config
+# guards treat it as a generate); this set only lets a new generate tell "a watcher sync
+# holds the DB" apart from "another generate is running" (the latter is allowed).
+_watch_sync_tokens: set = set()
 
 
 def mark_generate_active(token) -> None:
@@ -52,18 +57,48 @@ def mark_generate_active(token) -> None:
 
 
 def try_mark_generate_active(token) -> bool:
-    """Atomically register a generate UNLESS a switch is currently in progress.
+    """Atomically register a generate UNLESS a switch or a watcher sync is in progress.
 
     Returns False (caller must refuse to start) when `switch_external_manager` holds
-    the window — prevents the producer re-inserting rows the switch is purging (P1).
+    the window — prevents the producer re-inserting rows the switch is purging (P1) —
+    or while a folder-watcher sync is mid-`delete_by_paths`/`upsert_batch` on the same
+    rows (the caller may wait for `is_watch_sync_in_progress()` to clear and retry).
     """
     with _lock:
-        if _switch_active:
+        if _switch_active or _watch_sync_tokens:
+            return False
+        _active_tokens.add(token)
+        return True
+
+
+def try_begin_watch_sync(token) -> bool:
+    """Atomically register a folder-watcher sync UNLESS a generate or a switch is in-flight.
+
+    Check-and-register under one `_lock` acquisition: a separate `is_generate_in_progress()`
+    pre-check would let a generate register in between and run alongside the sync. Returns
+    False when the sync must be deferred; on True the caller must `end_watch_sync(token)`.
+    """
+    with _lock:
+        if _switch_active or _active_tokens:
             return False
         _active_tokens.add(token)
+        _watch_sync_tokens.add(token)
         return True
 
 
+def end_watch_sync(token) -> None:
+    """Release a watcher sync (idempotent; call from the sync's `finally`)."""
+    with _lock:
+        _active_tokens.discard(token)
+        _watch_sync_tokens.discard(token)
+
+
+def is_watch_sync_in_progress() -> bool:
+    """True while a folder-watcher sync holds the DB (a new generate must wait)."""
+    with _lock:
+        return bool(_watch_sync_tokens)
+
+
 def try_begin_switch():
     """Atomically begin a switch UNLESS a generate, another switch, OR a full-config
     save is in-flight.
@@ -517,6 +517,21 @@ def is_path_under_dir(path: str, dir_uri: str) -> bool:
     return path.startswith(prefix)
 
 
+def path_scope_key(uri: str) -> str:
+    """
+    is_path_under_dir 的可索引版本：把 file:/// URI 正規化成可直接做字串前綴比對的鍵。
+
+    Windows-style URI → NFC + casefold（與 is_path_under_dir 同序）；POSIX URI 原樣。
+    同風格的 path / dir 之間：
+    ``is_path_under_dir(p, d)`` ⇔ ``key(p) == key(d)`` 或 ``key(p)`` 以 ``key(d)`` + '/' 開頭
+    （d 已以 '/' 結尾時不再補）。videos.path_key 存的就是本函式結果，DB 端 scope 查詢
+    因此可以走索引範圍掃描，不用逐列呼叫 is_path_under_dir。
+    """
+    if _is_windows_style_uri(uri):
+        return unicodedata.normalize('NFC', uri).casefold()
+    return uri
+
+
 def is_fs_path_under_dir(fs_path: str, root_fs_path: str) -> bool:
     """
     判斷原生 FS path 是否在指定根目錄底下（CD-110b-4 五步鏈）。
@@ -35,7 +35,7 @@ from core import thumbnail_cache
 from core.config import STEM_IMAGE_MODES, iter_gallery_sources, normalize_external_manager
 from core.cover_attributes import effective_tags
 from core.cover_layout import nfo_image_flag, resolve_cover_target, same_target_verdict
-from core.database import Video, get_db_path
+from core.database import Video, get_db_path, scan_filter_key
 from core.enrich_contract import (
     EnrichResult,
     apply_cover_preserve,
@@ -129,6 +129,7 @@ def _min_size_bytes(gallery_config: dict) -> int:
 def _list_source_videos(
     source_path: str, extensions: set, min_size_bytes: int,
     on_skip: Optional[Callable[[str, Exception], None]] = None,
+    workers: Optional[int] = None,
 ) -> list[dict]:
     """List video files under source_path. Delegates to fast_scan_directory (CD-88b-1).
 
@@ -142,9 +143,12 @@ def _list_source_videos(
 
     on_skip (TASK-89b-T5): forwarded verbatim to fast_scan_directory — invoked
     (path, exception) for entries/subdirectories dropped due to OSError/PermissionError.
+
+    workers: directory-listing parallelism (gallery.scan_workers), forwarded verbatim;
+    None → fast_scan_directory's default. Output order and on_skip order do not depend on it.
     """
     fs_dir = uri_to_fs_path(source_path)  # uri-no-reverse: native config path (DirectoryConfig.path), no DB-mapped namespace
-    return fast_scan_directory(fs_dir, extensions, min_size_bytes, on_skip=on_skip)
+    return fast_scan_directory(fs_dir, extensions, min_size_bytes, on_skip=on_skip, workers=workers)
 
 
 def _should_skip(source_uri: str, attempted_index: dict, force: bool = False) -> bool:
@@ -408,6 +412,8 @@ def _build_basename(format_data: dict, source_fs_path: str, config: dict) -> str
 # reconstruction model.
 # ---------------------------------------------------------------------------
 
+_JOURNAL_ADVANCE_EVERY = 20  # scan-journal cursor write interval (files); resume re-checks at most this many
+
 _MAX_INCREMENT = 1000  # guard against a theoretical infinite loop (TASK-89a-T3)
 
 
@@ -2029,7 +2035,30 @@ def _emit(on_progress, result, source_uri, status, movie_dir="", number="", erro
         on_progress(outcome)
 
 
-def produce_source(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force: bool = False, reachable: bool = True, strm_mappings_getter=None) -> ProduceResult:
+def _load_or_list_source(source, config, result: ProduceResult, journal, resume: bool):
+    """Return (files, resumed journal entry or None) for produce_source.
+
+    resume=True with a matching journal entry replays its listing and skipped paths; otherwise
+    the source is listed afresh and, when a journal is given, a new entry is begun.
+    """
+    gallery = config.get("gallery", {})
+    extensions, min_size_bytes = get_video_extensions(config), _min_size_bytes(gallery)
+    filter_key = scan_filter_key(extensions, min_size_bytes)
+    resumed = journal.load("readonly", source.path, filter_key) if journal is not None and resume else None
+    if resumed is not None:
+        result.skipped_paths.extend(resumed.skipped_paths)
+        return resumed.files, resumed
+    files = _list_source_videos(
+        source.path, extensions, min_size_bytes,
+        on_skip=lambda p, _e: result.skipped_paths.append(p),
+        workers=gallery.get("scan_workers"),
+    )
+    if journal is not None and files:
+        journal.begin("readonly", source.path, filter_key, files, result.skipped_paths, len(files))
+    return files, None
+
+
+def produce_source(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force: bool = False, reachable: bool = True, strm_mappings_getter=None, journal=None, resume: bool = False) -> ProduceResult:
     """Orchestrate per-source readonly generation: guard → list → skip → scrape → write → upsert.
 
     Pure service layer. NO FastAPI, NO SSE, NO router. (CD-88b-8, §1.1)
@@ -2045,6 +2074,13 @@ def produce_source(source, config, repo, *, proxy_url="", on_progress=None, shou
     never self-healing). None (default) → the frozen config mapping is used, so every existing
     caller/test is behaviourally unchanged and no config re-read happens. Only consulted for
     media-server flavours (off writes no strm).
+
+    journal / resume: optional ScanJournalRepository (core.database.scan_journal). When given, the
+    listing and a per-file cursor are persisted under kind 'readonly' / root source.path and the
+    entry is deleted once the loop runs to completion; an interrupted run leaves it behind. With
+    resume=True a matching entry replaces the directory listing, files before the cursor are
+    counted as skipped, files that vanished since are ignored, and prune is skipped (the listing
+    is stale, so it cannot prove a deletion). None (default) → no journal I/O at all.
     """
     result = ProduceResult(source_path=source.path, output_path=source.output_path or "")
 
@@ -2077,17 +2113,25 @@ def produce_source(source, config, repo, *, proxy_url="", on_progress=None, shou
     attempted_index = repo.get_attempted_index()
     allocated_this_run: set = set()
 
-    files = _list_source_videos(
-        source.path, get_video_extensions(config), _min_size_bytes(gallery),
-        on_skip=lambda p, _e: result.skipped_paths.append(p),  # noqa: B023 — result consumed synchronously, same call stack
-    )
+    files, resumed = _load_or_list_source(source, config, result, journal, resume)
+    resume_cursor = resumed.processed if resumed is not None else 0
 
-    for fi in files:
+    for idx, fi in enumerate(files):
         if should_abort is not None and should_abort():
             break
 
+        # Cursor = files fully handled so far. Each file's DB write already committed before
+        # the next iteration starts, so recording idx here never claims unfinished work.
+        if journal is not None and idx and idx % _JOURNAL_ADVANCE_EVERY == 0:
+            journal.advance("readonly", source.path, idx)
+
         src_uri = to_file_uri(fi["path"], path_mappings)
 
+        if idx < resume_cursor or (resumed is not None and not os.path.exists(fi["path"])):
+            result.skipped += 1
+            _emit(on_progress, result, src_uri, "skipped")
+            continue
+
         if _should_skip(src_uri, attempted_index, force):
             result.skipped += 1
             _emit(on_progress, result, src_uri, "skipped")
@@ -2141,6 +2185,9 @@ def produce_source(source, config, repo, *, proxy_url="", on_progress=None, shou
             # (repo error policy) so raw exception text (paths, errno) never leaks.
             logger.exception("[readonly_producer] 生成失敗: %s", src_uri)
             _emit(on_progress, result, src_uri, "failed", number=number, error="生成失敗")
+    else:
+        if journal is not None:
+            journal.finish("readonly", source.path)
 
     # TASK-99b-T1 (CD-99b-1/2/7/8, spec §3.10)：post-loop bulk focal pass。落在
     # per-file 迴圈之後——此時本次產出的產物封面已落盤，提前呼叫會讓
@@ -2179,17 +2226,18 @@ def produce_source(source, config, repo, *, proxy_url="", on_progress=None, shou
             logger.warning("[readonly_producer] focal trigger 批次排程失敗（不影響生成結果）", exc_info=True)
 
     # TASK-89b-T6 (CD-89b-6): DB-row-only prune. Gate = reachable AND this-run
-    # list non-empty AND no skipped_paths. reachable is implicitly True here —
-    # the "unreachable" guard above already returned before this point, so any
-    # execution path reaching here has aborted_reason == "" (empty).
-    if files and not result.skipped_paths:
+    # list non-empty AND no skipped_paths AND not a journal resume (stale listing).
+    # reachable is implicitly True here — the "unreachable" guard above already
+    # returned before this point, so any execution path reaching here has
+    # aborted_reason == "" (empty).
+    if files and not result.skipped_paths and resumed is None:
         source_root_fs = uri_to_fs_path(source.path)  # uri-no-reverse: native config path (SourceConfig.path), comparison-only
         source_root_uri = to_file_uri(source_root_fs, path_mappings)
         this_run_uris = {to_file_uri(fi["path"], path_mappings) for fi in files}
         candidates = [
-            v.path for v in repo.get_all()
-            if is_path_under_dir(v.path, source_root_uri)
-            and (v.scrape_attempted_at > 0 or v.output_dir)
+            v.path for v in repo.iter_rows(
+                ('path', 'scrape_attempted_at', 'output_dir'), scope_uris=[source_root_uri])
+            if (v.scrape_attempted_at > 0 or v.output_dir)
             and v.path not in this_run_uris
         ]
         if candidates:
@@ -14,6 +14,13 @@ from core.logger import get_logger
 
 logger = get_logger(__name__)
 
+# ranker 排序特徵（tags / actresses / maker / series / number / release_date / duration）＋
+# similar 端點組卡片用的欄位；其餘欄位不進 corpus（唯讀快照欄位投影，字串與快照共用）
+_CORPUS_COLUMNS = (
+    'path', 'number', 'title', 'actresses', 'tags', 'maker', 'series',
+    'release_date', 'duration', 'cover_path', 'auto_focal', 'crop_mode',
+)
+
 
 class SimilarRankerCache:
     _instance: SimilarRanker | None = None
@@ -33,7 +40,7 @@ class SimilarRankerCache:
             if cls._instance is not None:
                 return cls._instance  # 雙重檢查：等鎖期間別人已 build
 
-            corpus = VideoRepository().get_all()
+            corpus = VideoRepository().get_snapshot().rows(('id',) + _CORPUS_COLUMNS)
             cls._instance = SimilarRanker(corpus)
             logger.debug(
                 "SimilarRankerCache: built corpus with %d videos", len(corpus)
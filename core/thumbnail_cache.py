@@ -3,6 +3,21 @@
 以「影片路徑 URI」為 key、扁平 hash 分桶（thumb/<h[:2]>/<h>.webp）、原子寫的
 本地 WebP 縮圖快取。對齊 spec-71 D1/D2/D5/D6/D7/D12、plan-71 CD-1/CD-2/CD-3。
 
+多尺寸：同一次解碼產出 THUMB_WIDTHS 各寬度。預設寬（THUMB_WIDTH）沿用 <h>.webp，
+其他寬度為同目錄 <h>_<w>.webp；三者共用 <h>.webp 的 per-thumb 鎖，一起生成、一起失效。
+
+容量管理：sweep 依 DB 現存影片清孤兒（改名 / 搬移 / prune / 移除來源留下的 webp），
+再依最近存取（LRU）整組淘汰到容量上限以下；usage 回報目前佔用。
+
+打包模式（use_packed(True)，見 core.thumbnail_pack）：同樣以 sha1 為 key，改存
+append-only pack 檔 ＋ 索引，不再一張一檔。thumb_file_for 仍是鎖 key 與 hash 來源；
+generate / invalidate / clear_all / iter_missing / usage / sweep 依目前模式分派，
+serve 端以 read_packed 取 bytes。切換模式時另一種後端的內容直接捨棄（lazy / 預熱重建）。
+
+熱快取：serve 讀過的 (bytes, ETag) 留在行程內 LRU（HOT_CACHE_MAX_BYTES 上限），
+read_hot 命中就不碰磁碟。填入在 per-thumb 鎖內與讀取一起做，generate / invalidate /
+sweep 在同一把鎖內丟掉該 entry；clear_all 與切換後端整個清空。
+
 設計約束：
 - 純函式，無 class。
 - 不 import web、不 import config（保持 core 不反向依賴，CD-1）。
@@ -10,14 +25,18 @@
 - generate 失敗（損圖/讀取/save 失敗）→ logger.warning 後回 False，不拋例外（D6）。
 """
 import hashlib
+import io
 import os
 import shutil
 import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Iterator, Optional, Tuple
+from typing import Iterable, Iterator, Optional, Tuple
 
 from PIL import Image
 
+from core import thumbnail_pack
 from core.atomic_write import atomic_write
 from core.database import get_db_path
 from core.logger import get_logger
@@ -44,10 +63,34 @@ def _lock_for_thumb(dst) -> threading.Lock:
             _thumb_locks[key] = lk
         return lk
 
+# 打包模式的 store（None = 檔案模式）。呼叫端取一次區域參照再用，切換時不會半途換後端。
+_pack_store: Optional["thumbnail_pack.PackStore"] = None
+_pack_store_guard = threading.Lock()
+_PACK_DIRNAME = "packs"
+
+# LRU 存取紀錄：entry hash -> 最近一次 serve 的 time.time()。只放記憶體（重啟歸零，
+# 淘汰順序退回檔案 mtime = 生成時間）；不 touch 檔案 mtime，serve 的 ETag 取自 st_mtime_ns。
+_last_access: dict = {}
+
+# 熱快取：str(縮圖路徑) -> (bytes, etag)，OrderedDict 尾端為最近使用。key 用完整路徑
+# （同 _thumb_locks），各寬度各一筆。_hot_generation 在 clear_all / 切換後端時遞增：
+# 讀取開始後才被整批清掉的結果不回填。
+_hot: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+_hot_bytes = 0
+_hot_generation = 0
+_hot_guard = threading.Lock()
+
 # 縮圖參數（CD-3 / D2，集中為模組常數供日後調參）
-THUMB_WIDTH = 400      # 目標寬度（px）
+THUMB_WIDTH = 400      # 預設寬度（px）；檔名不帶寬度後綴
+THUMB_WIDTHS = (200, 400, 800)  # 一次解碼產出的全部寬度（手機 / 一般 / 高 DPI），須含 THUMB_WIDTH
 THUMB_QUALITY = 80     # WebP quality
 THUMB_METHOD = 4       # WebP method（壓縮努力）
+# 超過容量上限時淘汰到上限的這個比例（留餘裕，避免每生成一張就觸發一次淘汰）
+SWEEP_LOW_WATERMARK = 0.9
+# 熱快取上限（bytes）：預設寬度約 30KB/張 → 約兩千張，涵蓋多個 client 同時瀏覽的封面牆
+HOT_CACHE_MAX_BYTES = 64 * 1024 * 1024
+# 預熱平行度：Pillow 的解碼 / resize / WebP 編碼都會釋放 GIL，執行緒池即可吃滿核心
+PREWARM_WORKERS = max(1, os.cpu_count() or 1)
 
 
 def _thumb_dir() -> Path:
@@ -55,19 +98,333 @@ def _thumb_dir() -> Path:
     return get_db_path().parent / "thumb"
 
 
-def thumb_file_for(video_path_uri: str) -> Path:
+def use_packed(enabled: bool) -> None:
+    """切換儲存後端（web 層於啟動與設定儲存時依 thumbnail_cache_packed 呼叫）。
+
+    冪等；真的切換時捨棄另一後端的全部內容：開啟打包 → 清掉散檔分桶，
+    關閉打包 → 清空並移除 packs/。啟動時若非打包模式但殘留 packs/ 也一併移除。
+    """
+    global _pack_store
+    with _pack_store_guard:
+        root = _thumb_dir()
+        if enabled and _pack_store is None:
+            _clear_loose(root)
+            _pack_store = thumbnail_pack.PackStore(root / _PACK_DIRNAME)
+        elif not enabled:
+            if _pack_store is not None:
+                _pack_store.clear()
+                _pack_store.close()
+                _pack_store = None
+            if (root / _PACK_DIRNAME).exists():
+                shutil.rmtree(root / _PACK_DIRNAME, ignore_errors=True)
+        _hot_reset()
+    _last_access.clear()
+
+
+def is_packed() -> bool:
+    """目前是否為打包模式。"""
+    return _pack_store is not None
+
+
+def _clear_loose(root: Path) -> None:
+    """移除散檔分桶（保留 packs/）。"""
+    try:
+        children = list(root.iterdir())
+    except OSError:
+        return
+    for child in children:
+        if child.name == _PACK_DIRNAME:
+            continue
+        if child.is_dir():
+            shutil.rmtree(child, ignore_errors=True)
+        else:
+            child.unlink(missing_ok=True)
+
+
+def snap_width(width: Optional[int]) -> int:
+    """把請求寬度對到 THUMB_WIDTHS：取不小於它的最小一檔，超過最大檔回最大檔；None → 預設。"""
+    if not width:
+        return THUMB_WIDTH
+    for w in THUMB_WIDTHS:
+        if w >= width:
+            return w
+    return THUMB_WIDTHS[-1]
+
+
+def _variant_file(base: Path, width: int) -> Path:
+    """預設寬度縮圖 base 對應的指定寬度檔（預設寬度即 base 本身）。"""
+    if width == THUMB_WIDTH:
+        return base
+    return base.with_name(f"{base.stem}_{width}{base.suffix}")
+
+
+def thumb_file_for(video_path_uri: str, width: int = THUMB_WIDTH) -> Path:
     """以 video path URI 為 key 推導縮圖檔路徑（純路徑推導，無 I/O）。
 
-    h = sha1(video_path_uri).hexdigest()；回 thumb/<h[:2]>/<h>.webp（D5/D12/CD-2）。
+    h = sha1(video_path_uri).hexdigest()；回 thumb/<h[:2]>/<h>.webp（D5/D12/CD-2），
+    非預設寬度回 thumb/<h[:2]>/<h>_<width>.webp。
     呼叫端負責傳規範 file URI（web 層用 v.path，DB 已是 file URI）。
     """
     h = hashlib.sha1(video_path_uri.encode("utf-8")).hexdigest()
-    return _thumb_dir() / h[:2] / f"{h}.webp"
+    return _variant_file(_thumb_dir() / h[:2] / f"{h}.webp", width)
+
+
+def _entry_hash(f: Path) -> str:
+    """縮圖檔所屬 entry 的 hash：<h>.webp / <h>_<w>.webp → h。"""
+    return f.stem.split("_", 1)[0]
+
+
+def _base_file(tf: Path) -> Path:
+    """任一寬度縮圖檔 → 同組的預設寬度檔（per-thumb 鎖的 key）。"""
+    return tf.with_name(f"{_entry_hash(tf)}{tf.suffix}")
+
+
+def record_access(tf: Path) -> None:
+    """記下一次 serve（LRU 淘汰依據）。tf 為任一寬度的縮圖檔。"""
+    _last_access[_entry_hash(tf)] = time.time()
+
+
+def _hot_put(key: str, data: bytes, etag: str, generation: int) -> None:
+    """回填熱快取（讀取期間遇到整批清空則放棄），超過上限從最久未用的丟。"""
+    global _hot_bytes
+    if len(data) > HOT_CACHE_MAX_BYTES:
+        return
+    with _hot_guard:
+        if generation != _hot_generation:
+            return
+        old = _hot.pop(key, None)
+        if old is not None:
+            _hot_bytes -= len(old[0])
+        _hot[key] = (data, etag)
+        _hot_bytes += len(data)
+        while _hot_bytes > HOT_CACHE_MAX_BYTES:
+            _k, (evicted, _e) = _hot.popitem(last=False)
+            _hot_bytes -= len(evicted)
+
+
+def _hot_drop(base: Path) -> None:
+    """丟掉某 entry 全部寬度的熱快取（呼叫端持 per-thumb 鎖）。"""
+    global _hot_bytes
+    with _hot_guard:
+        for width in THUMB_WIDTHS:
+            old = _hot.pop(str(_variant_file(base, width)), None)
+            if old is not None:
+                _hot_bytes -= len(old[0])
+
+
+def _hot_reset() -> None:
+    """清空熱快取並作廢進行中的回填。"""
+    global _hot_bytes, _hot_generation
+    with _hot_guard:
+        _hot.clear()
+        _hot_bytes = 0
+        _hot_generation += 1
+
+
+def hot_stats() -> dict:
+    """熱快取目前筆數 / bytes / 上限。"""
+    with _hot_guard:
+        return {"items": len(_hot), "bytes": _hot_bytes, "max_bytes": HOT_CACHE_MAX_BYTES}
+
+
+def read_hot(video_path_uri: str, width: int = THUMB_WIDTH) -> Optional[Tuple[bytes, str]]:
+    """只查熱快取（零 I/O）：回 (bytes, etag) 或 None。"""
+    tf = thumb_file_for(video_path_uri, width)
+    key = str(tf)
+    with _hot_guard:
+        hit = _hot.get(key)
+        if hit is None:
+            return None
+        _hot.move_to_end(key)
+    record_access(tf)
+    return hit
+
+
+def read_file(tf: Path) -> Tuple[bytes, str]:
+    """檔案模式 serve：讀 (bytes, etag) 並回填熱快取。ETag 取 st_mtime_ns。
+
+    stat + read 與回填在 per-thumb 鎖內：與 generate / invalidate 序列化，回填的一定
+    是磁碟上當下的內容。檔案不在（並發 unlink）拋 OSError，由呼叫端降級重生。
+    """
+    with _hot_guard:
+        generation = _hot_generation
+    with _lock_for_thumb(_base_file(tf)):
+        etag = f'"{tf.stat().st_mtime_ns}"'
+        data = tf.read_bytes()
+        _hot_put(str(tf), data, etag, generation)
+    record_access(tf)
+    return data, etag
+
+
+def read_packed(video_path_uri: str, width: int = THUMB_WIDTH) -> Optional[Tuple[bytes, str]]:
+    """打包模式 serve：回 (bytes, etag) 並回填熱快取；未命中或非打包模式回 None。
+
+    pack 在讀取期間被 compact 刪掉時拋 OSError（與檔案模式並發 unlink 同語意，
+    由呼叫端降級重生）。
+    """
+    store = _pack_store
+    if store is None:
+        return None
+    with _hot_guard:
+        generation = _hot_generation
+    tf = thumb_file_for(video_path_uri, width)
+    with _lock_for_thumb(thumb_file_for(video_path_uri)):
+        hit = store.get(_entry_hash(tf), width)
+        if hit is not None:
+            _hot_put(str(tf), hit[0], hit[1], generation)
+    if hit is not None:
+        record_access(tf)
+    return hit
+
+
+def _is_cached(video_path_uri: str, width: int = THUMB_WIDTH) -> bool:
+    """縮圖是否已在快取（依目前後端）。"""
+    store = _pack_store
+    tf = thumb_file_for(video_path_uri, width)
+    if store is not None:
+        return store.has(_entry_hash(tf), width)
+    return tf.exists()
+
+
+def _scan_entries() -> dict:
+    """走訪縮圖目錄，依 entry hash 分組：h -> [(path, size, mtime), ...]（缺目錄回空）。
+
+    只收 .webp；atomic_write 的暫存檔（.tmp）與其他雜檔不計。用 os.scandir
+    （Windows 上 stat 隨目錄列舉一起回來，不逐檔多一次 syscall）。
+    """
+    entries: dict = {}
+    root = _thumb_dir()
+    try:
+        buckets = [b.path for b in os.scandir(root) if b.is_dir()]
+    except OSError:
+        return entries
+    for bucket in buckets:
+        try:
+            with os.scandir(bucket) as it:
+                for f in it:
+                    if not f.name.endswith(".webp") or not f.is_file():
+                        continue
+                    st = f.stat()
+                    path = Path(f.path)
+                    entries.setdefault(_entry_hash(path), []).append((path, st.st_size, st.st_mtime))
+        except OSError:
+            continue  # 並發 clear_all（rmtree）中途消失的分桶
+    return entries
+
+
+def _summaries(store) -> dict:
+    """h -> (bytes, 檔數, 最新寫入時間)；打包模式讀索引，檔案模式走訪目錄。"""
+    if store is not None:
+        return store.entries()
+    return {
+        h: (sum(size for _p, size, _m in files), len(files), max(mtime for _p, _s, mtime in files))
+        for h, files in _scan_entries().items()
+    }
+
+
+def _usage_of(summaries: dict) -> dict:
+    return {
+        "entries": len(summaries),
+        "files": sum(files for _size, files, _mtime in summaries.values()),
+        "bytes": sum(size for size, _files, _mtime in summaries.values()),
+    }
+
+
+def usage() -> dict:
+    """縮圖快取目前佔用：entries（影片數）/ files（含各寬度）/ bytes。
+
+    打包模式另回 disk_bytes（pack 檔實際大小，含尚未 compact 的死空間）。
+    """
+    store = _pack_store
+    stats = _usage_of(_summaries(store))
+    if store is not None:
+        stats["disk_bytes"] = store.disk_bytes()
+    return stats
+
+
+def entry_bytes(video_path_uri: str) -> int:
+    """某影片全部寬度縮圖的總大小（缺檔計 0）。"""
+    store = _pack_store
+    base = thumb_file_for(video_path_uri)
+    if store is not None:
+        return store.entry_bytes(_entry_hash(base))
+    total = 0
+    for width in THUMB_WIDTHS:
+        try:
+            total += _variant_file(base, width).stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+def _drop_entry(h: str, cutoff: float, store=None) -> bool:
+    """在 per-thumb 鎖內刪掉 entry h 的全部寬度；鎖內發現已在 cutoff 之後重生則保留。"""
+    base = _thumb_dir() / h[:2] / f"{h}.webp"  # 與 thumb_file_for 同構 → 同一把鎖
+    with _lock_for_thumb(base):
+        if store is not None:
+            if not store.delete(h, older_than=cutoff):
+                return False
+            _hot_drop(base)
+            _last_access.pop(h, None)
+            return True
+        files = [_variant_file(base, width) for width in THUMB_WIDTHS]
+        for f in files:
+            try:
+                if f.stat().st_mtime >= cutoff:
+                    return False
+            except OSError:
+                pass
+        for f in files:
+            f.unlink(missing_ok=True)
+        _hot_drop(base)
+    _last_access.pop(h, None)
+    return True
+
+
+def sweep(known_uris: Iterable[str], max_bytes: int = 0) -> dict:
+    """清孤兒 ＋ LRU 淘汰（背景 GC 用），回 {orphans, evicted, entries, files, bytes}。
+
+    known_uris：DB 現存影片的 path URI（可為串流）。cutoff 取在消費 known_uris 之前：
+    之後才入庫的影片，其縮圖必在 cutoff 之後生成，刪除前鎖內比對 mtime 即保留，
+    不會把剛生成的縮圖當孤兒砍掉。
+    max_bytes > 0 時，清完孤兒仍超過上限 → 依最近存取（無紀錄者用生成時間）由舊到新
+    整組淘汰到 max_bytes * SWEEP_LOW_WATERMARK 以下。被淘汰者下次 serve 時 lazy 重生。
+    打包模式最後再 compact，把刪掉的部分從 pack 檔實際回收。
+    """
+    store = _pack_store
+    cutoff = time.time()
+    known = {hashlib.sha1(uri.encode("utf-8")).hexdigest() for uri in known_uris}
+    entries = _summaries(store)
+    orphans = evicted = 0
+    for h in [h for h in entries if h not in known]:
+        summary = entries.pop(h)
+        if _drop_entry(h, cutoff, store):
+            orphans += 1
+        else:
+            entries[h] = summary
+
+    total = sum(size for size, _files, _mtime in entries.values())
+    if max_bytes > 0 and total > max_bytes:
+        target = int(max_bytes * SWEEP_LOW_WATERMARK)
+        order = sorted(entries, key=lambda h: _last_access.get(h) or entries[h][2])
+        for h in order:
+            if total <= target:
+                break
+            if _drop_entry(h, cutoff, store):
+                total -= entries.pop(h)[0]
+                evicted += 1
+    if store is not None and (orphans or evicted):
+        store.compact()
+    logger.info("thumbnail sweep: orphans=%d evicted=%d remaining=%d bytes", orphans, evicted, total)
+    return {"orphans": orphans, "evicted": evicted, **_usage_of(entries)}
 
 
 def generate(cover_fs_path: str, dst: Path) -> bool:
-    """從封面 fs path 產出寬 THUMB_WIDTH 的 WebP 縮圖，原子寫到 dst。
+    """從封面 fs path 一次解碼產出 THUMB_WIDTHS 各寬度的 WebP 縮圖，原子寫到 dst 與其兄弟檔。
 
+    dst 為預設寬度（THUMB_WIDTH）檔，其他寬度寫到 _variant_file(dst, w)。JPEG 封面
+    先以 draft 讓 libjpeg 直接按 1/2、1/4、1/8 縮放解碼（只解出最大寬度所需的像素），
+    再由大到小逐級 LANCZOS 縮；dst 最後寫，存在即代表整組完整。
     成功回 True；損圖/讀取失敗/save 失敗 → logger.warning 後回 False（不拋，D6）。
     原子寫委派 core.atomic_write.atomic_write()（TASK-113d-T1 起的單一所有權）。
     本函式保留的部分：per-thumb 鎖、`dst.parent` 的 mkdir、以及「任何失敗一律
@@ -76,33 +433,53 @@ def generate(cover_fs_path: str, dst: Path) -> bool:
     """
     # 整個「讀 cover → 處理 → 原子寫」包進 per-thumb 鎖內，與 invalidate 的 unlink
     # 序列化（Codex round-2 P1 修法 A）。失敗回 False 的語義不變，只是被鎖包住。
+    # 打包模式：各寬度編碼成 bytes 後一次 put（索引一次 commit，整組同時可見）。
+    store = _pack_store
     with _lock_for_thumb(dst):
+        _hot_drop(dst)  # 重生即換內容（成功或失敗都不再沿用舊 bytes）
         try:
             with Image.open(cover_fs_path) as img:
+                largest = THUMB_WIDTHS[-1]
+                if img.width > largest:
+                    # reduced decode：非 JPEG 為 no-op；縮放後尺寸仍 >= 要求尺寸
+                    img.draft("RGB", (largest, max(1, round(img.height * largest / img.width))))
                 img = img.convert("RGB")  # 去 alpha/CMYK，WebP 友善
-                # 等比縮到寬 THUMB_WIDTH；原圖更窄則不放大
-                if img.width > THUMB_WIDTH:
-                    new_h = max(1, round(img.height * THUMB_WIDTH / img.width))
-                    img = img.resize((THUMB_WIDTH, new_h), Image.LANCZOS)
 
+                # 由大到小：每級從上一級縮（等比；原圖更窄則不放大）
+                rendered = {}
+                for width in sorted(THUMB_WIDTHS, reverse=True):
+                    if img.width > width:
+                        new_h = max(1, round(img.height * width / img.width))
+                        img = img.resize((width, new_h), Image.LANCZOS)
+                    rendered[width] = img
+                if store is not None:
+                    blobs = {}
+                    for width, im in rendered.items():
+                        buf = io.BytesIO()
+                        im.save(buf, "WEBP", quality=THUMB_QUALITY, method=THUMB_METHOD)
+                        blobs[width] = buf.getvalue()
+                    store.put(_entry_hash(dst), blobs)
+                    return True
                 dst.parent.mkdir(parents=True, exist_ok=True)
-                with atomic_write(dst) as f:
-                    img.save(f, "WEBP", quality=THUMB_QUALITY, method=THUMB_METHOD)
+                for width in sorted(rendered, key=lambda w: w == THUMB_WIDTH):  # dst（預設寬度）最後寫
+                    with atomic_write(_variant_file(dst, width)) as f:
+                        rendered[width].save(f, "WEBP", quality=THUMB_QUALITY, method=THUMB_METHOD)
             return True
         except Exception as e:
             logger.warning("thumbnail generate failed: cover=%s err=%s", cover_fs_path, e)
             return False
 
 
-def get_or_create(video_path_uri: str, cover_fs_path: str) -> Optional[Path]:
-    """lazy on-miss：thumb 已存在→直接回（hit，零生成）；否則 generate。
+def get_or_create(video_path_uri: str, cover_fs_path: str, width: int = THUMB_WIDTH) -> Optional[Path]:
+    """lazy on-miss：thumb 已存在→直接回（hit，零生成）；否則 generate（整組寬度）。
 
     成功回 Path、失敗回 None（web serve miss 路徑用，spec 2.A.8）。
+    打包模式下回的 Path 只是 key（磁碟上沒有這個檔），bytes 以 read_packed 取。
     """
-    tf = thumb_file_for(video_path_uri)
-    if tf.exists():
+    tf = thumb_file_for(video_path_uri, width)
+    if _is_cached(video_path_uri, width):
         return tf
-    if generate(cover_fs_path, tf):
+    if generate(cover_fs_path, thumb_file_for(video_path_uri)):
         return tf
     return None
 
@@ -112,15 +489,34 @@ def invalidate(video_path_uri: str) -> None:
 
     unlink 包在 per-thumb 鎖內，與 generate 的「讀 cover + 寫 thumb」序列化
     （Codex round-2 P1 修法 A）。tf 與 generate 的 dst 對同 uri 是同一 Path → 同一把鎖。
+    全部寬度一起砍（同一把鎖）；打包模式刪索引列（空間由 sweep 的 compact 回收）。
     """
+    store = _pack_store
     tf = thumb_file_for(video_path_uri)
     with _lock_for_thumb(tf):
-        tf.unlink(missing_ok=True)
+        if store is not None:
+            store.delete(_entry_hash(tf))
+        for width in THUMB_WIDTHS:
+            _variant_file(tf, width).unlink(missing_ok=True)
+        _hot_drop(tf)
+    _last_access.pop(_entry_hash(tf), None)
 
 
 def clear_all() -> None:
-    """清空整個縮圖快取目錄（缺目錄 no-op，CD-11）。"""
-    shutil.rmtree(_thumb_dir(), ignore_errors=True)
+    """清空整個縮圖快取目錄（缺目錄 no-op，CD-11）。
+
+    打包模式：store.clear()（索引列 ＋ pack 檔）後只移除散檔分桶——index.db 仍被
+    連線池持有，不能連目錄一起 rmtree。
+    """
+    store = _pack_store
+    _hot_reset()  # 前後各一次：清除期間讀到的舊內容不回填、已回填的也丟掉
+    if store is not None:
+        store.clear()
+        _clear_loose(_thumb_dir())
+    else:
+        shutil.rmtree(_thumb_dir(), ignore_errors=True)
+    _hot_reset()
+    _last_access.clear()
 
 
 def iter_missing(videos, path_mappings: dict = None) -> Iterator[Tuple[str, str]]:
@@ -136,7 +532,7 @@ def iter_missing(videos, path_mappings: dict = None) -> Iterator[Tuple[str, str]
         video_path_uri = getattr(v, "path", None)
         if not video_path_uri:
             continue
-        if thumb_file_for(video_path_uri).exists():
+        if _is_cached(video_path_uri):
             continue
         cover_path = getattr(v, "cover_path", None)
         if not cover_path:
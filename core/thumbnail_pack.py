@@ -0,0 +1,297 @@
+"""縮圖打包儲存（thumbnail_cache 的選用後端）。
+
+一張縮圖一個檔（thumb/<h[:2]>/<h>.webp）在 5 萬部片的庫就是 15 萬個 inode：
+serve 一頁 60 張 = 60 次 exists + stat + read，預熱時防毒逐檔掃描。打包模式改存：
+
+- thumb/packs/<id>.pack：append-only 資料檔，WebP bytes 首尾相接；超過
+  PACK_MAX_BYTES 換下一個 id。
+- thumb/packs/index.db：SQLite 索引 (h, width) -> (pack, offset, length, created)，
+  h 與檔案模式同一個 sha1(video_path_uri)。
+
+寫入先 append + fsync 資料、再 commit 索引：中途崩潰只留下沒人引用的尾巴（死空間），
+讀端永遠看不到半張圖。刪除只刪索引列，空間由 compact 回收（把存活資料搬到目前的
+pack，刪掉死空間比例過高的舊 pack）。讀取走 mmap（每個 pack 只 open/mmap 一次）。
+
+寫入（put / delete / compact / clear）以 store 內的鎖序列化；per-thumb 鎖仍由
+thumbnail_cache 在外層負責（generate / invalidate 的既有序列化語意不變）。
+"""
+import mmap
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from core.database import get_connection
+from core.logger import get_logger
+
+logger = get_logger(__name__)
+
+PACK_MAX_BYTES = 256 * 1024 * 1024  # 單一 pack 上限；超過就換新 pack
+COMPACT_DEAD_RATIO = 0.5            # 死空間佔比達此值的舊 pack 才搬移回收
+COMPACT_BATCH_BYTES = 32 * 1024 * 1024  # compact 每批搬移（一次 append ＋ fsync）的資料量上限
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS thumbs ("
+    " h TEXT NOT NULL, width INTEGER NOT NULL, pack INTEGER NOT NULL,"
+    " offset INTEGER NOT NULL, length INTEGER NOT NULL, created REAL NOT NULL,"
+    " PRIMARY KEY (h, width)) WITHOUT ROWID",
+    "CREATE INDEX IF NOT EXISTS idx_thumbs_pack ON thumbs(pack)",
+)
+
+
+class PackStore:
+    """單一目錄下的 pack 檔 ＋ 索引。一個 thumb 目錄同時只該有一個實例。"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.index_path = root / "index.db"
+        self._lock = threading.Lock()       # 寫入序列化
+        self._maps_lock = threading.Lock()  # mmap 快取
+        self._maps: Dict[int, mmap.mmap] = {}
+        root.mkdir(parents=True, exist_ok=True)
+        self._ensure_schema()
+        ids = self._pack_ids()
+        self._current = ids[-1] if ids else 0
+        self._current_size = self._pack_path(self._current).stat().st_size if ids else 0
+
+    # ── 內部 ──────────────────────────────────────────────────
+    def _pack_path(self, pack_id: int) -> Path:
+        return self.root / f"{pack_id:06d}.pack"
+
+    def _pack_ids(self) -> list:
+        return sorted(int(p.stem) for p in self.root.glob("*.pack") if p.stem.isdigit())
+
+    def _ensure_schema(self) -> None:
+        conn = get_connection(self.index_path)
+        try:
+            for sql in _SCHEMA:
+                conn.execute(sql)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _append(self, items: List[Tuple[Hashable, bytes]]) -> Dict[Hashable, Tuple[int, int, int]]:
+        """把 (key, bytes) 依序接到目前 pack 尾端並 fsync 一次；回 key -> (pack, offset, length)。須持 _lock。"""
+        need = sum(len(data) for _key, data in items)
+        if self._current_size and self._current_size + need > PACK_MAX_BYTES:
+            self._current += 1
+            self._current_size = 0
+        placed = {}
+        with open(self._pack_path(self._current), "ab") as f:
+            offset = f.seek(0, os.SEEK_END)
+            for key, data in items:
+                f.write(data)
+                placed[key] = (self._current, offset, len(data))
+                offset += len(data)
+            f.flush()
+            os.fsync(f.fileno())
+        self._current_size = offset
+        return placed
+
+    def _read(self, pack_id: int, offset: int, length: int) -> bytes:
+        """從 pack 的唯讀 mmap 取一段；既有映射太短（之後又 append 過）就重新映射。
+
+        切片在 _maps_lock 內做：別的執行緒重新映射時會 close 舊 mmap，鎖外切片會撞上。
+        """
+        end = offset + length
+        with self._maps_lock:
+            mm = self._maps.get(pack_id)
+            if mm is None or len(mm) < end:
+                with open(self._pack_path(pack_id), "rb") as f:
+                    fresh = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if mm is not None:
+                    mm.close()
+                self._maps[pack_id] = mm = fresh
+            return mm[offset:end]
+
+    def _unmap(self, pack_id: int) -> None:
+        with self._maps_lock:
+            mm = self._maps.pop(pack_id, None)
+            if mm is not None:
+                mm.close()
+
+    # ── 讀 ────────────────────────────────────────────────────
+    def get(self, h: str, width: int) -> Optional[Tuple[bytes, str]]:
+        """讀一張縮圖：回 (bytes, etag)；沒有回 None。
+
+        etag 由位置 ＋ 寫入時間組成：append-only 下每次寫入位置都不同，
+        clear 之後 pack 編號重用也因寫入時間不同而不撞。
+        """
+        conn = get_connection(self.index_path)
+        try:
+            row = conn.execute(
+                "SELECT pack, offset, length, created FROM thumbs WHERE h = ? AND width = ?",
+                (h, width),
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning("thumbnail pack index read failed: %s", e)
+            return None
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        pack, offset, length, created = row
+        return self._read(pack, offset, length), f'"p{pack}-{offset}-{int(created * 1_000_000)}"'
+
+    def has(self, h: str, width: int) -> bool:
+        conn = get_connection(self.index_path)
+        try:
+            return conn.execute(
+                "SELECT 1 FROM thumbs WHERE h = ? AND width = ?", (h, width)
+            ).fetchone() is not None
+        finally:
+            conn.close()
+
+    def entry_bytes(self, h: str) -> int:
+        conn = get_connection(self.index_path)
+        try:
+            return conn.execute(
+                "SELECT IFNULL(SUM(length), 0) FROM thumbs WHERE h = ?", (h,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def entries(self) -> dict:
+        """h -> (bytes, 寬度數, 寫入時間)，供 usage / sweep 使用。"""
+        conn = get_connection(self.index_path)
+        try:
+            rows = conn.execute(
+                "SELECT h, SUM(length), COUNT(*), MAX(created) FROM thumbs GROUP BY h"
+            ).fetchall()
+        finally:
+            conn.close()
+        return {h: (size, files, created) for h, size, files, created in rows}
+
+    def disk_bytes(self) -> int:
+        """pack 檔實際佔用（含尚未 compact 的死空間）。"""
+        total = 0
+        for pack_id in self._pack_ids():
+            try:
+                total += self._pack_path(pack_id).stat().st_size
+            except OSError:
+                pass
+        return total
+
+    # ── 寫 ────────────────────────────────────────────────────
+    def put(self, h: str, blobs: Dict[int, bytes]) -> None:
+        """寫入一組（各寬度）縮圖；同 h 的舊資料變成死空間。"""
+        now = time.time()
+        with self._lock:
+            placed = self._append(list(blobs.items()))
+            conn = get_connection(self.index_path)
+            try:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO thumbs (h, width, pack, offset, length, created) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [(h, w, p, o, n, now) for w, (p, o, n) in placed.items()],
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+    def delete(self, h: str, older_than: float = None) -> bool:
+        """刪除 h 的全部寬度。older_than 給定時，寫入時間不早於它就保留並回 False。"""
+        with self._lock:
+            conn = get_connection(self.index_path)
+            try:
+                if older_than is not None:
+                    newest = conn.execute(
+                        "SELECT MAX(created) FROM thumbs WHERE h = ?", (h,)
+                    ).fetchone()[0]
+                    if newest is not None and newest >= older_than:
+                        return False
+                conn.execute("DELETE FROM thumbs WHERE h = ?", (h,))
+                conn.commit()
+            finally:
+                conn.close()
+        return True
+
+    def compact(self, min_dead_ratio: float = COMPACT_DEAD_RATIO) -> int:
+        """回收死空間：死空間佔比達門檻的 pack，存活資料搬到目前 pack 後刪檔。回收回 bytes。
+
+        存活資料以 COMPACT_BATCH_BYTES 為單位整批 append（一批一次 fsync、一次索引 UPDATE），
+        不是一張一次：compact 全程持 _lock，逐張 fsync 會讓 put（serve miss / 預熱）卡上
+        數千次 fsync。搬移期間讀端可能拿到舊位置：舊 pack 刪掉後 open 失敗拋 OSError，
+        由呼叫端（get_thumb）降級重生，與檔案模式的並發 unlink 同一套處理。
+        """
+        reclaimed = 0
+        with self._lock:
+            conn = get_connection(self.index_path)
+            try:
+                live = dict(conn.execute(
+                    "SELECT pack, SUM(length) FROM thumbs GROUP BY pack"
+                ).fetchall())
+                # 目前 pack 自己死空間過多（小庫常只有一個 pack）→ 先換新 pack，舊的照常回收
+                if (self._current_size
+                        and (self._current_size - live.get(self._current, 0)) / self._current_size
+                        >= min_dead_ratio):
+                    self._current += 1
+                    self._current_size = 0
+                for pack_id in self._pack_ids():
+                    if pack_id == self._current:
+                        continue
+                    path = self._pack_path(pack_id)
+                    size = path.stat().st_size
+                    if size and (size - live.get(pack_id, 0)) / size < min_dead_ratio:
+                        continue
+                    rows = conn.execute(
+                        "SELECT h, width, offset, length FROM thumbs WHERE pack = ?", (pack_id,)
+                    ).fetchall()
+                    self._move_live(conn, pack_id, rows)
+                    self._unmap(pack_id)
+                    try:
+                        path.unlink()
+                    except OSError as e:  # Windows：別的執行緒還映射著 → 下次再刪
+                        logger.info("thumbnail pack %s not removed yet: %s", path.name, e)
+                        continue
+                    reclaimed += size - live.get(pack_id, 0)
+            finally:
+                conn.close()
+        if reclaimed:
+            logger.info("thumbnail pack compaction reclaimed %d bytes", reclaimed)
+        return reclaimed
+
+    def _move_live(self, conn, pack_id: int, rows: list) -> None:
+        """把 pack_id 的存活列整批搬到目前 pack 並更新索引。須持 _lock。"""
+        batch: list = []
+        batch_bytes = 0
+        for i, (h, width, offset, length) in enumerate(rows):
+            batch.append(((h, width), self._read(pack_id, offset, length)))
+            batch_bytes += length
+            if batch_bytes < COMPACT_BATCH_BYTES and i < len(rows) - 1:
+                continue
+            placed = self._append(batch)
+            conn.executemany(
+                "UPDATE thumbs SET pack = ?, offset = ? WHERE h = ? AND width = ?",
+                [(p, o, h_, w_) for (h_, w_), (p, o, _n) in placed.items()],
+            )
+            conn.commit()
+            batch, batch_bytes = [], 0
+
+    def clear(self) -> None:
+        """清空全部縮圖（索引列 ＋ pack 檔），index.db 本身保留。"""
+        with self._lock:
+            conn = get_connection(self.index_path)
+            try:
+                conn.execute("DELETE FROM thumbs")
+                conn.commit()
+            finally:
+                conn.close()
+            for pack_id in self._pack_ids():
+                self._unmap(pack_id)
+                try:
+                    self._pack_path(pack_id).unlink(missing_ok=True)
+                except OSError as e:  # 刪不掉的舊 pack 已無索引引用，留給下次 compact
+                    logger.info("thumbnail pack %s not removed: %s", pack_id, e)
+            ids = self._pack_ids()
+            self._current = ids[-1] if ids else 0
+            self._current_size = self._pack_path(self._current).stat().st_size if ids else 0
+
+    def close(self) -> None:
+        """釋放 mmap（切回檔案模式 / 測試收尾）。"""
+        with self._maps_lock:
+            for mm in self._maps.values():
+                mm.close()
+            self._maps.clear()
@@ -188,16 +188,6 @@ EXEMPTIONS: dict[tuple[str, str], tuple[int, str]] = {
         "（cache/manifest）更難追蹤，非本 Phase 治理範圍（build 工具鏈，與既有 C901 noqa "
         "理由一致）。",
     ),
-    ("core/database/connection.py", "init_db"): (
-        209,
-        "資料庫 schema 初始化主流程，逐表 CREATE TABLE/CREATE INDEX 語句序列，schema 仍在"
-        "演進中；拆成多個小函式不會降低本質複雜度，只會增加呼叫層次與跨函式的 cursor/conn "
-        "傳遞。"
-        " ／ 203→209（feature/123-user-pick-star T1）：videos 新增 user_rating 欄位的"
-        "冪等 migration（`if 'user_rating' not in existing_cols: ALTER TABLE`），與同函式內"
-        "既有的 auto_focal／crop_mode／focal_attempted_at 逐字同形。新增欄位必然在此多一段，"
-        "這是 schema 演進的固有成本，不是可以靠重構消掉的膨脹。",
-    ),
 }
 
 
@@ -148,34 +148,16 @@ class TestLibraryActressesEndpoint:
         不可回 200 + 空清單（前端 !resp.ok →「載入失敗」）。Codex PR#133 finding A。
 
         raise_server_exceptions=False：讓 TestClient 回 HTTP 狀態碼而非把例外再拋給測試。
-        注入點必須走真實 except 分支（execute 失敗），且只打 pairs 的 json_each SQL——
+        注入點必須走真實 except 分支（讀取失敗），且只打 pairs 的來源（片庫唯讀快照）——
         勿連 get_all 一起炸掉，否則 mutation 改回 return [] 時後續 get_all 仍會 500、
         測試假綠。
         """
         monkeypatch.setattr("core.database.connection.get_db_path", lambda: tmp_db)
 
-        real_get = ActressRepository._get_connection
+        def _fail_snapshot(db_path=None):
+            raise sqlite3.OperationalError("simulated pairs query failure")
 
-        class _FailPairsConn:
-            def __init__(self, real):
-                self._real = real
-
-            def execute(self, sql, *args, **kwargs):
-                if "json_each(videos.actresses)" in sql:
-                    raise sqlite3.OperationalError("simulated json_each failure")
-                return self._real.execute(sql, *args, **kwargs)
-
-            def close(self):
-                return self._real.close()
-
-            def __getattr__(self, name):
-                return getattr(self._real, name)
-
-        monkeypatch.setattr(
-            ActressRepository,
-            "_get_connection",
-            lambda self: _FailPairsConn(real_get(self)),
-        )
+        monkeypatch.setattr("core.database.actress.get_library_snapshot", _fail_snapshot)
 
         from web.app import app
         with TestClient(app, raise_server_exceptions=False) as client:
@@ -10,7 +10,7 @@ import sqlite3
 import pytest
 from fastapi.testclient import TestClient
 
-from core.database import init_db
+from core.database import VideoRepository, init_db
 from core.path_utils import to_file_uri
 
 
@@ -115,6 +115,22 @@ class TestAnalysisHappyPath:
 
 # ── I2: analysis 空 DB ────────────────────────────────────────────────────────
 
+class TestAnalysisReadOnly:
+    """I2b: GET analysis 唯讀——待補旗標留給背景維護，不在 GET 內寫入"""
+
+    def test_get_does_not_write(self, tmp_db, client):
+        _insert_videos(tmp_db, [
+            (to_file_uri("/test/TKSONE-205.mp4"), "TKSONE-205", "T", "[]", "M",
+             '["ドラマ"]', "D", "L", "O", "/c.jpg", "2024-01-01", 1.0),
+        ])
+        assert client.get("/api/collection/analysis").status_code == 200
+        conn = sqlite3.connect(str(tmp_db))
+        try:
+            assert conn.execute("SELECT number_issue FROM videos").fetchone() == (None,)
+        finally:
+            conn.close()
+
+
 class TestAnalysisEmptyDb:
     """I2: 空 videos 表，所有計數應為 0，available_groups 仍有 5 個"""
 
@@ -227,3 +243,146 @@ class TestGroupsInvalidGroup:
             json={"group": "evil_group", "limit": 50},
         )
         assert resp.status_code == 422
+
+
+# ── I5: video_health_summary 增量維護 ─────────────────────────────────────────
+
+def _brute_force_counts(db_path) -> dict:
+    """以舊版逐欄 COUNT + Python 全量比對重算，作為 summary 的對照組"""
+    from web.routers.collection import CORRUPTION_RULES, _has_japanese_tags, _is_corrupted_number
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        def count(where):
+            return conn.execute(f"SELECT COUNT(*) FROM videos WHERE {where}").fetchone()[0]
+
+        rows = conn.execute("SELECT number, tags FROM videos").fetchall()
+        return {
+            "total_videos": count("1"),
+            "missing_director": count("director IS NULL OR director = ''"),
+            "empty_tags": count("COALESCE(LENGTH(tags), 0) < 3"),
+            "has_nfo": count("nfo_mtime IS NOT NULL AND nfo_mtime > 0"),
+            "corrupted": sum(1 for number, _ in rows if _is_corrupted_number(number)),
+            "japanese": sum(1 for _, tags in rows if _has_japanese_tags(tags)),
+            "patterns": len(CORRUPTION_RULES),
+        }
+    finally:
+        conn.close()
+
+
+def _summary_view(data) -> dict:
+    return {
+        "total_videos": data["total_videos"],
+        "missing_director": data["missing_fields"]["director"],
+        "empty_tags": data["empty_array_fields"]["tags"],
+        "has_nfo": data["nfo_status"]["has_nfo"],
+        "corrupted": data["corrupted_numbers"]["total"],
+        "japanese": data["japanese_tags"]["total"],
+        "patterns": len(data["corrupted_numbers"]["patterns"]),
+    }
+
+
+def _heal(db_path):
+    """補算 raw SQL 寫入留下的健康度旗標（正式流程由 init_db / 寫入端 / 背景維護負責；GET analysis 本身唯讀）"""
+    VideoRepository(db_path).heal_health_flags()
+
+
+class TestAnalysisSummaryIncremental:
+    """I5: 統計由 trigger 維護；raw SQL 插入 / 改番號 / 改 tags / 刪除（補算旗標後）仍與全量重算一致"""
+
+    def test_summary_tracks_raw_sql_writes(self, tmp_db, client):
+        _insert_videos(tmp_db, [
+            (to_file_uri("/test/TKSONE-205.mp4"), "TKSONE-205", "T", '["a"]', "M",
+             '["巨乳","ハイビジョン"]', "", "L", "O", "/c.jpg", "2024-01-01", 1000.0),
+            (to_file_uri("/test/R-ABW-001.mp4"), "R-ABW-001", "T", '["b"]', "M",
+             '["女教師"]', "D", "L", "O", "/c.jpg", "2024-01-01", 0.0),
+            (to_file_uri("/test/IPZ-154.mp4"), "IPZ-154", "T", '["c"]', "M",
+             "[]", "D", "L", "O", "/c.jpg", "2024-01-01", 5.0),
+        ])
+        _heal(tmp_db)
+        data = client.get("/api/collection/analysis").json()
+        assert _summary_view(data) == _brute_force_counts(tmp_db)
+        patterns = {p["name"]: p["count"] for p in data["corrupted_numbers"]["patterns"]}
+        assert patterns["TK_prefix"] == 1
+        assert patterns["R_prefix"] == 1
+
+        # fix-numbers 式的 raw UPDATE、改 tags、刪除
+        conn = sqlite3.connect(str(tmp_db))
+        conn.execute("UPDATE videos SET number = 'SONE-205' WHERE number = 'TKSONE-205'")
+        conn.execute("UPDATE videos SET tags = '[\"ドラマ\"]', director = '' WHERE number = 'IPZ-154'")
+        conn.execute("DELETE FROM videos WHERE number = 'R-ABW-001'")
+        conn.commit()
+        conn.close()
+
+        _heal(tmp_db)
+        data = client.get("/api/collection/analysis").json()
+        assert _summary_view(data) == _brute_force_counts(tmp_db)
+        assert data["corrupted_numbers"]["total"] == 0
+        assert data["japanese_tags"]["total"] == 2
+
+    def test_summary_tracks_repository_writes(self, tmp_db, client):
+        from core.database import Video, VideoRepository
+
+        repo = VideoRepository(tmp_db)
+        repo.upsert(Video(path=to_file_uri("/test/K9ABC-001.mp4"), number="K9ABC-001",
+                          tags=["ハイビジョン"], nfo_mtime=10.0))
+        repo.upsert_batch([
+            Video(path=to_file_uri("/test/123ABC-002.mp4"), number="123ABC-002", tags=["中文"]),
+            Video(path=to_file_uri("/test/ABC-003.mp4"), number="ABC-003", tags=[]),
+        ])
+        # 重掃覆寫：番號修正 → 旗標隨 upsert 一併更新
+        repo.upsert(Video(path=to_file_uri("/test/K9ABC-001.mp4"), number="ABC-001",
+                          tags=["中文"], nfo_mtime=10.0))
+
+        data = client.get("/api/collection/analysis").json()
+        assert _summary_view(data) == _brute_force_counts(tmp_db)
+        patterns = {p["name"]: p["count"] for p in data["corrupted_numbers"]["patterns"]}
+        assert patterns == {"digit_prefix": 1, "TK_prefix": 0, "K9_prefix": 0, "R_prefix": 0}
+        assert data["japanese_tags"]["total"] == 0
+
+    def test_fix_numbers_apply_heals_flags(self, tmp_db, client):
+        from core.database import Video, VideoRepository
+
+        repo = VideoRepository(tmp_db)
+        vid = repo.upsert(Video(path=to_file_uri("/test/TKSONE-205.mp4"), number="TKSONE-205"))
+        assert client.get("/api/collection/analysis").json()["corrupted_numbers"]["total"] == 1
+
+        resp = client.post("/api/collection/fix-numbers/apply", json={"ids": [vid]})
+        assert resp.json()["updated"] == 1
+
+        conn = sqlite3.connect(str(tmp_db))
+        try:
+            assert conn.execute("SELECT number_issue FROM videos").fetchone() == ("",)
+        finally:
+            conn.close()
+        data = client.get("/api/collection/analysis").json()
+        assert _summary_view(data) == _brute_force_counts(tmp_db)
+        assert data["corrupted_numbers"]["total"] == 0
+
+
+# ── I6: groups 依旗標欄位 drill-down ──────────────────────────────────────────
+
+class TestGroupsHealthFlags:
+    """I6: corrupted_numbers / japanese_tags group 走旗標欄位，結果與判定函式一致"""
+
+    def test_corrupted_and_japanese_groups(self, tmp_db, client):
+        _insert_videos(tmp_db, [
+            (to_file_uri("/test/TKSONE-205.mp4"), "TKSONE-205", "T1", "[]", "M",
+             '["ハイビジョン"]', "", "", "", None, "", 0.0),
+            (to_file_uri("/test/西洋/R-ABW-001.mp4"), "R-ABW-001", "T2", "[]", "M",
+             '["中文"]', "", "", "", None, "", 0.0),
+            (to_file_uri("/test/IPZ-154.mp4"), "IPZ-154", "T3", "[]", "M",
+             '["ドラマ"]', "", "", "", None, "", 0.0),
+        ])
+
+        resp = client.post("/api/collection/analysis/groups",
+                           json={"group": "corrupted_numbers", "exclude_western": False})
+        assert [i["number"] for i in resp.json()["items"]] == ["TKSONE-205", "R-ABW-001"]
+
+        resp = client.post("/api/collection/analysis/groups",
+                           json={"group": "corrupted_numbers", "exclude_western": True})
+        assert resp.json()["total"] == 1
+
+        resp = client.post("/api/collection/analysis/groups",
+                           json={"group": "japanese_tags", "exclude_western": False})
+        assert [i["number"] for i in resp.json()["items"]] == ["TKSONE-205", "IPZ-154"]
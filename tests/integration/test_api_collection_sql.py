@@ -11,6 +11,7 @@ from unittest.mock import patch, MagicMock, call
 from fastapi.testclient import TestClient
 
 from core.database import init_db
+from core.path_utils import to_file_uri
 
 
 # ── Fixtures ──────────────────────────────────────────────────────────────────
@@ -379,3 +380,117 @@ class TestLayer8Pragmas:
         assert "5000" in busy_timeout_calls[0], (
             f"busy_timeout 值不是 5000：{busy_timeout_calls[0]}"
         )
+
+
+# ── 層 10：執行預算 / ndjson / explain ─────────────────────────────────────────
+
+class TestQueryBudget:
+    """progress handler 預算：失控查詢被中斷並回傳固定訊息，不吃滿 worker"""
+
+    def test_cartesian_join_interrupted(self, client, monkeypatch):
+        monkeypatch.setattr("web.routers.collection._SQL_VM_STEP_BUDGET", 200_000)
+        resp = client.post("/api/collection/sql", json={
+            "sql": "SELECT COUNT(*) FROM videos a, videos b, videos c, videos d, videos e, "
+                   "videos f, videos g, videos h, videos i, videos j, videos k, videos l"
+        })
+        assert resp.status_code == 200
+        data = resp.json()
+        assert data["success"] is False
+        assert "耗費資源" in data["error"]
+
+    def test_time_budget_interrupts(self, client, monkeypatch):
+        monkeypatch.setattr("web.routers.collection._SQL_TIME_BUDGET_S", 0.0)
+        data = client.post("/api/collection/sql", json={
+            "sql": "SELECT COUNT(*) FROM videos a, videos b, videos c, videos d, videos e, "
+                   "videos f, videos g, videos h, videos i, videos j, videos k, videos l"
+        }).json()
+        assert data["success"] is False
+        assert "耗費資源" in data["error"]
+
+    def test_normal_query_within_budget(self, client):
+        data = client.post("/api/collection/sql", json={"sql": "SELECT COUNT(*) FROM videos"}).json()
+        assert data["success"] is True
+        assert data["rows"] == [[3]]
+
+
+class TestNdjsonMode:
+    """mode=ndjson：超過 500 筆上限的結果以 NDJSON 串流"""
+
+    def _lines(self, resp):
+        import json
+        return [json.loads(line) for line in resp.text.splitlines()]
+
+    def test_streams_beyond_row_cap(self, client, tmp_db):
+        conn = sqlite3.connect(str(tmp_db))
+        conn.executemany(
+            "INSERT INTO videos (path, number) VALUES (?, ?)",
+            [(to_file_uri(f"/bulk/B-{i}.mp4"), f"B-{i}") for i in range(1200)],
+        )
+        conn.commit()
+        conn.close()
+
+        resp = client.post("/api/collection/sql", json={
+            "sql": "SELECT id, number FROM videos ORDER BY id", "mode": "ndjson",
+        })
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("application/x-ndjson")
+        lines = self._lines(resp)
+        assert lines[0] == {"columns": ["id", "number"]}
+        assert len(lines[1:-1]) == 1203
+        assert lines[1][1] == "SONE-205"
+        assert lines[-1] == {"done": True, "count": 1203, "truncated": False}
+
+    def test_stream_row_cap_truncates(self, client, monkeypatch):
+        monkeypatch.setattr("web.routers.collection._SQL_STREAM_MAX_ROWS", 2)
+        lines = self._lines(client.post("/api/collection/sql", json={
+            "sql": "SELECT number FROM videos", "mode": "ndjson",
+        }))
+        assert len(lines) == 4
+        assert lines[-1] == {"done": True, "count": 2, "truncated": True}
+
+    def test_stream_exactly_at_cap_is_not_truncated(self, client, monkeypatch):
+        monkeypatch.setattr("web.routers.collection._SQL_STREAM_MAX_ROWS", 3)
+        lines = self._lines(client.post("/api/collection/sql", json={
+            "sql": "SELECT number FROM videos", "mode": "ndjson",
+        }))
+        assert len(lines) == 5
+        assert lines[-1] == {"done": True, "count": 3, "truncated": False}
+
+    def test_budget_exceeded_mid_stream_reports_error_line(self, client, monkeypatch):
+        monkeypatch.setattr("web.routers.collection._SQL_VM_STEP_BUDGET", 50_000)
+        lines = self._lines(client.post("/api/collection/sql", json={
+            "sql": "SELECT a.id FROM videos a, videos b, videos c, videos d, videos e, "
+                   "videos f, videos g, videos h, videos i, videos j, videos k, videos l",
+            "mode": "ndjson",
+        }))
+        assert lines[0] == {"columns": ["id"]}
+        assert lines[-1]["done"] is False
+        assert lines[-1]["count"] == len(lines) - 2 > 0
+        assert "耗費資源" in lines[-1]["error"]
+
+    def test_syntax_error_returns_json_error(self, client):
+        data = client.post("/api/collection/sql", json={
+            "sql": "SELECT * FORM videos", "mode": "ndjson",
+        }).json()
+        assert data["success"] is False
+        assert "SQL 執行失敗" in data["error"]
+
+
+class TestExplainMode:
+    """mode=explain：回傳 EXPLAIN QUERY PLAN，不執行查詢本身"""
+
+    def test_explain_reports_index_usage(self, client):
+        data = client.post("/api/collection/sql", json={
+            "sql": "SELECT id FROM videos WHERE path = 'file:///test/SONE-205.mp4'",
+            "mode": "explain",
+        }).json()
+        assert data["success"] is True
+        assert "detail" in data["columns"]
+        detail = data["columns"].index("detail")
+        assert any("USING" in row[detail] for row in data["rows"])
+
+    def test_explain_still_validated(self, client):
+        resp = client.post("/api/collection/sql", json={
+            "sql": "SELECT * FROM sqlite_master", "mode": "explain",
+        })
+        assert resp.status_code == 400
@@ -1700,7 +1700,7 @@ class TestScannerGenerateLongPathsField:
         long_skip_path = "C:\\" + "a" * 280  # len > 260
         short_skip_path = "C:\\short-denied.mp4"  # len < 260（權限拒絕，不是長路徑）
 
-        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None):
+        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None, workers=None, dir_index=None):
             if on_skip is not None:
                 on_skip(long_skip_path, OSError(206, "too long"))
                 on_skip(short_skip_path, PermissionError(13, "denied"))
@@ -1772,7 +1772,7 @@ class TestScannerGenerateLongPathsField:
         assert existing_uri in pre_scan, "DB 預設記錄塞入失敗，測試前提不成立"
 
         # 3. Stub fast_scan_directory：回傳 [] + on_skip 回報一筆長路徑
-        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None):
+        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None, workers=None, dir_index=None):
             if on_skip is not None:
                 long_path = str(scan_dir / ("x" * 280 + ".mp4"))  # > 260 chars
                 on_skip(long_path, OSError(206, "File name too long"))
@@ -1930,7 +1930,7 @@ class TestScanPruneThumbnailInvalidation:
         kept_fs = str(scan_dir / "kept_video.mp4")
         Path(kept_fs).write_bytes(b"x" * 1024)
 
-        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None):
+        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None, workers=None, dir_index=None):
             return [{"path": kept_fs, "size": 1024, "mtime": 2000000.0}]
 
         monkeypatch.setattr("web.routers.scanner.fast_scan_directory", stub_fast_scan)
@@ -2064,7 +2064,7 @@ class TestGenerateReadonlyBridge:
         ])
         monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
 
-        def side_effect(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force=False, reachable=True, strm_mappings_getter=None):
+        def side_effect(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force=False, reachable=True, strm_mappings_getter=None, journal=None, resume=False):
             from core.readonly_producer import ProduceResult
             if source.path == str(tmp_path / "src0"):
                 on_progress(ProduceOutcome(source_uri="uri1", status="created", number="ABC-001"))
@@ -2128,7 +2128,7 @@ class TestGenerateReadonlyBridge:
         ])
         monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
 
-        def side_effect(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force=False, reachable=True, strm_mappings_getter=None):
+        def side_effect(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force=False, reachable=True, strm_mappings_getter=None, journal=None, resume=False):
             if source.path == str(tmp_path / "src0"):
                 raise ValueError("boom (迴圈前 normalize/列檔/DB 逃出)")
             return ProduceResult(source_path=source.path, output_path=source.output_path, created=3)
@@ -2160,7 +2160,7 @@ class TestGenerateReadonlyBridge:
 
         written_uri = to_file_uri(str(tmp_path / "src0" / "worker_written.mp4"))
 
-        def side_effect(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force=False, reachable=True, strm_mappings_getter=None):
+        def side_effect(source, config, repo, *, proxy_url="", on_progress=None, should_abort=None, force=False, reachable=True, strm_mappings_getter=None, journal=None, resume=False):
             # 在 worker frame 用傳入的 repo 寫一筆（per-call 連線）
             repo.upsert(Video(path=written_uri, number="WK-001", title="worker",
                               mtime=1.0, nfo_mtime=0.0))
@@ -2434,7 +2434,7 @@ class TestGenerateReadonlyBridge:
                                   extra_config=None):
         """sources_scan_map: {src_dir_name: [{"path": fs_path, "size": n, "mtime": t}, ...]}"""
 
-        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None):
+        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None, workers=None, dir_index=None):
             key = Path(directory).name
             return sources_scan_map.get(key, [])
 
@@ -2541,7 +2541,7 @@ class TestGenerateReadonlyBridge:
         monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
         monkeypatch.setattr("web.routers.scanner.get_db_path", lambda: db_path)
 
-        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None):
+        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None, workers=None, dir_index=None):
             # 回報一筆讀取失敗路徑 + 回傳空列表 → skipped_paths 非空
             if on_skip is not None:
                 on_skip(str(src_a / "unreadable_dir"), OSError("denied"))
@@ -2607,7 +2607,7 @@ class TestGenerateReadonlyBridge:
         monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
         monkeypatch.setattr("web.routers.scanner.get_db_path", lambda: db_path)
 
-        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None):
+        def stub_fast_scan(directory, extensions, min_size_bytes, on_skip=None, workers=None, dir_index=None):
             # gone.mp4 不再出現，但列表非空（有 kept.mp4）→ gate 通過，觸發 prune
             return [{"path": kept_fs, "size": 1024, "mtime": 2.0}]
 
@@ -2770,6 +2770,9 @@ class TestGenerateAvlistShouldAbortTopLevel:
 
         dir0, files = self._make_dir_with_files(tmp_path, "src0", 3)
         cfg = self._config(tmp_path, [dir0])
+        # 逐檔同步執行：平行時後續檔案會被預先送進執行緒池，scan_file 次數不再精確
+        # （平行版的契約見下一個測試）
+        cfg["gallery"]["scan_file_workers"] = 1
         monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
         monkeypatch.setattr("web.routers.scanner.get_db_path", lambda: tmp_path / "test.db")
 
@@ -2805,6 +2808,30 @@ class TestGenerateAvlistShouldAbortTopLevel:
         parsed = self._parse_events(events)
         assert not [e for e in parsed if e.get("type") == "done"]
 
+    def test_inner_loop_break_with_parallel_scan_discards_prefetched_results(self, tmp_path, monkeypatch, mocker):
+        """scan_file 平行執行時，中止前已預先掃完的檔案結果不得寫入 DB。"""
+        from core.database import VideoRepository
+        from web.routers.scanner import generate_avlist
+
+        dir0, files = self._make_dir_with_files(tmp_path, "src0", 3)
+        cfg = self._config(tmp_path, [dir0])
+        cfg["gallery"]["scan_file_workers"] = 4
+        monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
+        monkeypatch.setattr("web.routers.scanner.get_db_path", lambda: tmp_path / "test.db")
+
+        self._patch_scan_file(mocker)
+        mocker.patch("web.routers.scanner.HTMLGenerator")
+        mock_notif = mocker.patch("web.routers.scanner._emit_notif")
+
+        # 同上：第 3 次（inner file1 之前）True
+        events = list(generate_avlist(should_abort=self._counting_should_abort(trigger_after=2)))
+
+        # 只有中止前已消費的第一個檔案被寫入（檔案順序依 scandir，不固定是哪一個）
+        stored = [v.path for v in VideoRepository(tmp_path / "test.db").get_all()]
+        assert len(stored) == 1 and stored[0] in {to_file_uri(f) for f in files}
+        self._assert_cancelled_terminal(mock_notif)
+        assert not [e for e in self._parse_events(events) if e.get("type") == "done"]
+
     # ---- (2b) tail-race：迴圈已跑完、尾段進行中才斷線（PR#90b Codex P1）----
 
     def test_tail_race_disconnect_after_loop_reports_cancelled_not_success(
@@ -2915,6 +2942,97 @@ class TestGenerateAvlistShouldAbortTopLevel:
 
 # ============ TASK-98b-T2: 掃描 empty-focal gate（scanner.py router 路徑） ============
 
+class TestGenerateAvlistResume:
+    """掃描日誌（core.database.scan_journal）：中斷保留日誌，resume 不重新列舉、只補剩下的檔案。"""
+
+    def _setup(self, tmp_path, monkeypatch, mocker, count):
+        from core.gallery_scanner import VideoInfo
+
+        src = tmp_path / "src"
+        src.mkdir()
+        for i in range(count):
+            (src / f"video_{i}.mp4").write_bytes(b"x" * 2048)
+        output_dir = tmp_path / "html_out"
+        output_dir.mkdir()
+        cfg = {
+            "gallery": {
+                "directories": [str(src)], "output_dir": str(output_dir), "path_mappings": {},
+                "min_size_mb": 0, "scan_file_workers": 1,
+            },
+            "search": {"proxy_url": ""},
+            "general": {"theme": "light"},
+            "scraper": {"video_extensions": [".mp4"]},
+        }
+        monkeypatch.setattr("web.routers.scanner.load_config", lambda: cfg)
+        monkeypatch.setattr("web.routers.scanner.get_db_path", lambda: tmp_path / "test.db")
+        monkeypatch.setattr("web.routers.scanner.SCAN_UPSERT_CHUNK", 2)
+        mocker.patch("web.routers.scanner.HTMLGenerator")
+        mocker.patch("web.routers.scanner._emit_notif")
+        calls = []
+
+        def fake_scan_file(self, video_path, base_path=None):
+            calls.append(os.path.basename(video_path))
+            return VideoInfo(path=to_file_uri(video_path), title="t", num="ABC-001")
+
+        mocker.patch("web.routers.scanner.VideoScanner.scan_file", fake_scan_file)
+        return src, calls
+
+    def _abort_after(self, n):
+        state = {"n": 0}
+
+        def fake():
+            state["n"] += 1
+            return state["n"] > n
+        return fake
+
+    def test_abort_keeps_journal_and_resume_finishes_without_relisting(self, tmp_path, monkeypatch, mocker):
+        from core.database import ScanJournalRepository, VideoRepository
+        from web.routers.scanner import generate_avlist
+
+        src, calls = self._setup(tmp_path, monkeypatch, mocker, 5)
+        # 呼叫序列：來源層 #1，逐檔 #2..#4 → 第 4 檔之前中止；第 2 檔時分段寫入推進游標
+        list(generate_avlist(should_abort=self._abort_after(4)))
+        assert len(calls) == 3
+        journal = ScanJournalRepository(tmp_path / "test.db")
+        [entry] = journal.list_unfinished()
+        assert (entry["kind"], entry["processed"], entry["total"]) == ("gallery", 2, 5)
+
+        first_run = set(calls)
+        calls.clear()
+        listing = mocker.patch("web.routers.scanner.fast_scan_directory")
+        list(generate_avlist(resume=True))
+
+        listing.assert_not_called()
+        assert set(calls) == {f"video_{i}.mp4" for i in range(5)} - first_run
+        assert len(calls) == 2
+        assert journal.list_unfinished() == []
+        assert VideoRepository(tmp_path / "test.db").count() == 5
+
+    def test_resume_without_journal_lists_normally(self, tmp_path, monkeypatch, mocker):
+        from core.database import ScanJournalRepository
+        from web.routers.scanner import generate_avlist
+
+        _src, calls = self._setup(tmp_path, monkeypatch, mocker, 3)
+        list(generate_avlist(resume=True))
+        assert len(calls) == 3
+        assert ScanJournalRepository(tmp_path / "test.db").list_unfinished() == []
+
+    def test_resume_does_not_infer_deletions(self, tmp_path, monkeypatch, mocker):
+        from core.database import VideoRepository
+        from web.routers.scanner import generate_avlist
+
+        src, calls = self._setup(tmp_path, monkeypatch, mocker, 4)
+        list(generate_avlist(should_abort=self._abort_after(4)))
+        [not_scanned] = {f"video_{i}.mp4" for i in range(4)} - set(calls)
+        # 中斷後才消失的檔案：續掃不掃它，也不把已入庫的列當成刪除
+        (src / calls[0]).unlink()
+        (src / not_scanned).unlink()
+        calls.clear()
+        list(generate_avlist(resume=True))
+        assert calls == []
+        assert VideoRepository(tmp_path / "test.db").count() == 3
+
+
 class TestGenerateAvlistFocalTrigger:
     """generate_avlist 掃描入庫後的 focal trigger（empty-focal gate，router 路徑）。
 
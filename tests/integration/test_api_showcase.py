@@ -667,6 +667,18 @@ class TestShowcaseThumbnailCacheCoverUrl:
         # thumb key 必須是 video path，不是 cover path
         assert quote(cover_setup["cover_uri"], safe="") not in v["cover_url"]
 
+    def test_cover_srcset_lists_thumb_widths_only_when_enabled(self, client, cover_setup, mocker):
+        """多寬度縮圖：enabled → srcset 列出各寬度（預設寬度即 cover_url）；disabled / 無封面 → ''。"""
+        videos = self._get_videos(client, mocker, cover_setup, enabled=True)
+        v = videos[cover_setup["vid_cover_uri"]]
+        assert v["cover_srcset"] == (
+            f"{v['cover_url']}&w=200 200w, {v['cover_url']} 400w, {v['cover_url']}&w=800 800w"
+        )
+        assert videos[cover_setup["vid_nocover_uri"]]["cover_srcset"] == ""
+
+        videos = self._get_videos(client, mocker, cover_setup, enabled=False)
+        assert videos[cover_setup["vid_cover_uri"]]["cover_srcset"] == ""
+
     def test_disabled_cover_url_is_image_bytewise(self, client, cover_setup, mocker):
         """邊界 2：disabled → cover_url = /api/gallery/image?path=quote(uri_to_fs_path(cover))（字節不變）。"""
         videos = self._get_videos(client, mocker, cover_setup, enabled=False)
@@ -801,3 +813,237 @@ class TestAC18EnrichOnlyTouchesPart1:
         assert not part2_nfo.exists(), "part-2 不應該生出 NFO"
         assert part2_fs.stat().st_mtime == part2_mtime_before
         assert part2_fs.read_bytes() == part2_content_before
+
+
+class TestShowcaseSearch:
+    """GET /api/showcase/search — FTS5 trigram 全文檢索（排序、分頁、scope、短詞）"""
+
+    @pytest.fixture
+    def search_setup(self, tmp_path):
+        video_dir = tmp_path / "videos"
+        video_dir.mkdir()
+        outside_dir = tmp_path / "outside"
+        outside_dir.mkdir()
+
+        db_path = tmp_path / "search_test.db"
+        init_db(db_path)
+        repo = VideoRepository(db_path)
+        repo.upsert_batch([
+            Video(path=to_file_uri(str(video_dir / "a.mp4"), {}), number="SONE-205",
+                  title="新人デビュー", actresses=["三上悠亜"], series="SONE シリーズ"),
+            Video(path=to_file_uri(str(video_dir / "b.mp4"), {}), number="ABW-001",
+                  title="Summer Story", actresses=["河北彩花"], tags=["单体作品"]),
+            Video(path=to_file_uri(str(video_dir / "c.mp4"), {}), number="ABW-002",
+                  title="Winter Story", actresses=["河北彩花", "三上悠亜"]),
+            Video(path=to_file_uri(str(outside_dir / "d.mp4"), {}), number="SONE-999",
+                  title="Out of scope"),
+        ])
+        config = {
+            "gallery": {"directories": [str(video_dir)], "path_mappings": {}},
+        }
+        return {"db_path": db_path, "config": config, "repo": repo}
+
+    def _get(self, client, mocker, setup, **params):
+        mocker.patch("web.routers.showcase.get_db_path", return_value=setup["db_path"])
+        mocker.patch("web.routers.showcase.load_config", return_value=setup["config"])
+        resp = client.get("/api/showcase/search", params=params)
+        assert resp.status_code == 200
+        return resp.json()
+
+    def test_number_fragment_case_insensitive_and_scoped(self, client, search_setup, mocker):
+        data = self._get(client, mocker, search_setup, q="sone")
+        assert data["success"] is True
+        assert [v["number"] for v in data["videos"]] == ["SONE-205"]
+        assert data["total"] == 1
+
+    def test_cjk_substring_match(self, client, search_setup, mocker):
+        data = self._get(client, mocker, search_setup, q="三上悠")
+        assert {v["number"] for v in data["videos"]} == {"SONE-205", "ABW-002"}
+
+    def test_terms_are_anded(self, client, search_setup, mocker):
+        data = self._get(client, mocker, search_setup, q="story 三上悠亜")
+        assert [v["number"] for v in data["videos"]] == ["ABW-002"]
+
+    def test_short_term_falls_back_to_like(self, client, search_setup, mocker):
+        """兩字詞 trigram 無法索引，仍要命中（LIKE 子條件）"""
+        data = self._get(client, mocker, search_setup, q="河北")
+        assert {v["number"] for v in data["videos"]} == {"ABW-001", "ABW-002"}
+
+    def test_pagination(self, client, search_setup, mocker):
+        first = self._get(client, mocker, search_setup, q="story", limit=1, offset=0)
+        second = self._get(client, mocker, search_setup, q="story", limit=1, offset=1)
+        assert first["total"] == second["total"] == 2
+        assert len(first["videos"]) == len(second["videos"]) == 1
+        assert first["videos"][0]["path"] != second["videos"][0]["path"]
+
+    def test_fts_syntax_is_not_interpreted(self, client, search_setup, mocker):
+        """FTS5 運算子／引號當字面處理，不可 500"""
+        data = self._get(client, mocker, search_setup, q='"ABW OR NEAR(x*')
+        assert data["success"] is True
+        assert data["total"] == 0
+
+    def test_index_follows_updates(self, client, search_setup, mocker):
+        repo = search_setup["repo"]
+        v = repo.get_by_number("ABW-001")
+        v.title = "Autumn Leaves"
+        repo.upsert(v)
+        assert self._get(client, mocker, search_setup, q="autumn")["total"] == 1
+        assert [x["number"] for x in self._get(client, mocker, search_setup, q="story")["videos"]] == ["ABW-002"]
+
+
+class TestShowcaseVideosPaging:
+    """GET /api/showcase/videos?limit=… — keyset 分頁、伺服器端排序／篩選（不帶 limit 行為不變）"""
+
+    @pytest.fixture
+    def paging_setup(self, tmp_path):
+        video_dir = tmp_path / "videos"
+        video_dir.mkdir()
+        (video_dir / "multi").mkdir()
+        outside_dir = tmp_path / "outside"
+        outside_dir.mkdir()
+
+        def uri(d, name):
+            return to_file_uri(str(d / name), {})
+
+        db_path = tmp_path / "paging_test.db"
+        init_db(db_path)
+        repo = VideoRepository(db_path)
+        repo.upsert_batch([
+            Video(path=uri(video_dir, "a.mp4"), number="AAA-001", release_date="2024-03-01",
+                  actresses=["甲"], tags=["單體作品"], maker="M1", size_bytes=300,
+                  cover_path=uri(video_dir, "a.jpg")),
+            Video(path=uri(video_dir, "b.mp4"), number="BBB-001", release_date="2024-02-01",
+                  actresses=["乙"], maker="M2", size_bytes=100),
+            Video(path=uri(video_dir, "c.mp4"), number="CCC-001", release_date="2024-02-01",
+                  actresses=["甲", "乙"], tags=["單體作品"], maker="M1", size_bytes=200,
+                  cover_path=uri(video_dir, "c.jpg")),
+            Video(path=uri(video_dir, "d.mp4"), number="DDD-001", release_date=None, size_bytes=50),
+            Video(path=uri(video_dir / "multi", "EEE-001-cd1.mp4"), number="EEE-001",
+                  release_date="2024-01-01", size_bytes=10),
+            Video(path=uri(video_dir / "multi", "EEE-001-cd2.mp4"), number="EEE-001",
+                  release_date="2024-01-01", size_bytes=20),
+            Video(path=uri(outside_dir, "z.mp4"), number="ZZZ-001", release_date="2025-01-01"),
+        ])
+        repo.set_user_rating(uri(video_dir, "a.mp4"), 1)  # upsert 不寫 user_rating（CD-123-3）
+        config = {"gallery": {"directories": [str(video_dir)], "path_mappings": {}}}
+        return {"db_path": db_path, "config": config}
+
+    def _get(self, client, mocker, setup, expect=200, **params):
+        mocker.patch("web.routers.showcase.get_db_path", return_value=setup["db_path"])
+        mocker.patch("web.routers.showcase.load_config", return_value=setup["config"])
+        resp = client.get("/api/showcase/videos", params=params)
+        assert resp.status_code == expect, resp.text
+        return resp.json()
+
+    def _walk(self, client, mocker, setup, **params):
+        numbers, cursor, pages = [], None, 0
+        while True:
+            q = dict(params, **({"cursor": cursor} if cursor else {}))
+            data = self._get(client, mocker, setup, **q)
+            numbers += [v["number"] for v in data["videos"]]
+            pages += 1
+            cursor = data["next_cursor"]
+            if cursor is None:
+                return numbers, data, pages
+
+    def test_walk_date_desc_covers_scope_once(self, client, paging_setup, mocker):
+        numbers, last, pages = self._walk(client, mocker, paging_setup, limit=2)
+        # 同日（BBB/CCC）以 id DESC 決勝；NULL release_date 排最後；分集片只出現一次；scope 外不出現
+        assert numbers == ["AAA-001", "CCC-001", "BBB-001", "EEE-001", "DDD-001"]
+        assert pages == 3
+        assert last["total"] == 6  # 檔案數（EEE 兩段各算一筆）
+
+    def test_multipart_group_merged_even_with_limit_one(self, client, paging_setup, mocker):
+        numbers, _, _ = self._walk(client, mocker, paging_setup, limit=1, sort="size", order="asc")
+        assert numbers == ["EEE-001", "DDD-001", "BBB-001", "CCC-001", "AAA-001"]
+        data = self._get(client, mocker, paging_setup, limit=1, sort="size", order="asc")
+        group = data["videos"][0]
+        assert group["part_tokens"] == ["cd1", "cd2"]
+        assert group["size"] == 30
+
+    @pytest.mark.parametrize("params,expected", [
+        ({"actress": "甲"}, {"AAA-001", "CCC-001"}),
+        ({"tag": "單體作品", "maker": "M1"}, {"AAA-001", "CCC-001"}),
+        ({"has_cover": "false"}, {"BBB-001", "DDD-001", "EEE-001"}),
+        ({"rating": 1}, {"AAA-001"}),
+        ({"maker": "nope"}, set()),
+    ])
+    def test_filters(self, client, paging_setup, mocker, params, expected):
+        data = self._get(client, mocker, paging_setup, limit=50, **params)
+        assert {v["number"] for v in data["videos"]} == expected
+        assert data["next_cursor"] is None
+
+    def test_cursor_must_match_sort(self, client, paging_setup, mocker):
+        first = self._get(client, mocker, paging_setup, limit=1, sort="mtime")
+        self._get(client, mocker, paging_setup, expect=400, limit=1, sort="size",
+                  cursor=first["next_cursor"])
+        self._get(client, mocker, paging_setup, expect=400, limit=1, cursor="!!garbage")
+
+    def test_invalid_sort_rejected(self, client, paging_setup, mocker):
+        self._get(client, mocker, paging_setup, expect=422, limit=1, sort="title")
+
+    def test_no_limit_keeps_full_payload(self, client, paging_setup, mocker):
+        data = self._get(client, mocker, paging_setup, sort="size")
+        assert data["total"] == 5
+        assert "next_cursor" not in data
+
+
+class TestShowcaseVideosPayloadCache:
+    """GET /api/showcase/videos（不分頁）— generation × config 快取、強 ETag / 304、gzip"""
+
+    def _patch(self, mocker, setup, config=None):
+        mocker.patch("web.routers.showcase.get_db_path", return_value=setup["db_path"])
+        mocker.patch("web.routers.showcase.load_config", return_value=config or setup["config"])
+
+    def test_conditional_request_gets_304(self, client, showcase_setup, mocker):
+        self._patch(mocker, showcase_setup)
+        first = client.get("/api/showcase/videos")
+        etag = first.headers["etag"]
+        assert etag.startswith('"') and etag.endswith('"')
+        assert first.headers["cache-control"] == "no-cache"
+
+        again = client.get("/api/showcase/videos", headers={"If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+    def test_unchanged_library_skips_rebuild(self, client, showcase_setup, mocker):
+        self._patch(mocker, showcase_setup)
+        spy = mocker.spy(VideoRepository, "get_all_in_scope")
+        first = client.get("/api/showcase/videos")
+        second = client.get("/api/showcase/videos")
+        assert spy.call_count == 1
+        assert first.content == second.content
+
+    def test_write_invalidates(self, client, showcase_setup, mocker):
+        self._patch(mocker, showcase_setup)
+        etag = client.get("/api/showcase/videos").headers["etag"]
+
+        VideoRepository(showcase_setup["db_path"]).set_user_rating(showcase_setup["vid1_uri"], 1)
+
+        resp = client.get("/api/showcase/videos", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etag
+        rated = {v["path"]: v["user_rating"] for v in resp.json()["videos"]}
+        assert rated[showcase_setup["vid1_uri"]] == 1
+
+    def test_config_change_invalidates(self, client, showcase_setup, mocker):
+        self._patch(mocker, showcase_setup)
+        assert client.get("/api/showcase/videos").json()["total"] == 2
+
+        self._patch(mocker, showcase_setup, config={"gallery": {"directories": [], "path_mappings": {}}})
+        assert client.get("/api/showcase/videos").json()["total"] == 0
+
+    def test_gzip_representation(self, client, showcase_setup, mocker, monkeypatch):
+        monkeypatch.setattr("web.routers.showcase._PAYLOAD_GZIP_MIN_BYTES", 1)
+        self._patch(mocker, showcase_setup)
+        plain = client.get("/api/showcase/videos", headers={"Accept-Encoding": "identity"})
+        zipped = client.get("/api/showcase/videos", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in plain.headers
+        assert zipped.headers["content-encoding"] == "gzip"
+        assert zipped.headers["etag"] != plain.headers["etag"]
+        assert zipped.json() == plain.json()
+
+        not_modified = client.get("/api/showcase/videos", headers={
+            "Accept-Encoding": "gzip", "If-None-Match": zipped.headers["etag"]})
+        assert not_modified.status_code == 304
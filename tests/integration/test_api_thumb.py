@@ -8,6 +8,8 @@
 隔離關鍵：thumbnail_cache._thumb_dir 與 scanner.get_db_path 是兩個獨立 reference，
 兩者都要 patch（見 TASK card 測試隔離坑）。
 """
+import os
+
 import pytest
 from pathlib import Path
 
@@ -95,6 +97,19 @@ class TestGetThumbHit:
         repo_spy.assert_not_called()
         db_spy.assert_not_called()
 
+    def test_repeat_hit_served_from_memory(self, client, thumb_dir, mocker):
+        """熱快取：同一張第二次 serve 不再讀檔（read_bytes 被擋仍 200、內容 / ETag 相同）。"""
+        uri = to_file_uri("/movies/v1.mp4")
+        _make_webp(thumbnail_cache.thumb_file_for(uri))
+        first = client.get("/api/gallery/thumb", params={"path": uri})
+
+        mocker.patch.object(Path, "read_bytes", side_effect=AssertionError("hit 應走熱快取"))
+        second = client.get("/api/gallery/thumb", params={"path": uri})
+
+        assert second.status_code == 200
+        assert second.content == first.content
+        assert second.headers["etag"] == first.headers["etag"]
+
     def test_if_none_match_returns_304(self, client, thumb_dir):
         """邊界3：If-None-Match 命中 → 304 空 body。"""
         uri = to_file_uri("/movies/v1.mp4")
@@ -111,6 +126,19 @@ class TestGetThumbHit:
         assert resp.status_code == 304
         assert resp.content == b""
 
+    def test_304_revalidation_counts_as_access(self, client, thumb_dir, monkeypatch):
+        """縮圖是 no-cache ＋ ETag，重複瀏覽多半是 304：也要更新 LRU 存取時間，否則最熱的封面先被淘汰。"""
+        uri = to_file_uri("/movies/v1.mp4")
+        tf = thumbnail_cache.thumb_file_for(uri)
+        _make_webp(tf)
+        etag = client.get("/api/gallery/thumb", params={"path": uri}).headers["etag"]
+        monkeypatch.setattr(thumbnail_cache, "_last_access", {})
+
+        resp = client.get("/api/gallery/thumb", params={"path": uri}, headers={"If-None-Match": etag})
+
+        assert resp.status_code == 304
+        assert thumbnail_cache._last_access.get(thumbnail_cache._entry_hash(tf))
+
 
 class TestGetThumbMiss:
     def test_miss_generates_webp(self, client, thumb_dir, thumb_enabled, temp_db, tmp_path):
@@ -132,6 +160,22 @@ class TestGetThumbMiss:
         assert resp.headers["content-type"] == "image/webp"
         assert tf.exists()
 
+    def test_miss_with_width_serves_requested_variant(self, client, thumb_dir, thumb_enabled, temp_db, tmp_path):
+        """多寬度：w=700 → 對到 800 檔；一次 miss 生成全部寬度。"""
+        import io
+        from core.database import Video
+        _, repo = temp_db
+        cover = _make_small_jpg(tmp_path / "cover.jpg", size=(1600, 1000))
+        uri = to_file_uri("/movies/wide.mp4")
+        repo.upsert_batch([Video(path=uri, mtime=100.0, cover_path=to_file_uri(str(cover)))])
+
+        resp = client.get("/api/gallery/thumb", params={"path": uri, "w": 700})
+
+        assert resp.status_code == 200
+        with Image.open(io.BytesIO(resp.content)) as img:
+            assert img.width == 800
+        assert all(thumbnail_cache.thumb_file_for(uri, w).exists() for w in thumbnail_cache.THUMB_WIDTHS)
+
     def test_no_cover_returns_404(self, client, thumb_dir, temp_db):
         """邊界5a：DB 有 video 但 cover_path 空 → 404。"""
         from core.database import Video
@@ -459,11 +503,24 @@ class TestThumbHitConcurrentUnlinkRace:
 
 # ============ P2: clear/prewarm 競態（feature/71 round-3）============
 
+def _cover_map_side_effect(get_by_path_side):
+    """把「逐次 get_by_path 回值」（單一 video / None / list）轉成
+    repo.get_cover_path_map 的 side_effect：每次呼叫取下一個回值，套到該批全部 path。"""
+    seq = list(get_by_path_side) if isinstance(get_by_path_side, list) else None
+
+    def cover_map(paths):
+        video = seq.pop(0) if seq is not None else get_by_path_side
+        if video is None or not video.cover_path:
+            return {}
+        return {p: video.cover_path for p in paths}
+    return cover_map
+
+
 class TestPrewarmClearRace:
     """round-3 P2：_prewarm_worker 從 stale snapshot 逐一 generate；期間用戶按
     「清除所有影片快取」→ clear_cache 跑 repo.clear_all() + thumbnail_cache.clear_all()
     （rmtree）。worker 不可在已清空目錄重建 orphan webp（DB 空 thumb 在）。
-    修法：迴圈內 get_by_path re-check（before 跳過 / after 清 TOCTOU 孤兒），surgical。
+    修法：逐批 get_cover_path_map re-check（before 跳過 / after 清 TOCTOU 孤兒），surgical。
     """
 
     def _patch_worker_deps(self, mocker, iter_items, get_by_path_side,
@@ -493,11 +550,10 @@ class TestPrewarmClearRace:
 
         repo_mock = mocker.MagicMock()
         repo_mock.get_all.return_value = []  # iter_missing 被 mock，回值不重要
-        if isinstance(get_by_path_side, list):
-            repo_mock.get_by_path.side_effect = get_by_path_side
-        else:
-            repo_mock.get_by_path.return_value = get_by_path_side
+        repo_mock.get_cover_path_map.side_effect = _cover_map_side_effect(get_by_path_side)
         mocker.patch("web.routers.scanner.VideoRepository", return_value=repo_mock)
+        # 一批一張：before/after fence 逐批進行，批量 1 讓下列斷言維持逐張語意
+        mocker.patch("web.routers.scanner._PREWARM_CHUNK", 1)
 
         mocker.patch(
             "web.routers.scanner.thumbnail_cache.iter_missing",
@@ -718,6 +774,50 @@ class TestPrewarmClearRace:
         assert "notif.thumb_prewarm_done" not in done_keys  # 不送誤導 done
 
 
+class TestPrewarmBatching:
+    """_prewarm_worker 逐批：批次查 cover（before/after 各一次）+ 執行緒池生成 + 進度回寫通知。"""
+
+    def test_chunk_uses_bulk_cover_queries_and_reports_progress(self, mocker):
+        import web.routers.scanner as scanner_mod
+
+        uris = [to_file_uri(f"/m/{c}.mp4") for c in "abc"]
+        db_path = mocker.MagicMock()
+        db_path.exists.return_value = True
+        mocker.patch("web.routers.scanner.get_db_path", return_value=db_path)
+        mocker.patch("web.routers.scanner.load_config", return_value={"thumbnail_cache_enabled": True})
+        repo_mock = mocker.MagicMock()
+        repo_mock.get_cover_path_map.side_effect = lambda paths: {
+            p: to_file_uri("/cover/" + p.rsplit("/", 1)[-1] + ".jpg") for p in paths
+        }
+        mocker.patch("web.routers.scanner.VideoRepository", return_value=repo_mock)
+        mocker.patch("web.routers.scanner.thumbnail_cache.iter_missing",
+                     return_value=iter([(u, "/stale.jpg") for u in uris]))
+        gen_spy = mocker.patch("web.routers.scanner.thumbnail_cache.generate", return_value=True)
+        mocker.patch("web.routers.scanner.thumbnail_cache.invalidate")
+        notif_spy = mocker.patch("web.routers.scanner._emit_notif", return_value="nid")
+        update_spy = mocker.patch("web.routers.scanner._update_notif")
+
+        scanner_mod._prewarming = True
+        try:
+            scanner_mod._prewarm_worker()
+        finally:
+            scanner_mod._prewarming = False
+
+        assert gen_spy.call_count == 3
+        assert repo_mock.get_cover_path_map.call_count == 2  # 一批：before + after
+        repo_mock.get_by_path.assert_not_called()
+        assert update_spy.call_args.args[0] == "nid"
+        assert update_spy.call_args.args[1].startswith("3/3 張")
+        assert notif_spy.call_args.args[1] == "notif.thumb_prewarm_done"
+        assert notif_spy.call_args.kwargs["message"] == "3 張"
+
+    def test_progress_format(self):
+        from web.routers.scanner import _format_prewarm_progress
+
+        assert _format_prewarm_progress(100, 400, 10.0) == "100/400 張 · 10.0 張/秒 · 剩餘約 0 分 30 秒"
+        assert _format_prewarm_progress(400, 400, 20.0).endswith("完成")
+
+
 # ============ POST /api/gallery/thumb/clear (71b-T2) ============
 
 class TestThumbClear:
@@ -768,6 +868,120 @@ class TestThumbClear:
         assert resp.json() == {"cleared": True}
 
 
+# ============ 容量管理：GC（孤兒 + LRU 淘汰）/ stats ============
+
+class TestThumbGc:
+    """背景 GC 依 DB 清孤兒；stats 回報佔用與上限；預熱補到上限即停。"""
+
+    def test_gc_worker_removes_thumbs_of_videos_not_in_db(self, thumb_dir, temp_db, mocker):
+        import web.routers.scanner as scanner_mod
+        from core.database import Video
+        _, repo = temp_db
+        keep, gone = to_file_uri("/movies/keep.mp4"), to_file_uri("/movies/gone.mp4")
+        repo.upsert_batch([Video(path=keep, mtime=1.0)])
+        for uri in (keep, gone):
+            f = _make_webp(thumbnail_cache.thumb_file_for(uri))
+            os.utime(f, (1_000_000, 1_000_000))
+        mocker.patch("web.routers.scanner.load_config", return_value={})
+
+        scanner_mod._thumb_gc_running = True
+        scanner_mod._thumb_gc_worker()
+
+        assert thumbnail_cache.thumb_file_for(keep).exists()
+        assert not thumbnail_cache.thumb_file_for(gone).exists()
+        assert scanner_mod._thumb_gc_running is False
+
+    def test_gc_endpoint_single_flight(self, client, mocker):
+        import web.routers.scanner as scanner_mod
+        mocker.patch("web.routers.scanner.threading.Thread")
+        scanner_mod._thumb_gc_running = False
+        try:
+            assert client.post("/api/gallery/thumb/gc").json() == {"status": "started"}
+            assert client.post("/api/gallery/thumb/gc").json() == {"status": "already_running"}
+        finally:
+            scanner_mod._thumb_gc_running = False
+
+    def test_stats_reports_usage_and_limit(self, client, thumb_dir, mocker):
+        mocker.patch("web.routers.scanner.load_config", return_value={"thumbnail_cache_max_mb": 2})
+        f = _make_webp(thumbnail_cache.thumb_file_for(to_file_uri("/movies/a.mp4")))
+
+        data = client.get("/api/gallery/thumb/stats").json()
+
+        assert data["entries"] == 1 and data["files"] == 1
+        assert data["bytes"] == f.stat().st_size
+        assert data["max_bytes"] == 2 * 1024 * 1024
+        assert data["gc_running"] is False
+
+    def test_prewarm_stops_at_size_limit(self, mocker):
+        import web.routers.scanner as scanner_mod
+
+        uris = [to_file_uri(f"/m/{c}.mp4") for c in "abc"]
+        db_path = mocker.MagicMock()
+        db_path.exists.return_value = True
+        mocker.patch("web.routers.scanner.get_db_path", return_value=db_path)
+        mocker.patch("web.routers.scanner.load_config",
+                     return_value={"thumbnail_cache_enabled": True, "thumbnail_cache_max_mb": 1})
+        repo_mock = mocker.MagicMock()
+        repo_mock.get_cover_path_map.side_effect = lambda paths: {p: to_file_uri("/c.jpg") for p in paths}
+        mocker.patch("web.routers.scanner.VideoRepository", return_value=repo_mock)
+        mocker.patch("web.routers.scanner._PREWARM_CHUNK", 1)
+        mocker.patch("web.routers.scanner.thumbnail_cache.iter_missing",
+                     return_value=iter([(u, "/c.jpg") for u in uris]))
+        mocker.patch("web.routers.scanner.thumbnail_cache.usage", return_value={"bytes": 0})
+        mocker.patch("web.routers.scanner.thumbnail_cache.entry_bytes", return_value=600 * 1024)
+        gen_spy = mocker.patch("web.routers.scanner.thumbnail_cache.generate", return_value=True)
+        mocker.patch("web.routers.scanner._emit_notif", return_value="nid")
+        mocker.patch("web.routers.scanner._update_notif")
+
+        scanner_mod._prewarming = True
+        try:
+            scanner_mod._prewarm_worker()
+        finally:
+            scanner_mod._prewarming = False
+
+        assert gen_spy.call_count == 2  # 600KB + 600KB 超過 1MB → 第三張不生成
+
+
+# ============ 打包模式（thumbnail_cache_packed）============
+
+@pytest.fixture
+def packed_store(thumb_dir):
+    thumbnail_cache.use_packed(True)
+    yield
+    thumbnail_cache.use_packed(False)
+
+
+class TestGetThumbPacked:
+    """打包模式：miss 生成進 pack、hit 由索引 + mmap serve，ETag / 304 語意同檔案模式。"""
+
+    def test_miss_then_hit_served_from_pack(self, client, thumb_dir, thumb_enabled, temp_db,
+                                            packed_store, tmp_path):
+        from core.database import Video
+        _, repo = temp_db
+        cover = _make_small_jpg(tmp_path / "cover.jpg")
+        uri = to_file_uri("/movies/v1.mp4")
+        repo.upsert_batch([Video(path=uri, mtime=100.0, cover_path=to_file_uri(str(cover)))])
+
+        miss = client.get("/api/gallery/thumb", params={"path": uri})
+        assert miss.status_code == 200
+        assert miss.headers["content-type"] == "image/webp"
+        assert not thumbnail_cache.thumb_file_for(uri).exists()  # 不落散檔
+
+        hit = client.get("/api/gallery/thumb", params={"path": uri})
+        assert hit.content == miss.content
+        assert hit.headers["ETag"] == miss.headers["ETag"]
+
+        revalidate = client.get("/api/gallery/thumb", params={"path": uri},
+                                headers={"If-None-Match": hit.headers["ETag"]})
+        assert revalidate.status_code == 304
+
+    def test_stats_reports_packed(self, client, thumb_dir, packed_store, mocker):
+        mocker.patch("web.routers.scanner.load_config", return_value={})
+        data = client.get("/api/gallery/thumb/stats").json()
+        assert data["packed"] is True
+        assert data["entries"] == 0 and data["disk_bytes"] == 0
+
+
 # ============ TASK-71c P2-A：double-decode（字面 % 路徑 miss → 404）============
 
 class TestGetThumbDoubleDecodeP2A:
@@ -984,7 +1198,7 @@ class TestUriToLocalFsPathReverseMappingThumb:
         video_a = mocker.MagicMock(cover_path=cover_uri)
         repo_mock = mocker.MagicMock()
         repo_mock.get_all.return_value = []  # iter_missing 被 mock，回值不重要
-        repo_mock.get_by_path.side_effect = [video_a, video_a]
+        repo_mock.get_cover_path_map.side_effect = _cover_map_side_effect([video_a, video_a])
         mocker.patch("web.routers.scanner.VideoRepository", return_value=repo_mock)
 
         mocker.patch(
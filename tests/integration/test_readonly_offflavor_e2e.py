@@ -55,6 +55,10 @@ _BASELINE_VIDEO_COLUMNS = {
     # spec-123 精選：user_rating（全域 migration 加的欄位，同樣不是 off-flavor 寫入路徑新增；
     # 該路徑對它零寫入——CD-123-3 已把它排除在 upsert/upsert_batch/repath 分支 2 之外）
     "user_rating",
+    # path_key：path 的正規化 scope 索引鍵（全域 migration，由 path 衍生，非新的內容欄位）
+    "path_key",
+    # 健康度旗標：由 number / tags 衍生（collection analysis 統計用，全域 migration）
+    "number_issue", "has_japanese_tags",
 }
 
 _FAKE_COVER_BYTES = b"\xff\xd8\xff\xe0FAKE-COVER-JPEG"
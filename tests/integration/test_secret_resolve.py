@@ -28,7 +28,7 @@ CONNECT_URL = "http://192.168.1.10:8080"
 
 
 def _seed_three_secrets() -> None:
-    cfg = load_config()
+    cfg = load_config().copy()
     cfg.setdefault("translate", {}).setdefault("gemini", {})["api_key"] = GEMINI_PLAIN
     cfg.setdefault("translate", {}).setdefault("openai", {})["api_key"] = OPENAI_PLAIN
     cfg.setdefault("metatube", {})["token"] = METATUBE_PLAIN
@@ -146,7 +146,7 @@ class TestR3ConnectMaskToken:
     """connect 送遮罩 token → client / canary / state.connect / 背景 probe 四處收真值；config 不毀。"""
 
     def test_r3_connect_mask_token_four_sinks(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("metatube", {})["token"] = METATUBE_PLAIN
         save_config(cfg)
 
@@ -289,7 +289,7 @@ class TestR5Clear:
 
 class TestR6GeminiTest:
     def test_r6g1_mask_uses_stored(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("gemini", {})["api_key"] = GEMINI_PLAIN
         save_config(cfg)
 
@@ -315,7 +315,7 @@ class TestR6GeminiTest:
         assert headers["x-goog-api-key"] == GEMINI_PLAIN
 
     def test_r6g2_new_plaintext_uses_incoming(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("gemini", {})["api_key"] = GEMINI_PLAIN
         save_config(cfg)
 
@@ -339,7 +339,7 @@ class TestR6GeminiTest:
 
 class TestR6GeminiTestTranslate:
     def test_r6gt1_mask_uses_stored(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("gemini", {})["api_key"] = GEMINI_PLAIN
         cfg.setdefault("general", {})["locale"] = "zh-TW"
         save_config(cfg)
@@ -364,7 +364,7 @@ class TestR6GeminiTestTranslate:
         assert headers["x-goog-api-key"] == GEMINI_PLAIN
 
     def test_r6gt2_new_plaintext_uses_incoming(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("gemini", {})["api_key"] = GEMINI_PLAIN
         cfg.setdefault("general", {})["locale"] = "zh-TW"
         save_config(cfg)
@@ -388,7 +388,7 @@ class TestR6GeminiTestTranslate:
 
 class TestR6OpenAIModels:
     def test_r6o1_mask_uses_stored(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("openai", {})["api_key"] = OPENAI_PLAIN
         save_config(cfg)
 
@@ -409,7 +409,7 @@ class TestR6OpenAIModels:
         assert headers["Authorization"] == f"Bearer {OPENAI_PLAIN}"
 
     def test_r6o2_new_plaintext_uses_incoming(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("openai", {})["api_key"] = OPENAI_PLAIN
         save_config(cfg)
 
@@ -429,7 +429,7 @@ class TestR6OpenAIModels:
 
 class TestR6OpenAITest:
     def test_r6ot1_mask_uses_stored(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("openai", {})["api_key"] = OPENAI_PLAIN
         cfg.setdefault("general", {})["locale"] = "zh-TW"
         save_config(cfg)
@@ -453,7 +453,7 @@ class TestR6OpenAITest:
         assert headers["Authorization"] == f"Bearer {OPENAI_PLAIN}"
 
     def test_r6ot2_new_plaintext_uses_incoming(self, client):
-        cfg = load_config()
+        cfg = load_config().copy()
         cfg.setdefault("translate", {}).setdefault("openai", {})["api_key"] = OPENAI_PLAIN
         cfg.setdefault("general", {})["locale"] = "zh-TW"
         save_config(cfg)
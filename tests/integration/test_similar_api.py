@@ -210,6 +210,14 @@ class TestSimilarCoversAPI:
         data = resp.json()
         assert len(data["results"]) == 12
 
+    def test_by_number_hyphenless_lowercase_variant(self, client_with_corpus):
+        """by-number 走番號比對鍵：去掉分隔符、小寫仍命中同一目標"""
+        client, target_id, target_number = client_with_corpus
+        variant = target_number.replace("-", "").lower()
+        resp = client.get(f"/api/similar-covers/by-number/{variant}")
+        assert resp.status_code == 200
+        assert resp.json()["video_id"] == target_id
+
     # --- T3: by-number 404 ---
 
     def test_by_number_404(self, client_with_corpus):
@@ -410,6 +418,36 @@ class TestSimilarCoversAPI:
             f"target number {target_number!r} should not appear in results"
         )
 
+    # --- T12: 真實 corpus 建置路徑（不 patch _instance）---
+
+    def test_real_corpus_build_scores_duration_bucket(self, tmp_path, monkeypatch):
+        """SimilarRankerCache.get() 以投影欄位建 corpus；_score 讀 cand.duration，
+        corpus 欄位少了 duration 就會 AttributeError（500）。同桶時長要拿到 +0.10。"""
+        db_path = tmp_path / "corpus.db"
+        init_db(db_path)
+        repo = VideoRepository(db_path)
+        target_id = repo.upsert(_make_video(idx=1, number="DUR-001", duration=120))
+        repo.upsert_batch([
+            _make_video(idx=2, number="DUR-002", tags=["高畫質", "單體作品", "tag1"], duration=130),
+            _make_video(idx=3, number="DUR-003", tags=["高畫質", "單體作品", "tag1"], duration=15),
+        ])
+
+        class _PatchedRepo(VideoRepository):
+            def __init__(self, db_path_arg=None):
+                super().__init__(db_path)
+
+        monkeypatch.setattr("web.routers.similar.VideoRepository", _PatchedRepo)
+        monkeypatch.setattr("core.similar.ranker_cache.VideoRepository", _PatchedRepo)
+        monkeypatch.setattr(SimilarRankerCache, "_instance", None)
+        try:
+            resp = TestClient(_make_test_app()).get(f"/api/similar-covers/{target_id}")
+        finally:
+            SimilarRankerCache._instance = None
+
+        assert resp.status_code == 200
+        scores = {r["number"]: r["cosine_score"] for r in resp.json()["results"]}
+        assert scores["DUR-002"] - scores["DUR-003"] == pytest.approx(0.10)
+
 
 # ---------------------------------------------------------------------------
 # feature/71 T4 — thumbnail_cache cover_url switch
@@ -83,7 +83,7 @@ def test_get_video_actress_pairs_handles_malformed_json(temp_db):
 
 
 def test_get_video_actress_pairs_operational_error_propagates(temp_db, monkeypatch):
-    """json_each / execute 丟 OperationalError 必須往上拋（不可吞成 []），
+    """讀取（片庫快照的 execute）丟 OperationalError 必須往上拋（不可吞成 []），
     且 finally 仍要 close 連線（Codex PR#133 finding A）。"""
     repo = ActressRepository(temp_db)
     close_calls = []
@@ -95,7 +95,7 @@ def test_get_video_actress_pairs_operational_error_propagates(temp_db, monkeypat
         def close(self):
             close_calls.append(True)
 
-    monkeypatch.setattr(repo, "_get_connection", lambda: _BoomConn())
+    monkeypatch.setattr("core.database.connection.get_connection", lambda db_path=None: _BoomConn())
 
     with pytest.raises(sqlite3.OperationalError, match="simulated json_each failure"):
         repo.get_video_actress_pairs()
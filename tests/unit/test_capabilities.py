@@ -48,6 +48,7 @@ EXPECTED_TOOL_NAMES = {
     "user_rating",
     "showcase_videos",
     "showcase_video",
+    "showcase_search",
     "favorite_actress",
     "get_actress",
     "unfavorite_actress",
@@ -117,7 +118,7 @@ class TestCapabilitiesEndpoint:
 
     def test_tools_count_is_40(self, client):
         data = client.get("/api/capabilities").json()
-        assert len(data["tools"]) == 41
+        assert len(data["tools"]) == 42
 
     def test_all_tool_names_present(self, client):
         data = client.get("/api/capabilities").json()
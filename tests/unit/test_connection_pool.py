@@ -0,0 +1,186 @@
+"""測試 core/database/connection.py 的 per-thread 連線池（get_connection / get_readonly_connection）"""
+import sqlite3
+import threading
+
+import pytest
+
+from core.database import (
+    close_pooled_connections,
+    get_connection,
+    get_readonly_connection,
+    init_db,
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    p = tmp_path / "pool.db"
+    init_db(p)
+    return p
+
+
+def test_close_returns_connection_to_pool(db_path):
+    """close() 是歸還：同執行緒下一次借用拿回同一條連線"""
+    conn = get_connection(db_path)
+    conn.close()
+    again = get_connection(db_path)
+    try:
+        assert again is conn
+    finally:
+        again.close()
+
+
+def test_nested_acquire_gets_distinct_connections(db_path):
+    """同執行緒巢狀借用（如 get_by_path 內呼叫 _get_columns）拿到不同連線"""
+    outer = get_connection(db_path)
+    inner = get_connection(db_path)
+    try:
+        assert outer is not inner
+    finally:
+        inner.close()
+        outer.close()
+
+
+def test_pragmas_applied_once(db_path):
+    """新連線套用 WAL / synchronous=NORMAL / temp_store=MEMORY"""
+    conn = get_connection(db_path)
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    finally:
+        conn.close()
+
+
+def test_release_rolls_back_uncommitted_writes(db_path):
+    """未 commit 的寫入在 close() 時丟棄（等同真 close 語意）"""
+    conn = get_connection(db_path)
+    conn.execute("INSERT INTO videos (path) VALUES ('file:///uncommitted.mp4')")
+    conn.close()
+
+    check = get_connection(db_path)
+    try:
+        row = check.execute("SELECT COUNT(*) FROM videos").fetchone()
+        assert row[0] == 0
+    finally:
+        check.close()
+
+
+def test_release_closes_dangling_cursor_snapshot(db_path):
+    """未讀完的 SELECT 不可讓歸還後的連線停在舊 WAL snapshot"""
+    writer = sqlite3.connect(str(db_path))
+    writer.executemany("INSERT INTO videos (path) VALUES (?)", [("file:///a.mp4",), ("file:///b.mp4",)])
+    writer.commit()
+
+    conn = get_connection(db_path)
+    cur = conn.execute("SELECT path FROM videos")
+    cur.fetchone()  # 讀一半就歸還
+    conn.close()
+
+    writer.execute("INSERT INTO videos (path) VALUES ('file:///c.mp4')")
+    writer.commit()
+    writer.close()
+
+    again = get_connection(db_path)
+    try:
+        assert again is conn
+        assert again.execute("SELECT COUNT(*) FROM videos").fetchone()[0] == 3
+    finally:
+        again.close()
+
+
+def test_release_resets_callbacks_and_row_factory(db_path):
+    """trace callback / row_factory 不外漏給下一個借用者"""
+    seen = []
+    conn = get_connection(db_path)
+    conn.set_trace_callback(seen.append)
+    conn.row_factory = sqlite3.Row
+    conn.close()
+
+    again = get_connection(db_path)
+    try:
+        row = again.execute("SELECT 1").fetchone()
+        assert isinstance(row, tuple)
+        assert seen == []
+    finally:
+        again.close()
+
+
+def test_replaced_db_file_is_not_reused(tmp_path):
+    """DB 檔被刪除重建後，池內舊連線（指向已 unlink 的 inode）被丟棄"""
+    db_path = tmp_path / "replaced.db"
+    init_db(db_path)
+    conn = get_connection(db_path)
+    conn.close()
+
+    for suffix in ("", "-wal", "-shm"):
+        (tmp_path / f"replaced.db{suffix}").unlink(missing_ok=True)
+    init_db(db_path)
+
+    fresh = get_connection(db_path)
+    try:
+        assert fresh is not conn
+        tables = {r[0] for r in fresh.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        assert "videos" in tables
+    finally:
+        fresh.close()
+
+
+def test_connections_are_per_thread(db_path):
+    """不同執行緒不共用池內連線（sqlite3 check_same_thread）"""
+    main_conn = get_connection(db_path)
+    main_conn.close()
+
+    result = {}
+
+    def _worker():
+        conn = get_connection(db_path)
+        try:
+            result["same"] = conn is main_conn
+            result["count"] = conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
+        finally:
+            conn.close()
+
+    t = threading.Thread(target=_worker)
+    t.start()
+    t.join()
+    assert result == {"same": False, "count": 0}
+
+
+def test_close_pooled_connections_invalidates_idle(db_path):
+    conn = get_connection(db_path)
+    conn.close()
+    close_pooled_connections()
+    fresh = get_connection(db_path)
+    try:
+        assert fresh is not conn
+    finally:
+        fresh.close()
+
+
+def test_readonly_connection_rejects_writes(db_path):
+    conn = get_readonly_connection(db_path)
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0] == 0
+        with pytest.raises(sqlite3.OperationalError):
+            conn.execute("INSERT INTO videos (path) VALUES ('file:///x.mp4')")
+    finally:
+        conn.close()
+
+
+def test_readonly_pool_is_separate_from_rw(db_path):
+    rw = get_connection(db_path)
+    rw.close()
+    ro = get_readonly_connection(db_path)
+    try:
+        assert ro is not rw
+    finally:
+        ro.close()
+
+
+def test_readonly_connection_missing_db_raises(tmp_path):
+    """唯讀連線不會新建空檔"""
+    missing = tmp_path / "missing.db"
+    with pytest.raises(sqlite3.OperationalError):
+        get_readonly_connection(missing)
+    assert not missing.exists()
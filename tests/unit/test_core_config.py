@@ -1834,3 +1834,78 @@ class TestCoverBadgesConfig:
         # 對照：pydantic 認得的布林字串仍 coerce（記錄既有行為，非本案新邏輯）
         assert CoverBadgesConfig(enabled="true").enabled is True
         assert CoverBadgesConfig(enabled="false").enabled is False
+
+
+# ============ load_config 快照快取 ============
+
+class TestLoadConfigSnapshotCache:
+    """stat（mtime_ns + size + inode）驗證的唯讀快照；save/mutate/reset 清快取"""
+
+    @pytest.fixture
+    def config_path(self, tmp_path, monkeypatch):
+        config_path = tmp_path / "config.json"
+        monkeypatch.setattr(core_config, "CONFIG_PATH", config_path)
+        monkeypatch.setattr(core_config, "CONFIG_DEFAULT_PATH", tmp_path / "config.default.json")
+        monkeypatch.setattr(core_config, "_config_cache", None)
+        _write_config(config_path, {"gallery": {"output_dir": "out"}})
+        return config_path
+
+    def test_unchanged_file_returns_same_snapshot_without_reparse(self, config_path, monkeypatch):
+        first = load_config()
+        calls = []
+        real = core_config._load_config_unlocked
+        monkeypatch.setattr(core_config, "_load_config_unlocked", lambda: calls.append(1) or real())
+        assert load_config() is first
+        assert calls == []
+
+    def test_external_edit_invalidates(self, config_path):
+        load_config()
+        _write_config(config_path, {"gallery": {"output_dir": "other-output"}})
+        assert load_config()["gallery"]["output_dir"] == "other-output"
+
+    def test_same_size_edit_with_new_mtime_invalidates(self, config_path):
+        load_config()
+        _write_config(config_path, {"gallery": {"output_dir": "zzz"}})
+        st = config_path.stat()
+        os.utime(config_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_config()["gallery"]["output_dir"] == "zzz"
+
+    def test_mutate_config_invalidates(self, config_path):
+        load_config()
+
+        def _mut(cfg):
+            cfg["gallery"]["output_dir"] = "mutated"
+
+        core_config.mutate_config(_mut)
+        assert load_config()["gallery"]["output_dir"] == "mutated"
+
+    def test_save_config_invalidates(self, config_path):
+        cfg = load_config().copy()
+        cfg["gallery"]["output_dir"] = "saved"
+        save_config(cfg)
+        assert load_config()["gallery"]["output_dir"] == "saved"
+
+    def test_snapshot_is_read_only(self, config_path):
+        cfg = load_config()
+        with pytest.raises(TypeError):
+            cfg["gallery"] = {}
+        with pytest.raises(TypeError):
+            cfg["gallery"]["output_dir"] = "x"
+        with pytest.raises(TypeError):
+            cfg.setdefault("new", {})
+        with pytest.raises(TypeError):
+            cfg["general"].pop("close_action")
+
+    def test_copy_is_mutable_and_detached(self, config_path):
+        import copy
+
+        cfg = load_config()
+        for mutable in (cfg.copy(), copy.deepcopy(cfg)):
+            assert type(mutable) is dict and type(mutable["gallery"]) is dict
+            mutable["gallery"]["output_dir"] = "local"
+        assert load_config()["gallery"]["output_dir"] == "out"
+
+    def test_snapshot_serializes_like_dict(self, config_path):
+        cfg = load_config()
+        assert isinstance(cfg, dict)
+        assert json.loads(json.dumps(cfg)) == cfg
@@ -27,13 +27,12 @@ _VIDEO_PY = Path(__file__).resolve().parents[2] / "core" / "database" / "video.p
 # 數字變了必須重新盤點：新 writer 若沒走 effective_tags()，下次掃描會把剛補的
 # 屬性 tag 清回舊值。
 _TAGS_WRITE_FUNCS = (
-    "upsert",
+    "_upsert_sql",  # upsert / upsert_batch 共用的 INSERT … ON CONFLICT 建構
     "insert_if_ignore",
     "repath",
-    "upsert_batch",
     "update_tags_if_changed",
 )
-_TAGS_WRITE_FUNC_COUNT = 5
+_TAGS_WRITE_FUNC_COUNT = 4
 
 
 def _attr_subset(tags) -> set[str]:
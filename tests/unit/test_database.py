@@ -695,6 +695,125 @@ class TestDbMigration:
         assert 'label' in columns
 
 
+class TestSchemaVersion:
+    """PRAGMA user_version 版本閘門 + process-level 已驗證閂鎖"""
+
+    def _user_version(self, db_path: Path) -> int:
+        conn = sqlite3.connect(str(db_path))
+        try:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_new_db_stamped_with_schema_version(self, tmp_path):
+        from core.database.connection import SCHEMA_VERSION
+
+        db_path = tmp_path / "new.db"
+        init_db(db_path)
+        assert self._user_version(db_path) == SCHEMA_VERSION
+
+    def test_legacy_db_upgraded_and_stamped(self, tmp_path):
+        """user_version = 0 的舊庫跑完全部 migration 後寫回版本"""
+        from core.database.connection import SCHEMA_VERSION
+
+        db_path = tmp_path / "old.db"
+        TestDbMigration()._create_old_schema_db(db_path)
+        init_db(db_path)
+
+        assert self._user_version(db_path) == SCHEMA_VERSION
+        conn = sqlite3.connect(str(db_path))
+        try:
+            tables = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        finally:
+            conn.close()
+        assert {"video_actresses", "video_tags", "library_generation", "video_health_summary"} <= tables
+
+    def test_upgrade_backfills_health_flags_and_summary(self, tmp_path):
+        """v7 → v8：既有列補算健康度旗標，video_health_summary 一次彙總既有資料"""
+        from core.database import connection
+
+        db_path = tmp_path / "v7.db"
+        init_db(db_path)
+        conn = sqlite3.connect(str(db_path))
+        conn.executemany(
+            "INSERT INTO videos (path, number, tags) VALUES (?, ?, ?)",
+            [(to_file_uri("/a.mp4"), "TKABC-001", '["ドラマ"]'),
+             (to_file_uri("/b.mp4"), "ABC-002", '["中文"]')],
+        )
+        conn.execute("UPDATE videos SET number_issue = NULL, has_japanese_tags = NULL")
+        for suffix in ("ai", "ad", "au"):
+            conn.execute(f"DROP TRIGGER trg_videos_health_{suffix}")
+        conn.execute("DROP TABLE video_health_summary")
+        conn.execute("PRAGMA user_version = 7")
+        conn.commit()
+        conn.close()
+        connection._schema_verified.clear()
+
+        init_db(db_path)
+        conn = sqlite3.connect(str(db_path))
+        try:
+            flags = conn.execute(
+                "SELECT number, number_issue, has_japanese_tags FROM videos ORDER BY id"
+            ).fetchall()
+            total, tk, japanese = conn.execute(
+                "SELECT total, corrupted_TK_prefix, japanese_tags FROM video_health_summary"
+            ).fetchone()
+        finally:
+            conn.close()
+        assert flags == [("TKABC-001", "TK_prefix", 1), ("ABC-002", "", 0)]
+        assert (total, tk, japanese) == (2, 1, 1)
+
+    def test_second_call_skips_database(self, tmp_path, monkeypatch):
+        """同 process 內第二次 init_db 命中閂鎖，不再開連線"""
+        from core.database import connection
+
+        db_path = tmp_path / "latch.db"
+        init_db(db_path)
+
+        opened = []
+        real_get_connection = connection.get_connection
+        monkeypatch.setattr(connection, "get_connection",
+                            lambda *a, **kw: opened.append(a) or real_get_connection(*a, **kw))
+        init_db(db_path)
+        assert opened == []
+
+    def test_current_version_runs_no_ddl(self, tmp_path, monkeypatch):
+        """版本已是最新時（新 process）只做讀取，不跑任何 DDL"""
+        from core.database import connection
+
+        db_path = tmp_path / "current.db"
+        init_db(db_path)
+        connection._schema_verified.clear()
+
+        statements = []
+        real_get_connection = connection.get_connection
+
+        def _traced(*a, **kw):
+            conn = real_get_connection(*a, **kw)
+            conn.set_trace_callback(statements.append)
+            return conn
+
+        monkeypatch.setattr(connection, "get_connection", _traced)
+        init_db(db_path)
+
+        ddl = [s for s in statements if s.lstrip().upper().startswith(("CREATE", "ALTER", "DROP", "BEGIN"))]
+        assert statements and ddl == []
+
+    def test_replaced_db_file_is_reverified(self, tmp_path):
+        """DB 檔被刪除後重建 → 閂鎖失效，重新建 schema"""
+        db_path = tmp_path / "replaced.db"
+        init_db(db_path)
+        for suffix in ("", "-wal", "-shm"):
+            (tmp_path / f"replaced.db{suffix}").unlink(missing_ok=True)
+
+        init_db(db_path)
+        conn = sqlite3.connect(str(db_path))
+        try:
+            assert conn.execute("SELECT COUNT(*) FROM videos").fetchone()[0] == 0
+        finally:
+            conn.close()
+
+
 class TestGetColumnsOrder:
     """_get_columns() 順序與 SELECT * 一致，upsert + get_by_path round-trip 驗證"""
 
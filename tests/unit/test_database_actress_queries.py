@@ -1,13 +1,15 @@
-"""Tests for the json_each-based actress query methods in VideoRepository.
+"""Tests for the actress query methods in VideoRepository.
 
 Covers exact-match semantics, empty-array / NULL guards, deduplication (F3),
-and multi-video OR queries — all of which the old 4-LIKE-OR pattern failed.
+and multi-video OR queries — all of which the old 4-LIKE-OR pattern failed —
+plus the trigger-maintained video_actresses / video_tags junction tables the
+queries now read.
 """
 import sqlite3
 import pytest
 from pathlib import Path
 
-from core.database import Video, VideoRepository, init_db
+from core.database import Video, VideoRepository, connection, init_db
 from core.path_utils import to_file_uri
 
 
@@ -140,3 +142,68 @@ def test_get_videos_by_actress_names_returns_multiple_videos(temp_db):
     assert to_file_uri("/test/v2.mp4") in paths
     # Carol's video must not appear
     assert to_file_uri("/test/v3.mp4") not in paths
+
+
+# ── video_actresses / video_tags junction sync ─────────────────────────────────
+
+def _junction(db_path, table: str) -> set:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return set(conn.execute(f"SELECT * FROM {table}").fetchall())
+    finally:
+        conn.close()
+
+
+def test_junction_follows_upsert_update_and_delete(temp_db):
+    """upsert 新增 / 改名 / delete_by_paths 都同步 junction 表"""
+    repo = VideoRepository(temp_db)
+    v = _video("j1", ["Alice", "Bob", "Alice"])
+    v.tags = ["巨乳", ""]
+    vid = repo.upsert(v)
+    assert _junction(temp_db, "video_actresses") == {(vid, "Alice"), (vid, "Bob")}
+    assert _junction(temp_db, "video_tags") == {(vid, "巨乳")}
+
+    v.actresses = ["Carol"]
+    repo.upsert(v)
+    assert _junction(temp_db, "video_actresses") == {(vid, "Carol")}
+    assert repo.count_by_actress("Alice") == 0
+
+    repo.update_tags_if_changed(v.path, ["女教師"])
+    assert _junction(temp_db, "video_tags") == {(vid, "女教師")}
+
+    repo.delete_by_paths([v.path])
+    assert _junction(temp_db, "video_actresses") == set()
+    assert _junction(temp_db, "video_tags") == set()
+
+
+def test_junction_follows_repath_collision(temp_db):
+    """repath 碰撞分支（DELETE old + INSERT）後 junction 表指向存活的 row"""
+    repo = VideoRepository(temp_db)
+    old = _video("old", ["Alice"])
+    new = _video("new", ["Alice"])
+    repo.upsert(old)
+    repo.upsert(new)
+
+    repo.repath(old.path, new.path, _video("new", ["Dana"]))
+    survivor = repo.get_by_path(new.path)
+    assert _junction(temp_db, "video_actresses") == {(survivor.id, "Dana")}
+
+
+def test_junction_backfilled_on_upgrade(temp_db):
+    """既有庫（無 junction 表）重跑 init_db 時一次性 backfill"""
+    repo = VideoRepository(temp_db)
+    vid = repo.upsert(_video("b1", ["Alice"]))
+
+    conn = sqlite3.connect(str(temp_db))
+    for table in ("video_actresses", "video_tags"):
+        conn.execute(f"DROP TABLE {table}")
+    for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("PRAGMA user_version = 1")  # 模擬 junction migration 之前的舊版庫
+    conn.commit()
+    conn.close()
+
+    connection._schema_verified.clear()  # 模擬重新啟動的 process
+    init_db(temp_db)
+    assert _junction(temp_db, "video_actresses") == {(vid, "Alice")}
+    assert repo.count_by_actress("Alice") == 1
@@ -0,0 +1,196 @@
+"""core.database.maintenance — 背景 DB 維護排程（optimize / ANALYZE / checkpoint / vacuum）"""
+import sqlite3
+
+import pytest
+
+from core.database import init_db
+from core.database import maintenance
+from core.database.maintenance import DbMaintenance
+from core.path_utils import to_file_uri
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "maint.db"
+    init_db(path)
+    return path
+
+
+def _insert(db_path, count, start=0):
+    """raw SQL 插入（健康度旗標照 repository 寫好，避免每輪多出 health_heal）。"""
+    conn = sqlite3.connect(str(db_path))
+    conn.executemany(
+        "INSERT INTO videos (path, number, title, number_issue, has_japanese_tags) "
+        "VALUES (?, ?, ?, '', 0)",
+        [(to_file_uri(f"/m/V-{i}.mp4"), f"V-{i}", "x" * 400) for i in range(start, start + count)],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _pragma(db_path, name):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class TestSchedule:
+    def test_first_round_optimizes_and_analyzes(self, db_path):
+        m = DbMaintenance(db_path)
+        assert m.run_once(now=1000.0) == ["optimize", "analyze"]
+        assert m.status()["last_run"]["analyze"]["ok"] is True
+
+    def test_idle_rounds_do_nothing(self, db_path):
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        assert m.run_once(now=1060.0) == []
+        assert m.run_once(now=1120.0) == []
+
+    def test_optimize_and_analyze_intervals(self, db_path):
+        m = DbMaintenance(db_path)
+        m.run_once(now=0.0)
+        _insert(db_path, 5)
+        assert m.run_once(now=maintenance._OPTIMIZE_INTERVAL_S) == ["optimize"]
+        assert m.run_once(now=maintenance._ANALYZE_INTERVAL_S) == ["optimize", "analyze"]
+
+    def test_analyze_skipped_without_writes(self, db_path):
+        m = DbMaintenance(db_path)
+        m.run_once(now=0.0)
+        assert "analyze" not in m.run_once(now=maintenance._ANALYZE_INTERVAL_S)
+
+    def test_checkpoint_after_large_write_batch(self, db_path, monkeypatch):
+        monkeypatch.setattr(maintenance, "_CHECKPOINT_WRITE_THRESHOLD", 50)
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        _insert(db_path, 60)
+        assert "checkpoint" in m.run_once(now=1060.0)
+        detail = m.status()["last_run"]["checkpoint"]["detail"]
+        assert detail["writes"] == 60
+        assert m.status()["wal_bytes"] == 0
+        # 基準已前移：沒有新寫入就不再 checkpoint
+        assert "checkpoint" not in m.run_once(now=1120.0)
+
+    def test_missing_db_is_noop(self, tmp_path):
+        m = DbMaintenance(tmp_path / "absent.db")
+        assert m.run_once(now=1.0) == []
+        assert m.status()["exists"] is False
+
+    def test_heals_health_flags_left_by_raw_sql(self, db_path):
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("INSERT INTO videos (path, number, tags) VALUES (?, 'TKSONE-205', '[\"ドラマ\"]')",
+                     (to_file_uri("/m/TKSONE-205.mp4"),))
+        conn.commit()
+        conn.close()
+
+        assert "health_heal" in m.run_once(now=1060.0)
+        assert m.status()["last_run"]["health_heal"]["detail"] == {"rows": 1}
+        conn = sqlite3.connect(str(db_path))
+        try:
+            assert conn.execute("SELECT number_issue, has_japanese_tags FROM videos").fetchone() == (
+                "TK_prefix", 1)
+        finally:
+            conn.close()
+        assert "health_heal" not in m.run_once(now=1120.0)
+
+    def test_concurrent_round_skipped(self, db_path):
+        m = DbMaintenance(db_path)
+        m._lock.acquire()
+        try:
+            assert m.run_once(now=1.0) == []
+        finally:
+            m._lock.release()
+
+
+class TestVacuum:
+    def test_new_db_uses_incremental_auto_vacuum(self, db_path):
+        assert _pragma(db_path, "auto_vacuum") == 2
+
+    def test_incremental_vacuum_on_idle(self, db_path, monkeypatch):
+        monkeypatch.setattr(maintenance, "_VACUUM_MIN_FREE_PAGES", 1)
+        _insert(db_path, 2000)
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("DELETE FROM videos")
+        conn.commit()
+        conn.close()
+
+        # 有寫入的這一輪不是閒置 → 不 vacuum；下一輪閒置才回收
+        assert "vacuum" not in m.run_once(now=1060.0)
+        assert "vacuum" in m.run_once(now=1120.0)
+        detail = m.status()["last_run"]["vacuum"]["detail"]
+        assert detail["kind"] == "incremental"
+        assert detail["free_pages_before"] > 0
+        assert detail["free_pages_after"] == 0
+
+    def test_legacy_db_converted_by_full_vacuum(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(maintenance, "_VACUUM_MIN_FREE_PAGES", 1)
+        db_path = tmp_path / "legacy.db"
+        sqlite3.connect(str(db_path)).execute("CREATE TABLE legacy (x)").connection.close()
+        init_db(db_path)
+        assert _pragma(db_path, "auto_vacuum") == 0
+        _insert(db_path, 2000)
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("DELETE FROM videos")
+        conn.commit()
+        conn.close()
+
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        # 完整 VACUUM 整檔重寫、持獨佔鎖：短暫閒置不做，連續閒置夠久才一次性轉換
+        assert "vacuum" not in m.run_once(now=1060.0)
+        assert _pragma(db_path, "auto_vacuum") == 0
+        assert "vacuum" in m.run_once(now=1000.0 + maintenance._FULL_VACUUM_IDLE_S)
+        assert m.status()["last_run"]["vacuum"]["detail"]["kind"] == "full"
+        assert _pragma(db_path, "auto_vacuum") == 2
+        assert _pragma(db_path, "freelist_count") == 0
+
+
+    def test_legacy_idle_window_restarts_on_write(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(maintenance, "_VACUUM_MIN_FREE_PAGES", 1)
+        db_path = tmp_path / "legacy.db"
+        sqlite3.connect(str(db_path)).execute("CREATE TABLE legacy (x)").connection.close()
+        init_db(db_path)
+        _insert(db_path, 2000)
+        conn = sqlite3.connect(str(db_path))
+        conn.execute("DELETE FROM videos WHERE id > 10")
+        conn.commit()
+        conn.close()
+
+        m = DbMaintenance(db_path)
+        m.run_once(now=0.0)
+        _insert(db_path, 1, start=5000)
+        m.run_once(now=maintenance._FULL_VACUUM_IDLE_S - 60)  # 有寫入：閒置重新起算
+        assert "vacuum" not in m.run_once(now=maintenance._FULL_VACUUM_IDLE_S + 60)
+        assert "vacuum" in m.run_once(now=2 * maintenance._FULL_VACUUM_IDLE_S)
+
+
+class TestAnalyze:
+    def test_analysis_limit_set_before_analyze(self, db_path):
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        conn = maintenance.connection.get_connection(db_path)
+        try:
+            assert conn.execute("PRAGMA analysis_limit").fetchone()[0] == maintenance._ANALYSIS_LIMIT
+        finally:
+            conn.close()
+
+
+class TestDiagnosticsEndpoint:
+    def test_reports_maintenance_status(self, db_path, monkeypatch):
+        from fastapi.testclient import TestClient
+        from web.app import app
+
+        m = DbMaintenance(db_path)
+        m.run_once(now=1000.0)
+        monkeypatch.setattr("web.routers.diagnostics.db_maintenance", m)
+
+        data = TestClient(app).get("/api/diagnostics").json()["db_maintenance"]
+        assert data["exists"] is True
+        assert data["auto_vacuum"] == "incremental"
+        assert set(data["last_run"]) == {"optimize", "analyze"}
+        assert data["db_bytes"] > 0
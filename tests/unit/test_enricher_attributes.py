@@ -314,6 +314,21 @@ def test_boundary5_update_tags_if_changed_invalidates_when_changed(tmp_path, rep
     assert updated.tags == ["A", "B"]
 
 
+def test_boundary5_update_tags_if_changed_heals_health_flag(tmp_path, repo):
+    """trigger 會清空 has_japanese_tags；同一交易內補算，analysis 計數不留 NULL 旗標。"""
+    path_uri = to_file_uri(str(tmp_path / "Z.mp4"))
+    repo.upsert(_make_db_video("Z-001", path_uri, tags=["A"]))
+
+    assert repo.update_tags_if_changed(path_uri, ["A", "ドラマ"]) is True
+
+    conn = repo._get_connection()
+    try:
+        row = conn.execute("SELECT has_japanese_tags FROM videos WHERE path = ?", (path_uri,)).fetchone()
+    finally:
+        conn.close()
+    assert row[0] == 1
+
+
 # ── 邊界 6：A4 — 無屬性檔名不產生任何屬性 tag ──────────────────────────────────
 
 def test_boundary6_a4_no_attribute_tags_for_plain_multipart(tmp_path, repo):
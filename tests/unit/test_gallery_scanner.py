@@ -466,6 +466,262 @@ class TestFastScanDirectorySkipCallback:
         assert results == []
 
 
+class TestFastScanDirectoryParallel:
+    """fast_scan_directory 平行目錄列舉：結果、順序、on_skip 順序與單執行緒完全一致"""
+
+    @staticmethod
+    def _make_tree(root):
+        for a in range(4):
+            for b in range(3):
+                d = root / f"d{a}" / f"s{b}"
+                d.mkdir(parents=True)
+                (d / f"V-{a}{b}.mp4").write_bytes(b"x" * (a + b + 1))
+                (d / f"V-{a}{b}.nfo").write_text("<movie/>")
+                if b == 1:
+                    (d / "extrafanart").mkdir()
+                    (d / "extrafanart" / "1.jpg").write_bytes(b"j")
+            (root / f"d{a}" / f"top{a}.mkv").write_bytes(b"y")
+        (root / "root.mp4").write_bytes(b"z")
+
+    def test_parallel_matches_serial(self, tmp_path):
+        from core.gallery_scanner import fast_scan_directory
+
+        self._make_tree(tmp_path)
+        serial = fast_scan_directory(str(tmp_path), {'.mp4', '.mkv'}, 0, workers=1)
+        parallel = fast_scan_directory(str(tmp_path), {'.mp4', '.mkv'}, 0, workers=8)
+
+        assert len(serial) == 17
+        assert parallel == serial
+        # 子目錄的結果先於本層影片（既有遞迴順序）
+        assert serial[-1]['path'].endswith("root.mp4")
+        assert {f['sample_image_count'] for f in serial if "s1" in f['path']} == {1}
+
+    def test_on_skip_order_matches_serial(self, tmp_path, monkeypatch):
+        import os
+        from core.gallery_scanner import fast_scan_directory
+
+        self._make_tree(tmp_path)
+        real_scandir = os.scandir
+        broken = {str(tmp_path / "d1" / "s0"), str(tmp_path / "d3"), str(tmp_path / "d0" / "s2")}
+
+        def flaky_scandir(path):
+            if str(path) in broken:
+                raise PermissionError(13, "Permission denied", str(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr("core.gallery_scanner.os.scandir", flaky_scandir)
+
+        def run(workers):
+            calls = []
+            results = fast_scan_directory(
+                str(tmp_path), {'.mp4', '.mkv'}, 0,
+                on_skip=lambda p, e: calls.append(p), workers=workers,
+            )
+            return results, calls
+
+        serial = run(1)
+        assert sorted(serial[1]) == sorted(broken)
+        assert run(8) == serial
+
+
+class TestFastScanDirectoryIndex:
+    """fast_scan_directory 目錄簽章索引：未變動目錄沿用上次列舉，結果與全量列舉一致"""
+
+    EXTS = {'.mp4', '.mkv'}
+
+    @staticmethod
+    def _age(root, seconds=3600):
+        """把整棵樹的目錄 mtime 調舊（避開 racy 窗口）。"""
+        import os
+        import time
+
+        t = time.time() - seconds
+        for dirpath, _dirs, _files in os.walk(root):
+            os.utime(dirpath, (t, t))
+
+    @pytest.fixture
+    def env(self, tmp_path, monkeypatch):
+        import os
+        from core.database import ScanDirIndexRepository, init_db
+
+        db = tmp_path / "idx.db"
+        init_db(db)
+        root = tmp_path / "lib"
+        root.mkdir()
+        TestFastScanDirectoryParallel._make_tree(root)
+        self._age(root)
+
+        listed = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            listed.append(str(path))
+            return real_scandir(path)
+
+        monkeypatch.setattr(os, "scandir", counting_scandir)
+        return root, ScanDirIndexRepository(db), listed
+
+    def _scan(self, root, repo, **kw):
+        from core.gallery_scanner import fast_scan_directory
+
+        return fast_scan_directory(str(root), kw.pop('exts', self.EXTS), 0, dir_index=repo, **kw)
+
+    def test_unchanged_tree_replays_without_listing(self, env):
+        from core.gallery_scanner import fast_scan_directory
+
+        root, repo, listed = env
+        first = self._scan(root, repo)
+        assert first == fast_scan_directory(str(root), self.EXTS, 0)
+        listed.clear()
+
+        assert self._scan(root, repo, workers=1) == first
+        assert self._scan(root, repo) == first
+        assert listed == []
+
+    def test_changed_directory_is_relisted(self, env):
+        root, repo, listed = env
+        self._scan(root, repo)
+        (root / "d2" / "s0" / "NEW-1.mp4").write_bytes(b"n")
+        (root / "d1" / "s1" / "extrafanart" / "2.jpg").write_bytes(b"j")
+        listed.clear()
+
+        result = self._scan(root, repo)
+        # extrafanart/ 本身也是被走訪的子目錄，它的 mtime 變了也會重列
+        assert sorted(listed) == sorted([
+            str(root / "d2" / "s0"), str(root / "d1" / "s1"), str(root / "d1" / "s1" / "extrafanart"),
+        ])
+        assert any(f['path'].endswith("NEW-1.mp4") for f in result)
+        assert {f['sample_image_count'] for f in result if "d1/s1" in f['path'].replace("\\", "/")} == {2}
+
+    def test_filter_change_forces_full_listing(self, env):
+        root, repo, listed = env
+        self._scan(root, repo)
+        listed.clear()
+
+        result = self._scan(root, repo, exts={'.mkv'})
+        assert len(listed) > 1
+        assert result and all(f['path'].endswith(".mkv") for f in result)
+
+    def test_verify_pass_marks_unreliable_mtime(self, env, monkeypatch):
+        import os
+        from core.database import scan_index
+
+        root, repo, listed = env
+        self._scan(root, repo)
+        # 模擬 mtime 不可靠的檔案系統：新增檔案後目錄 mtime 被還原
+        target = root / "d0" / "s0"
+        st = os.stat(target)
+        (target / "SNEAK-1.mp4").write_bytes(b"s")
+        os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+        monkeypatch.setattr(scan_index, "FULL_VERIFY_INTERVAL_S", 0)
+        result = self._scan(root, repo)
+        assert any(f['path'].endswith("SNEAK-1.mp4") for f in result)
+        assert repo.load(str(root), "irrelevant").unreliable is True
+
+        monkeypatch.setattr(scan_index, "FULL_VERIFY_INTERVAL_S", 24 * 3600.0)
+        listed.clear()
+        self._scan(root, repo)
+        assert len(listed) > 1  # 不可靠的根目錄一律全量列舉
+
+    def test_recent_directory_mtime_is_not_trusted(self, env):
+        import os
+
+        root, repo, listed = env
+        fresh = root / "d3" / "s2"
+        os.utime(fresh)  # mtime = 現在，落在 racy 窗口內
+        self._scan(root, repo)
+        listed.clear()
+
+        self._scan(root, repo)
+        assert listed == [str(fresh)]
+
+    def test_in_place_rewrite_is_relisted(self, env):
+        """原地改寫 NFO / 影片（tree.write 覆寫）不推進目錄 mtime，仍要重列該目錄。"""
+        import os
+        import time
+
+        root, repo, listed = env
+        self._scan(root, repo)
+        nfo_dir, video_dir = root / "d0" / "s0", root / "d2" / "s2"
+        later = time.time() - 60
+        for target, touched in ((nfo_dir, nfo_dir / "V-00.nfo"), (video_dir, video_dir / "V-22.mp4")):
+            st = os.stat(target)
+            touched.write_bytes(touched.read_bytes() + b" ")
+            os.utime(touched, (later, later))
+            os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+        listed.clear()
+
+        result = {f['path']: f for f in self._scan(root, repo)}
+        assert sorted(listed) == sorted([str(nfo_dir), str(video_dir)])
+        assert result[str(nfo_dir / "V-00.mp4")]['nfo_mtime'] == later
+        assert result[str(video_dir / "V-22.mp4")]['mtime'] == later
+        listed.clear()
+        self._scan(root, repo)
+        assert listed == []
+
+
+class TestIterScanFiles:
+    """iter_scan_files：平行 scan_file 的結果依輸入順序產出，單檔例外不影響其他檔案"""
+
+    @staticmethod
+    def _scan_file(calls):
+        import random
+        import time
+
+        def fake(path, base_path=None):
+            calls.append(path)
+            time.sleep(random.random() / 200)  # 打亂完成順序
+            if path.endswith("7"):
+                raise OSError(path)
+            return path.upper()
+
+        return fake
+
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_results_follow_input_order(self, workers):
+        from core.gallery_scanner import iter_scan_files
+
+        infos = [{'path': f"v{i}"} for i in range(30)]
+        out = list(iter_scan_files(self._scan_file([]), infos, workers))
+
+        assert [info['path'] for info, _r, _e in out] == [f"v{i}" for i in range(30)]
+        for info, result, error in out:
+            if info['path'].endswith("7"):
+                assert result is None and isinstance(error, OSError)
+            else:
+                assert result == info['path'].upper() and error is None
+
+    def test_close_stops_submitting(self):
+        import time
+        from core.gallery_scanner import iter_scan_files
+
+        calls = []
+        gen = iter_scan_files(self._scan_file(calls), [{'path': f"v{i}"} for i in range(100)], 2)
+        for i, _ in enumerate(gen):
+            if i == 2:
+                break
+        gen.close()
+        time.sleep(0.05)
+        # 已消費 3 筆 ＋ 最多 workers * 2 筆在途
+        assert len(calls) <= 3 + 4
+
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_should_abort_stops_before_next_file(self, workers):
+        import time
+        from core.gallery_scanner import iter_scan_files
+
+        calls, consumed = [], []
+        infos = [{'path': f"v{i}"} for i in range(100)]
+        gen = iter_scan_files(self._scan_file(calls), infos, workers, lambda: len(consumed) >= 3)
+        consumed.extend(info['path'] for info, _r, _e in gen)
+        time.sleep(0.05)
+
+        assert consumed == ["v0", "v1", "v2"]
+        # 逐檔同步：中止後不會多掃一檔；平行：最多 workers * 2 筆在途
+        assert len(calls) == 3 if workers == 1 else len(calls) <= 3 + 4
+
+
 class TestCollectLongPaths:
     """spec-48a §a5 契約 1+2 — _collect_long_paths helper 行為"""
 
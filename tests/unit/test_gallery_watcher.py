@@ -0,0 +1,158 @@
+"""core.gallery_watcher — 資料夾變動 → 精準增量同步（新增 / 變更 / 刪除 / 搬移）"""
+import os
+
+import pytest
+
+from core.database import VideoRepository, init_db
+from core.gallery_watcher import GallerySync, GalleryWatcher, PendingFolders, folders_for_change
+from core.path_utils import to_file_uri
+
+EXTS = {'.mp4', '.mkv'}
+
+
+@pytest.fixture
+def env(tmp_path):
+    db = tmp_path / "watch.db"
+    init_db(db)
+    root = tmp_path / "lib"
+    (root / "A").mkdir(parents=True)
+    (root / "B").mkdir()
+    (root / "A" / "AAA-001.mp4").write_bytes(b"a" * 10)
+    (root / "B" / "BBB-001.mp4").write_bytes(b"b" * 20)
+    config = {"gallery": {"path_mappings": {}, "min_size_mb": 0}, "scraper": {"video_extensions": sorted(EXTS)}}
+    sync = GallerySync(config, [str(root)], db)
+    sync.sync({str(root): True})
+    return root, sync, VideoRepository(db)
+
+
+def _paths(repo):
+    return sorted(v.path for v in repo.get_all())
+
+
+class TestFoldersForChange:
+    def test_video_and_nfo_mark_parent_shallow(self, tmp_path):
+        assert folders_for_change(str(tmp_path / "A" / "X-1.mp4"), False, EXTS) == [(str(tmp_path / "A"), False)]
+        assert folders_for_change(str(tmp_path / "A" / "X-1.nfo"), True, EXTS) == [(str(tmp_path / "A"), False)]
+
+    def test_extrafanart_image_marks_movie_folder(self, tmp_path):
+        path = tmp_path / "A" / "extrafanart" / "1.jpg"
+        assert folders_for_change(str(path), False, EXTS) == [(str(tmp_path / "A"), False)]
+
+    def test_new_directory_is_deep_and_irrelevant_file_ignored(self, tmp_path):
+        (tmp_path / "New").mkdir()
+        assert folders_for_change(str(tmp_path / "New"), False, EXTS) == [(str(tmp_path / "New"), True)]
+        (tmp_path / "x.srt").write_text("")
+        assert folders_for_change(str(tmp_path / "x.srt"), False, EXTS) == []
+
+    def test_deleted_unknown_path_treated_as_directory(self, tmp_path):
+        assert folders_for_change(str(tmp_path / "Gone.1080p"), True, EXTS) == [(str(tmp_path / "Gone.1080p"), True)]
+
+
+class TestPendingFolders:
+    def test_waits_for_quiet_period_and_merges_deep(self):
+        pending = PendingFolders(debounce_s=2.0, max_delay_s=30.0)
+        pending.add([("/a", False)], now=0.0)
+        pending.add([("/a", True), ("/b", False)], now=1.5)
+        assert pending.take_due(now=3.0) == {}
+        assert pending.take_due(now=3.6) == {"/a": True, "/b": False}
+        assert len(pending) == 0
+
+    def test_max_delay_flushes_during_continuous_events(self):
+        pending = PendingFolders(debounce_s=2.0, max_delay_s=5.0)
+        for t in range(7):
+            pending.add([("/a", False)], now=float(t))
+        assert pending.take_due(now=6.0) == {"/a": False}
+
+
+class TestGallerySync:
+    def test_initial_deep_sync_inserts(self, env):
+        root, _sync, repo = env
+        assert _paths(repo) == sorted([
+            to_file_uri(str(root / "A" / "AAA-001.mp4")), to_file_uri(str(root / "B" / "BBB-001.mp4")),
+        ])
+
+    def test_added_and_deleted_files(self, env):
+        root, sync, repo = env
+        (root / "A" / "AAA-002.mp4").write_bytes(b"new")
+        (root / "B" / "BBB-001.mp4").unlink()
+
+        result = sync.sync({str(root / "A"): False, str(root / "B"): False})
+
+        assert result["scanned"] == 1 and result["deleted"] == 1
+        assert _paths(repo) == sorted([
+            to_file_uri(str(root / "A" / "AAA-001.mp4")), to_file_uri(str(root / "A" / "AAA-002.mp4")),
+        ])
+
+    def test_shallow_sync_leaves_subfolders_alone(self, env):
+        root, sync, repo = env
+        # root 本身沒有影片；shallow 同步 root 不得把 A/、B/ 底下的列當成已刪除
+        result = sync.sync({str(root): False})
+        assert result == {"scanned": 0, "moved": 0, "deleted": 0, "skipped_folders": 0}
+        assert len(_paths(repo)) == 2
+
+    def test_move_keeps_row_identity(self, env):
+        root, sync, repo = env
+        old_uri = to_file_uri(str(root / "B" / "BBB-001.mp4"))
+        row_id = repo.get_by_path(old_uri).id
+        (root / "C").mkdir()
+        os.rename(root / "B" / "BBB-001.mp4", root / "C" / "BBB-001.mp4")
+
+        result = sync.sync({str(root / "B"): False, str(root / "C"): True})
+
+        new_uri = to_file_uri(str(root / "C" / "BBB-001.mp4"))
+        assert result["moved"] == 1 and result["deleted"] == 0
+        assert repo.get_by_path(old_uri) is None
+        assert repo.get_by_path(new_uri).id == row_id
+
+    def test_removed_directory_deletes_rows_under_it(self, env):
+        import shutil
+
+        root, sync, repo = env
+        shutil.rmtree(root / "A")
+        assert sync.sync({str(root / "A"): True})["deleted"] == 1
+        assert _paths(repo) == [to_file_uri(str(root / "B" / "BBB-001.mp4"))]
+
+    def test_unreachable_root_never_deletes(self, env, tmp_path):
+        root, sync, repo = env
+        sync.roots = [str(tmp_path / "offline")]
+        assert sync.sync({str(tmp_path / "offline" / "A"): True})["skipped_folders"] == 1
+        assert len(_paths(repo)) == 2
+
+
+class TestPolling:
+    def test_poll_marks_changed_folders_after_baseline(self, env):
+        root, _sync, repo = env
+        watcher = GalleryWatcher(db_path=repo.db_path)
+        watcher._config = {"gallery": {"scan_dir_index": False}, "scraper": {"video_extensions": sorted(EXTS)}}
+
+        watcher._poll(str(root))
+        assert len(watcher._pending) == 0  # 第一輪只建立基準
+
+        (root / "B" / "BBB-002.mkv").write_bytes(b"x")
+        (root / "A" / "AAA-001.mp4").unlink()
+        watcher._poll(str(root))
+        assert watcher._pending.take_due(now=1e12) == {str(root / "A"): False, str(root / "B"): False}
+
+
+class TestFlush:
+    def test_failed_sync_requeues_folders(self, env, monkeypatch):
+        root, _sync, repo = env
+        watcher = GalleryWatcher(db_path=repo.db_path)
+        watcher._config = {"gallery": {}, "scraper": {"video_extensions": sorted(EXTS)}}
+        watcher._pending.add([(str(root / "A"), False), (str(root / "B"), True)], now=0)
+
+        def boom(self, folders):
+            raise OSError("db locked")
+
+        monkeypatch.setattr(GallerySync, "sync", boom)
+        with pytest.raises(OSError):
+            watcher._flush(now=1e12)
+
+        assert watcher._pending.take_due(now=1e12) == {}  # 重新排隊：等下一個 debounce 窗口
+        retry_at = 1e12 + watcher._pending.debounce_s
+        assert watcher._pending.take_due(now=retry_at) == {str(root / "A"): False, str(root / "B"): True}
+        # watcher sync 標記已釋放，下一輪 / generate 不會被卡住
+        from core.generate_state import end_watch_sync, try_begin_watch_sync
+        token = object()
+        assert try_begin_watch_sync(token)
+        end_watch_sync(token)
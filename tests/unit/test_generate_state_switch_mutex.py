@@ -18,10 +18,12 @@ def _reset_state():
     gs._active_tokens.clear()
     gs._switch_active = False
     gs._config_save_tokens.clear()
+    gs._watch_sync_tokens.clear()
     yield
     gs._active_tokens.clear()
     gs._switch_active = False
     gs._config_save_tokens.clear()
+    gs._watch_sync_tokens.clear()
 
 
 class TestSwitchGenerateMutex:
@@ -178,3 +180,27 @@ class TestSwitchConfigSaveMutex:
         assert gs.try_begin_switch() == "config_save_in_progress"  # B 仍在
         gs.end_config_save(b)
         assert gs.try_begin_switch() is None  # 全清 → 放行
+
+
+class TestWatchSyncMutex:
+    """資料夾監看同步 vs generate / switch：雙向互斥，且 check-and-register 原子。"""
+
+    def test_watch_sync_deferred_while_generate_active(self):
+        assert gs.try_mark_generate_active("g") is True
+        assert gs.try_begin_watch_sync("w") is False
+        assert not gs._watch_sync_tokens
+
+    def test_generate_refused_while_watch_sync_active(self):
+        assert gs.try_begin_watch_sync("w") is True
+        assert gs.is_watch_sync_in_progress() is True
+        # generate 登記被拒（呼叫端等同步結束再重試），switch 也被擋
+        assert gs.try_mark_generate_active("g") is False
+        assert gs.try_begin_switch() == "generate_in_progress"
+        gs.end_watch_sync("w")
+        assert gs.is_watch_sync_in_progress() is False
+        assert gs.is_generate_in_progress() is False
+        assert gs.try_mark_generate_active("g") is True
+
+    def test_watch_sync_deferred_while_switch_active(self):
+        assert gs.try_begin_switch() is None
+        assert gs.try_begin_watch_sync("w") is False
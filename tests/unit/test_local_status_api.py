@@ -242,3 +242,52 @@ class TestVideoRepositoryGetByNumbers:
 
         result = repo.get_by_numbers(["SONE-205"])
         assert len(result["SONE-205"]) == 2
+
+    def test_get_by_numbers_hyphen_and_fc2_variants(self, temp_db):
+        """分隔符 / FC2-PPV 寫法不同仍視為同番號（normalize_number 前後兩種寫法）"""
+        repo = VideoRepository(temp_db)
+        repo.upsert_batch([
+            Video(path="/mnt/media/sone205.mp4", number="sone205", mtime=100.0),
+            Video(path="/mnt/media/fc2.mp4", number="FC2-PPV-1234567", mtime=200.0),
+        ])
+
+        result = repo.get_by_numbers(["SONE-205", "FC2-1234567", "fc2ppv_1234567"])
+        assert [v.path for v in result["SONE-205"]] == ["/mnt/media/sone205.mp4"]
+        assert [v.path for v in result["FC2-1234567"]] == ["/mnt/media/fc2.mp4"]
+        assert [v.path for v in result["fc2ppv_1234567"]] == ["/mnt/media/fc2.mp4"]
+
+    def test_get_by_numbers_equivalent_inputs_each_get_results(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert(Video(path="/mnt/media/SONE-205.mp4", number="SONE-205", mtime=100.0))
+
+        result = repo.get_by_numbers(["sone-205", "SONE-205"])
+        assert set(result) == {"sone-205", "SONE-205"}
+
+    def test_get_by_numbers_uses_number_key_index(self, temp_db):
+        from core.database import connection
+
+        repo = VideoRepository(temp_db)
+        conn = repo._get_connection()
+        try:
+            plan = " ".join(r[3] for r in conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT * FROM videos WHERE {connection.NUMBER_KEY_SQL} IN (?, ?)",
+                ("SONE205", "ABW001"),
+            ))
+        finally:
+            conn.close()
+        assert "idx_videos_number_key" in plan
+
+    def test_number_key_matches_sql_expression(self, temp_db):
+        """Python number_key() 與 NUMBER_KEY_SQL 逐字一致（含非 ASCII 不轉大寫）"""
+        from core.database import connection
+
+        samples = ["sone-205", "FC2-PPV-1234567", "fc2 ppv_99", "ABC123", "ñ-abc-1", "FC2-123"]
+        conn = VideoRepository(temp_db)._get_connection()
+        try:
+            for raw in samples:
+                sql_key = conn.execute(
+                    f"SELECT {connection.NUMBER_KEY_SQL} FROM (SELECT ? AS number)", (raw,)
+                ).fetchone()[0]
+                assert connection.number_key(raw) == sql_key, raw
+        finally:
+            conn.close()
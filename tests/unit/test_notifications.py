@@ -57,6 +57,17 @@ def test_emit_evicts_orphan_read_id():
     assert oldest_id not in _read_ids
 
 
+def test_update_notification_rewrites_message_in_place():
+    from web.routers.notifications import emit_notification, update_notification, _notifications, _read_ids
+    notif_id = emit_notification("info", "notif.thumb_prewarm_start")
+    _read_ids.add(notif_id)
+    update_notification(notif_id, "10/20 張")
+    assert len(_notifications) == 1
+    assert _notifications[0]["message"] == "10/20 張"
+    assert notif_id in _read_ids
+    update_notification("evicted-id", "x")  # 不存在 → no-op
+
+
 def test_calc_highest_unread_level_priority():
     """直接 unit-test helper 函式，不經 API。"""
     from web.routers.notifications import _calc_highest_unread_level
@@ -698,6 +698,39 @@ class TestIsPathUnderDir:
         assert is_path_under_dir(path_uri, dir_uri) is False
 
 
+
+# ============ TestPathScopeKey ============
+
+class TestPathScopeKey:
+    """path_scope_key：is_path_under_dir 的可索引鍵（前綴比對結果須一致）"""
+
+    @staticmethod
+    def _under(path, dir_uri):
+        from core.path_utils import path_scope_key
+        key, d = path_scope_key(path), path_scope_key(dir_uri)
+        prefix = d if d.endswith('/') else d + '/'
+        return key == d or key.startswith(prefix)
+
+    @pytest.mark.parametrize("path,dir_uri", [
+        ("file:///E:/media/SONE-205.mp4", "file:///E:/media"),
+        ("file:///E:/media2/SONE-205.mp4", "file:///E:/media"),
+        ("file:///e:/MEDIA/sub/a.mp4", "file:///E:/media/"),
+        ("file:///E:/media", "file:///E:/media"),
+        ("file:///home/User/a.mp4", "file:///home/user"),
+        ("file:///home/user/a.mp4", "file:///home/user"),
+        ("file://///NAS/Share/a.mp4", "file://///nas/share"),
+        ("file://///nas/share10/a.mp4", "file://///nas/share1"),
+        ("file:///C:/Caf\u0065\u0301/a.mp4", "file:///c:/CAF\u00c9"),
+    ])
+    def test_agrees_with_is_path_under_dir(self, path, dir_uri):
+        from core.path_utils import is_path_under_dir
+        assert self._under(path, dir_uri) is is_path_under_dir(path, dir_uri)
+
+    def test_posix_key_is_identity(self):
+        from core.path_utils import path_scope_key
+        assert path_scope_key("file:///home/User/A.mp4") == "file:///home/User/A.mp4"
+
+
 # ============ TestStripVerbatimPrefix ============
 
 class TestStripVerbatimPrefix:
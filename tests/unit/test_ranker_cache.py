@@ -30,7 +30,7 @@ def test_get_builds_on_first_call():
 
     mock_video = MagicMock()
     with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls:
-        mock_repo_cls.return_value.get_all.return_value = [mock_video]
+        mock_repo_cls.return_value.iter_rows.return_value = [mock_video]
         result = SimilarRankerCache.get()
 
     assert result is not None
@@ -45,7 +45,7 @@ def test_get_returns_same_instance():
 
     mock_video = MagicMock()
     with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls:
-        mock_repo_cls.return_value.get_all.return_value = [mock_video]
+        mock_repo_cls.return_value.iter_rows.return_value = [mock_video]
         a = SimilarRankerCache.get()
         b = SimilarRankerCache.get()
 
@@ -60,7 +60,7 @@ def test_invalidate_clears_cache():
 
     mock_video = MagicMock()
     with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls:
-        mock_repo_cls.return_value.get_all.return_value = [mock_video]
+        mock_repo_cls.return_value.iter_rows.return_value = [mock_video]
         a = SimilarRankerCache.get()
         SimilarRankerCache.invalidate()
         b = SimilarRankerCache.get()
@@ -90,7 +90,7 @@ def test_thread_safety_single_build():
     # 我們需要在 patch SimilarRanker 之前先保存原來的，但這裡直接計次即可
     with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls, \
          patch("core.similar.ranker_cache.SimilarRanker") as mock_ranker_cls:
-        mock_repo_cls.return_value.get_all.return_value = [mock_video]
+        mock_repo_cls.return_value.iter_rows.return_value = [mock_video]
 
         def counting_init(corpus):
             build_count[0] += 1
@@ -131,7 +131,7 @@ def test_thread_safety_reentrant():
     def run():
         try:
             with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls:
-                mock_repo_cls.return_value.get_all.return_value = [mock_video]
+                mock_repo_cls.return_value.iter_rows.return_value = [mock_video]
                 SimilarRankerCache.get()
                 SimilarRankerCache.invalidate()
                 SimilarRankerCache.get()
@@ -162,8 +162,8 @@ def test_lazy_import_no_db_on_import():
         with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls:
             importlib.reload(core.similar.ranker_cache)
 
-            # import/reload 後不應呼叫 get_all
-            assert mock_repo_cls.return_value.get_all.call_count == 0
+            # import/reload 後不應呼叫 iter_rows
+            assert mock_repo_cls.return_value.iter_rows.call_count == 0
     finally:
         core.similar.ranker_cache.SimilarRankerCache = original_class
 
@@ -176,7 +176,7 @@ def test_get_empty_corpus():
     from core.similar.ranker import SimilarRanker
 
     with patch("core.similar.ranker_cache.VideoRepository") as mock_repo_cls:
-        mock_repo_cls.return_value.get_all.return_value = []
+        mock_repo_cls.return_value.iter_rows.return_value = []
         result = SimilarRankerCache.get()
 
     assert result is not None
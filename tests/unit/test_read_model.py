@@ -0,0 +1,163 @@
+"""core.database.read_model — videos 唯讀快照：與 SQL 路徑結果一致、增量更新、copy-on-write"""
+import sqlite3
+
+import pytest
+
+from core.database import Video, VideoRepository, get_library_snapshot, init_db
+from core.database import maintenance, read_model
+from core.database.maintenance import DbMaintenance
+from core.path_utils import to_file_uri
+from core.similar.ranker_cache import SimilarRankerCache
+
+
+def _video(i, **kw):
+    defaults = dict(
+        path=to_file_uri(f"/lib/{'a' if i % 2 else 'b'}/V-{i:03d}.mp4"),
+        number=f"V-{i:03d}",
+        title=f"title {i}",
+        actresses=[f"Actress{i % 3}", "Shared"],
+        maker=f"Maker{i % 2}",
+        tags=["tagA", f"tag{i % 4}"],
+        duration=60 + i,
+    )
+    defaults.update(kw)
+    return Video(**defaults)
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "snap.db"
+    init_db(path)
+    VideoRepository(path).upsert_batch([_video(i) for i in range(1, 21)])
+    return path
+
+
+def _raw(db_path, sql, params=()):
+    conn = sqlite3.connect(str(db_path))
+    try:
+        rows = conn.execute(sql, params).fetchall()
+        conn.commit()
+        return rows
+    finally:
+        conn.close()
+
+
+class TestParity:
+    def test_videos_match_get_all(self, db):
+        _raw(db, "INSERT INTO videos (path, actresses, tags) VALUES (?, 'not-json', '\"scalar\"')",
+             (to_file_uri("/lib/a/broken.mp4"),))
+        assert get_library_snapshot(db).videos() == VideoRepository(db).get_all()
+
+    def test_scope_matches_sql_scope(self, db):
+        _raw(db, "INSERT INTO videos (path) VALUES (?)", (to_file_uri("/lib/a/raw.mp4"),))  # path_key NULL
+        scope = [to_file_uri("/lib/a")]
+        expected = [r.path for r in VideoRepository(db).iter_rows(('path',), scope_uris=scope)]
+        assert [v.path for v in get_library_snapshot(db).videos_in_scope(scope)] == expected
+        assert get_library_snapshot(db).videos_in_scope([]) == []
+
+    def test_find_by_number_matches_get_by_number(self, db):
+        repo = VideoRepository(db)
+        snapshot = get_library_snapshot(db)
+        for query in ("V-007", "v007", "v_007", "NOPE-1"):
+            assert snapshot.find_by_number(query) == repo.get_by_number(query)
+
+    def test_aggregates_match_junctions(self, db):
+        snapshot = get_library_snapshot(db)
+        tags = dict(_raw(db, "SELECT tag, COUNT(*) FROM video_tags GROUP BY tag"))
+        assert dict(snapshot.tag_counts()) == tags
+        pairs = _raw(db, "SELECT video_id, name FROM video_actresses")
+        assert sorted(snapshot.actress_pairs()) == sorted(pairs)
+
+    def test_rows_projection_includes_duration(self, db):
+        rows = get_library_snapshot(db).rows(('id', 'number', 'duration', 'tags'))
+        assert rows == list(VideoRepository(db).iter_rows(('id', 'number', 'duration', 'tags')))
+        with pytest.raises(ValueError):
+            get_library_snapshot(db).rows(('no_such_column',))
+
+    def test_ranker_corpus_scores_with_duration(self, db, monkeypatch):
+        monkeypatch.setattr("core.database.connection.get_db_path", lambda: db)
+        SimilarRankerCache.invalidate()
+        try:
+            ranker = SimilarRankerCache.get()
+            target = VideoRepository(db).get_by_number("V-001")
+            for cand in ranker.rank(target, top_k=5):
+                ranker._score(target, cand)  # corpus row 需有 duration 欄位
+        finally:
+            SimilarRankerCache.invalidate()
+
+
+class TestRefresh:
+    def test_unchanged_library_returns_same_snapshot(self, db):
+        assert get_library_snapshot(db) is get_library_snapshot(db)
+
+    def test_incremental_update_insert_delete(self, db, monkeypatch):
+        repo = VideoRepository(db)
+        before = get_library_snapshot(db)
+        full_builds = []
+        real_full = read_model._build_full
+        monkeypatch.setattr(read_model, "_build_full",
+                            lambda *a: full_builds.append(1) or real_full(*a))
+
+        repo.set_user_rating(_video(3).path, 5)
+        repo.upsert(_video(99, tags=["fresh"]))
+        repo.delete_by_paths([_video(4).path])
+
+        after = get_library_snapshot(db)
+        assert full_builds == []
+        assert after is not before and after.seq > before.seq
+        assert after.videos() == repo.get_all()
+        assert after.tag_counts()["fresh"] == 1
+        # copy-on-write：舊快照不受影響
+        assert before.get(after.find_by_number("V-099").id) is None
+        assert before.find_by_number("V-003").user_rating == 0
+        assert len(before) == 20
+
+    def test_out_of_order_id_insert(self, db):
+        repo = VideoRepository(db)
+        get_library_snapshot(db)
+        _raw(db, "INSERT INTO videos (id, path, number) VALUES (0, ?, 'ZERO-1')", (to_file_uri("/lib/a/zero.mp4"),))
+        snapshot = get_library_snapshot(db)
+        assert snapshot.ids[0] == 0
+        assert snapshot.videos() == repo.get_all()
+
+    def test_returned_objects_are_private_copies(self, db):
+        snapshot = get_library_snapshot(db)
+        video = snapshot.get(1)
+        video.actresses.append("Mutated")
+        video.tags.clear()
+        assert "Mutated" not in snapshot.get(1).actresses
+        assert snapshot.get(1).tags == ["tagA", "tag1"]
+
+    def test_pruned_changelog_falls_back_to_full_build(self, db, monkeypatch):
+        repo = VideoRepository(db)
+        get_library_snapshot(db)
+        repo.set_user_rating(_video(1).path, 1)
+        repo.set_user_rating(_video(2).path, 1)
+        _raw(db, "DELETE FROM video_changes WHERE seq < (SELECT MAX(seq) FROM video_changes)")
+
+        full_builds = []
+        real_full = read_model._build_full
+        monkeypatch.setattr(read_model, "_build_full",
+                            lambda *a: full_builds.append(1) or real_full(*a))
+        snapshot = get_library_snapshot(db)
+        assert full_builds == [1]
+        assert snapshot.videos() == repo.get_all()
+
+    def test_recreated_db_rebuilds(self, tmp_path):
+        path = tmp_path / "again.db"
+        init_db(path)
+        VideoRepository(path).upsert(_video(1))
+        assert len(get_library_snapshot(path)) == 1
+        path.unlink()
+        init_db(path)
+        assert len(get_library_snapshot(path)) == 0
+
+
+class TestChangelogPrune:
+    def test_maintenance_prunes_old_entries(self, db, monkeypatch):
+        monkeypatch.setattr(maintenance, "_CHANGELOG_KEEP", 5)
+        m = DbMaintenance(db)
+        assert "changelog_prune" in m.run_once(now=0.0)
+        assert _raw(db, "SELECT COUNT(*) FROM video_changes")[0][0] == 5
+        assert m.status()["last_run"]["changelog_prune"]["ok"] is True
+        assert "changelog_prune" not in m.run_once(now=60.0)
@@ -15,7 +15,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from core.path_utils import to_file_uri
+from core.path_utils import is_path_under_dir, to_file_uri
 from tests.conftest import MOCK_FOCAL_XY
 
 
@@ -76,7 +76,7 @@ class TestListSourceVideos:
             result = _list_source_videos("/src", {".mp4", ".mkv"}, 0)
 
         mock_coerce.assert_called_once_with("/src")
-        mock_scan.assert_called_once_with("/src", {".mp4", ".mkv"}, 0, on_skip=None)
+        mock_scan.assert_called_once_with("/src", {".mp4", ".mkv"}, 0, on_skip=None, workers=None)
         assert result == FAKE_FILES
 
     def test_returns_raw_list_unchanged(self):
@@ -123,7 +123,7 @@ class TestListSourceVideosOnSkip:
              patch("core.readonly_producer.uri_to_fs_path", return_value="/src"):
             _list_source_videos("/src", {".mp4"}, 0, on_skip=on_skip)
 
-        mock_scan.assert_called_once_with("/src", {".mp4"}, 0, on_skip=on_skip)
+        mock_scan.assert_called_once_with("/src", {".mp4"}, 0, on_skip=on_skip, workers=None)
 
     def test_on_skip_defaults_to_none(self):
         """Backward compatible: callers that don't pass on_skip get None forwarded."""
@@ -133,7 +133,7 @@ class TestListSourceVideosOnSkip:
              patch("core.readonly_producer.uri_to_fs_path", return_value="/src"):
             _list_source_videos("/src", {".mp4"}, 0)
 
-        mock_scan.assert_called_once_with("/src", {".mp4"}, 0, on_skip=None)
+        mock_scan.assert_called_once_with("/src", {".mp4"}, 0, on_skip=None, workers=None)
 
 
 # ---------------------------------------------------------------------------
@@ -2815,6 +2815,61 @@ class TestProduceSourceUnreachable:
         mock_list.assert_not_called()
 
 
+class TestProduceSourceJournal:
+    """Scan journal (core.database.scan_journal): listing + cursor persisted, resume skips re-listing."""
+
+    def test_completed_run_begins_and_finishes_journal(self):
+        from core.readonly_producer import produce_source
+
+        source = _make_source()
+        repo = MagicMock()
+        repo.get_attempted_index.return_value = {"file:///src/videos/ABC-123.mp4": 1.0}
+        journal = MagicMock()
+        files = [_make_file_info()]
+
+        with patch("core.readonly_producer._list_source_videos", return_value=files):
+            produce_source(source, _make_config(), repo, journal=journal)
+
+        assert journal.begin.call_args.args[:2] == ("readonly", "/src/videos")
+        assert journal.begin.call_args.args[3] == files
+        journal.finish.assert_called_once_with("readonly", "/src/videos")
+
+    def test_aborted_run_keeps_journal(self):
+        from core.readonly_producer import produce_source
+
+        repo = MagicMock()
+        repo.get_attempted_index.return_value = {}
+        journal = MagicMock()
+
+        with patch("core.readonly_producer._list_source_videos", return_value=[_make_file_info()]):
+            produce_source(_make_source(), _make_config(), repo, journal=journal, should_abort=lambda: True)
+
+        journal.begin.assert_called_once()
+        journal.finish.assert_not_called()
+
+    def test_resume_uses_listing_skips_cursor_and_vanished_files_and_prune(self, tmp_path):
+        from core.database import ScanJournal
+        from core.readonly_producer import produce_source
+
+        files = [_make_file_info(str(tmp_path / f"ABC-00{i}.mp4")) for i in range(3)]
+        repo = MagicMock()
+        repo.get_attempted_index.return_value = {}
+        journal = MagicMock()
+        journal.load.return_value = ScanJournal("readonly", "/src/videos", 3, 2, 0.0, 0.0, files, [])
+
+        # files[2] vanished since the interrupted run → skipped without scraping
+        with patch("core.readonly_producer._list_source_videos") as mock_list, \
+             patch("core.readonly_producer.resolve_ingest_plan") as mock_plan:
+            result = produce_source(_make_source(), _make_config(), repo, journal=journal, resume=True)
+
+        mock_list.assert_not_called()
+        mock_plan.assert_not_called()
+        assert result.skipped == 3
+        journal.begin.assert_not_called()
+        journal.finish.assert_called_once()
+        repo.iter_rows.assert_not_called()  # stale listing never drives prune
+
+
 class TestProduceSourceSkippedPaths:
     """TASK-89b-T5 / CD-89b-5: on_skip callback populates ProduceResult.skipped_paths."""
 
@@ -2827,7 +2882,7 @@ class TestProduceSourceSkippedPaths:
         repo.get_attempted_index.return_value = {}
         config = _make_config()
 
-        def fake_list_source_videos(source_path, extensions, min_size_bytes, on_skip=None):
+        def fake_list_source_videos(source_path, extensions, min_size_bytes, on_skip=None, workers=None):
             if on_skip is not None:
                 on_skip("/src/videos/broken_dir", PermissionError("denied"))
             return []
@@ -2861,7 +2916,7 @@ class TestProduceSourceSkippedPaths:
         repo.get_attempted_index.return_value = {}
         config = _make_config()
 
-        def fake_list_source_videos(source_path, extensions, min_size_bytes, on_skip=None):
+        def fake_list_source_videos(source_path, extensions, min_size_bytes, on_skip=None, workers=None):
             if on_skip is not None:
                 on_skip("/src/videos/broken_dir", OSError("unreadable"))
             return []  # nothing entered the loop → outcomes stays empty
@@ -2918,7 +2973,7 @@ class TestProduceSourceThreeSignalMatrix:
         repo.get_attempted_index.return_value = {}
         config = _make_config()
 
-        def fake_list_source_videos(source_path, extensions, min_size_bytes, on_skip=None):
+        def fake_list_source_videos(source_path, extensions, min_size_bytes, on_skip=None, workers=None):
             if on_skip is not None:
                 on_skip("/src/videos/partial", OSError("boom"))
             return []
@@ -3535,9 +3590,9 @@ class TestProduceSourcePrune:
 
     Gate = files (this-run list) non-empty AND result.skipped_paths empty
     (reachable is implicitly True — the unreachable guard already returned
-    upstream). Candidates come from repo.get_all(), filtered to rows under
-    the source root, with scrape_attempted_at>0 or output_dir set, and not
-    present in this-run's URI set.
+    upstream). Candidates come from repo.iter_rows(..., scope_uris=[source root]), with
+    scrape_attempted_at>0 or output_dir set, and not present in this-run's URI
+    set.
     """
 
     def _run(self, *, get_all_rows, this_run_files=None, on_skip_paths=None,
@@ -3547,7 +3602,10 @@ class TestProduceSourcePrune:
         source = _make_source(path=source_path)
         repo = MagicMock()
         repo.get_attempted_index.return_value = {}
-        repo.get_all.return_value = get_all_rows
+        # iter_rows(scope_uris=...) 的 scope 語意＝is_path_under_dir（DB 端以 path_key 索引實作）
+        repo.iter_rows.side_effect = lambda columns, scope_uris=None, **kw: iter([
+            r for r in get_all_rows if any(is_path_under_dir(r.path, u) for u in scope_uris)
+        ])
         if delete_return is not None:
             repo.delete_by_paths.side_effect = None
             repo.delete_by_paths.return_value = delete_return
@@ -3557,7 +3615,7 @@ class TestProduceSourcePrune:
         config = _make_config()
         files = this_run_files if this_run_files is not None else []
 
-        def fake_list_source_videos(src_path, extensions, min_size_bytes, on_skip=None):
+        def fake_list_source_videos(src_path, extensions, min_size_bytes, on_skip=None, workers=None):
             if on_skip is not None and on_skip_paths:
                 for p in on_skip_paths:
                     on_skip(p, OSError("unreadable"))
@@ -3613,7 +3671,10 @@ class TestProduceSourcePrune:
 
         result, repo, mock_thumb = self._run(get_all_rows=get_all_rows, this_run_files=this_run_files)
 
-        assert repo.get_all.call_count == 1
+        repo.iter_rows.assert_called_once()
+        assert repo.iter_rows.call_args.kwargs["scope_uris"] == ["file:///src/videos"]
+        repo.get_all.assert_not_called()
+        repo.get_all_in_scope.assert_not_called()
         assert repo.delete_by_paths.call_count == 1
 
     def test_gate_false_when_skipped_paths_nonempty_no_prune(self):
@@ -3627,7 +3688,7 @@ class TestProduceSourcePrune:
             on_skip_paths=["/src/videos/broken_dir"],
         )
 
-        repo.get_all.assert_not_called()
+        repo.iter_rows.assert_not_called()
         repo.delete_by_paths.assert_not_called()
         mock_thumb.invalidate.assert_not_called()
         assert result.pruned == 0
@@ -3640,7 +3701,7 @@ class TestProduceSourcePrune:
 
         result, repo, mock_thumb = self._run(get_all_rows=get_all_rows, this_run_files=[])
 
-        repo.get_all.assert_not_called()
+        repo.iter_rows.assert_not_called()
         repo.delete_by_paths.assert_not_called()
         assert result.pruned == 0
 
@@ -3652,7 +3713,7 @@ class TestProduceSourcePrune:
 
         result, repo, mock_thumb = self._run(get_all_rows=get_all_rows, this_run_files=this_run_files)
 
-        repo.get_all.assert_called_once()
+        repo.iter_rows.assert_called_once()
         repo.delete_by_paths.assert_not_called()
         mock_thumb.invalidate.assert_not_called()
 
@@ -3690,7 +3751,7 @@ class TestProduceSourcePrune:
             _make_file_info(path="/src/videos/C-003.mp4"),
         ]
 
-        def fake_list_source_videos(src_path, extensions, min_size_bytes, on_skip=None):
+        def fake_list_source_videos(src_path, extensions, min_size_bytes, on_skip=None, workers=None):
             return files
 
         # should_abort is checked at the top of each iteration: let A through
@@ -4697,14 +4758,14 @@ class TestProduceSourceFocalTrigger:
         filenames = ['SIRO-010.mp4', 'SIRO-011.mp4', 'SIRO-012.mp4']
         source_dir, output_dir = _focal_setup_source(tmp_path, filenames)
         repo = VideoRepository(temp_db)
-        # Spy (not stub) get_all / get_empty_focal_candidates so the real
+        # Spy (not stub) iter_rows / get_empty_focal_candidates so the real
         # prune / candidate-query behaviour is unchanged but call counts are
         # observable.
-        real_get_all = repo.get_all
+        real_get_all = repo.iter_rows
         real_get_candidates = repo.get_empty_focal_candidates
         get_all_spy = MagicMock(side_effect=real_get_all)
         get_candidates_spy = MagicMock(side_effect=real_get_candidates)
-        repo.get_all = get_all_spy
+        repo.iter_rows = get_all_spy
         repo.get_empty_focal_candidates = get_candidates_spy
 
         call_count = [0]
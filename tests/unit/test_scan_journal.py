@@ -0,0 +1,45 @@
+"""core.database.scan_journal — 可續掃的掃描日誌（列舉結果 + 游標）"""
+import pytest
+
+from core.database import ScanJournalRepository, init_db, scan_filter_key
+
+FILES = [{"path": "/lib/A/AAA-001.mp4", "mtime": 1.0, "size": 10, "nfo_mtime": 0}]
+KEY = scan_filter_key({".mp4", ".mkv"}, 0)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    db = tmp_path / "journal.db"
+    init_db(db)
+    return ScanJournalRepository(db)
+
+
+def test_begin_advance_load_roundtrip(journal):
+    journal.begin("gallery", "/lib", KEY, FILES, ["/lib/locked"], 1)
+    journal.advance("gallery", "/lib", 1)
+
+    entry = journal.load("gallery", "/lib", KEY)
+    assert (entry.total, entry.processed) == (1, 1)
+    assert entry.files == FILES
+    assert entry.skipped_paths == ["/lib/locked"]
+
+
+def test_filter_key_is_order_insensitive_and_mismatch_ignored(journal):
+    journal.begin("gallery", "/lib", KEY, FILES, [], 1)
+    assert journal.load("gallery", "/lib", scan_filter_key([".mkv", ".mp4"], 0)) is not None
+    assert journal.load("gallery", "/lib", scan_filter_key({".mp4"}, 0)) is None
+    assert journal.load("readonly", "/lib", KEY) is None
+
+
+def test_begin_replaces_and_finish_deletes(journal):
+    journal.begin("gallery", "/lib", KEY, FILES, [], 1)
+    journal.advance("gallery", "/lib", 1)
+    journal.begin("gallery", "/lib", KEY, FILES * 2, [], 2)
+    assert journal.load("gallery", "/lib", KEY).processed == 0
+
+    summary = journal.list_unfinished()
+    assert [(s["kind"], s["root"], s["total"]) for s in summary] == [("gallery", "/lib", 2)]
+
+    journal.finish("gallery", "/lib")
+    assert journal.list_unfinished() == []
+    assert journal.load("gallery", "/lib", KEY) is None
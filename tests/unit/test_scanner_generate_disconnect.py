@@ -16,6 +16,7 @@ T2 範圍只到「cancel_event 建立 + 被正確設置」，尚未串進 genera
 """
 
 import asyncio
+import json
 import threading
 
 import pytest
@@ -29,9 +30,11 @@ def _clear_generate_registry():
     """每個測試前後清空 module-level 登記表，避免跨測試污染。"""
     with gs._lock:
         gs._active_tokens.clear()
+        gs._watch_sync_tokens.clear()
     yield
     with gs._lock:
         gs._active_tokens.clear()
+        gs._watch_sync_tokens.clear()
 
 
 class _FakeRequest:
@@ -193,3 +196,40 @@ async def test_concurrent_generates_in_progress_until_all_done():
 
     await resp_b.background()
     assert gs.is_generate_in_progress() is False
+
+
+# ── 資料夾監看同步進行中：generate 等它套用完才登記，逾時則拒絕 ──
+
+
+@pytest.mark.asyncio
+async def test_generate_waits_for_running_watch_sync(monkeypatch):
+    import web.routers.scanner as scanner_mod
+
+    monkeypatch.setattr(scanner_mod, "_WATCH_SYNC_POLL_SEC", 0.01)
+    sync_token = object()
+    assert gs.try_begin_watch_sync(sync_token) is True
+    asyncio.get_running_loop().call_later(0.05, gs.end_watch_sync, sync_token)
+
+    response = await generate(_FakeRequest(disconnect_after=None))
+
+    assert gs.is_watch_sync_in_progress() is False
+    assert response.cancel_event in gs._active_tokens
+    await response.background()
+
+
+@pytest.mark.asyncio
+async def test_generate_refused_when_watch_sync_outlasts_wait(monkeypatch):
+    import web.routers.scanner as scanner_mod
+
+    monkeypatch.setattr(scanner_mod, "_WATCH_SYNC_POLL_SEC", 0.01)
+    monkeypatch.setattr(scanner_mod, "_WATCH_SYNC_WAIT_SEC", 0.05)
+    sync_token = object()
+    assert gs.try_begin_watch_sync(sync_token) is True
+
+    response = await generate(_FakeRequest(disconnect_after=None))
+    body = [chunk async for chunk in response.body_iterator]
+
+    assert len(body) == 1
+    assert "資料夾監看同步中" in json.loads(body[0].removeprefix("data: "))["message"]
+    assert gs._active_tokens == {sync_token}
+    gs.end_watch_sync(sync_token)
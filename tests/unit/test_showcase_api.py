@@ -385,11 +385,11 @@ class TestShowcaseVideosAPI:
             return populated_db
         monkeypatch.setattr("web.routers.showcase.get_db_path", mock_get_db_path)
 
-        # Mock VideoRepository.get_all() 拋出異常
-        def mock_get_all_error(self):
+        # Mock VideoRepository.get_all_in_scope() 拋出異常
+        def mock_get_all_error(self, scope_uris):
             raise Exception("db error")
 
-        monkeypatch.setattr("core.database.VideoRepository.get_all", mock_get_all_error)
+        monkeypatch.setattr("core.database.VideoRepository.get_all_in_scope", mock_get_all_error)
 
         response = client.get("/api/showcase/videos")
         assert response.status_code == 500
@@ -171,16 +171,20 @@ class TestAC4BaselineFixtureComparison:
                     f"expected={expected_value!r} actual={actual_v[key]!r}"
                 )
             # 反向確認沒有意外多出的既有 key
-            # 排除的兩個都是「後續 branch 全域新增、有自己的測試」的鍵，各自單獨斷言過：
+            # 排除的三個都是「後續 branch 全域新增、有自己的測試」的鍵，各自單獨斷言過：
             #   part_tokens —— 本 task（122）新增
             #   user_rating —— spec-123 精選新增（TASK-123-T2 的 _serialize_video 無條件輸出，
             #                   未精選為 0；該欄位的行為由 tests/integration/test_api_showcase.py
             #                   的 TestShowcaseUserRatingField 三支守著，不歸本 baseline 管）
+            #   cover_srcset —— 多寬度縮圖新增；baseline 情境縮圖快取關閉，恆為 ''
             assert actual_v.get("user_rating") == 0, (
                 f"單檔片 {path} 的 user_rating 在 baseline fixture 情境下必為 0，"
                 f"實際 {actual_v.get('user_rating')}"
             )
-            extra_keys = set(actual_v.keys()) - set(expected_v.keys()) - {"part_tokens", "user_rating"}
+            assert actual_v.get("cover_srcset") == "", (
+                f"單檔片 {path} 的 cover_srcset 在縮圖快取關閉時必為 ''，實際 {actual_v.get('cover_srcset')!r}"
+            )
+            extra_keys = set(actual_v.keys()) - set(expected_v.keys()) - {"part_tokens", "user_rating", "cover_srcset"}
             assert not extra_keys, f"多出非預期 key: {extra_keys}（path={path}）"
 
 
@@ -12,6 +12,7 @@ import pytest
 from PIL import Image
 
 import core.thumbnail_cache as tc
+from core.path_utils import to_file_uri
 
 
 @pytest.fixture
@@ -65,6 +66,37 @@ def test_generate_produces_valid_webp_smaller(thumb_dir, tmp_path):
     assert dst.stat().st_size < cover.stat().st_size
 
 
+def test_generate_writes_all_widths_from_one_decode(thumb_dir, tmp_path):
+    cover = _make_jpg(tmp_path / "big.jpg", 3200, 1800)
+    uri = "file:///x/multi.mp4"
+    assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True
+    for width in tc.THUMB_WIDTHS:
+        with Image.open(str(tc.thumb_file_for(uri, width))) as img:
+            assert img.format == "WEBP"
+            assert img.size == (width, round(width * 1800 / 3200))
+    assert tc.thumb_file_for(uri, 800).name.endswith("_800.webp")
+
+
+def test_generate_uses_jpeg_draft_for_reduced_decode(thumb_dir, tmp_path, monkeypatch):
+    cover = _make_jpg(tmp_path / "big.jpg", 3200, 1800)
+    from PIL import JpegImagePlugin
+
+    requested = []
+    orig = JpegImagePlugin.JpegImageFile.draft
+    monkeypatch.setattr(JpegImagePlugin.JpegImageFile, "draft",
+                        lambda self, mode, size: requested.append(size) or orig(self, mode, size))
+    assert tc.generate(str(cover), thumb_dir / "ab" / "abc.webp") is True
+    assert requested == [(800, 450)]
+
+
+def test_snap_width():
+    assert tc.snap_width(None) == tc.THUMB_WIDTH
+    assert tc.snap_width(150) == 200
+    assert tc.snap_width(400) == 400
+    assert tc.snap_width(401) == 800
+    assert tc.snap_width(5000) == 800
+
+
 # ── 4. 原圖更窄不放大 ───────────────────────────────────────────
 def test_generate_does_not_upscale_narrow_source(thumb_dir, tmp_path):
     cover = _make_jpg(tmp_path / "narrow.jpg", 300, 200)
@@ -115,6 +147,7 @@ def test_invalidate_removes_existing(thumb_dir, tmp_path):
     assert tf.exists()
     tc.invalidate(uri)
     assert not tf.exists()
+    assert not any(tc.thumb_file_for(uri, w).exists() for w in tc.THUMB_WIDTHS)
 
 
 # ── 8. clear_all ────────────────────────────────────────────────
@@ -258,3 +291,194 @@ def test_lock_for_thumb_distinct_paths_distinct_locks(thumb_dir):
     a = tc.thumb_file_for("file:///x/A.mp4")
     b = tc.thumb_file_for("file:///x/B.mp4")
     assert tc._lock_for_thumb(a) is not tc._lock_for_thumb(b)
+
+
+# ── 12. 容量管理：usage / sweep（孤兒 GC + LRU 淘汰）──────────────
+def _fake_entry(uri, size=1000, mtime=1_000_000.0):
+    """直接造一組三寬度的假縮圖檔（內容不重要，只看大小 / mtime）。"""
+    for w in tc.THUMB_WIDTHS:
+        f = tc.thumb_file_for(uri, w)
+        f.parent.mkdir(parents=True, exist_ok=True)
+        f.write_bytes(b"x" * size)
+        os.utime(f, (mtime, mtime))
+
+
+@pytest.fixture
+def fresh_access(monkeypatch):
+    """隔離模組層 LRU 存取紀錄。"""
+    monkeypatch.setattr(tc, "_last_access", {})
+
+
+def test_usage_counts_entries_and_ignores_tmp(thumb_dir):
+    assert tc.usage() == {"entries": 0, "files": 0, "bytes": 0}
+    _fake_entry("file:///x/a.mp4", size=100)
+    (tc.thumb_file_for("file:///x/a.mp4").parent / "junk.tmp").write_bytes(b"y" * 999)
+    assert tc.usage() == {"entries": 1, "files": 3, "bytes": 300}
+    assert tc.entry_bytes("file:///x/a.mp4") == 300
+
+
+def test_sweep_removes_orphans_only(thumb_dir, fresh_access):
+    _fake_entry("file:///x/keep.mp4")
+    _fake_entry("file:///x/gone.mp4")
+
+    result = tc.sweep(iter(["file:///x/keep.mp4"]))
+
+    assert result["orphans"] == 1 and result["evicted"] == 0
+    assert all(tc.thumb_file_for("file:///x/keep.mp4", w).exists() for w in tc.THUMB_WIDTHS)
+    assert not any(tc.thumb_file_for("file:///x/gone.mp4", w).exists() for w in tc.THUMB_WIDTHS)
+
+
+def test_sweep_keeps_thumbs_generated_after_cutoff(thumb_dir, fresh_access):
+    """sweep 開始後才生成（新入庫影片）→ mtime 晚於 cutoff，不當孤兒刪。"""
+    import time
+    _fake_entry("file:///x/new.mp4", mtime=time.time() + 60)
+    assert tc.sweep([])["orphans"] == 0
+    assert tc.thumb_file_for("file:///x/new.mp4").exists()
+
+
+def test_sweep_evicts_least_recently_used_to_low_watermark(thumb_dir, fresh_access):
+    uris = [to_file_uri(f"/x/{i}.mp4") for i in range(4)]
+    for i, uri in enumerate(uris):
+        _fake_entry(uri, size=1000, mtime=1_000_000.0 + i)  # 每組 3000 bytes，0 最舊
+    # 0 最舊生成但剛被 serve → 最後才淘汰
+    tc.record_access(tc.thumb_file_for(uris[0], 200))
+
+    result = tc.sweep(uris, max_bytes=9000)  # 目前 12000 → 淘汰到 8100 以下
+
+    assert result["evicted"] == 2
+    assert result["bytes"] == 6000
+    kept = [u for u in uris if tc.thumb_file_for(u).exists()]
+    assert kept == [uris[0], uris[3]]
+
+
+def test_invalidate_and_clear_all_drop_access_records(thumb_dir, fresh_access):
+    uri = "file:///x/a.mp4"
+    _fake_entry(uri)
+    tc.record_access(tc.thumb_file_for(uri))
+    tc.invalidate(uri)
+    assert tc._last_access == {}
+    tc.record_access(tc.thumb_file_for(uri))
+    tc.clear_all()
+    assert tc._last_access == {}
+
+
+# ── 13. 打包模式（use_packed）──────────────────────────────────────
+@pytest.fixture
+def packed(thumb_dir, fresh_access):
+    tc.use_packed(True)
+    yield
+    tc.use_packed(False)
+
+
+def test_packed_generate_writes_no_loose_files(packed, thumb_dir, tmp_path):
+    uri = "file:///x/movie.mp4"
+    cover = _make_jpg(tmp_path / "cover.jpg")
+
+    assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True
+
+    assert not tc.thumb_file_for(uri).exists()
+    data, etag = tc.read_packed(uri, 200)
+    assert data[:4] == b"RIFF" and data[8:12] == b"WEBP"
+    assert list(tc.iter_missing([types.SimpleNamespace(path=uri, cover_path="file://" + str(cover))])) == []
+    assert tc.usage()["entries"] == 1
+
+
+def test_packed_invalidate_and_clear_all(packed, thumb_dir, tmp_path):
+    cover = _make_jpg(tmp_path / "cover.jpg")
+    for uri in ("file:///x/a.mp4", "file:///x/b.mp4"):
+        assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True
+
+    tc.invalidate("file:///x/a.mp4")
+    assert tc.read_packed("file:///x/a.mp4") is None
+    assert tc.read_packed("file:///x/b.mp4") is not None
+
+    tc.clear_all()
+    assert tc.read_packed("file:///x/b.mp4") is None
+    assert tc.usage()["entries"] == 0
+
+
+def test_packed_sweep_removes_orphans(packed, thumb_dir, tmp_path, monkeypatch):
+    cover = _make_jpg(tmp_path / "cover.jpg")
+    for uri in ("file:///x/keep.mp4", "file:///x/gone.mp4"):
+        assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True
+    monkeypatch.setattr(tc.time, "time", lambda: 4_000_000_000.0)  # sweep 在生成之後開始
+
+    result = tc.sweep(["file:///x/keep.mp4"])
+
+    assert result["orphans"] == 1
+    assert tc.read_packed("file:///x/keep.mp4") is not None
+    assert tc.read_packed("file:///x/gone.mp4") is None
+
+
+def test_switching_backend_discards_other_backend(thumb_dir, tmp_path, fresh_access):
+    uri = "file:///x/movie.mp4"
+    cover = _make_jpg(tmp_path / "cover.jpg")
+    assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True  # 檔案模式
+
+    tc.use_packed(True)
+    try:
+        assert not tc.thumb_file_for(uri).exists()
+        assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True
+    finally:
+        tc.use_packed(False)
+    assert not tc.is_packed()
+    assert not (thumb_dir / "packs").exists()
+
+
+# ── 14. 熱快取（行程內 bytes LRU）────────────────────────────────
+@pytest.fixture
+def fresh_hot(monkeypatch):
+    from collections import OrderedDict
+    monkeypatch.setattr(tc, "_hot", OrderedDict())
+    monkeypatch.setattr(tc, "_hot_bytes", 0)
+
+
+def test_read_file_fills_hot_and_invalidate_drops(thumb_dir, fresh_access, fresh_hot):
+    uri = "file:///x/a.mp4"
+    _fake_entry(uri, size=100)
+    tf = tc.thumb_file_for(uri, 200)
+    assert tc.read_hot(uri, 200) is None
+
+    data, etag = tc.read_file(tf)
+
+    assert tc.read_hot(uri, 200) == (data, etag)
+    assert etag == f'"{tf.stat().st_mtime_ns}"'
+    tc.invalidate(uri)
+    assert tc.read_hot(uri, 200) is None
+
+
+def test_hot_cache_is_size_bounded_lru(thumb_dir, fresh_access, fresh_hot, monkeypatch):
+    monkeypatch.setattr(tc, "HOT_CACHE_MAX_BYTES", 250)
+    uris = [to_file_uri(f"/x/{i}.mp4") for i in range(3)]
+    for uri in uris:
+        _fake_entry(uri, size=100)
+    tc.read_file(tc.thumb_file_for(uris[0]))
+    tc.read_file(tc.thumb_file_for(uris[1]))
+    tc.read_hot(uris[0])  # 0 變最近使用
+    tc.read_file(tc.thumb_file_for(uris[2]))  # 超過 250 → 淘汰最久未用的 1
+
+    assert tc.read_hot(uris[0]) is not None
+    assert tc.read_hot(uris[1]) is None
+    assert tc.read_hot(uris[2]) is not None
+    assert tc.hot_stats()["bytes"] == 200
+
+
+def test_clear_all_and_generate_drop_hot(thumb_dir, tmp_path, fresh_access, fresh_hot):
+    uri = "file:///x/a.mp4"
+    cover = _make_jpg(tmp_path / "cover.jpg")
+    assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True
+    tc.read_file(tc.thumb_file_for(uri))
+
+    assert tc.generate(str(cover), tc.thumb_file_for(uri)) is True  # 重生 → 舊 bytes 作廢
+    assert tc.read_hot(uri) is None
+
+    tc.read_file(tc.thumb_file_for(uri))
+    tc.clear_all()
+    assert tc.read_hot(uri) is None
+
+
+def test_fill_started_before_reset_is_discarded(thumb_dir, fresh_hot):
+    generation = tc._hot_generation
+    tc._hot_reset()
+    tc._hot_put("k", b"stale", '"1"', generation)
+    assert tc.hot_stats()["items"] == 0
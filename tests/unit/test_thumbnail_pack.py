@@ -0,0 +1,105 @@
+"""core.thumbnail_pack — append-only pack 檔 ＋ SQLite 索引的縮圖儲存"""
+import pytest
+
+import core.thumbnail_pack as tp
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = tp.PackStore(tmp_path / "packs")
+    yield s
+    s.close()
+
+
+def test_put_get_roundtrip_and_has(store):
+    store.put("aa11", {200: b"small", 400: b"medium"})
+
+    data, etag = store.get("aa11", 400)
+    assert data == b"medium"
+    assert etag.startswith('"p0-5-')
+    assert store.get("aa11", 200)[0] == b"small"
+    assert store.has("aa11", 200) and not store.has("aa11", 800)
+    assert store.get("bb22", 400) is None
+    assert store.entry_bytes("aa11") == 11
+
+
+def test_rewrite_changes_etag_and_reads_remap_after_append(store):
+    store.put("aa11", {400: b"v1"})
+    _, first = store.get("aa11", 400)  # 映射建立於較短的 pack
+    store.put("aa11", {400: b"v2-longer"})
+
+    data, second = store.get("aa11", 400)
+    assert data == b"v2-longer"
+    assert second != first
+
+
+def test_delete_respects_older_than(store):
+    store.put("aa11", {400: b"x"})
+    assert store.delete("aa11", older_than=0.0) is False  # 寫入時間較新 → 保留
+    assert store.has("aa11", 400)
+    assert store.delete("aa11") is True
+    assert store.entries() == {}
+
+
+def test_rolls_to_new_pack_and_compacts_dead_space(store, monkeypatch):
+    monkeypatch.setattr(tp, "PACK_MAX_BYTES", 10)
+    store.put("aa11", {400: b"12345678"})
+    store.put("bb22", {400: b"abcdefgh"})  # 超過上限 → 換 pack 1
+    store.put("cc33", {400: b"ABCDEFGH"})  # pack 2
+    assert [p.name for p in sorted(store.root.glob("*.pack"))] == \
+        ["000000.pack", "000001.pack", "000002.pack"]
+
+    store.delete("aa11")
+    reclaimed = store.compact()
+
+    assert reclaimed == 8
+    assert not (store.root / "000000.pack").exists()
+    assert store.get("bb22", 400)[0] == b"abcdefgh"  # 死空間比例不足的 pack 不搬
+    assert store.get("cc33", 400)[0] == b"ABCDEFGH"
+
+
+def test_compact_moves_live_records(store, monkeypatch):
+    monkeypatch.setattr(tp, "PACK_MAX_BYTES", 20)
+    store.put("aa11", {400: b"live-data"})
+    store.put("bb22", {400: b"dead-data-x"})
+    store.put("cc33", {400: b"current"})  # pack 1（目前 pack 不參與 compact）
+    store.delete("bb22")
+
+    store.compact()
+
+    assert not (store.root / "000000.pack").exists()
+    assert store.get("aa11", 400)[0] == b"live-data"
+
+
+def test_compact_moves_live_records_in_batched_appends(store, monkeypatch):
+    """搬移整批 append：一批一次 fsync，不是一張一次（compact 全程持寫入鎖）。"""
+    store.put("dead", {400: b"x" * 1000})
+    for i in range(20):
+        store.put(f"h{i:02d}", {200: b"s%02d" % i, 400: b"m%02d" % i})
+    store.delete("dead")
+    monkeypatch.setattr(tp, "COMPACT_BATCH_BYTES", 50)
+    fsyncs = []
+    real_fsync = tp.os.fsync
+    monkeypatch.setattr(tp.os, "fsync", lambda fd: (fsyncs.append(fd), real_fsync(fd)))
+
+    store.compact()
+
+    # 40 筆 × 3 bytes = 120 bytes，每批 ≥ 50 bytes → 3 批（17 ＋ 17 ＋ 6 筆）
+    assert len(fsyncs) == 3
+    assert not (store.root / "000000.pack").exists()
+    for i in range(20):
+        assert store.get(f"h{i:02d}", 200)[0] == b"s%02d" % i
+        assert store.get(f"h{i:02d}", 400)[0] == b"m%02d" % i
+
+
+def test_clear_and_reopen(store, tmp_path):
+    store.put("aa11", {400: b"x"})
+    store.clear()
+    assert store.entries() == {} and store.disk_bytes() == 0
+
+    store.put("bb22", {400: b"persisted"})
+    reopened = tp.PackStore(tmp_path / "packs")
+    try:
+        assert reopened.get("bb22", 400)[0] == b"persisted"
+    finally:
+        reopened.close()
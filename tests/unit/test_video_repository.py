@@ -251,6 +251,24 @@ class TestVideoRepository:
         assert repo.count() == 1
         assert repo.get_by_path(to_file_uri("/video2.mp4")) is not None
 
+    def test_get_cover_path_map(self, temp_db):
+        """測試 get_cover_path_map 批次讀 cover（未在 DB 的 path 不出現、無 cover 回空字串）"""
+        repo = VideoRepository(temp_db)
+        repo.upsert_batch([
+            Video(path=to_file_uri("/video1.mp4"), mtime=100.0, cover_path=to_file_uri("/video1.jpg")),
+            Video(path=to_file_uri("/video2.mp4"), mtime=200.0),
+        ])
+
+        cover_map = repo.get_cover_path_map([
+            to_file_uri("/video1.mp4"), to_file_uri("/video2.mp4"), to_file_uri("/missing.mp4"),
+        ])
+
+        assert cover_map == {
+            to_file_uri("/video1.mp4"): to_file_uri("/video1.jpg"),
+            to_file_uri("/video2.mp4"): "",
+        }
+        assert repo.get_cover_path_map([]) == {}
+
     def test_delete_by_paths_empty(self, temp_db):
         """測試 delete_by_paths 空列表"""
         repo = VideoRepository(temp_db)
@@ -1836,3 +1854,198 @@ class TestSetUserRatingMutator:
         assert result == {path_a: True, path_b: True, path_missing: False}
         assert repo.get_by_path(path_a).user_rating == 1
         assert repo.get_by_path(path_b).user_rating == 1
+
+
+class TestLibraryGeneration:
+    """get_library_generation：videos 任何寫入（含 raw SQL）都讓 generation 前進"""
+
+    def test_every_write_kind_bumps(self, temp_db, sample_video):
+        repo = VideoRepository(temp_db)
+        epoch, g0 = repo.get_library_generation()
+
+        repo.upsert(sample_video)
+        _, g1 = repo.get_library_generation()
+        assert g1 > g0
+
+        repo.set_user_rating(sample_video.path, 1)
+        _, g2 = repo.get_library_generation()
+        assert g2 > g1
+
+        conn = repo._get_connection()
+        try:
+            conn.execute("UPDATE videos SET title = 'raw' WHERE path = ?", (sample_video.path,))
+            conn.commit()
+        finally:
+            conn.close()
+        _, g3 = repo.get_library_generation()
+        assert g3 > g2
+
+        repo.delete_by_paths([sample_video.path])
+        epoch_after, g4 = repo.get_library_generation()
+        assert g4 > g3
+        assert epoch_after == epoch
+
+    def test_reads_do_not_bump(self, temp_db, sample_video):
+        repo = VideoRepository(temp_db)
+        repo.upsert(sample_video)
+        before = repo.get_library_generation()
+        repo.get_all()
+        repo.get_by_path(sample_video.path)
+        assert repo.get_library_generation() == before
+
+
+class TestPathKeyScope:
+    """videos.path_key + get_all_in_scope：DB 端 scope 與 is_path_under_dir 一致"""
+
+    @staticmethod
+    def _path_keys(repo):
+        conn = repo._get_connection()
+        try:
+            return dict(conn.execute("SELECT path, path_key FROM videos").fetchall())
+        finally:
+            conn.close()
+
+    def test_scope_matches_is_path_under_dir(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert_batch([
+            Video(path="file:///E:/Media/a.mp4"),
+            Video(path="file:///E:/media2/b.mp4"),
+            Video(path="file:///home/user/c.mp4"),
+            Video(path="file:///home/User/d.mp4"),
+        ])
+        got = {v.path for v in repo.get_all_in_scope(["file:///e:/MEDIA", "file:///home/user"])}
+        assert got == {"file:///E:/Media/a.mp4", "file:///home/user/c.mp4"}
+        assert repo.get_all_in_scope([]) == []
+
+    def test_writes_maintain_path_key(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert(Video(path="file:///C:/Old/a.mp4"))
+        repo.repath_path_only("file:///C:/Old/a.mp4", "file:///D:/New/a.mp4")
+        repo.repath("file:///D:/New/a.mp4", "file:///D:/Newer/a.mp4", Video(path="file:///D:/Newer/a.mp4"))
+        assert self._path_keys(repo) == {"file:///D:/Newer/a.mp4": "file:///d:/newer/a.mp4"}
+
+    def test_raw_writes_fall_back_and_backfill(self, temp_db):
+        """不經 repository 的寫入：path_key 為 NULL 仍查得到，init_db 補算"""
+        from core.database import connection, init_db
+
+        repo = VideoRepository(temp_db)
+        repo.upsert(Video(path="file:///C:/Lib/a.mp4"))
+        conn = repo._get_connection()
+        try:
+            conn.execute("INSERT INTO videos (path) VALUES ('file:///C:/Lib/raw.mp4')")
+            conn.execute("UPDATE videos SET path = 'file:///C:/Lib/moved.mp4' WHERE path = 'file:///C:/Lib/a.mp4'")
+            conn.commit()
+        finally:
+            conn.close()
+        assert set(self._path_keys(repo).values()) == {None}
+
+        got = {v.path for v in repo.get_all_in_scope(["file:///c:/lib"])}
+        assert got == {"file:///C:/Lib/raw.mp4", "file:///C:/Lib/moved.mp4"}
+
+        connection._schema_verified.clear()  # 補算發生在下一次 process 啟動驗證 schema 時
+        init_db(temp_db)
+        assert self._path_keys(repo) == {
+            "file:///C:/Lib/raw.mp4": "file:///c:/lib/raw.mp4",
+            "file:///C:/Lib/moved.mp4": "file:///c:/lib/moved.mp4",
+        }
+
+    def test_scope_uses_path_key_index(self, temp_db):
+        repo = VideoRepository(temp_db)
+        conn = repo._get_connection()
+        try:
+            sql, params = repo._scope_where(conn, ["file:///C:/Lib"])
+            plan = " ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN SELECT id FROM videos WHERE {sql}", params))
+        finally:
+            conn.close()
+        assert "idx_videos_path_key" in plan
+
+
+class TestUpsertBatchBulk:
+    """upsert_batch：單一 SQL + executemany 分塊 transaction，筆數由 changes()/id 水位推得"""
+
+    def test_counts_across_chunks(self, temp_db, monkeypatch):
+        from core.database import video as video_module
+        monkeypatch.setattr(video_module, "_UPSERT_BATCH_CHUNK", 3)
+
+        repo = VideoRepository(temp_db)
+        repo.upsert_batch([Video(path=to_file_uri(f"/lib/{i}.mp4")) for i in range(4)])
+        batch = [Video(path=to_file_uri(f"/lib/{i}.mp4"), title="t") for i in range(10)]
+        assert repo.upsert_batch(batch) == (6, 4)
+        assert repo.count() == 10
+        assert repo.get_by_path(to_file_uri("/lib/0.mp4")).title == "t"
+
+    def test_large_batch_exceeds_variable_limit(self, temp_db):
+        """超過 SQLite 變數上限的首次掃描批量（舊版 IN (...) 預查會炸）"""
+        repo = VideoRepository(temp_db)
+        batch = [Video(path=to_file_uri(f"/big/{i}.mp4")) for i in range(5000)]
+        assert repo.upsert_batch(batch) == (5000, 0)
+        assert repo.upsert_batch(batch) == (0, 5000)
+
+    def test_duplicate_path_in_batch(self, temp_db):
+        repo = VideoRepository(temp_db)
+        batch = [Video(path="file:///dup.mp4", title="a"), Video(path="file:///dup.mp4", title="b")]
+        assert repo.upsert_batch(batch) == (1, 1)
+        assert repo.get_by_path("file:///dup.mp4").title == "b"
+
+    def test_sql_built_once_per_shape(self, temp_db):
+        repo = VideoRepository(temp_db)
+        VideoRepository._upsert_sql.cache_clear()
+        repo.upsert_batch([Video(path=to_file_uri(f"/s/{i}.mp4")) for i in range(50)])
+        repo.upsert(Video(path="file:///s/single.mp4"))
+        info = VideoRepository._upsert_sql.cache_info()
+        assert info.misses == 1 and info.hits == 1
+
+    def test_failed_chunk_rolls_back_and_skips_invalidate(self, temp_db):
+        repo = VideoRepository(temp_db)
+        with patch("core.similar.ranker_cache.SimilarRankerCache.invalidate") as inv:
+            with pytest.raises(Exception):
+                repo.upsert_batch([Video(path="file:///ok.mp4"), Video(path=None)])
+            inv.assert_not_called()
+        assert repo.count() == 0
+
+
+class TestIterRows:
+    """iter_rows：欄位投影 namedtuple + id keyset 分批串流"""
+
+    def test_projection_and_json_decoding(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert(Video(path=to_file_uri("/p/a.mp4"), number="A-1", actresses=["X", "Y"], tags=["t"]))
+        rows = list(repo.iter_rows(("path", "number", "actresses", "tags")))
+        assert len(rows) == 1
+        row = rows[0]
+        assert row._fields == ("path", "number", "actresses", "tags")
+        assert row.actresses == ["X", "Y"] and row.tags == ["t"]
+        assert row.number == "A-1"
+
+    def test_corrupt_json_decodes_to_empty_list(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert(Video(path=to_file_uri("/p/bad.mp4")))
+        conn = repo._get_connection()
+        try:
+            conn.execute("UPDATE videos SET tags = '{broken'")
+            conn.commit()
+        finally:
+            conn.close()
+        assert [r.tags for r in repo.iter_rows(("tags",))] == [[]]
+
+    def test_batches_cover_all_rows_in_id_order(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert_batch([Video(path=to_file_uri(f"/p/{i:02d}.mp4")) for i in range(25)])
+        expected = [v.path for v in repo.get_all()]
+        assert [r.path for r in repo.iter_rows(("path",), batch=7)] == expected
+
+    def test_where_and_scope(self, temp_db):
+        repo = VideoRepository(temp_db)
+        repo.upsert_batch([
+            Video(path="file:///C:/Lib/a.mp4", cover_path="file:///C:/Lib/a.jpg"),
+            Video(path="file:///C:/Lib/b.mp4"),
+            Video(path="file:///D:/Other/c.mp4", cover_path="file:///D:/Other/c.jpg"),
+        ])
+        got = [r.path for r in repo.iter_rows(("path",), where="IFNULL(cover_path, '') != ''",
+                                              scope_uris=["file:///c:/lib"])]
+        assert got == ["file:///C:/Lib/a.mp4"]
+
+    def test_unknown_column_rejected(self, temp_db):
+        repo = VideoRepository(temp_db)
+        with pytest.raises(ValueError):
+            list(repo.iter_rows(("path", "path; DROP TABLE videos")))
@@ -36,6 +36,10 @@ logger = get_logger(__name__)
 from core.config import load_config
 from core.database import init_db
 from core.database import backfill_readonly_nfo_mtime
+from core.database import close_pooled_connections
+from core.database import MAINTENANCE_INTERVAL_S, db_maintenance
+from core.gallery_watcher import gallery_watcher
+from core import thumbnail_cache
 from core.metatube.state import metatube_state as _mt_startup_state
 from core.access_auth import ensure_schema, load_snapshot, snapshot, verify_ticket
 
@@ -70,6 +74,21 @@ async def _startup_update_check() -> None:
         logger.warning("lifespan: startup update check failed", exc_info=True)
 
 
+async def _db_maintenance_loop() -> None:
+    """背景 DB 維護：每 MAINTENANCE_INTERVAL_S 在 executor 跑一輪 db_maintenance.run_once()。
+
+    第一輪延後一個間隔才跑（不拖慢啟動）；各項目是否執行由 DbMaintenance 依條件決定，
+    結果經 GET /api/diagnostics 回報。任何例外只記錄，迴圈持續到 shutdown cancel。
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(MAINTENANCE_INTERVAL_S)
+        try:
+            await loop.run_in_executor(None, db_maintenance.run_once)
+        except Exception:
+            logger.warning("lifespan: db maintenance round failed", exc_info=True)
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # ── startup ───────────────────────────────────────────────
@@ -98,6 +117,12 @@ async def lifespan(app: FastAPI):
     except Exception:
         logger.warning("lifespan: backfill_readonly_nfo_mtime failed unexpectedly", exc_info=True)
 
+    # 縮圖儲存後端（thumbnail_cache_packed）：請求進來前決定，之後由 PUT /api/config 切換。
+    try:
+        thumbnail_cache.use_packed(bool(load_config().get("thumbnail_cache_packed", False)))
+    except Exception:
+        logger.warning("lifespan: thumbnail storage setup failed", exc_info=True)
+
     # TASK-63e-1: auto-reconnect metatube from persisted config.
     # Wrapped in try-except so any unexpected failure cannot crash startup.
     try:
@@ -123,9 +148,20 @@ async def lifespan(app: FastAPI):
     # 執行中途被 GC 回收 —— 存 app.state（app 已建立、比 module global 乾淨，無需 global）。
     app.state.startup_check_task = asyncio.create_task(_startup_update_check())
 
+    # 背景 DB 維護（optimize / ANALYZE / checkpoint / vacuum，見 core/database/maintenance.py）
+    app.state.db_maintenance_task = asyncio.create_task(_db_maintenance_loop())
+
+    # gallery 資料夾監看（背景執行緒；gallery.watch_enabled 關閉時只空轉讀 config，
+    # 見 core/gallery_watcher.py）
+    gallery_watcher.start()
+
     yield
     # ── shutdown ──────────────────────────────────────────────
-    # 目前無 shutdown 邏輯（setup_logging 是 module-level，不需 teardown）
+    app.state.db_maintenance_task.cancel()
+    gallery_watcher.stop()
+    # 關閉 SQLite 連線池的閒置連線（setup_logging 是 module-level，不需 teardown）。
+    # 其他執行緒持有的閒置連線隨執行緒結束釋放，這裡只需作廢 generation。
+    close_pooled_connections()
 
 
 # FastAPI 應用
@@ -464,7 +500,7 @@ def get_common_context(request: Request) -> dict:
     """取得共用的模板 Context (包含設定)"""
     from core.config import load_config, mutate_config
     from core.i18n import t as _t, get_merged_translations, detect_locale_from_accept_language
-    config = load_config()
+    config = load_config().copy()  # template context 會就地補 locale / sources 的 transient 欄位
 
     # Font size mapping
     FONT_SIZE_MAP = {"xs": 13, "sm": 14, "md": 16, "lg": 18, "xl": 20}
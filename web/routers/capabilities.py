@@ -401,7 +401,17 @@ _TOOLS: list[dict] = [
                     "type": "integer",
                     "default": 500,
                     "maximum": 500,
-                    "description": "回傳筆數上限",
+                    "description": "回傳筆數上限（mode=rows）",
+                },
+                "mode": {
+                    "type": "string",
+                    "enum": ["rows", "ndjson", "explain"],
+                    "default": "rows",
+                    "description": (
+                        "rows：JSON 一次回傳；ndjson：application/x-ndjson 串流，可超過 500 筆"
+                        "（首行 columns、每列一行 array、末行 {done,count,truncated}）；"
+                        "explain：只回傳 EXPLAIN QUERY PLAN"
+                    ),
                 },
             },
             "required": ["sql"],
@@ -412,6 +422,7 @@ _TOOLS: list[dict] = [
             "rows": "[[any]] — 二維結果陣列",
             "count": "integer — 回傳筆數",
         },
+        "cost_hint": "單一查詢有 VM 指令數與執行時間預算（約 5 秒），超過回「查詢過於耗費資源」；先用 mode=explain 確認走索引",
         "retry_safe": True,
         "database_schema": {
             "videos": {
@@ -675,7 +686,10 @@ _TOOLS: list[dict] = [
             "合併成單一 item，`path` 是**段號最小的那一段**（通常是 cd1，但不保證 cd1 存在）、"
             "`size` 是各段加總、`part_tokens` 列出段別。"
             "因此 `total` 是**分組數不是檔案數**，做全庫盤點時不要當成檔案總數。"
-            " ⚠️ 高 token 成本：回整個 configured directory（可能數百到數千筆）一次回完，無分頁。"
+            " ⚠️ 高 token 成本：不帶 `limit` 時回整個 configured directory（可能數百到數千筆）一次回完。"
+            " 帶 `limit` 則改為 keyset 分頁：伺服器端排序（sort/order）與篩選"
+            "（actress/tag/maker/series 精確比對、rating 下限、has_cover），回 `next_cursor`"
+            "（null ＝ 最後一頁），下一頁原樣帶回 `cursor`；分頁模式的 `total` 是符合條件的**檔案數**。"
             " Routing 規則（依優先級）："
             " (1) 已知具體 path → 用 `showcase_video`（單筆，省 token）；"
             " (2) 只需 ID/path 篩選、統計、條件查詢 → 用 `collection_sql`（自訂 SELECT）"
@@ -687,12 +701,24 @@ _TOOLS: list[dict] = [
         "path": "/api/showcase/videos",
         "input_schema": {
             "type": "object",
-            "properties": {},
+            "properties": {
+                "limit": {"type": "integer", "description": "每頁組數 1-500；省略＝不分頁回全部"},
+                "cursor": {"type": "string", "description": "上一頁回傳的 next_cursor（僅分頁模式）"},
+                "sort": {"type": "string", "enum": ["date", "mtime", "size", "rating"], "default": "date"},
+                "order": {"type": "string", "enum": ["asc", "desc"], "default": "desc"},
+                "actress": {"type": "string", "description": "女優名精確比對（僅分頁模式）"},
+                "tag": {"type": "string", "description": "標籤精確比對（僅分頁模式）"},
+                "maker": {"type": "string", "description": "片商精確比對（僅分頁模式）"},
+                "series": {"type": "string", "description": "系列精確比對（僅分頁模式）"},
+                "rating": {"type": "integer", "description": "user_rating 下限（僅分頁模式）"},
+                "has_cover": {"type": "boolean", "description": "有／無封面（僅分頁模式）"},
+            },
             "required": [],
         },
         "output_schema": {
             "success": "boolean",
-            "total": "integer — videos 陣列長度",
+            "total": "integer — 不分頁：videos 陣列長度；分頁：符合條件的檔案數",
+            "next_cursor": "string | null — 僅分頁模式；null 表示已到最後一頁",
             "videos": {
                 "type": "array",
                 "description": "影片清單；每筆 item 為 23 欄位 dict（分集片一組一筆）",
@@ -765,6 +791,40 @@ _TOOLS: list[dict] = [
         "retry_safe": True,
         "_example_template": "curl '{base}/api/showcase/video?path=file:///C:/AVtest/SONE-205/SONE-205.mp4'",
     },
+    {
+        "name": "showcase_search",
+        "description": (
+            "本地片庫全文檢索（伺服器端、依相關度排序、分頁）。關鍵字以空白分隔、詞與詞 AND，"
+            "每個詞對番號／標題／原文標題／女優／標籤／系列／片商／廠牌做不分大小寫的子字串比對"
+            "（中日文可用，例如女優名片段、系列名片段）。"
+            " 只回當前 Showcase 設定資料夾下的影片；命中以單檔為單位，不做分集合併（無 part_tokens）。"
+            " 找特定關鍵字時優先用本 tool，比 `showcase_videos` 全量拉回省大量 token。"
+        ),
+        "method": "GET",
+        "path": "/api/showcase/search",
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "q": {"type": "string", "description": "關鍵字（空白分隔，全部都要命中）"},
+                "limit": {"type": "integer", "default": 60, "minimum": 1, "maximum": 200},
+                "offset": {"type": "integer", "default": 0, "minimum": 0},
+            },
+            "required": ["q"],
+        },
+        "output_schema": {
+            "success": "boolean",
+            "total": "integer — scope 內命中總數（分頁前）",
+            "offset": "integer",
+            "limit": "integer",
+            "videos": (
+                "array — 當頁影片，依相關度排序；item schema 同 showcase_videos.videos.item_fields"
+                "（不含 part_tokens）"
+            ),
+        },
+        "side_effect": False,
+        "retry_safe": True,
+        "_example_template": "curl '{base}/api/showcase/search?q=SONE&limit=20'",
+    },
     {
         "name": "jellyfin_check",
         "description": (
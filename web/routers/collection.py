@@ -10,15 +10,23 @@ collection.py — POST /api/collection/sql read-only SQL 查詢端點 + /api/use
 import json
 import re
 import sqlite3
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, List, Literal, Optional
 
 from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
+from core.collection_health import (  # 判定規則移至 core（寫入端預算旗標共用），此處保留原名
+    CORRUPTION_RULES,
+    get_fixed_number as _get_fixed_number,
+    has_japanese_tags as _has_japanese_tags,  # noqa: F401 — 既有測試 import 入口
+    is_corrupted_number as _is_corrupted_number,
+)
 from core.config import load_config
-from core.database import Video, VideoRepository, get_connection, get_db_path
+from core.database import Video, VideoRepository, get_connection, get_db_path, get_readonly_connection
 from core.logger import get_logger
 from core.multipart_group import resolve_groups_bulk
 from core.nfo_updater import update_nfo_user_tags
@@ -32,14 +40,18 @@ router = APIRouter(prefix="/api/collection", tags=["collection"])
 # 允許的表名白名單
 ALLOWED_TABLES = {"videos", "actress_aliases"}
 
-# ── Analysis 常數 ─────────────────────────────────────────────────────────────
+# ── SQL 執行預算 ──────────────────────────────────────────────────────────────
+# busy_timeout 只管等鎖，不限 CPU：cartesian join / json_each 爆量的查詢會吃滿一顆核心、
+# 佔住 threadpool worker 直到跑完。以 progress handler 同時限制 VM 指令數與執行時間，
+# 超過即 interrupt（LAN 共用 server 不被單一 agent 查詢拖住）。
+_SQL_PROGRESS_INTERVAL = 10_000        # 每執行 N 個 VM 指令呼叫一次 handler
+_SQL_VM_STEP_BUDGET = 100_000_000      # 單一查詢 VM 指令上限
+_SQL_TIME_BUDGET_S = 5.0               # 單一查詢執行時間上限（ndjson 只計 SQLite 執行時間）
+_SQL_STREAM_MAX_ROWS = 100_000         # ndjson 模式筆數上限（rows 模式仍為 500）
+_SQL_STREAM_BATCH = 500
+_ERR_TOO_EXPENSIVE = "查詢過於耗費資源（超過執行預算），請加上 WHERE / LIMIT 縮小範圍"
 
-CORRUPTION_RULES = [
-    {"name": "digit_prefix", "pattern": r"^(\d+)([A-Z]{2,}-\d+)$",  "fix_group": 2},
-    {"name": "TK_prefix",    "pattern": r"^TK([A-Z]{2,}-\d+)$",     "fix_group": 1},
-    {"name": "K9_prefix",    "pattern": r"^K9([A-Z]{2,}-\d+)$",     "fix_group": 1},
-    {"name": "R_prefix",     "pattern": r"^R-([A-Z]{2,}-\d+)$",     "fix_group": 1},
-]
+# ── Analysis 常數 ─────────────────────────────────────────────────────────────
 
 WESTERN_PATH_PATTERNS = ["西洋", "《03》", "《05》"]
 
@@ -56,51 +68,14 @@ def _is_western(path: str) -> bool:
     return any(p in path for p in WESTERN_PATH_PATTERNS)
 
 
-def _is_corrupted_number(number) -> bool:
-    """判斷番號是否符合任一 corruption pattern（None-safe）"""
-    if number is None:
-        return False
-    upper = number.upper()
-    return any(re.match(rule["pattern"], upper) for rule in CORRUPTION_RULES)
-
-
-def _get_fixed_number(number) -> Optional[str]:
-    """
-    遍歷 CORRUPTION_RULES，找第一個 match，回傳 fix_group 對應的 capture group。
-    不 match → 回傳 None。供 preview 和 apply 共用。
-    """
-    if number is None:
-        return None
-    upper = number.upper()
-    for rule in CORRUPTION_RULES:
-        m = re.match(rule["pattern"], upper)
-        if m:
-            return m.group(rule["fix_group"])
-    return None
-
-
-def _has_japanese_tags(tags_json) -> bool:
-    """判斷 tags JSON 字串中是否含有假名字元（None-safe，非法 JSON 返回 False）"""
-    if not tags_json:
-        return False
-    try:
-        tags = json.loads(tags_json)
-    except (json.JSONDecodeError, TypeError):
-        return False
-    if not isinstance(tags, list):
-        return False
-    return any(
-        bool(re.search(r"[\u3040-\u30ff]", tag))
-        for tag in tags
-        if isinstance(tag, str)
-    )
-
-
 # ── Request / Response Model ──────────────────────────────────────────────────
 
 class SqlRequest(BaseModel):
     sql: str = Field(..., min_length=1)
     limit: int = Field(default=500, ge=1, le=500)
+    # rows：JSON 一次回傳（limit 筆）；ndjson：串流回傳至多 _SQL_STREAM_MAX_ROWS 筆；
+    # explain：只回傳 EXPLAIN QUERY PLAN，不執行查詢
+    mode: Literal["rows", "ndjson", "explain"] = "rows"
 
 
 class AnalysisGroupRequest(BaseModel):
@@ -197,20 +172,75 @@ def validate_sql(sql: str) -> Optional[str]:
     return None  # 全部通過
 
 
+class _QueryBudget:
+    """SQLite progress handler：VM 指令數或執行時間超過預算即中斷查詢。
+
+    handler 回傳非 0 時 SQLite 中止目前語句，sqlite3 拋 OperationalError("interrupted")；
+    `exceeded` 供呼叫端把這個 interrupt 與一般 SQL 錯誤區分開。
+    執行時間只在 `running()` 區間內累計——ndjson 串流時等待 client 讀取的時間不算。
+    """
+
+    def __init__(self, max_steps: int, max_seconds: float):
+        self.max_steps = max_steps
+        self.max_seconds = max_seconds
+        self.steps = 0
+        self.elapsed = 0.0
+        self.exceeded = False
+        self._started: Optional[float] = None
+
+    def install(self, conn: sqlite3.Connection) -> None:
+        conn.set_progress_handler(self, _SQL_PROGRESS_INTERVAL)
+
+    @contextmanager
+    def running(self):
+        self._started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.elapsed += time.monotonic() - self._started
+            self._started = None
+
+    def __call__(self) -> int:
+        self.steps += _SQL_PROGRESS_INTERVAL
+        elapsed = self.elapsed
+        if self._started is not None:
+            elapsed += time.monotonic() - self._started
+        if self.steps > self.max_steps or elapsed > self.max_seconds:
+            self.exceeded = True
+            return 1
+        return 0
+
+
+def _ndjson_default(value: Any) -> Any:
+    """ndjson 序列化 BLOB 欄位（與 JSONResponse 的 bytes 處理一致：decode 為字串）"""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _ndjson_line(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, default=_ndjson_default) + "\n"
+
+
 # ── 端點實作 ──────────────────────────────────────────────────────────────────
 
-@router.post("/sql")
-def collection_sql(request: SqlRequest) -> dict:
+@router.post("/sql", response_model=None)
+def collection_sql(request: SqlRequest) -> dict | JSONResponse | StreamingResponse:
     """
     執行 read-only SQL 查詢。
 
     12 層安全防護：
     - 層 1–7：字串層級 pre-check（validate_sql）
     - 層 8：read-only connection（mode=ro + PRAGMA query_only + busy_timeout）
-    - 層 9：結果限制 min(limit, 500)
-    - 層 10：timeout 由 busy_timeout PRAGMA 控制
+    - 層 9：結果限制 min(limit, 500)；mode=ndjson 串流至多 _SQL_STREAM_MAX_ROWS 筆
+    - 層 10：執行預算（_QueryBudget：VM 指令數 + 執行時間），超過回「查詢過於耗費資源」
     - 層 11：columns 從 cursor.description 提取
     - 層 12：錯誤細節遮蔽（不暴露 sqlite 原始訊息）
+
+    mode=explain 只回傳 EXPLAIN QUERY PLAN（columns/rows 同一格式），供 agent 先確認
+    查詢是否走索引。mode=ndjson 回傳 application/x-ndjson：首行 {"columns": [...]}、
+    每列一行 JSON array、末行 {"done": true, "count": n, "truncated": bool}（中途超過預算則末行為
+    {"done": false, "error": ..., "count": n}）。
     """
     _ERR_EMPTY = {"success": False, "error": "", "columns": [], "rows": [], "count": 0}
 
@@ -232,22 +262,43 @@ def collection_sql(request: SqlRequest) -> dict:
 
     # 層 9：結果限制
     effective_limit = min(request.limit, 500)
+    streaming = request.mode == "ndjson"
+    sql = f"EXPLAIN QUERY PLAN {request.sql}" if request.mode == "explain" else request.sql
 
     conn = None
+    budget = _QueryBudget(_SQL_VM_STEP_BUDGET, _SQL_TIME_BUDGET_S)
     try:
         # 層 8：read-only connection
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        if streaming:
+            # StreamingResponse 以 threadpool 逐批呼叫 generator，可能跨執行緒
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
         conn.execute("PRAGMA query_only = ON")    # belt-and-suspenders
-        conn.execute("PRAGMA busy_timeout = 5000")  # 5 秒 timeout
+        conn.execute("PRAGMA busy_timeout = 5000")  # 5 秒等鎖
+        # 層 10：執行預算
+        budget.install(conn)
 
         cursor = conn.cursor()
-        cursor.execute(request.sql)
+        with budget.running():
+            cursor.execute(sql)
 
         # 層 11：columns 從 cursor.description 提取
         columns: List[str] = [desc[0] for desc in cursor.description]
 
+        if streaming:
+            with budget.running():
+                first = cursor.fetchmany(_SQL_STREAM_BATCH)
+            response = StreamingResponse(
+                _stream_rows(conn, cursor, budget, columns, first),
+                media_type="application/x-ndjson",
+            )
+            conn = None  # 交給 generator 關閉
+            return response
+
         # 層 9：fetchmany 限制筆數
-        rows: List[List[Any]] = [list(row) for row in cursor.fetchmany(effective_limit)]
+        with budget.running():
+            rows: List[List[Any]] = [list(row) for row in cursor.fetchmany(effective_limit)]
 
         return {
             "success": True,
@@ -257,6 +308,9 @@ def collection_sql(request: SqlRequest) -> dict:
         }
 
     except sqlite3.OperationalError as e:
+        if budget.exceeded:
+            logger.warning("[collection/sql] 超過執行預算（%d VM steps, %.2fs）", budget.steps, budget.elapsed)
+            return _err(_ERR_TOO_EXPENSIVE)
         # 層 12：含 database is locked（timeout）+ 語法錯誤等
         logger.warning("[collection/sql] SQL 執行失敗: %s", e)
         return _err("SQL 執行失敗，請確認語法")
@@ -274,6 +328,42 @@ def collection_sql(request: SqlRequest) -> dict:
             conn.close()
 
 
+def _stream_rows(conn, cursor, budget: _QueryBudget, columns: List[str], first: list):
+    """mode=ndjson 的 generator：逐批 fetchmany，總筆數上限 _SQL_STREAM_MAX_ROWS。
+
+    truncated 只在確實還有第 max+1 列時為 true：剛好取滿上限時多探一列再判斷。
+    """
+    count = 0
+    truncated = False
+    batch = first
+    try:
+        yield _ndjson_line({"columns": columns})
+        while batch:
+            room = _SQL_STREAM_MAX_ROWS - count
+            if len(batch) > room:
+                batch, truncated = batch[:room], True
+            count += len(batch)
+            yield "".join(_ndjson_line(list(row)) for row in batch)
+            if count >= _SQL_STREAM_MAX_ROWS:
+                if not truncated:
+                    with budget.running():
+                        truncated = cursor.fetchone() is not None
+                break
+            with budget.running():
+                batch = cursor.fetchmany(_SQL_STREAM_BATCH)
+        yield _ndjson_line({"done": True, "count": count, "truncated": truncated})
+    except sqlite3.Error as e:
+        if budget.exceeded:
+            logger.warning("[collection/sql] ndjson 超過執行預算（%d 筆後中斷）", count)
+            error = _ERR_TOO_EXPENSIVE
+        else:
+            logger.warning("[collection/sql] ndjson 串流失敗: %s", e)
+            error = "SQL 執行失敗，請確認語法"
+        yield _ndjson_line({"done": False, "error": error, "count": count})
+    finally:
+        conn.close()
+
+
 # ── GET /api/collection/analysis ─────────────────────────────────────────────
 
 @router.get("/analysis")
@@ -282,94 +372,43 @@ def collection_analysis() -> dict:
     收藏庫 metadata 健康度診斷。
 
     回傳各欄位缺失數、空陣列數、異常番號、日文 tag 統計、NFO 狀態以及可用的 group 名稱。
+
+    計數由 trigger 維護在 video_health_summary 單列（見 connection._ensure_video_health），
+    這裡只讀一列，不隨片庫大小變慢。
     """
     db_path = get_db_path()
     if not db_path.exists():
         return {"success": False, "error": "資料庫尚未初始化"}
 
-    conn = None
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.execute("PRAGMA query_only = ON")
-        conn.execute("PRAGMA busy_timeout = 5000")
-        cur = conn.cursor()
-
-        # 總筆數
-        total_videos = cur.execute("SELECT COUNT(*) FROM videos").fetchone()[0]
-
-        # missing_fields（NULL 或空字串）
-        def _count_missing(col: str) -> int:
-            return cur.execute(
-                f"SELECT COUNT(*) FROM videos WHERE {col} IS NULL OR {col} = ''"
-            ).fetchone()[0]
+        counts = VideoRepository(db_path).get_health_summary()
 
         missing_fields = {
-            "title":          _count_missing("title"),
-            "actresses":      _count_missing("actresses"),   # 只計 NULL/''，不含 '[]'
-            "maker":          _count_missing("maker"),
-            "tags":           _count_missing("tags"),
-            "release_date":   _count_missing("release_date"),
-            "cover_path":     _count_missing("cover_path"),
-            "director":       _count_missing("director"),
-            "label":          _count_missing("label"),
-            "original_title": _count_missing("original_title"),
+            col: counts[f"missing_{col}"]   # 只計 NULL/''；actresses/tags 的 '[]' 算在 empty_array_fields
+            for col in ("title", "actresses", "maker", "tags", "release_date",
+                        "cover_path", "director", "label", "original_title")
         }
-
         # empty_array_fields：LENGTH < 3（'[]' 長度為 2）
-        def _count_empty_array(col: str) -> int:
-            return cur.execute(
-                f"SELECT COUNT(*) FROM videos WHERE COALESCE(LENGTH({col}), 0) < 3"
-            ).fetchone()[0]
-
         empty_array_fields = {
-            "actresses": _count_empty_array("actresses"),
-            "tags":      _count_empty_array("tags"),
+            "actresses": counts["empty_actresses"],
+            "tags":      counts["empty_tags"],
         }
-
-        # corrupted_numbers：從 DB 全取 number，Python 端比對
-        all_numbers = [
-            row[0] for row in cur.execute("SELECT number FROM videos").fetchall()
+        patterns = [
+            {"name": rule["name"], "count": counts[f"corrupted_{rule['name']}"]}
+            for rule in CORRUPTION_RULES
         ]
-        pattern_counts = {rule["name"]: 0 for rule in CORRUPTION_RULES}
-        for num in all_numbers:
-            if num is None:
-                continue
-            upper = num.upper()
-            for rule in CORRUPTION_RULES:
-                if re.match(rule["pattern"], upper):
-                    pattern_counts[rule["name"]] += 1
-        corrupted_total = sum(pattern_counts.values())
         corrupted_numbers = {
-            "total": corrupted_total,
-            "patterns": [
-                {"name": rule["name"], "count": pattern_counts[rule["name"]]}
-                for rule in CORRUPTION_RULES
-            ],
+            "total": sum(p["count"] for p in patterns),
+            "patterns": patterns,
         }
 
-        # japanese_tags：從 DB 全取 tags，Python 端比對
-        all_tags = [
-            row[0] for row in cur.execute("SELECT tags FROM videos").fetchall()
-        ]
-        japanese_total = sum(1 for t in all_tags if _has_japanese_tags(t))
-        japanese_tags = {"total": japanese_total}
-
-        # nfo_status
-        has_nfo = cur.execute(
-            "SELECT COUNT(*) FROM videos WHERE nfo_mtime IS NOT NULL AND nfo_mtime > 0"
-        ).fetchone()[0]
-        missing_nfo = cur.execute(
-            "SELECT COUNT(*) FROM videos WHERE nfo_mtime IS NULL OR nfo_mtime = 0"
-        ).fetchone()[0]
-        nfo_status = {"has_nfo": has_nfo, "missing_nfo": missing_nfo}
-
         return {
-            "total_videos":      total_videos,
+            "total_videos":      counts["total"],
             "missing_fields":    missing_fields,
             "empty_array_fields": empty_array_fields,
             "corrupted_numbers": corrupted_numbers,
-            "japanese_tags":     japanese_tags,
-            "nfo_status":        nfo_status,
+            "japanese_tags":     {"total": counts["japanese_tags"]},
+            "nfo_status":        {"has_nfo": counts["has_nfo"], "missing_nfo": counts["missing_nfo"]},
             "available_groups":  _AVAILABLE_GROUPS,
         }
 
@@ -377,10 +416,6 @@ def collection_analysis() -> dict:
         logger.error("[collection/analysis] 非預期錯誤: %s", e)
         return {"success": False, "error": "內部錯誤，請稍後再試"}
 
-    finally:
-        if conn:
-            conn.close()
-
 
 # ── POST /api/collection/analysis/groups ─────────────────────────────────────
 
@@ -401,9 +436,9 @@ def collection_analysis_groups(request: AnalysisGroupRequest) -> dict:
 
     conn = None
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.execute("PRAGMA query_only = ON")
-        conn.execute("PRAGMA busy_timeout = 5000")
+        if group in ("corrupted_numbers", "japanese_tags"):
+            VideoRepository(db_path).heal_health_flags()
+        conn = get_readonly_connection(db_path)
         cur = conn.cursor()
 
         def _row_to_item(row) -> dict:
@@ -435,37 +470,21 @@ def collection_analysis_groups(request: AnalysisGroupRequest) -> dict:
                     if len(items) < limit:
                         items.append(item)
 
-        elif group == "corrupted_numbers":
+        elif group in ("corrupted_numbers", "japanese_tags"):
+            # 寫入時預算的旗標欄位（partial index）；只撈命中列，不再全表 Python 比對
+            flag_where = (
+                "number_issue != ''" if group == "corrupted_numbers" else "has_japanese_tags = 1"
+            )
             rows = cur.execute(
-                "SELECT id, number, path, title, maker FROM videos",
+                f"SELECT id, number, path, title, maker FROM videos WHERE {flag_where} ORDER BY id",
             ).fetchall()
             for row in rows:
                 item = _row_to_item(row)
-                if _is_corrupted_number(item["number"]):
-                    if exclude_western and _is_western(item["file_path"] or ""):
-                        continue
-                    total += 1
-                    if len(items) < limit:
-                        items.append(item)
-
-        elif group == "japanese_tags":
-            rows = cur.execute(
-                "SELECT id, number, path, title, maker, tags FROM videos",
-            ).fetchall()
-            for row in rows:
-                id_, number, file_path, title, maker, tags = row
-                if _has_japanese_tags(tags):
-                    if exclude_western and _is_western(file_path or ""):
-                        continue
-                    total += 1
-                    if len(items) < limit:
-                        items.append({
-                            "id":        id_,
-                            "number":    number,
-                            "file_path": file_path,
-                            "title":     title,
-                            "maker":     maker,
-                        })
+                if exclude_western and _is_western(item["file_path"] or ""):
+                    continue
+                total += 1
+                if len(items) < limit:
+                    items.append(item)
 
         elif group == "missing_core":
             rows = cur.execute(
@@ -552,9 +571,7 @@ def fix_numbers_preview(request: FixNumbersPreviewRequest) -> dict:
 
     conn = None
     try:
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.execute("PRAGMA query_only = ON")
-        conn.execute("PRAGMA busy_timeout = 5000")
+        conn = get_readonly_connection(db_path)
         cur = conn.cursor()
 
         rows = cur.execute("SELECT id, number, path FROM videos").fetchall()
@@ -644,6 +661,8 @@ def fix_numbers_apply(request: FixNumbersApplyRequest) -> dict:
             updated += 1
 
         conn.commit()
+        # raw UPDATE number 由 trigger 清空 number_issue；此處補算，analysis 計數不必等重啟
+        VideoRepository(db_path).heal_health_flags()
 
         # invalidate ranker cache（寫成功才 invalidate；commit 失敗跳過）
         try:
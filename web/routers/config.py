@@ -70,6 +70,14 @@ def _reset_translate_service():
     reset_translate_service()
 
 
+def _apply_thumbnail_storage(packed: bool) -> None:
+    """依設定切換縮圖儲存後端（切換失敗只記錄，不影響設定存檔結果）。"""
+    try:
+        thumbnail_cache.use_packed(packed)
+    except Exception:
+        logger.exception("切換縮圖儲存後端失敗（packed=%s）", packed)
+
+
 @router.get("/config")
 def get_config() -> dict:
     """取得所有設定（三個不透明憑證以遮罩形狀回傳；CD-114c-2）"""
@@ -146,6 +154,7 @@ def update_config(config: AppConfig) -> dict:
 
             mutate_config(_write_preserving_server_mode)
             _reset_translate_service()  # 重置翻譯服務，讓新配置生效
+            _apply_thumbnail_storage(config.thumbnail_cache_packed)
             return {"success": True, "message": "設定已儲存"}
         except Exception as e:
             logger.error("儲存設定失敗: %s", e)
@@ -167,6 +176,7 @@ def reset_config() -> dict:
             reset_config_file()  # 鎖內 exists/unlink，無 TOCTOU（CD-66b-1）
             lan_listener.stop()
         _reset_translate_service()  # 清除舊服務實例（與 server_mode 無關，鎖外）
+        _apply_thumbnail_storage(False)  # 預設為檔案模式
         return {"success": True, "message": "已恢復預設設定"}
     except Exception as e:
         logger.error("恢復預設設定失敗: %s", e)
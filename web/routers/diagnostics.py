@@ -7,8 +7,11 @@ web/routers/diagnostics.py — TASK-79-T3
   POST /api/client-log — 前端 head inline beacon 送 boot / post_alpine /
                          error 生命週期事件；寫入 OpenAver.frontend channel
                          （→ debug.log）。回 204、無 body。
+  GET  /api/diagnostics — 本機診斷資訊：openaver.db 背景維護（optimize /
+                         ANALYZE / checkpoint / vacuum）最近結果與檔案狀態、
+                         gallery 資料夾監看狀態。
 
-性質：純本地 append-only log sink。零外送、無 DB、無背景任務。
+性質：純本地診斷。零外送；client-log 無 DB、無背景任務，diagnostics 只讀維護狀態。
 刻意「不揭露」於 capabilities._TOOLS（CD13）——它是診斷基建，非 AI 工具。
 """
 from typing import Literal, Optional
@@ -16,6 +19,8 @@ from typing import Literal, Optional
 from fastapi import APIRouter, Response
 from pydantic import BaseModel
 
+from core.database import db_maintenance
+from core.gallery_watcher import gallery_watcher
 from core.logger import get_logger
 
 logger = get_logger('frontend')  # → OpenAver.frontend，進 debug.log
@@ -51,3 +56,9 @@ def client_log(payload: ClientLogPayload) -> Response:
     else:
         logger.info(line)  # CD10: boot / post_alpine → INFO
     return Response(status_code=204)
+
+
+@router.get("/diagnostics")
+def diagnostics() -> dict:
+    """本機診斷：DB 背景維護最近一次各項結果 + DB / WAL / freelist 大小 + 監看狀態。"""
+    return {"db_maintenance": db_maintenance.status(), "gallery_watcher": gallery_watcher.status()}
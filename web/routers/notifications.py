@@ -35,8 +35,8 @@ def emit_notification(
     title_key: str,
     message: str = "",
     task_type: Optional[str] = None,
-) -> None:
-    """後端各處呼叫此函式新增一筆通知。
+) -> str:
+    """後端各處呼叫此函式新增一筆通知，回傳該筆 id（供 update_notification 原地更新）。
     設計為極度輕量（只做 deque.appendleft），不可拋出例外。
     level: "info" | "success" | "warn" | "error"
     """
@@ -54,6 +54,19 @@ def emit_notification(
             _read_ids.discard(evicted["id"])
         _notifications.appendleft(notif)
     logger.debug("[notif] emit level=%s title_key=%s", level, title_key)
+    return notif["id"]
+
+
+def update_notification(notif_id: str, message: str) -> None:
+    """原地改寫某筆通知的 message（長任務進度用，不另佔 buffer 名額）。
+
+    已被擠出 buffer 或清空的 id → no-op。已讀狀態不變，不可拋出例外。
+    """
+    with _lock:
+        for item in _notifications:
+            if item["id"] == notif_id:
+                item["message"] = message
+                break
 
 
 def _calc_highest_unread_level(items: list, read_ids: set) -> Optional[str]:
@@ -26,6 +26,7 @@ import sys
 import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from urllib.parse import unquote, quote
 from pathlib import Path
@@ -35,26 +36,26 @@ from fastapi import APIRouter, Query, Request
 from fastapi.responses import StreamingResponse, HTMLResponse, Response, FileResponse, JSONResponse
 from starlette.background import BackgroundTask
 
-from core.gallery_scanner import VideoScanner, fast_scan_directory, VideoInfo, _run_sample_images_cleanup_pass  # noqa: PLC2701 — scanner 的 rescan 端點需要在特定時機主動觸發 gallery_scanner 內部的樣本圖清理 pass（該 pass 平常只在 scanner 自身流程內被呼叫），避免把整段清理邏輯複製一份到 router 層
+from core.gallery_scanner import VideoScanner, fast_scan_directory, iter_scan_files, SCAN_UPSERT_CHUNK, VideoInfo, _run_sample_images_cleanup_pass  # noqa: PLC2701 — scanner 的 rescan 端點需要在特定時機主動觸發 gallery_scanner 內部的樣本圖清理 pass（該 pass 平常只在 scanner 自身流程內被呼叫），避免把整段清理邏輯複製一份到 router 層
 from core.cover_layout import cover_base_stem
 from core.video_extensions import get_proxy_extensions, get_video_extensions
 from core.gallery_generator import HTMLGenerator
 from core.path_utils import to_file_uri, is_path_under_dir, uri_to_fs_path, coerce_to_file_uri, uri_to_local_fs_path
 from core.nfo_updater import check_cache_needs_update, update_videos_generator
-from core.database import VideoRepository, Video, init_db, get_db_path, migrate_json_to_sqlite
+from core.database import VideoRepository, Video, init_db, get_db_path, migrate_json_to_sqlite, ScanDirIndexRepository, ScanJournalRepository, scan_filter_key
 from core.multipart_group import resolve_group
 from core.focal import requires_face_detection
 from core.focal_trigger import maybe_submit_video_focal
 from core.organizer import generate_jellyfin_images, HEADERS as _EMBED_HEADERS
 from core.config import load_config, iter_gallery_sources, get_gallery_source_paths, STEM_IMAGE_MODES
 from core.readonly_producer import produce_source, resolve_output_root
-from core.generate_state import try_mark_generate_active, mark_generate_done
+from core.generate_state import is_watch_sync_in_progress, try_mark_generate_active, mark_generate_done
 from core import thumbnail_cache
 from core.scraper import smart_search
 from core.source_settings import is_uncensored_mode_effective
 from pydantic import BaseModel
 from core.logger import get_logger
-from web.routers.notifications import emit_notification as _emit_notif
+from web.routers.notifications import emit_notification as _emit_notif, update_notification as _update_notif
 
 logger = get_logger(__name__)
 
@@ -248,7 +249,7 @@ def _yield_source_summary(result) -> Generator[str, None, None]:
             })
 
 
-def _run_readonly_source(src, config, repo, proxy_url, summary, reachable: bool = True, should_abort: Optional[Callable[[], bool]] = None, strm_mappings_getter: Optional[Callable[[], dict]] = None) -> Generator[str, None, None]:
+def _run_readonly_source(src, config, repo, proxy_url, summary, reachable: bool = True, should_abort: Optional[Callable[[], bool]] = None, strm_mappings_getter: Optional[Callable[[], dict]] = None, journal=None, resume: bool = False) -> Generator[str, None, None]:
     """在 daemon worker thread 跑 produce_source，drain 無界 queue 逐片 yield SSE。
 
     worker 例外（含 produce_source 迴圈前的 normalize/列檔/DB 拋錯，未被 producer
@@ -257,6 +258,8 @@ def _run_readonly_source(src, config, repo, proxy_url, summary, reachable: bool
 
     strm_mappings_getter（PR #93 五審四次 P2, option C）：注入 produce_source，讓 media-server
     模式每片重讀 fresh strm 映射，封死斷線尾巴那片用凍結舊映射落檔的殘留。
+
+    journal / resume：原樣轉給 produce_source（掃描日誌，見 core.database.scan_journal）。
     """
     q: "queue.Queue" = queue.Queue()  # 無界：worker 永不阻塞於 put，client 斷線 daemon 自然退出
     _SENTINEL = object()
@@ -270,6 +273,8 @@ def _run_readonly_source(src, config, repo, proxy_url, summary, reachable: bool
                 should_abort=should_abort,
                 reachable=reachable,
                 strm_mappings_getter=strm_mappings_getter,
+                journal=journal,
+                resume=resume,
             )
         except Exception:
             logger.exception("唯讀生成來源失敗: %s", src.path)
@@ -299,8 +304,93 @@ def _run_readonly_source(src, config, repo, proxy_url, summary, reachable: bool
         yield from _yield_source_summary(result)
 
 
-def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Generator[str, None, None]:  # noqa: C901 — avlist SSE 生成主流程；109 已判定為「列 backlog、現在別搬」（60–100 處測試 patch target 焊死該函式，拆分成本由測試面而非邏輯面決定）
-    """產生影片列表（SSE 串流）- 使用 SQLite 儲存"""
+def _list_gallery_source(normalized_dir, config, journal, dir_index, resume: bool, skipped_paths: list) -> tuple:
+    """列出一般來源的影片；resume 且有相符的掃描日誌時沿用日誌裡的列舉。
+
+    讀取失敗被跳過的路徑 append 進 skipped_paths。回傳 (all_files, 日誌項目或 None, filter_key)。
+    """
+    gallery_config = config.get('gallery', {})
+    min_size_bytes = gallery_config.get('min_size_mb', 0) * 1024 * 1024
+    video_extensions = get_video_extensions(config)
+    filter_key = scan_filter_key(video_extensions, min_size_bytes)
+    resumed = journal.load('gallery', normalized_dir, filter_key) if resume else None
+    if resumed is not None:
+        skipped_paths.extend(resumed.skipped_paths)
+        return resumed.files, resumed, filter_key
+    all_files = fast_scan_directory(
+        normalized_dir,
+        video_extensions,
+        min_size_bytes,
+        on_skip=lambda p, _e: skipped_paths.append(p),
+        workers=gallery_config.get('scan_workers'),
+        dir_index=dir_index,
+    )
+    return all_files, None, filter_key
+
+
+def _scan_and_upsert(scanner, repo, journal, normalized_dir, needs_scan: list, workers, should_abort, session_added_paths: list, stats: dict) -> Generator[str, None, None]:
+    """逐檔 scan_file 並分段寫入 DB，每檔 yield 一筆 SSE 進度。
+
+    scan_file 在執行緒池上跑（gallery.scan_file_workers），結果依 needs_scan 原順序回到
+    這裡；SSE 與 DB 寫入都留在呼叫端執行緒。每寫入一段就推進日誌游標，整個來源跑完才
+    刪日誌；中止時保留，下次 resume 由此續掃。stats 的 inserted / updated / cache_misses /
+    errors 就地累加（同 _run_readonly_source 的 summary）。
+    """
+    videos_to_upsert = []
+
+    # TASK-90b-T4: 逐檔中止檢查（每檔處理之前）。單一資料夾內檔案量大時，逐來源層檢查
+    # 粒度太粗，交給 iter_scan_files 在每檔之前檢查：逐檔同步時在 scan_file() 之前就停；
+    # 平行時已預先送出的檔案被取消，已完成的結果直接捨棄、不寫入（不中斷正在進行中的
+    # scan_file() 呼叫）。
+    processed = 0
+    for i, (file_info, video_info, scan_error) in enumerate(
+        iter_scan_files(scanner.scan_file, needs_scan, workers, should_abort), 1
+    ):
+        processed = i
+        video_name = os.path.basename(file_info['path'])
+        yield _sse_event({"type": "log", "level": "info", "message": f"  [{i}/{len(needs_scan)}] {video_name}"})
+
+        try:
+            if scan_error is not None:
+                raise scan_error
+            video = Video.from_video_info(video_info)
+            video.mtime = file_info['mtime']
+            video.nfo_mtime = file_info.get('nfo_mtime', 0)
+            videos_to_upsert.append(video)
+            session_added_paths.append(video.path)
+            stats["cache_misses"] += 1
+        except Exception:
+            logger.exception("掃描檔案失敗: %s", file_info.get('path', ''))
+            yield _sse_event({"type": "log", "level": "warn", "message": f"  [{i}] 掃描發生錯誤，已跳過"})
+            stats["errors"] += 1
+
+        # 分段寫入：不必等整個資料夾掃完才一次 upsert；寫入後推進日誌游標
+        if len(videos_to_upsert) >= SCAN_UPSERT_CHUNK:
+            _upsert_chunk(repo, videos_to_upsert, stats)
+            videos_to_upsert = []
+            journal.advance('gallery', normalized_dir, i)
+
+    # 批次寫入（剩餘不足一段的部分）
+    if videos_to_upsert:
+        _upsert_chunk(repo, videos_to_upsert, stats)
+
+    if processed == len(needs_scan):
+        journal.finish('gallery', normalized_dir)
+
+
+def _upsert_chunk(repo, videos: list, stats: dict) -> None:
+    """upsert 一段影片，新增 / 更新筆數累加進 stats。"""
+    inserted, updated = repo.upsert_batch(videos)
+    stats["inserted"] += inserted
+    stats["updated"] += updated
+
+
+def generate_avlist(should_abort: Optional[Callable[[], bool]] = None, resume: bool = False) -> Generator[str, None, None]:  # noqa: C901 — avlist SSE 生成主流程；109 已判定為「列 backlog、現在別搬」（60–100 處測試 patch target 焊死該函式，拆分成本由測試面而非邏輯面決定）
+    """產生影片列表（SSE 串流）- 使用 SQLite 儲存
+
+    resume=True：上次中斷、留有掃描日誌（core.database.scan_journal）的來源沿用日誌裡
+    的列舉結果，不重新列目錄，也不據此推論刪除。
+    """
 
     try:
         # 載入設定
@@ -311,7 +401,6 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
         output_dir = gallery_config.get('output_dir', 'output')
         output_filename = gallery_config.get('output_filename', 'gallery_output.html')
         path_mappings = gallery_config.get('path_mappings', {})
-        min_size_mb = gallery_config.get('min_size_mb', 0)
 
         # 預設顯示設定
         default_mode = gallery_config.get('default_mode', 'image')
@@ -350,6 +439,10 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
         # 初始化資料庫
         init_db(db_path)
         repo = VideoRepository(db_path)
+        # 目錄簽章索引：未變動的資料夾沿用上次列舉結果（gallery.scan_dir_index 可關）
+        dir_index = ScanDirIndexRepository(db_path) if gallery_config.get('scan_dir_index', True) else None
+        # 掃描日誌：每個來源的列舉結果與進度，中斷後 resume 可直接續掃
+        journal = ScanJournalRepository(db_path)
 
         yield _sse_event({"type": "log", "level": "info", "message": f"資料庫筆數: {repo.count()}"})
 
@@ -390,12 +483,13 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
                 # （比照 :353/:96 既定作法，見 TASK-89b-T5 現況分析 #5）。
                 reachable = os.path.exists(uri_to_fs_path(src.path))  # uri-no-reverse: native config path (src.path), no DB-mapped namespace
                 # PR #93 五審四次 P2 (option C)：注入 fresh strm 映射 getter。config 是 :303
-                # 一次載入的凍結快照；load_config() 無 lru_cache、每次讀 disk（同 :1275 prewarm
+                # 一次載入的凍結快照；load_config() 以 config.json 的 stat 驗證快取、寫入即失效（同 :1275 prewarm
                 # pattern），故 getter 拿到的是「當下磁碟上的」映射 → 斷線尾巴那片也用當前映射。
                 yield from _run_readonly_source(
                     src, config, repo, proxy_url, readonly_summary, reachable,
                     should_abort=should_abort,
                     strm_mappings_getter=lambda: load_config().get('scraper', {}).get('strm_path_mappings', {}),
+                    journal=journal, resume=resume,
                 )
                 continue
 
@@ -422,18 +516,17 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
                 continue
 
             try:
-                # 快速掃描取得檔案列表
-                min_size_bytes = min_size_mb * 1024 * 1024
-                video_extensions = get_video_extensions(config)
                 # a5 Codex fix: 收集因 OSError/PermissionError 被跳過的路徑
                 # （含 Windows 長路徑觸發的 OSError — 這些 entry 根本不會進 all_files）
                 skipped_paths: list[str] = []
-                all_files = fast_scan_directory(
-                    normalized_dir,
-                    video_extensions,
-                    min_size_bytes,
-                    on_skip=lambda p, _e: skipped_paths.append(p),  # noqa: B023 — skipped_paths consumed synchronously within same iteration, not deferred
+                all_files, resumed, filter_key = _list_gallery_source(
+                    normalized_dir, config, journal, dir_index, resume, skipped_paths,
                 )
+                if resumed is not None:
+                    yield _sse_event({
+                        "type": "log", "level": "info",
+                        "message": f"{directory}: 從上次中斷處續掃（已處理 {resumed.processed}/{resumed.total}）",
+                    })
 
                 if not all_files and not skipped_paths:
                     yield _sse_event({"type": "log", "level": "info", "message": f"{directory}: 沒有影片檔案"})
@@ -473,7 +566,10 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
                 # 被跳過，current_paths 就不是本目錄完整集合，用它做 diff 會把「原本存在
                 # 但這次沒掃到（因失敗）」的 DB 紀錄誤判為已刪除並清掉。
                 # partial scan 只做 insert/update，不能 infer 刪除。
-                if skipped_paths:
+                # 續掃沿用的是中斷前的列舉，同樣不據此推論刪除（留給下一次完整 generate）。
+                if resumed is not None:
+                    pass
+                elif skipped_paths:
                     yield _sse_event({
                         "type": "log",
                         "level": "warn",
@@ -492,39 +588,26 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
                         yield _sse_event({"type": "log", "level": "info", "message": f"  清理 {deleted_count} 個已刪除檔案"})
 
                 # 掃描並寫入需要更新的檔案
-                videos_to_upsert = []
                 cache_hits = len(all_files) - len(needs_scan)
-                cache_misses = 0
-
-                for i, file_info in enumerate(needs_scan, 1):
-                    # TASK-90b-T4: 逐檔中止檢查（每檔處理之前）。單一資料夾內
-                    # 檔案量大時，逐來源層檢查粒度太粗，需要在此內層迴圈頂端
-                    # 再插一次，讓中止在「下一個可偵測的時間點」生效（不中斷
-                    # 正在進行中的單一 scan_file() 呼叫）。
-                    if should_abort and should_abort():
-                        break
-
-                    video_name = os.path.basename(file_info['path'])
-                    yield _sse_event({"type": "log", "level": "info", "message": f"  [{i}/{len(needs_scan)}] {video_name}"})
-
-                    try:
-                        video_info = scanner.scan_file(file_info['path'], None)
-                        video = Video.from_video_info(video_info)
-                        video.mtime = file_info['mtime']
-                        video.nfo_mtime = file_info.get('nfo_mtime', 0)
-                        videos_to_upsert.append(video)
-                        session_added_paths.append(video.path)
-                        cache_misses += 1
-                    except Exception:
-                        logger.exception("掃描檔案失敗: %s", file_info.get('path', ''))
-                        yield _sse_event({"type": "log", "level": "warn", "message": f"  [{i}] 掃描發生錯誤，已跳過"})
-                        scan_error_count += 1
-
-                # 批次寫入
-                if videos_to_upsert:
-                    inserted, updated = repo.upsert_batch(videos_to_upsert)
-                    total_inserted += inserted
-                    total_updated += updated
+
+                # 日誌游標 = needs_scan 已寫入到第幾筆。續掃時已寫入的片已被上面的
+                # mtime 比對排除，needs_scan 就是剩下的工作；中斷後才消失的檔案不掃
+                # （scan_file 對不存在的檔案仍會產生一列）。
+                if resumed is None:
+                    if needs_scan:
+                        journal.begin('gallery', normalized_dir, filter_key, all_files, skipped_paths, len(needs_scan))
+                else:
+                    needs_scan = [f for f in needs_scan if os.path.exists(f['path'])]
+                    journal.advance('gallery', normalized_dir, 0, total=len(needs_scan))
+
+                stats = {"inserted": 0, "updated": 0, "cache_misses": 0, "errors": 0}
+                yield from _scan_and_upsert(
+                    scanner, repo, journal, normalized_dir, needs_scan,
+                    gallery_config.get('scan_file_workers'), should_abort, session_added_paths, stats,
+                )
+                total_inserted += stats["inserted"]
+                total_updated += stats["updated"]
+                scan_error_count += stats["errors"]
 
                 # 掃描 focal trigger（TASK-98b-T2 / Codex PR#105 P2）：涵蓋本次掃描
                 # in-scope 的所有空焦點無碼片，不只 upsert batch（needs_scan）——既有、
@@ -556,7 +639,7 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
                 yield _sse_event({
                     "type": "log",
                     "level": "info",
-                    "message": f"{directory}: {len(all_files)} 部 (快取: {cache_hits}, 新增/更新: {cache_misses})"
+                    "message": f"{directory}: {len(all_files)} 部 (快取: {cache_hits}, 新增/更新: {stats['cache_misses']})"
                 })
             except Exception:
                 logger.exception("掃描資料夾失敗: %s", directory)
@@ -585,8 +668,7 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
                 continue
 
         # 從 SQLite 取得影片，只保留當前設定資料夾底下的記錄
-        all_db_videos = [v for v in repo.get_all()
-                         if any(is_path_under_dir(v.path, uri) for uri in configured_dir_uris)]
+        all_db_videos = repo.get_all_in_scope(configured_dir_uris)
 
         # 轉換為 VideoInfo 格式供 HTMLGenerator 使用
         all_videos = []
@@ -810,11 +892,33 @@ def generate_avlist(should_abort: Optional[Callable[[], bool]] = None) -> Genera
 # channel（該輪詢與 StreamingResponse 內部行為互不干擾，spike 已驗證）。
 _DISCONNECT_POLL_INTERVAL_SEC = 0.5
 
+# 資料夾監看（core.gallery_watcher）正在套用同步時，generate 最多等這麼久再開始；
+# 同步通常只涉及少數資料夾、數秒內結束。逾時就拒絕，不與監看同時寫同一批列。
+_WATCH_SYNC_WAIT_SEC = 30.0
+_WATCH_SYNC_POLL_SEC = 0.2
+
+
+async def _register_generate(token) -> Optional[str]:
+    """登記 generate 進行中；成功回 None，否則回拒絕訊息。
+
+    設定切換中直接拒絕；資料夾監看同步中則等它結束再登記（逾時才拒絕）。
+    """
+    deadline = time.monotonic() + _WATCH_SYNC_WAIT_SEC
+    while not try_mark_generate_active(token):
+        if not is_watch_sync_in_progress():
+            return '設定切換中，請稍後再產生列表。'
+        if time.monotonic() >= deadline:
+            return '資料夾監看同步中，請稍後再產生列表。'
+        await asyncio.sleep(_WATCH_SYNC_POLL_SEC)
+    return None
+
 
 @router.get("/generate")
-async def generate(request: Request):
+async def generate(request: Request, resume: bool = False):
     """產生影片列表（SSE 串流回傳進度）
 
+    resume=true：有未完成掃描日誌的來源從中斷處續掃（見 generate_avlist）。
+
     TASK-90b-T2：加入斷線偵測機制。`cancel_event`（`threading.Event`，非
     `asyncio.Event`——T3 要讓背景 daemon thread 安全讀取）在偵測到 client
     斷線時被設置；本 task 尚未把它串進 `generate_avlist`/`produce_source`
@@ -825,11 +929,14 @@ async def generate(request: Request):
     # 讓設定頁切換媒體伺服器模式在 generate 仍跑時被擋。try_mark_generate_active 同時檢查
     # 反方向——若設定頁正在切換模式（purge 窗口中），回 False → 拒絕開始產生，避免背景
     # producer 讀到舊唯讀來源、把剛被 purge 的卡 _upsert 補回（切模式後殭屍卡）。
-    if not try_mark_generate_active(cancel_event):
-        async def _refuse_switching():
-            yield f"data: {json.dumps({'type': 'error', 'message': '設定切換中，請稍後再產生列表。'})}\n\n"
+    # 資料夾監看同步進行中也回 False：等它套用完（最多 _WATCH_SYNC_WAIT_SEC）再登記，
+    # 不與監看的 delete_by_paths / upsert_batch 同時跑。
+    refusal = await _register_generate(cancel_event)
+    if refusal is not None:
+        async def _refuse():
+            yield f"data: {json.dumps({'type': 'error', 'message': refusal})}\n\n"
         return StreamingResponse(
-            _refuse_switching(),
+            _refuse(),
             media_type="text/event-stream",
             headers={"Cache-Control": "no-cache", "Connection": "keep-alive"},
         )
@@ -871,7 +978,7 @@ async def generate(request: Request):
             pass
 
     response = StreamingResponse(
-        generate_avlist(should_abort=cancel_event.is_set),
+        generate_avlist(should_abort=cancel_event.is_set, resume=resume),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -887,6 +994,20 @@ async def generate(request: Request):
     return response
 
 
+@router.get("/generate/journal")
+def get_scan_journal():
+    """列出未完成的掃描日誌（前端據此決定是否提供「續掃」）"""
+    try:
+        db_path = get_db_path()
+        if not db_path.exists():
+            return {"success": True, "data": []}
+        init_db(db_path)
+        return {"success": True, "data": ScanJournalRepository(db_path).list_unfinished()}
+    except Exception as e:
+        logger.error("取得掃描日誌失敗: %s", e)
+        return {"success": False, "error": "取得掃描日誌失敗"}
+
+
 @router.get("/stats")
 def get_stats():
     """取得 Scanner 統計資訊（從 SQLite 讀取）"""
@@ -936,6 +1057,35 @@ def clear_cache():  # ranker-invalidate-ok: (DELETE FROM videos only in docstrin
         return {"success": False, "error": "清除快取失敗"}
 
 
+# check_update / generate_nfo_update 只需要這幾欄：走 iter_rows 投影，不建完整 Video
+_UPDATE_CHECK_COLUMNS = (
+    'path', 'nfo_mtime', 'title', 'release_date', 'actresses', 'tags',
+    'maker', 'number', 'director', 'duration', 'series', 'label',
+)
+
+
+def _build_update_cache(repo: VideoRepository) -> dict:
+    """建構相容 check_cache_needs_update 的格式 {path: {'nfo_mtime', 'info'}}"""
+    cache = {}
+    for v in repo.iter_rows(_UPDATE_CHECK_COLUMNS):
+        cache[v.path] = {
+            'nfo_mtime': v.nfo_mtime,
+            'info': {
+                'title': v.title,
+                'date': v.release_date,
+                'actor': ','.join(v.actresses) if v.actresses else '',
+                'genre': ','.join(v.tags) if v.tags else '',
+                'maker': v.maker,
+                'num': v.number or '',
+                'director': v.director or '',
+                'duration': v.duration,
+                'series': v.series or '',
+                'label': v.label or '',
+            }
+        }
+    return cache
+
+
 @router.get("/update-check")
 def check_update():
     """檢查需要更新的影片數量（從 SQLite 讀取）"""
@@ -945,28 +1095,7 @@ def check_update():
         if not db_path.exists():
             return {"success": True, "data": {"need_update": 0}}
 
-        repo = VideoRepository(db_path)
-        all_videos = repo.get_all()
-
-        # 建構相容 check_cache_needs_update 的格式
-        cache = {}
-        for v in all_videos:
-            cache[v.path] = {
-                'nfo_mtime': v.nfo_mtime,
-                'info': {
-                    'title': v.title,
-                    'date': v.release_date,
-                    'actor': ','.join(v.actresses) if v.actresses else '',
-                    'genre': ','.join(v.tags) if v.tags else '',
-                    'maker': v.maker,
-                    'num': v.number or '',
-                    'director': v.director or '',
-                    'duration': v.duration,
-                    'series': v.series or '',
-                    'label': v.label or '',
-                }
-            }
-
+        cache = _build_update_cache(VideoRepository(db_path))
         stats = check_cache_needs_update(cache)
 
         # 不要返回 paths 列表（太大）
@@ -988,6 +1117,9 @@ def check_update():
         return {"success": False, "error": "檢查更新數量失敗"}
 
 
+_MISSING_CHECK_COLUMNS = ('path', 'number', 'nfo_mtime', 'cover_path', 'output_dir', 'scrape_attempted_at')
+
+
 @router.get("/missing-check")
 def check_missing():
     """T10: 檢查 DB 中缺少 NFO 或封面的影片數量與清單"""
@@ -999,7 +1131,7 @@ def check_missing():
                                                "missing_cover": 0, "total_missing": 0, "items": []}}
 
         repo = VideoRepository(db_path)
-        all_videos = repo.get_all()
+        all_videos = repo.iter_rows(_MISSING_CHECK_COLUMNS)
 
         missing_both = 0
         missing_nfo = 0
@@ -1054,32 +1186,11 @@ def generate_nfo_update() -> Generator[str, None, None]:
             yield _sse_event({"type": "error", "message": "資料庫不存在，請先產生列表"})
             return
 
-        repo = VideoRepository(db_path)
-        all_videos = repo.get_all()
-
-        if not all_videos:
+        cache = _build_update_cache(VideoRepository(db_path))
+        if not cache:
             yield _sse_event({"type": "done", "message": "沒有影片資料", "updated": 0})
             return
 
-        # 建構相容 check_cache_needs_update 的格式
-        cache = {}
-        for v in all_videos:
-            cache[v.path] = {
-                'nfo_mtime': v.nfo_mtime,
-                'info': {
-                    'title': v.title,
-                    'date': v.release_date,
-                    'actor': ','.join(v.actresses) if v.actresses else '',
-                    'genre': ','.join(v.tags) if v.tags else '',
-                    'maker': v.maker,
-                    'num': v.number or '',
-                    'director': v.director or '',
-                    'duration': v.duration,
-                    'series': v.series or '',
-                    'label': v.label or '',
-                }
-            }
-
         # 檢查需要更新的影片
         stats = check_cache_needs_update(cache)
         if stats['need_update'] == 0:
@@ -1239,6 +1350,12 @@ def get_image(path: str = Query(..., description="圖片路徑")):
 # prewarm 單例鎖（背景 daemon thread，fire-and-forget；sync def → 無 event loop）
 _prewarm_lock = threading.Lock()
 _prewarming = False
+_PREWARM_CHUNK = 64  # 每批：兩次批次 DB 查詢（before/after fence）+ 一輪執行緒池生成
+# 縮圖 GC（清孤兒 + 容量淘汰）單例（背景 daemon thread，同 prewarm pattern）
+_thumb_gc_lock = threading.Lock()
+_thumb_gc_running = False
+_THUMB_GC_EVERY = 256  # 設了容量上限時，serve miss 每生成這麼多組就順手排一次 GC
+_thumb_generated_since_gc = 0
 
 # fallback 原圖用副檔名 → mime（thumb 端點不抄 get_image 的安全鏈，用 DB 背書）
 _THUMB_FALLBACK_MIME = {
@@ -1254,7 +1371,8 @@ _THUMB_FALLBACK_MIME = {
 def _serve_thumb_file(tf: Path, request: Request) -> Response:
     """serve 一個已存在的 thumb webp：強 ETag + no-cache + If-None-Match → 304。
 
-    本地一次 stat（零 DB / 零 NAS）。CD-4 明令不可用 max-age。
+    本地一次 stat + read（零 DB / 零 NAS），讀到的 bytes 回填熱快取（thumbnail_cache.read_file）。
+    CD-4 明令不可用 max-age。
 
     Codex P2(b)：200 路徑改 read_bytes() 在 handler try 內把整檔讀進記憶體，**不再用
     FileResponse**。FileResponse 會把 stat/open 延到 ASGI send 階段（在 handler try 外），
@@ -1262,10 +1380,14 @@ def _serve_thumb_file(tf: Path, request: Request) -> Response:
     在此同步讀 bytes → send 階段已不碰磁碟；read 期間的並發 unlink 會在這裡拋 OSError，
     由呼叫端 get_thumb 既有的 try/except OSError 接住降級 miss 重生（與 M1 一致）。
     """
-    etag = f'"{tf.stat().st_mtime_ns}"'
+    data, etag = thumbnail_cache.read_file(tf)  # 並發 unlink → OSError 上拋給 get_thumb 降級重生
+    return _serve_thumb_bytes(data, etag, request)
+
+
+def _serve_thumb_bytes(data: bytes, etag: str, request: Request) -> Response:
+    """serve 記憶體中的縮圖 bytes（熱快取 / 打包 / 剛讀的檔）：強 ETag + no-cache，If-None-Match → 304。"""
     if request.headers.get("If-None-Match") == etag:
         return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
-    data = tf.read_bytes()  # 並發 unlink → OSError 上拋給 get_thumb 降級重生
     return Response(
         content=data,
         media_type="image/webp",
@@ -1273,24 +1395,58 @@ def _serve_thumb_file(tf: Path, request: Request) -> Response:
     )
 
 
+def _serve_thumb(path: str, width: int, tf: Path, request: Request) -> Response:
+    """依目前儲存後端 serve 一張已生成的縮圖；不在（並發失效）拋 OSError。"""
+    if thumbnail_cache.is_packed():
+        hit = thumbnail_cache.read_packed(path, width)
+        if hit is None:
+            raise FileNotFoundError(f"thumb not in pack: {path}")
+        return _serve_thumb_bytes(*hit, request)
+    return _serve_thumb_file(tf, request)
+
+
 @router.get("/thumb")
-def get_thumb(request: Request, path: str = Query(..., description="影片路徑 URI")):
+def get_thumb(
+    request: Request,
+    path: str = Query(..., description="影片路徑 URI"),
+    w: Optional[int] = Query(None, ge=1, description="期望寬度（px），對到最接近的已產寬度；省略為預設寬度"),
+):
     """縮圖 serve（feature/71 T3）：hit 零 DB/NAS、miss 生成、失敗 fallback 原圖。
 
+    w：對到 thumbnail_cache.THUMB_WIDTHS 中不小於它的一檔（snap_width）。miss 時一次
+    生成全部寬度（generate 的 dst 固定是預設寬度檔），再 serve 要求的那一檔。
+
     sync def → 跑在 Starlette threadpool worker thread。
 
     P2-A（TASK-71c）：不呼叫 unquote(path)。FastAPI 已自動 decode query string 一次；
     再 unquote 造成 double-decode → 檔名含字面 % 的影片 key 失配 → 404。
     get_image / get_video 的 unquote 是 pre-existing 不同建構鏈，留作 follow-up。
+
+    打包模式（thumbnail_cache_packed）：hit 是一次索引查詢 ＋ mmap 切片，不碰檔案
+    metadata；miss / fallback 流程與檔案模式相同。
+
+    兩種模式之前先查行程內熱快取（thumbnail_cache.read_hot）：反覆瀏覽的封面牆
+    直接從 RAM serve，零 I/O。
     """
-    tf = thumbnail_cache.thumb_file_for(path)
+    width = thumbnail_cache.snap_width(w)
+    hot = thumbnail_cache.read_hot(path, width)
+    if hot is not None:
+        return _serve_thumb_bytes(*hot, request)
+    tf = thumbnail_cache.thumb_file_for(path, width)
 
     # hit：零 DB、零 NAS（只一次本地 stat）— 驗收 4.A 核心
     # feature/71 T8 M1（+ Codex P2(b)）：hit 判定（tf.exists()）通過後、_serve_thumb_file
     # 內讀 thumb（stat / read_bytes）期間，thumb 可能被並發 invalidate(unlink) → 拋 OSError
     # （含 FileNotFoundError）。整個 serve 在此 try 內把 bytes 讀完（send 時不再碰磁碟），
     # 拋出時降級 fall through 到下方 miss 重生路徑（DB 有 cover → 重生；無 → 404），不 500。
-    if tf.exists():
+    if thumbnail_cache.is_packed():
+        try:
+            hit = thumbnail_cache.read_packed(path, width)
+            if hit is not None:
+                return _serve_thumb_bytes(*hit, request)
+        except OSError as e:  # pack 被 compact 移除
+            logger.warning("thumb hit 後並發失效，降級重生: path=%s err=%s", path, e)
+    elif tf.exists():
         try:
             return _serve_thumb_file(tf, request)
         except OSError as e:
@@ -1322,12 +1478,14 @@ def get_thumb(request: Request, path: str = Query(..., description="影片路徑
     # P2-B（TASK-71c）：miss 路徑 gate disabled，不重生 WebP。
     # 用戶關閉快取 + clear 後，stale 分頁的 miss 請求不應重建剛清的目錄。
     # disabled → fall through 到下方 fallback 原圖（D6 不破圖）。
-    # load_config() 無 lru_cache，每次讀 disk（與 _prewarm_worker:945 同 pattern）。
+    # load_config() 以 stat 驗證快取、mutate_config 寫入即失效，永遠反映磁碟現值（與 _prewarm_worker 同 pattern）。
     # hit 路徑（tf.exists() → _serve_thumb_file）不 gate：已存在直接 serve 是 harmless。
-    if not load_config().get("thumbnail_cache_enabled", False):
+    config = load_config()
+    if not config.get("thumbnail_cache_enabled", False):
         # disabled：跳過 generate，fall through 到 fallback 原圖
         pass
-    elif thumbnail_cache.generate(cover_fs, tf):
+    elif thumbnail_cache.generate(cover_fs, thumbnail_cache.thumb_file_for(path)):
+        _note_thumb_generated(config)
         # Codex P1（round-1 + round-2）：generate 用的 cover_fs 是 miss 進來時的 DB 值。
         # 生成期間若 enrich/rescrape 並發換封面，剛寫的 thumb 可能是 stale。re-read DB 一次
         # （miss 路徑本就碰本地 DB，不違反 D4「serve hit 不碰 NAS」）：
@@ -1352,7 +1510,7 @@ def get_thumb(request: Request, path: str = Query(..., description="影片路徑
             # generate 後 thumb 被並發刪（DB row 刪除 + invalidate）→ OSError，fall through
             # 到 fallback（round-2 P2：此 serve 過去在 try 外，會冒成 500）。
             try:
-                return _serve_thumb_file(tf, request)
+                return _serve_thumb(path, width, tf, request)
             except OSError as e:
                 logger.warning("thumb miss→generate 後並發失效，降級 fallback: path=%s err=%s", path, e)
 
@@ -1370,15 +1528,84 @@ def get_thumb(request: Request, path: str = Query(..., description="影片路徑
     )
 
 
+def _thumb_max_bytes(config: dict) -> int:
+    """縮圖快取容量上限（bytes）；0 = 不限。"""
+    try:
+        return max(0, int(config.get("thumbnail_cache_max_mb", 0) or 0)) * 1024 * 1024
+    except (TypeError, ValueError):
+        return 0
+
+
+def _note_thumb_generated(config: dict) -> None:
+    """serve miss 生成成功一組：設了上限時每 _THUMB_GC_EVERY 組排一次背景 GC。"""
+    global _thumb_generated_since_gc
+    if not _thumb_max_bytes(config):
+        return
+    with _thumb_gc_lock:
+        _thumb_generated_since_gc += 1
+        if _thumb_generated_since_gc < _THUMB_GC_EVERY:
+            return
+    _start_thumb_gc()
+
+
+def _thumb_gc_worker():
+    """背景縮圖 GC：依 DB 現存影片清孤兒 webp，再依容量上限做 LRU 淘汰。
+
+    孤兒來自 DB 已無對應列的影片（改名 / 搬移 / prune / 移除來源 / 單筆刪除漏失效）。
+    known 以 iter_rows 串流 path（不建整庫 Video）；與 thumbnail_cache.sweep 的 cutoff
+    配合，GC 期間才入庫並生成的縮圖不會被誤刪。沒有 DB 時不動（無從判斷孤兒）。
+    """
+    global _thumb_gc_running, _thumb_generated_since_gc
+    try:
+        db_path = get_db_path()
+        if not db_path.exists():
+            return
+        repo = VideoRepository(db_path)
+        known = (row.path for row in repo.iter_rows(('path',)))
+        thumbnail_cache.sweep(known, _thumb_max_bytes(load_config()))
+    except Exception:
+        logger.exception("縮圖 GC 背景任務失敗")
+    finally:
+        with _thumb_gc_lock:
+            _thumb_gc_running = False
+            _thumb_generated_since_gc = 0
+
+
+def _start_thumb_gc() -> bool:
+    """排一次背景 GC（單例）；已在跑回 False。"""
+    global _thumb_gc_running
+    with _thumb_gc_lock:
+        if _thumb_gc_running:
+            return False
+        _thumb_gc_running = True
+    threading.Thread(target=_thumb_gc_worker, daemon=True).start()
+    return True
+
+
+def _format_prewarm_progress(done: int, total: int, elapsed: float) -> str:
+    """預熱進度字串：已處理 / 總數、吞吐量、預估剩餘時間。"""
+    rate = done / elapsed if elapsed > 0 else 0.0
+    if rate > 0 and done < total:
+        remaining = int((total - done) / rate)
+        eta = f"剩餘約 {remaining // 60} 分 {remaining % 60} 秒"
+    else:
+        eta = "即將完成" if done < total else "完成"
+    return f"{done}/{total} 張 · {rate:.1f} 張/秒 · {eta}"
+
+
 def _prewarm_worker():
     """背景預熱 daemon thread：對 DB 全部影片補缺縮圖。
 
     自包 try/except（不冒泡 → 沒包就靜默死 + flag 卡死）+ finally 清 flag。
     絕不碰 event loop（sync thread 無 running loop）。notification center 跨 thread 安全。
+
+    逐批（_PREWARM_CHUNK 張）處理：一次批次查 DB 取當前 cover（before fence）→ 整批
+    丟執行緒池 generate（thumbnail_cache.PREWARM_WORKERS）→ 再批次查一次（after fence）。
+    進度（張數 / 吞吐量 / ETA）原地寫回開始那筆通知。
     """
     global _prewarming
     try:
-        _emit_notif("info", "notif.thumb_prewarm_start", task_type="thumb_prewarm")
+        notif_id = _emit_notif("info", "notif.thumb_prewarm_start", task_type="thumb_prewarm")
         db_path = get_db_path()
         if not db_path.exists():
             return
@@ -1387,60 +1614,88 @@ def _prewarm_worker():
         stopped_disabled = False  # Codex P3：被 disable 中止時跳過 done 通知
         # TASK-91-T2b #11：迴圈外讀一次即可（mapping 配置在 prewarm 進行中變更是
         # pathological case，非本 task 範圍，比照 thumbnail_cache_enabled 之外的容忍度）
-        path_mappings = load_config().get('gallery', {}).get('path_mappings', {})
-        # round-3 P2：snapshot（iter_missing 吃 repo.get_all()）取得後，用戶可能按
+        config = load_config()
+        path_mappings = config.get('gallery', {}).get('path_mappings', {})
+        # 容量上限：補到上限就停（否則預熱補滿 → GC 淘汰 → 下次預熱又補回，來回空轉）。
+        # used 起點走訪一次目錄，之後只累加本次生成的大小。
+        max_bytes = _thumb_max_bytes(config)
+        used = thumbnail_cache.usage()["bytes"] if max_bytes else 0
+        # round-3 P2：snapshot（iter_missing 吃 repo.iter_rows() 的 path/cover 投影）取得後，用戶可能按
         # 「清除所有影片快取」→ clear_cache 跑 repo.clear_all()（清空 DB）+
         # thumbnail_cache.clear_all()（rmtree thumb 目錄）；單筆刪除 / prune 亦同理。
         # clear_all 只是 rmtree，不 fence 後續生成，故 worker 從 stale snapshot 繼續
         # generate 會在已清空目錄重建 orphan webp（DB 空 thumb 在）。
-        # surgical fence：逐項用「同一個 repo」re-check get_by_path（reuse，不每筆新建），
-        # 只跳過/清理被移除的那部，存活影片照常完成預熱（不像 generation token 會 abort
-        # 整個 prewarm，也不需 clear_cache cancel/join 背景 thread 卡住同步請求）。
+        # surgical fence：逐批用「同一個 repo」re-check 當前 cover（get_cover_path_map，
+        # 一批一次查詢），只跳過/清理被移除的那部，存活影片照常完成預熱（不像 generation
+        # token 會 abort 整個 prewarm，也不需 clear_cache cancel/join 背景 thread 卡住同步請求）。
         # round-4 P2：snapshot 的 cover 只用來「列出待補項」，不用於 generate。enrich /
         # rescrape 可能在 snapshot 後換封面（video 還在但 cover_path 變），故一律從
         # fresh DB 讀「當前」cover 生成（與 get_thumb miss 路徑對稱：fresh re-read +
         # path-change 偵測）；before/after re-check 收 video 消失 / 無 cover / cover 換掉
-        # 三種期間變動（≤1 generate-期間-變動窗口，與 get_thumb 同級）。
-        for video_uri, _stale_cover_fs in thumbnail_cache.iter_missing(repo.get_all(), path_mappings):
-            # Codex P2 race：用戶可在 prewarm 進行中關閉快取（toggle false → save →
-            # clear）。worker 每筆重讀 load_config()（無 lru_cache，每次讀 disk）拿前端
-            # 剛 PUT 的 false → 立即 break，不再 generate 後續 item（否則在 clear 已
-            # rmtree 的目錄重建 orphan webp）。before-check：關閉即停。
-            if not load_config().get("thumbnail_cache_enabled", False):
-                stopped_disabled = True
-                break
-            # before-check：影片已從 DB 移除（clear / prune / 單筆刪除）或無 cover → 不生成孤兒
-            fresh = repo.get_by_path(video_uri)
-            if fresh is None or not fresh.cover_path:
-                continue
-            cover_fs = uri_to_local_fs_path(fresh.cover_path, path_mappings)  # 用當前 cover，忽略 stale snapshot
-            ok = thumbnail_cache.generate(cover_fs, thumbnail_cache.thumb_file_for(video_uri))
-            # after-check：generate 期間影片被清 / cover 又換 / 快取被關閉（≤1 窗口）→
-            # 丟棄剛寫的 stale thumb。disabled_after：再讀一次 load_config，若快取已關閉
-            # → invalidate 剛生成的 webp + break（關掉 generate-in-flight 的最後殘留窗口）。
-            # 正確性依賴前端契約「先 save(false) 才 clear」（config.json 寫 false 早於
-            # clear fetch）；若未來改成「先清才存」會破此假設。
-            disabled_after = not load_config().get("thumbnail_cache_enabled", False)
-            after = repo.get_by_path(video_uri)
-            # disabled-after 拉到 ok 判斷外（Codex P3-2）：generate 期間被關閉時，無論這筆
-            # 成功或失敗都要停止且不送 done 通知。成功才需 invalidate（清剛寫的殘留 thumb）；
-            # 失敗無 thumb 可清。否則「最後一筆 generate 失敗 + 同時關閉」會漏 break → 誤送 done。
-            if disabled_after:
-                if ok:
-                    thumbnail_cache.invalidate(video_uri)
-                stopped_disabled = True
-                break
-            # 既有孤兒處理：generate 成功但影片消失 / 無 cover / cover 換掉 → 丟棄 stale thumb
-            # 注意：此比對必須跟上面 #11 的反解入口一致，否則 WSL+mapping 環境下
-            # cover_fs（已反解為本機路徑）永遠不等於裸 uri_to_fs_path 結果，
-            # 造成每筆都被誤判「cover 換了」而錯誤 invalidate（TASK-91-T2b 修正，
-            # 卡片未列此行，但與 #11 同一變數耦合，不修會製造新 regression）
-            if ok and (after is None or not after.cover_path
-                       or uri_to_local_fs_path(after.cover_path, path_mappings) != cover_fs):
-                thumbnail_cache.invalidate(video_uri)
-                continue
-            if ok:
-                n += 1
+        # 三種期間變動（≤1 批 generate-期間-變動窗口）。
+        # 只投影 path / cover_path 逐批串流（不 get_all() 建整庫 Video）。待補清單先收齊
+        # （只是 URI 字串）才有總數可算 ETA；收齊後的 DB 變動由下方逐批 re-check 收斂。
+        candidates = repo.iter_rows(('path', 'cover_path'), where="IFNULL(cover_path, '') != ''")
+        missing = [uri for uri, _stale_cover_fs in thumbnail_cache.iter_missing(candidates, path_mappings)]
+        total = len(missing)
+        started = time.monotonic()
+
+        def _generate(job):
+            uri, cover_fs = job
+            return thumbnail_cache.generate(cover_fs, thumbnail_cache.thumb_file_for(uri))
+
+        with ThreadPoolExecutor(max_workers=thumbnail_cache.PREWARM_WORKERS) as pool:
+            for start in range(0, total, _PREWARM_CHUNK):
+                chunk = missing[start:start + _PREWARM_CHUNK]
+                if max_bytes and used >= max_bytes:
+                    logger.info("縮圖預熱達容量上限（%d MB），停止補齊", max_bytes // (1024 * 1024))
+                    break
+                # Codex P2 race：用戶可在 prewarm 進行中關閉快取（toggle false → save →
+                # clear）。每批重讀 load_config()（stat 驗證快取，未變時零解析成本）拿前端
+                # 剛 PUT 的 false → 立即 break，不再 generate 後續批次（否則在 clear 已
+                # rmtree 的目錄重建 orphan webp）。before-check：關閉即停。
+                if not load_config().get("thumbnail_cache_enabled", False):
+                    stopped_disabled = True
+                    break
+                # before-check：影片已從 DB 移除（clear / prune / 單筆刪除）或無 cover → 不生成孤兒
+                before = repo.get_cover_path_map(chunk)
+                jobs = [
+                    (uri, uri_to_local_fs_path(before[uri], path_mappings))  # 用當前 cover，忽略 stale snapshot
+                    for uri in chunk if before.get(uri)
+                ]
+                results = list(pool.map(_generate, jobs))
+                # after-check：generate 期間影片被清 / cover 又換 / 快取被關閉（≤1 批窗口）→
+                # 丟棄剛寫的 stale thumb。disabled_after：再讀一次 load_config，若快取已關閉
+                # → invalidate 本批剛生成的 webp + break（關掉 generate-in-flight 的最後殘留窗口）。
+                # 正確性依賴前端契約「先 save(false) 才 clear」（config.json 寫 false 早於
+                # clear fetch）；若未來改成「先清才存」會破此假設。
+                disabled_after = not load_config().get("thumbnail_cache_enabled", False)
+                after = repo.get_cover_path_map([uri for uri, _cover_fs in jobs]) if jobs else {}
+                # disabled-after 拉到 ok 判斷外（Codex P3-2）：generate 期間被關閉時，無論這批
+                # 成功或失敗都要停止且不送 done 通知。成功才需 invalidate（清剛寫的殘留 thumb）；
+                # 失敗無 thumb 可清。否則「最後一批 generate 失敗 + 同時關閉」會漏 break → 誤送 done。
+                if disabled_after:
+                    for (uri, _cover_fs), ok in zip(jobs, results, strict=True):
+                        if ok:
+                            thumbnail_cache.invalidate(uri)
+                    stopped_disabled = True
+                    break
+                for (uri, cover_fs), ok in zip(jobs, results, strict=True):
+                    if not ok:
+                        continue
+                    # 既有孤兒處理：generate 成功但影片消失 / 無 cover / cover 換掉 → 丟棄 stale thumb
+                    # 注意：此比對必須跟上面 #11 的反解入口一致，否則 WSL+mapping 環境下
+                    # cover_fs（已反解為本機路徑）永遠不等於裸 uri_to_fs_path 結果，
+                    # 造成每筆都被誤判「cover 換了」而錯誤 invalidate（TASK-91-T2b 修正）
+                    current = after.get(uri)
+                    if not current or uri_to_local_fs_path(current, path_mappings) != cover_fs:
+                        thumbnail_cache.invalidate(uri)
+                        continue
+                    n += 1
+                    if max_bytes:
+                        used += thumbnail_cache.entry_bytes(uri)
+                _update_notif(notif_id, _format_prewarm_progress(
+                    start + len(chunk), total, time.monotonic() - started))
         # Codex P3：若被 disable 中止（用戶「關閉並清除」），跳過「完成 N 張」通知——那些
         # 縮圖已被 clear 刪除 / invalidate，顯示完成數會誤導且與「關閉並清除」UX 打架。
         # disable 流程自身有確認 modal + saveConfig 回饋，無需 done 通知。
@@ -1486,6 +1741,27 @@ def thumb_clear():
     return {"cleared": True}
 
 
+@router.post("/thumb/gc")
+def thumb_gc():
+    """背景清理縮圖快取（孤兒 + 超過容量上限的最久未用者），fire-and-forget。
+
+    掃描完成（可能 prune / 改名）與設定頁「立即清理」呼叫。單例：已在跑回 already_running。
+    """
+    return {"status": "started" if _start_thumb_gc() else "already_running"}
+
+
+@router.get("/thumb/stats")
+def thumb_stats():
+    """縮圖快取磁碟佔用（設定頁顯示）：entries / files / bytes ＋ 容量上限。"""
+    stats = thumbnail_cache.usage()
+    stats["max_bytes"] = _thumb_max_bytes(load_config())
+    stats["packed"] = thumbnail_cache.is_packed()
+    stats["hot"] = thumbnail_cache.hot_stats()
+    with _thumb_gc_lock:
+        stats["gc_running"] = _thumb_gc_running
+    return stats
+
+
 @router.get("/video")
 def get_video(request: Request, path: str = Query(..., description="影片路徑（file:/// URI 或 FS 路徑）")):
     """代理影片請求，解決瀏覽器無法開啟 file:/// URI 的問題"""
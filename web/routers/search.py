@@ -1005,7 +1005,7 @@ def get_local_status(numbers: str = Query(..., description="逗號分隔的番
         }
 
     Notes:
-        - 大小寫不敏感比對
+        - 大小寫、分隔符、FC2-PPV 寫法不敏感比對（VideoRepository.get_by_numbers，走番號比對鍵索引）
         - 限制單次查詢最多 100 個番號
     """
     # 解析番號列表
@@ -2,15 +2,25 @@
 Showcase API 路由 - 影片展示資料端點
 
 端點：
-- GET /api/showcase/videos        — 取得所有影片資料（供 Showcase 頁面客戶端渲染）
+- GET /api/showcase/videos        — 取得所有影片資料（供 Showcase 頁面客戶端渲染）；
+                                    帶 limit 時改回 keyset 分頁、伺服器端排序／篩選的單頁
+- GET /api/showcase/search?q=     — 本地片庫全文檢索（FTS5 trigram，依相關度排序、分頁）
 - GET /api/showcase/video?path=   — 取得單筆影片資料（供 T3 enrich 後刷新卡片）
 """
 
+import base64
+import binascii
+import gzip
+import hashlib
+import json
 import os
+import sqlite3
+import threading
+from typing import Optional
 from urllib.parse import quote
 
-from fastapi import APIRouter, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel
 
 from core.database import VideoRepository, get_db_path, init_db
@@ -23,7 +33,9 @@ from core.logger import get_logger
 from core.config import load_config, get_gallery_source_paths
 from core.focal import detect_focal, format_focal, parse_focal
 from core import thumbnail_cache
-from core.multipart_group import group_rows, resolve_group
+from core.multipart_group import (
+    VideoGroup, group_rows, part_token, resolve_group, resolve_groups_bulk,
+)
 
 logger = get_logger(__name__)
 
@@ -52,14 +64,21 @@ def _serialize_video(v, path_mappings: dict, enabled: bool = False) -> dict:
     - enabled  → cover_url 指向 T3 /api/gallery/thumb?path=<quote(v.path)>（thumb key = video path）
     - disabled → 維持現狀 /api/gallery/image?path=<quote(uri_to_local_fs_path(v.cover_path, path_mappings))>（字節不變）
     cover_full_url 恆原圖（不受 flag 影響），供 T6 燈箱 blur-up 上層淡入用。
+    cover_srcset：enabled 時列出 THUMB_WIDTHS 各寬度（預設寬度沿用 cover_url，與其共用瀏覽器
+    快取），讓卡片依實際顯示寬度 / DPI 挑檔；disabled 或無封面為 ''。
     """
     cover_url = ""
     cover_full_url = ""
+    cover_srcset = ""
     if v.cover_path:
         original_url = f"/api/gallery/image?path={quote(uri_to_local_fs_path(v.cover_path, path_mappings), safe='')}"
         cover_full_url = original_url
         if enabled:
             cover_url = f"/api/gallery/thumb?path={quote(v.path, safe='')}"
+            cover_srcset = ", ".join(
+                f"{cover_url if w == thumbnail_cache.THUMB_WIDTH else f'{cover_url}&w={w}'} {w}w"
+                for w in thumbnail_cache.THUMB_WIDTHS
+            )
         else:
             cover_url = original_url
 
@@ -79,6 +98,7 @@ def _serialize_video(v, path_mappings: dict, enabled: bool = False) -> dict:
         "tags": ','.join(v.tags) if v.tags else '',              # 逗號分隔字串
         "size": v.size_bytes,
         "cover_url": cover_url,                                  # enabled→thumb / disabled→image
+        "cover_srcset": cover_srcset,                            # enabled→多寬度 thumb srcset / disabled→''
         "cover_full_url": cover_full_url,                        # 恆原圖 /api/gallery/image?path=...（T6 燈箱）
         "mtime": int(v.mtime) if v.mtime else 0,                 # Unix timestamp 整數
         "director": v.director or '',
@@ -133,9 +153,120 @@ def _get_configured_dirs(config: dict) -> tuple[set, dict]:
     return configured_dir_uris, path_mappings
 
 
+def _encode_cursor(sort: str, order: str, value, video_id: int) -> str:
+    """keyset 游標：(排序鍵, 方向, 最後一列排序值, 最後一列 id) → base64url JSON（對前端不透明）。"""
+    raw = json.dumps([sort, order, value, video_id], ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def _decode_cursor(cursor: str, sort: str, order: str) -> Optional[tuple]:
+    """解回 (排序值, id)；格式錯誤、或排序鍵／方向與本次請求不一致時回 None。"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        c_sort, c_order, value, video_id = json.loads(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, ValueError, TypeError):
+        return None
+    if c_sort != sort or c_order != order or not isinstance(video_id, int):
+        return None
+    if not isinstance(value, (str, int, float)) or isinstance(value, bool):
+        return None
+    return value, video_id
+
+
 @router.get("/videos")
-def get_videos():
-    """取得所有影片資料（用於 Showcase 頁面客戶端渲染）"""
+def get_videos(
+    request: Request,
+    limit: Optional[int] = Query(None, ge=1, le=500, description="給定即改回單頁（keyset 分頁）"),
+    cursor: Optional[str] = Query(None, description="上一頁回傳的 next_cursor"),
+    sort: str = Query("date", pattern="^(date|mtime|size|rating)$"),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    actress: Optional[str] = Query(None),
+    tag: Optional[str] = Query(None),
+    maker: Optional[str] = Query(None),
+    series: Optional[str] = Query(None),
+    rating: Optional[int] = Query(None, ge=0, description="user_rating 下限"),
+    has_cover: Optional[bool] = Query(None),
+):
+    """取得影片資料（用於 Showcase 頁面客戶端渲染）。
+
+    不帶 limit：回傳全部影片（既有行為，Showcase 前端在記憶體內篩選／排序），
+    片庫與設定未變時直接回快取 payload，If-None-Match 命中回 304。
+    帶 limit：改走 `_get_videos_page()`，只回一頁。
+    """
+    if limit is None:
+        return _get_all_videos(request)
+    return _get_videos_page(
+        limit=limit, cursor=cursor, sort=sort, order=order,
+        filters=dict(actress=actress, tag=tag, maker=maker, series=series,
+                     min_rating=rating, has_cover=has_cover),
+    )
+
+
+# ── /videos 完整 payload 快取 ──────────────────────────────────────────────
+# 片庫沒變時，每次進 Showcase（多台 LAN 裝置各自進）都重跑 init_db + 全表讀取 +
+# group_rows + 逐列 URL quote，結果卻逐位元組相同。快取 key：
+#   (db_path, 片庫 epoch, generation, config hash)
+# generation 由 videos 表 trigger 維護（任何寫入都 +1，見
+# connection._ensure_library_generation）；config hash 只涵蓋會影響 payload 的
+# gallery 設定與 thumbnail_cache_enabled。只留最新一份（單一片庫、單一設定）。
+_PAYLOAD_GZIP_MIN_BYTES = 1024
+_payload_lock = threading.Lock()
+_payload_cache: dict = {}   # {'entry': {'key': tuple, 'etag': str, 'body': bytes, 'gzip': bytes | None}}
+
+
+def _payload_config_hash(config: dict) -> str:
+    relevant = {
+        'gallery': config.get('gallery', {}),
+        'thumbnail_cache_enabled': config.get('thumbnail_cache_enabled', False),
+    }
+    raw = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _accepts_gzip(request: Request) -> bool:
+    """Accept-Encoding 是否接受 gzip（明寫 q=0 視為拒絕）。"""
+    for part in request.headers.get('accept-encoding', '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if coding.strip().lower() in ('gzip', '*'):
+            q = params.strip().lower()
+            if not q.startswith('q='):
+                return True
+            try:
+                return float(q[2:]) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get('if-none-match')
+    if not header:
+        return False
+    tags = [t.strip() for t in header.split(',')]
+    return '*' in tags or etag in tags
+
+
+def _payload_response(request: Request, entry: dict) -> Response:
+    """由快取項組回應：強 ETag + no-cache（每次重驗），gzip 表示法另有自己的 ETag。"""
+    body, etag = entry['body'], entry['etag']
+    headers = {'Cache-Control': 'no-cache', 'Vary': 'Accept-Encoding'}
+    if len(body) >= _PAYLOAD_GZIP_MIN_BYTES and _accepts_gzip(request):
+        etag = etag[:-1] + '-gz"'
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={**headers, 'ETag': etag})
+        with _payload_lock:
+            if entry['gzip'] is None:
+                entry['gzip'] = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+        body = entry['gzip']
+    elif _etag_matches(request, etag):
+        return Response(status_code=304, headers={**headers, 'ETag': etag})
+    headers['ETag'] = etag
+    return Response(content=body, media_type='application/json', headers=headers)
+
+
+def _get_all_videos(request: Request) -> Response:
+    """回傳 scope 內全部影片（分組後）的完整 payload（generation 快取 + ETag/304）。"""
     try:
         db_path = get_db_path()
 
@@ -147,38 +278,196 @@ def get_videos():
                 "total": 0
             })
 
+        config = load_config()
+        repo = VideoRepository(db_path)
+        key = _payload_key(repo, db_path, config)
+        entry = _payload_cache.get('entry')
+        if key is not None and entry is not None and entry['key'] == key:
+            return _payload_response(request, entry)
+
         init_db(db_path)  # 確保 schema 存在（防止半毀損 DB）
+        if key is None:
+            key = _payload_key(repo, db_path, config)
+        # generation 必須在讀資料「之前」取：讀取期間若有寫入，payload 可能比 key 新，
+        # 下一次請求 generation 已前進 → miss 重建；反過來（讀完才取）會把舊資料掛在新 key 上。
+        body = _build_all_videos_body(repo, config)
+        entry = {
+            'key': key,
+            'etag': '"' + hashlib.sha1(body).hexdigest() + '"',
+            'body': body,
+            'gzip': None,
+        }
+        if key is not None:
+            _payload_cache['entry'] = entry
+        return _payload_response(request, entry)
+
+    except Exception as e:
+        logger.error("取得影片資料失敗: %s", e)
+        return JSONResponse({
+            "success": False,
+            "error": "取得影片資料失敗",
+            "videos": [],
+            "total": 0
+        }, status_code=500)
+
+
+def _payload_key(repo: VideoRepository, db_path, config: dict) -> Optional[tuple]:
+    """快取 key；舊庫尚無 library_generation 表時回 None（本次不快取，init_db 後再取）。"""
+    try:
+        epoch, generation = repo.get_library_generation()
+    except sqlite3.OperationalError:
+        return None
+    return (str(db_path), epoch, generation, _payload_config_hash(config))
+
+
+def _build_all_videos_body(repo: VideoRepository, config: dict) -> bytes:
+    """全表讀取 → scope 過濾 → 分組 → 序列化，回 JSON bytes（與 JSONResponse 同編碼）。"""
+    # 只取「當前設定資料夾」底下的記錄（DB 保留全部當 cache）
+    configured_dir_uris, path_mappings = _get_configured_dirs(config)
+
+    all_videos = repo.get_all_in_scope(configured_dir_uris)
+
+    # feature/122 CD-122-1：分組在序列化層收斂，前端拿到的 videos 陣列已是
+    # 合併後的一筆一組（多一個 part_tokens 欄位）。單檔片的 group 只有自己
+    # 一個 member，_serialize_group() 輸出與改動前逐鍵逐值相同（AC-4）。
+    groups = group_rows(all_videos, fs_path_of=lambda v: uri_to_local_fs_path(v.path, path_mappings))
+
+    thumb_enabled = config.get('thumbnail_cache_enabled', False)
+    videos_json = [_serialize_group(g, path_mappings, thumb_enabled)
+                   for g in groups]
+
+    return JSONResponse({
+        "success": True,
+        "videos": videos_json,
+        "total": len(videos_json)
+    }).body
+
+
+def _get_videos_page(limit: int, cursor: Optional[str], sort: str, order: str,
+                     filters: dict) -> JSONResponse:
+    """keyset 分頁單頁：排序、篩選、scope 都在 SQL 完成，只序列化當頁。
+
+    分組（feature/122）：頁面以「組」為單位，每組只在 part-1 那列出現一次；
+    其他段落在掃描時略過（不佔 limit），篩選與排序一律以 part-1 的欄位判定，
+    與完整列表「卡片欄位逐字取 part-1」一致。只有檔名帶 part token 的列才需要
+    反解同資料夾分組（`resolve_groups_bulk`），單檔片零額外查詢。
+
+    `total` 是符合條件的檔案數（分集片每段各算一筆），供前端估算捲軸長度；
+    `next_cursor` 為 None 表示已到最後一頁。
+    """
+    descending = order == 'desc'
+    after = None
+    if cursor:
+        after = _decode_cursor(cursor, sort, order)
+        if after is None:
+            return JSONResponse({"success": False, "error": "cursor 無效或與排序條件不符"},
+                                status_code=400)
+    try:
+        db_path = get_db_path()
+        if not db_path.exists():
+            return JSONResponse({"success": True, "videos": [], "total": 0, "next_cursor": None})
+
+        init_db(db_path)
         repo = VideoRepository(db_path)
 
-        # 只取「當前設定資料夾」底下的記錄（DB 保留全部當 cache）
         config = load_config()
         configured_dir_uris, path_mappings = _get_configured_dirs(config)
+        filters = dict(filters, scope_uris=sorted(configured_dir_uris))
+
+        groups = []
+        last = after
+        exhausted = False
+        while len(groups) < limit:
+            # 每列最多產出一組，只取「還缺幾組」就不會超額掃描
+            want = limit - len(groups)
+            rows = repo.list_page(sort=sort, descending=descending, after=last, limit=want, **filters)
+            if rows:
+                last = (rows[-1][0], rows[-1][1].id)
+            groups.extend(_page_groups(repo, [v for _, v in rows], path_mappings))
+            if len(rows) < want:
+                exhausted = True
+                break
+
+        if not exhausted and last is not None:
+            exhausted = not repo.list_page(sort=sort, descending=descending, after=last, limit=1, **filters)
 
-        all_videos = [v for v in repo.get_all()
-                      if any(is_path_under_dir(v.path, uri) for uri in configured_dir_uris)]
+        thumb_enabled = config.get('thumbnail_cache_enabled', False)
+        return JSONResponse({
+            "success": True,
+            "videos": [_serialize_group(g, path_mappings, thumb_enabled) for g in groups],
+            "total": repo.count_listing(**filters),
+            "next_cursor": None if exhausted else _encode_cursor(sort, order, *last),
+        })
 
-        # feature/122 CD-122-1：分組在序列化層收斂，前端拿到的 videos 陣列已是
-        # 合併後的一筆一組（多一個 part_tokens 欄位）。單檔片的 group 只有自己
-        # 一個 member，_serialize_group() 輸出與改動前逐鍵逐值相同（AC-4）。
-        groups = group_rows(all_videos, fs_path_of=lambda v: uri_to_local_fs_path(v.path, path_mappings))
+    except Exception as e:
+        logger.error("取得影片分頁失敗: %s", e)
+        return JSONResponse({
+            "success": False,
+            "error": "取得影片資料失敗",
+            "videos": [],
+            "total": 0,
+        }, status_code=500)
 
-        thumb_enabled = config.get('thumbnail_cache_enabled', False)
-        videos_json = [_serialize_group(g, path_mappings, thumb_enabled)
-                       for g in groups]
 
+def _page_groups(repo: VideoRepository, rows: list, path_mappings: dict) -> list:
+    """把一批分頁列轉成 VideoGroup，非 part-1 的分集段落丟棄（見 `_get_videos_page`）。"""
+    multipart = [v.path for v in rows
+                 if part_token(uri_to_local_fs_path(v.path, path_mappings)) is not None]
+    resolved = resolve_groups_bulk(repo, multipart, path_mappings) if multipart else {}
+
+    groups = []
+    for v in rows:
+        group = resolved.get(v.path)
+        if group is None:
+            groups.append(VideoGroup(members=[v], part_tokens=[]))
+        elif group.members[0].path == v.path:
+            groups.append(group)
+    return groups
+
+
+@router.get("/search")
+def search_videos(
+    q: str = Query(..., min_length=1, max_length=200, description="關鍵字（空白分隔、AND）"),
+    limit: int = Query(60, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+):
+    """本地片庫全文檢索：番號／標題／女優／標籤／系列／片商／廠牌子字串比對，依相關度排序。
+
+    與 /videos 同 scope（只回當前設定資料夾底下的記錄）。命中以單檔為單位，不做
+    feature/122 分集合併（每筆都是實際命中的那個檔案，無 part_tokens）。
+    `total` 是 scope 內的命中總數；當頁完整列才從 DB 取回並序列化。
+    """
+    try:
+        db_path = get_db_path()
+        if not db_path.exists():
+            return JSONResponse({"success": True, "videos": [], "total": 0,
+                                 "offset": offset, "limit": limit})
+
+        init_db(db_path)
+        repo = VideoRepository(db_path)
+
+        config = load_config()
+        configured_dir_uris, path_mappings = _get_configured_dirs(config)
+
+        hit_ids = [vid for vid, _ in repo.search_text(q, scope_uris=configured_dir_uris)]
+        page = repo.get_by_ids(hit_ids[offset:offset + limit])
+
+        thumb_enabled = config.get('thumbnail_cache_enabled', False)
         return JSONResponse({
             "success": True,
-            "videos": videos_json,
-            "total": len(videos_json)
+            "videos": [_serialize_video(v, path_mappings, thumb_enabled) for v in page],
+            "total": len(hit_ids),
+            "offset": offset,
+            "limit": limit,
         })
 
     except Exception as e:
-        logger.error("取得影片資料失敗: %s", e)
+        logger.error("搜尋影片失敗: %s", e)
         return JSONResponse({
             "success": False,
-            "error": "取得影片資料失敗",
+            "error": "搜尋影片失敗",
             "videos": [],
-            "total": 0
+            "total": 0,
         }, status_code=500)
 
 
@@ -66,8 +66,10 @@ def _compute_similar_covers(video_id: int, limit: int) -> dict:
     Raises:
         HTTPException 404: target 不存在
     """
-    repo = VideoRepository()
-    target = repo.get_by_id(video_id)
+    # 片庫唯讀快照（core.database.read_model）：取用時已確認新鮮，target 與結果的
+    # fresh 欄位都從同一份讀，不再各自查 DB
+    snapshot = VideoRepository().get_snapshot()
+    target = snapshot.get(video_id)
     if target is None:
         raise HTTPException(status_code=404, detail="找不到影片")
 
@@ -77,8 +79,12 @@ def _compute_similar_covers(video_id: int, limit: int) -> dict:
     # Codex PR#105 P2 修復：ranker.rank() 可能回 SimilarRankerCache 快取的 Video 物件（非
     # fresh DB row）。update_auto_focal()/update_manual_focal() 刻意不 invalidate 整個 ranker
     # cache（焦點/裁切模式是純顯示欄位、不影響排序特徵，比照 upsert/delete invalidate 代價
-    # 不對稱），改為此處批次 fresh 覆蓋，避免卡片顯示 stale 焦點/裁切模式。
-    focal_crop_map = repo.get_focal_crop_map([v.path for v in results_videos])
+    # 不對稱），改為此處以 fresh 快照覆蓋，避免卡片顯示 stale 焦點/裁切模式。
+    focal_crop_map = {}
+    for v in results_videos:
+        fresh = snapshot.get(v.id)
+        if fresh is not None:
+            focal_crop_map[v.path] = (fresh.auto_focal, fresh.crop_mode)
 
     # feature/71 T4：讀一次 thumbnail_cache flag，套用於 query_video + 每個 result
     config = load_config()
@@ -124,14 +130,13 @@ def get_similar_covers_by_number(
 ) -> dict:
     """GET /api/similar-covers/by-number/{number}
 
-    根據番號查詢相似影片。番號大小寫不敏感。
+    根據番號查詢相似影片。番號大小寫、分隔符、FC2-PPV 寫法不敏感（同 get_by_number）。
 
     Returns:
         200: v0.8.6 response shape
         404: 查無番號
     """
-    repo = VideoRepository()
-    video = repo.get_by_number(number)
+    video = VideoRepository().get_snapshot().find_by_number(number)
     if video is None:
         raise HTTPException(status_code=404, detail="找不到影片")
     return _compute_similar_covers(video.id, limit)
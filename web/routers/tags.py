@@ -5,12 +5,10 @@ Tags API Router — /api/tags
     GET /api/tags/top — NFO tag 頻次排序（不含 user_tags），AI agent 用於跨語言同義詞候選分析
 """
 
-import sqlite3
-
 from fastapi import APIRouter, Query
 from fastapi.responses import JSONResponse
 
-from core.database import get_db_path, init_db
+from core.database import VideoRepository, get_db_path, init_db
 from core.logger import get_logger
 
 logger = get_logger(__name__)
@@ -27,36 +25,22 @@ def get_top_tags(
     try:
         db_path = get_db_path()
         # Codex P2-1: AI agent 可能在 first-run（用戶尚未跑過 scan/search）直接呼叫此端點，
-        # 此時 DB 檔尚未建立 → sqlite3.connect 會新建空檔但 videos 表不存在 → OperationalError。
+        # 此時 DB 檔尚未建立 → 唯讀連線開不起來（videos 表也不存在）→ OperationalError。
         # init_db() idempotent，已存在 schema 時為 no-op。
         init_db(db_path)
-        with sqlite3.connect(str(db_path)) as conn:
-            cur = conn.cursor()
-
-            # top N tags（套 min_count + limit）
-            cur.execute(
-                """
-                SELECT je.value AS tag, COUNT(*) AS cnt
-                FROM videos, json_each(videos.tags) AS je
-                WHERE je.value IS NOT NULL AND je.value != ''
-                GROUP BY je.value
-                HAVING cnt >= ?
-                ORDER BY cnt DESC, je.value ASC
-                LIMIT ?
-                """,
-                (min_count, limit),
-            )
-            items = [{"tag": row[0], "count": row[1]} for row in cur.fetchall()]
+        # 片庫唯讀快照（core.database.read_model）已預先解碼 tags 並以詞彙表 id 存放；
+        # 口徑同 video_tags junction（每片同一 tag 只算一次、已濾空字串）
+        counts = VideoRepository(db_path).get_snapshot().tag_counts()
+
+        # top N tags（套 min_count + limit），排序 cnt DESC, tag ASC
+        ranked = sorted(
+            ((tag, cnt) for tag, cnt in counts.items() if cnt >= min_count),
+            key=lambda item: (-item[1], item[0]),
+        )
+        items = [{"tag": tag, "count": cnt} for tag, cnt in ranked[:limit]]
 
-            # total unique（不套 min_count）
-            cur.execute(
-                """
-                SELECT COUNT(DISTINCT je.value) AS total
-                FROM videos, json_each(videos.tags) AS je
-                WHERE je.value IS NOT NULL AND je.value != ''
-                """
-            )
-            total = cur.fetchone()[0]
+        # total unique（不套 min_count）
+        total = len(counts)
 
         return {
             "success": True,
@@ -865,6 +865,10 @@ export function stateScan() {
                         // T10: 掃描完成後檢查缺失 NFO/封面
                         this.checkMissing();
 
+                        // 掃描可能 prune / 改名 → 背景清掉孤兒縮圖（fire-and-forget，後端單例）
+                        fetch('/api/gallery/thumb/gc', { method: 'POST' })
+                            .catch((e) => console.error('縮圖 GC POST 失敗:', e));
+
                         // 更新資料夾快照（generate 成功視為儲存）
                         this.folderSnapshot = JSON.stringify(this.directories);
                     } else if (data.type === 'error') {
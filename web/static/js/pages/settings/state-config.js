@@ -21,6 +21,8 @@ export function stateConfig() {
             searchFavoriteFolder: '',
             proxyUrl: '',
             thumbnailCacheEnabled: true,   // 縮圖快取開關（feature/71 T2，top-level config 欄位）；新安裝預設開啟（0.9.11+），舊用戶 migration 維持關閉
+            thumbnailCacheMaxMb: 0,        // 縮圖快取容量上限（MB，top-level config 欄位）；0 = 不限
+            thumbnailCachePacked: false,   // 縮圖改存 pack 檔（top-level config 欄位）；切換即捨棄舊後端內容
 
             // Translate
             translateEnabled: false,
@@ -226,6 +228,11 @@ export function stateConfig() {
             return Math.round((this.videoCount || 0) * 32 / 1024);
         },
 
+        // 縮圖快取目前佔用（MB，一位小數）；stats 未載入 → 0
+        get _thumbUsageMb() {
+            return ((this.thumbStats?.bytes || 0) / 1048576).toFixed(1);
+        },
+
         // 71-T11: 縮圖快取 HDD 時間估算（分鐘）。每張 ~0.25s（HDD 常數）→ 分鐘；
         // Math.ceil 確保非 0 庫至少 1 分鐘（videoCount=0 → 0）；`|| 0` 防 NaN。
         get _thumbEstimateMin() {
@@ -640,8 +647,11 @@ export function stateConfig() {
                     this.form.searchFavoriteFolder = config.search?.favorite_folder || '';
                     this.form.proxyUrl = config.search?.proxy_url || '';
                     this.form.thumbnailCacheEnabled = config.thumbnail_cache_enabled || false;
+                    this.form.thumbnailCacheMaxMb = config.thumbnail_cache_max_mb || 0;
+                    this.form.thumbnailCachePacked = config.thumbnail_cache_packed === true;
                     // 71-T5: 載入目前片數供縮圖快取空間估算（失敗降級 0，不阻塞表單）
                     this._loadVideoCount();
+                    this._loadThumbStats();
 
                     // Translate
                     this.form.translateEnabled = config.translate.enabled;
@@ -839,6 +849,28 @@ export function stateConfig() {
             }
         },
 
+        // 縮圖快取磁碟佔用（/api/gallery/thumb/stats）；失敗降級 null（不顯示佔用列）
+        async _loadThumbStats() {
+            try {
+                const r = await fetch('/api/gallery/thumb/stats');
+                this.thumbStats = r.ok ? await r.json() : null;
+            } catch (e) {
+                console.error('載入縮圖快取佔用失敗:', e);
+                this.thumbStats = null;
+            }
+        },
+
+        // 「立即清理」：背景 GC（孤兒 + 超過上限者）。端點 fire-and-forget，稍後重讀佔用。
+        async runThumbGc() {
+            try {
+                await fetch('/api/gallery/thumb/gc', { method: 'POST' });
+                this.showToast(window.t('settings.thumbnail_cache.gc_started'), 'info');
+                setTimeout(() => this._loadThumbStats(), 3000);
+            } catch (e) {
+                console.error('觸發縮圖 GC 失敗:', e);
+            }
+        },
+
         // 71-T5: 觸發背景全量 prewarm（由 saveConfig 在「剛開啟並已存檔」時呼叫，
         // 確保此刻 config.json 已 true、後端 gate 放行）。scan-done 亦無條件 POST，同由後端 gate。
         async _triggerThumbPrewarm() {
@@ -879,6 +911,8 @@ export function stateConfig() {
                 // 71-T5: 存檔前的「已持久化」縮圖快取狀態（authoritative：剛從 server GET 的 config.json）。
                 // 用來在 PUT 成功後判定「這次儲存是否剛把它從關打開」→ 才觸發背景 prewarm。
                 const prevThumbEnabled = config.thumbnail_cache_enabled === true;
+                // 儲存後端切換（散檔 ↔ pack）會捨棄既有縮圖 → 快取維持開啟時要重新預熱。
+                const prevThumbPacked = config.thumbnail_cache_packed === true;
                 // 90c-T6: 存前「已持久化」的 strm 映射（authoritative：剛 GET 的 config.json）。
                 // PUT 成功後與新映射比對，判定「這次儲存是否改動了路徑規則」→ 才提示改寫既有 strm。
                 const prevStrmMappings = JSON.stringify(config.scraper?.strm_path_mappings || {});
@@ -960,6 +994,8 @@ export function stateConfig() {
                 };
 
                 config.thumbnail_cache_enabled = this.form.thumbnailCacheEnabled;
+                config.thumbnail_cache_max_mb = Math.max(0, parseInt(this.form.thumbnailCacheMaxMb, 10) || 0);
+                config.thumbnail_cache_packed = this.form.thumbnailCachePacked === true;
 
                 // 更新 translate
                 config.translate = {
@@ -1045,6 +1081,9 @@ export function stateConfig() {
                     // 必在 PUT 成功之後——此刻 config.json 已寫入 true，後端 gate 才會放行（非 disabled）。
                     if (!prevThumbEnabled && this.form.thumbnailCacheEnabled === true) {
                         this._triggerThumbPrewarm();
+                    } else if (prevThumbEnabled && this.form.thumbnailCacheEnabled === true
+                               && prevThumbPacked !== (this.form.thumbnailCachePacked === true)) {
+                        this._triggerThumbPrewarm();
                     }
                     // 71b-T2: 縮圖快取「剛被關閉」(persisted true → 現在 false) 才清空 output/thumb/。
                     // 必在 PUT 成功之後——先存才清（config.json 已寫 false）。confirmThumbCacheDisable
@@ -33,6 +33,9 @@ export function stateUI() {
         // 71b-T2: 關閉封面縮圖快取 Confirm Modal State
         thumbCacheDisableConfirmOpen: false,
 
+        // 縮圖快取磁碟佔用（/api/gallery/thumb/stats，_loadThumbStats 填；null = 未載入/失敗）
+        thumbStats: null,
+
         // T4: 伺服器模式切換 Confirm Modal State
         serverModeConfirmOpen: false,
         serverModeConfirmValue: null,
@@ -0,0 +1,91 @@
+// user-022：多寬度 srcset 下瀏覽器只看 srcset、不看 src。封面載入失敗要清掉 srcset
+// 才看得到 placeholder；refreshVideoData 補封面 / 重抓後 srcset 各寬度要與 cover_url
+// 同一個 &t= bust，grid 才會換新圖。
+//
+// 與 pill-clear.test.mjs 同一套 importmap resolve hook（FE-GUARD-11）。
+
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import { register } from 'node:module';
+import { pathToFileURL, fileURLToPath } from 'node:url';
+import path from 'node:path';
+
+globalThis.window = globalThis;
+globalThis.window.t = (key) => key;
+
+const IMPORTMAP = {
+    '@/settings/': 'pages/settings/',
+    '@/shared/': 'shared/',
+    '@/components/': 'components/',
+    '@/search/': 'pages/search/',
+    '@/showcase/': 'pages/showcase/',
+    '@/scanner/': 'pages/scanner/',
+};
+const STATIC_JS_ROOT = pathToFileURL(
+    path.resolve(path.dirname(fileURLToPath(import.meta.url)), '../../../') + '/',
+).href;
+
+const loaderCode = `
+const IMPORTMAP = ${JSON.stringify(IMPORTMAP)};
+const STATIC_JS_ROOT = ${JSON.stringify(STATIC_JS_ROOT)};
+export async function resolve(specifier, context, nextResolve) {
+    for (const [prefix, rel] of Object.entries(IMPORTMAP)) {
+        if (specifier.startsWith(prefix)) {
+            return nextResolve(STATIC_JS_ROOT + rel + specifier.slice(prefix.length), context);
+        }
+    }
+    if (specifier.startsWith('@/')) {
+        return nextResolve(STATIC_JS_ROOT + specifier.slice(2), context);
+    }
+    return nextResolve(specifier, context);
+}
+`;
+register(`data:text/javascript,${encodeURIComponent(loaderCode)}`, import.meta.url);
+
+const { stateLightbox, bustSrcset } = await import('../state-lightbox.js');
+const { stateBase, _NO_COVER_PLACEHOLDER } = await import('../state-base.js');
+
+const THUMB = '/api/gallery/thumb?path=file%3A%2F%2F%2Fa%2Cb.mp4';
+const SRCSET = `${THUMB}&w=240 240w, ${THUMB} 360w, ${THUMB}&w=720 720w`;
+
+test('bustSrcset：每個候選都追加同一個 t，寬度描述不變', () => {
+    assert.equal(
+        bustSrcset(SRCSET, 42),
+        `${THUMB}&w=240&t=42 240w, ${THUMB}&t=42 360w, ${THUMB}&w=720&t=42 720w`,
+    );
+});
+
+test('bustSrcset：空字串原樣回傳（disabled / 無封面）', () => {
+    assert.equal(bustSrcset('', 42), '');
+});
+
+test('handleCoverError：清掉 srcset 後才換 placeholder', () => {
+    const removed = [];
+    const img = { removeAttribute: (name) => removed.push(name), src: THUMB, onerror: () => {} };
+    const video = { has_cover: true, cover_srcset: SRCSET };
+
+    stateBase.call({ $persist: (obj) => ({ as: () => obj }) }).handleCoverError(video, { target: img });
+
+    assert.deepEqual(removed, ['srcset']);
+    assert.equal(video.cover_srcset, '');
+    assert.equal(img.src, _NO_COVER_PLACEHOLDER);
+    assert.equal(video.has_cover, false);
+});
+
+test('refreshVideoData：cover_srcset 與 cover_url 帶同一個 &t=', async () => {
+    globalThis.fetch = async () => ({
+        ok: true,
+        json: async () => ({
+            success: true,
+            video: { path: 'file:///a.mp4', cover_url: THUMB, cover_full_url: '/api/gallery/image?path=x', cover_srcset: SRCSET },
+        }),
+    });
+    const c = Object.assign({}, stateLightbox(), { currentLightboxVideo: null });
+    const video = { path: 'file:///a.mp4', cover_url: THUMB, cover_srcset: SRCSET };
+
+    await c.refreshVideoData(video);
+
+    const t = video.cover_url.split('&t=')[1];
+    assert.ok(t);
+    assert.equal(video.cover_srcset, bustSrcset(SRCSET, t));
+});
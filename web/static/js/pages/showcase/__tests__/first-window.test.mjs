@@ -0,0 +1,165 @@
+// user-004：首屏視窗（fetchFirstWindow）——先以 keyset 分頁端點畫第一頁，完整清單
+// （fetchVideos）回來後整批取代。覆蓋：觸發條件閘門、請求參數、只動顯示層不動
+// _videos、完整清單先到時不覆蓋、fetchVideos 不把已畫出的首頁閃回 loading。
+//
+// 與 pill-clear.test.mjs 同一套 importmap resolve hook（FE-GUARD-11）。
+
+import { test } from 'node:test';
+import assert from 'node:assert/strict';
+import { register } from 'node:module';
+import { pathToFileURL, fileURLToPath } from 'node:url';
+import path from 'node:path';
+
+globalThis.window = globalThis;
+globalThis.window.t = (key) => key;
+
+const IMPORTMAP = {
+    '@/settings/': 'pages/settings/',
+    '@/shared/': 'shared/',
+    '@/components/': 'components/',
+    '@/search/': 'pages/search/',
+    '@/showcase/': 'pages/showcase/',
+    '@/scanner/': 'pages/scanner/',
+};
+const STATIC_JS_ROOT = pathToFileURL(
+    path.resolve(path.dirname(fileURLToPath(import.meta.url)), '../../../') + '/',
+).href;
+
+const loaderCode = `
+const IMPORTMAP = ${JSON.stringify(IMPORTMAP)};
+const STATIC_JS_ROOT = ${JSON.stringify(STATIC_JS_ROOT)};
+export async function resolve(specifier, context, nextResolve) {
+    for (const [prefix, rel] of Object.entries(IMPORTMAP)) {
+        if (specifier.startsWith(prefix)) {
+            return nextResolve(STATIC_JS_ROOT + rel + specifier.slice(prefix.length), context);
+        }
+    }
+    if (specifier.startsWith('@/')) {
+        return nextResolve(STATIC_JS_ROOT + specifier.slice(2), context);
+    }
+    return nextResolve(specifier, context);
+}
+`;
+register(`data:text/javascript,${encodeURIComponent(loaderCode)}`, import.meta.url);
+
+const { stateVideos } = await import('../state-videos.js');
+const { _videos, _filteredVideos, _setVideos } = await import('../state-base.js');
+
+const PAGE = [{ path: 'file:///a.mp4' }, { path: 'file:///b.mp4' }];
+const FULL = [{ path: 'file:///a.mp4' }, { path: 'file:///b.mp4' }, { path: 'file:///c.mp4' }];
+
+function stubFetch(routes) {
+    const calls = [];
+    globalThis.fetch = async (url) => {
+        calls.push(url);
+        const body = url.includes('limit=') ? routes.page : routes.full;
+        return { ok: true, json: async () => body };
+    };
+    return calls;
+}
+
+function makeComponent(overrides) {
+    _setVideos([]);
+    return Object.assign({}, stateVideos(), {
+        loading: true,
+        error: '',
+        videoCount: 0,
+        filteredCount: 0,
+        paginatedVideos: [],
+        totalPages: 1,
+        page: 1,
+        perPage: 90,
+        sort: 'date',
+        order: 'desc',
+        search: '',
+        pills: [],
+        showFavoriteActresses: false,
+        _firstWindowShown: false,
+    }, overrides);
+}
+
+test('fetchFirstWindow：無篩選時以 keyset 端點取第一頁並畫出，_videos 不動', async () => {
+    const calls = stubFetch({ page: { success: true, videos: PAGE, total: 3, next_cursor: 'x' } });
+    const c = makeComponent({ sort: 'mdate', order: 'asc' });
+    await c.fetchFirstWindow();
+    assert.deepEqual(calls, ['/api/showcase/videos?limit=90&sort=mtime&order=asc']);
+    assert.equal(c.loading, false);
+    assert.deepEqual(c.paginatedVideos.map(v => v.path), ['file:///a.mp4', 'file:///b.mp4']);
+    assert.equal(_filteredVideos.length, 2);
+    assert.equal(_videos.length, 0);
+});
+
+test('fetchFirstWindow：有搜尋 / pill / 非第 1 頁 / 伺服器不支援的排序時不發請求', async () => {
+    const calls = stubFetch({ page: { success: true, videos: PAGE } });
+    for (const o of [{ search: 'abc' }, { pills: [{ dim: 'maker', value: 'S1' }] },
+        { page: 2 }, { sort: 'title' }, { showFavoriteActresses: true }]) {
+        const c = makeComponent(o);
+        await c.fetchFirstWindow();
+        assert.equal(c.loading, true);
+    }
+    assert.equal(calls.length, 0);
+});
+
+test('fetchVideos：首頁已畫出時不切回 loading，完整清單回來後整批取代', async () => {
+    stubFetch({
+        page: { success: true, videos: PAGE },
+        full: { success: true, videos: FULL },
+    });
+    const c = makeComponent();
+    await c.fetchFirstWindow();
+    let loadingDuringFetch = null;
+    const realFetch = globalThis.fetch;
+    globalThis.fetch = async (url) => { loadingDuringFetch = c.loading; return realFetch(url); };
+    await c.fetchVideos();
+    assert.equal(loadingDuringFetch, false);
+    assert.equal(c._firstWindowShown, false);
+    assert.equal(_videos.length, 3);
+    assert.equal(c.videoCount, 3);
+});
+
+test('fetchFirstWindow：完整清單已先到就不覆蓋', async () => {
+    stubFetch({ page: { success: true, videos: PAGE } });
+    const c = makeComponent();
+    _setVideos(FULL.slice());
+    await c.fetchFirstWindow();
+    assert.equal(c.paginatedVideos.length, 0);
+    assert.equal(c._firstWindowShown, false);
+});
+
+// init 讓兩個請求同時在途：以可控的 deferred 回應模擬兩種到達順序
+function deferredFetch() {
+    const pending = {};
+    globalThis.fetch = (url) => new Promise((resolve) => {
+        pending[url.includes('limit=') ? 'page' : 'full'] = (body) => resolve({ ok: true, json: async () => body });
+    });
+    return pending;
+}
+
+test('並行：第一頁先到就先畫，完整清單回來後取代', async () => {
+    const pending = deferredFetch();
+    const c = makeComponent();
+    const full = c.fetchVideos();
+    const first = c.fetchFirstWindow();
+    pending.page({ success: true, videos: PAGE });
+    await first;
+    assert.equal(c.loading, false);
+    assert.equal(c.paginatedVideos.length, 2);
+    pending.full({ success: true, videos: FULL });
+    await full;
+    assert.equal(c._firstWindowShown, false);
+    assert.equal(c.filteredCount, 3);
+});
+
+test('並行：完整清單先到（含空片庫）時第一頁不覆蓋', async () => {
+    const pending = deferredFetch();
+    const c = makeComponent();
+    const full = c.fetchVideos();
+    const first = c.fetchFirstWindow();
+    pending.full({ success: true, videos: [] });
+    await full;
+    pending.page({ success: true, videos: PAGE });
+    await first;
+    assert.equal(c.paginatedVideos.length, 0);
+    assert.equal(c._firstWindowShown, false);
+    assert.equal(c.filteredCount, 0);
+});
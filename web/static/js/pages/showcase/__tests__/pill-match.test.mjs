@@ -594,6 +594,7 @@ test('CoverBadgeManifest cold/warm：pill 中文字幕 vs user_tags 中字（B1
     // 若只餵本地 loaded map，init 漏 await 這條仍會綠——mutation A 就測不紅。
     const c = stateBase.call({ $persist: (obj) => ({ as: () => obj }) });
     c.restoreState = () => {};
+    c.fetchFirstWindow = async () => {};
     c.fetchVideos = async () => {};
     c.applyFilterAndSort = () => {};
     c.updatePagination = () => {};
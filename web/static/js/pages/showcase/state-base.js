@@ -314,6 +314,7 @@ export function stateBase() {
         page: 1,
         perPage: 90,
         totalPages: 1,
+        _firstWindowShown: false,  // fetchFirstWindow 已畫出首頁、完整清單尚未到
         _animGeneration: 0,  // B13: 防止 stale deferred callback
         _lightboxAnimating: false,  // B16: Lightbox 動畫進行中 guard
         _lightboxGeneration: 0,    // B19: invalidation token for deferred $nextTick lightbox callbacks
@@ -345,7 +346,10 @@ export function stateBase() {
 
             this.restoreState();        // M2c: 先恢復狀態
             const savedPage = this.page;
-            await this.fetchVideos();
+            // user-004：完整清單與首屏視窗同時發出；第一頁先到就先畫，完整清單回來後整批取代
+            const fullList = this.fetchVideos();
+            await this.fetchFirstWindow();
+            await fullList;
             // 57e hotfix：fire-and-forget warm-up SimilarRankerCache，避免 magic icon 首次點擊 cold-start race。
             // 失敗靜默（端點不存在的舊 server / 網路斷線都不影響 showcase 主流程）。
             fetch('/api/similar/warmup').catch(() => {});
@@ -584,6 +588,9 @@ export function stateBase() {
             // 二次 @load 觸發（脆弱）→ 直接設 _imgLoaded=true，確定性顯示 placeholder（不依賴 @load）。
             video._imgLoaded = true;
             event.target.onerror = null;  // 防止 placeholder 失敗無限迴圈
+            // 有 srcset 時瀏覽器忽略 src：先清掉（Alpine 綁定同步清空，避免之後又被寫回）再換 placeholder。
+            video.cover_srcset = '';
+            event.target.removeAttribute('srcset');
             event.target.src = _NO_COVER_PLACEHOLDER;
         },
 
@@ -30,6 +30,16 @@ export function isStaleLbFullError(actualSrc, expectedSrc) {
 
 // 排除清單容器（橫向捲動列表/表格）：命中即整條 wheel handler 提早 return，
 // 讓原生橫向捲動不受影響（見 TASK-102d-T1.md「技術要點」排除清單段）。
+// 多寬度 thumb srcset 逐候選追加 &t= cache-bust（與 cover_url 同一個 t）。候選以 ', '
+// 分隔；path 已 quote(safe='')，URL 內的逗號是 %2C，不會被誤切。
+export function bustSrcset(srcset, t) {
+    if (!srcset) return srcset;
+    return srcset.split(', ').map((candidate) => {
+        const [url, descriptor] = candidate.split(' ');
+        return `${url}&t=${t} ${descriptor}`;
+    }).join(', ');
+}
+
 const WHEEL_EXCLUDE_SELECTOR = '.sample-strip, .sg-thumbs, .picker-candidates-grid, .table-scroll-container, .overflow-x-auto';
 // 102d P2b（owner 拍板 2026-07-19）：overlay 內可垂直捲動的子容器（lightbox metadata 面板，
 // showcase.css:785/946 `.lightbox-metadata{overflow-y:auto}`）——垂直滾輪命中時交還原生捲動，
@@ -1883,6 +1893,8 @@ export function stateLightbox() {
                     if (data.video.cover_url) {
                         data.video.cover_url = data.video.cover_url + '&t=' + _t;
                     }
+                    // 有 srcset 時瀏覽器只看 srcset、不看 src：各寬度同樣 bust，grid 才會換新封面。
+                    data.video.cover_srcset = bustSrcset(data.video.cover_srcset, _t);
                     // cover_full_url 恆為 /api/gallery/image（max-age=86400），URL 不變瀏覽器吃舊快取。
                     // 同步追加 &t= cache-bust，確保 lightbox overlay（.lb-full）顯示新封面。
                     if (data.video.cover_full_url) {
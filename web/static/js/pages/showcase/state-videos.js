@@ -29,6 +29,9 @@ function _releaseFieldValue(rawText, isBad) {
     return { has: t != null, raw: t };
 }
 
+// 前端排序鍵 → /api/showcase/videos keyset 模式的 sort（只有伺服器也能排的才列）
+const _SERVER_SORT = { date: 'date', size: 'size', mdate: 'mtime' };
+
 export function stateVideos() {
     return {
 
@@ -38,8 +41,41 @@ export function stateVideos() {
         applyCellFocal,
 
         // --- API 呼叫 ---
+
+        // 首屏視窗：完整清單（篩選 / pill / 徽章都在記憶體內做）仍由 fetchVideos 載入，
+        // 但先用 keyset 分頁端點只取第一頁畫出來——手機開大型片庫不必等幾 MB 的完整 payload
+        // 才看到第一頁（完整清單仍照常下載）。
+        // 只在「無搜尋、無 pill、影片模式第 1 頁、伺服器支援此排序」時走，否則首頁內容
+        // 與完整清單算出來的對不上，直接等 fetchVideos。失敗一律靜默（完整清單照常載入）。
+        async fetchFirstWindow() {
+            var serverSort = _SERVER_SORT[this.sort];
+            var perPage = parseInt(this.perPage) || 0;
+            if (!serverSort || perPage <= 0 || this.page !== 1 || this.showFavoriteActresses
+                || this.pills.length || (this.search && this.search.trim())) return;
+            try {
+                const resp = await fetch('/api/showcase/videos?limit=' + Math.min(perPage, 500)
+                    + '&sort=' + serverSort + '&order=' + this.order);
+                if (!resp.ok) return;
+                const data = await resp.json();
+                // 完整清單已先到（或已失敗收尾，loading 已關）：不覆蓋
+                if (!data.success || !this.loading || _videos.length) return;
+                var vids = data.videos || [];
+                vids.forEach(function (v) { if (v._imgLoaded === undefined) v._imgLoaded = false; });
+                // 只動顯示層：_videos 留空，由 fetchVideos 回來後整批取代
+                _setFilteredVideos(vids);
+                this.filteredCount = vids.length;
+                this.paginatedVideos = vids.slice();
+                this.totalPages = 1;
+                this._firstWindowShown = true;
+                this.loading = false;
+            } catch (e) {
+                // 靜默：fetchVideos 會回報連線錯誤
+            }
+        },
+
         async fetchVideos() {
-            this.loading = true;
+            // 首屏視窗已畫出時不再切回 loading（否則畫面會閃回載入中）
+            this.loading = !this._firstWindowShown;
             this.error = '';
             try {
                 const resp = await fetch('/api/showcase/videos');
@@ -81,6 +117,7 @@ export function stateVideos() {
                 this.error = window.t('showcase.error.cannot_connect');
             } finally {
                 this.loading = false;
+                this._firstWindowShown = false;
             }
         },
 